@@ -3,19 +3,20 @@ FastAPI server for EcoSynk AI Services
 Provides endpoints for Opus workflows and frontend integration
 """
 
-import os
 import json
+import asyncio
 import uuid
 import math
+import heapq
 import base64
-import tempfile
 import traceback
 import time
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import parse_qs
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Body, Query, Header, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Body, Query, Header, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
@@ -23,11 +24,24 @@ import uvicorn
 
 from config import settings, validate_config
 from gemini.trash_analyzer import TrashAnalyzer
-from qdrant.vector_store import EcoSynkVectorStore
+from qdrant.connection import close_qdrant_connection
+from qdrant.report_schema import report_details_needed
+from qdrant.search_cache import SearchResultCache, report_search_key, snap_to_grid
+from qdrant.user_replica import UserReplica
+from qdrant.vector_store import EcoSynkVectorStore, iter_collection_points, point_id_for
 from embeddings.generator import EmbeddingGenerator
-from yolo.waste_detector import WasteDetector
+from embeddings.batcher import EmbeddingBatcher
+from embeddings.registry import model_registry
+from yolo.batcher import DetectionBatcher
+from yolo.waste_detector import CLASS_COLORS, WasteDetector
 from geocoding import reverse_geocode
+from imaging import (
+    ImageTooLarge, PreparedUpload, UploadSizeLimitMiddleware, annotate_shared_jpeg, detection_block, prepare_upload
+)
 from campaigns import CampaignManager
+from executors import get_executors, run_cpu, run_image, run_io, shutdown_executors
+from metrics import ResponseSizeMiddleware, ResponseSizeStats, UploadStats, metrics_registry
+from projection import LEADERBOARD_FIELDS, REPORT_FIELDS, VOLUNTEER_FIELDS, Projection, parse_fields, projection_label
 
 from image_generation import (
     CampaignBannerGenerator,
@@ -116,6 +130,22 @@ class ReportSearchRequest(BaseModel):
     radius_km: float = Field(default=5.0, ge=0.1, le=100.0)
 
 
+class BulkReportItem(BaseModel):
+    """A single pre-analyzed trash report for bulk ingestion"""
+    report_id: Optional[str] = None
+    analysis: Dict[str, Any] = Field(..., description="Trash report analysis data")
+    location: Optional[LocationModel] = None
+    user_id: Optional[str] = None
+    timestamp: Optional[Any] = Field(default=None, description="ISO string or epoch seconds/milliseconds")
+
+
+class BulkReportIngestRequest(BaseModel):
+    """Request model for bulk trash report ingestion (imports and backfills)"""
+    reports: List[BulkReportItem] = Field(..., min_length=1, max_length=5000)
+    chunk_size: Optional[int] = Field(default=None, ge=1, le=2000, description="Points per Qdrant upsert")
+    wait: bool = Field(default=True, description="Wait for Qdrant to apply each chunk")
+
+
 # ============================================================================
 # FastAPI App Setup
 # ============================================================================
@@ -140,19 +170,58 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# Response sizes of the endpoints with payload projection, labelled default/custom/full by `fields=`
+PROJECTED_ENDPOINTS = ("/trash-reports", "/volunteers", "/leaderboard", "/reports/search", "/detect-hotspots")
+response_sizes = ResponseSizeStats()
+metrics_registry.register("response_sizes", response_sizes)
+app.add_middleware(
+    ResponseSizeMiddleware,
+    stats=response_sizes,
+    paths=PROJECTED_ENDPOINTS,
+    variant=lambda scope: projection_label(parse_qs(scope["query_string"].decode()).get("fields", [None])[-1])
+)
+
+# Image uploads: oversized bodies are rejected while streaming (batches may carry
+# analyze_batch_max_images images); accepted ones are read back from Starlette's
+# spooled upload file, which only goes to disk past 1 MB
+UPLOAD_ENDPOINTS = ("/analyze-trash", "/detect-waste", "/detect-waste/live")
+upload_stats = UploadStats()
+metrics_registry.register("uploads", upload_stats)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        **{path: settings.upload_max_bytes for path in UPLOAD_ENDPOINTS},
+        "/analyze-trash/batch": settings.upload_max_bytes * settings.analyze_batch_max_images,
+    },
+    on_reject=lambda path: upload_stats.reject("body_too_large")
 )
 
 # Global service instances (initialized on startup)
 analyzer: Optional[TrashAnalyzer] = None
 vector_store: Optional[EcoSynkVectorStore] = None
 embedder: Optional[EmbeddingGenerator] = None
+embedding_batcher: Optional[EmbeddingBatcher] = None
 waste_detector: Optional[WasteDetector] = None
+detection_batcher: Optional[DetectionBatcher] = None
 campaign_manager: Optional[CampaignManager] = None
 banner_generator: Optional[CampaignBannerGenerator] = None
 user_service: Optional[UserService] = None
+user_replica: Optional[UserReplica] = None
+report_search_cache: Optional[SearchResultCache] = None
 
 
 
+def _projection(fields: Optional[str], default: Tuple[str, ...]) -> Projection:
+    """Parse a `fields=` query parameter (see projection.parse_fields), answering 400 if malformed"""
+    try:
+        return parse_fields(fields, default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 def _normalize_payload_location(payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
     """Extract a normalized lat/lon dict from a payload."""
     if not payload:
@@ -192,20 +261,7 @@ def _calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -
     return radius * c
 
 
-def _parse_timestamp(candidate: Optional[str]) -> Optional[datetime]:
-    """Parse ISO timestamp strings into aware datetime objects."""
-    if not candidate:
-        return None
-    try:
-        parsed = datetime.fromisoformat(candidate.replace('Z', '+00:00'))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed
-    except Exception:
-        return None
-
-
-def _enrich_location(raw_location: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+async def _enrich_location(raw_location: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Normalize lat/lon values and attach human-readable context."""
     if not raw_location:
         return None
@@ -231,7 +287,7 @@ def _enrich_location(raw_location: Optional[Dict[str, Any]]) -> Optional[Dict[st
     label = None
 
     try:
-        context = reverse_geocode(lat_f, lon_f)
+        context = await run_io(reverse_geocode, lat_f, lon_f)
         if context:
             label = context.get('name') or context.get('display_name')
     except Exception as geo_error:  # noqa: BLE001 - avoid breaking request flow
@@ -245,6 +301,53 @@ def _enrich_location(raw_location: Optional[Dict[str, Any]]) -> Optional[Dict[st
     }
 
 
+async def _prepare_upload(content: bytes, detection: bool = True, gemini: bool = True) -> PreparedUpload:
+    """
+    Decode an upload into the variants a request needs, in an image worker process
+
+    The detection image comes back in shared memory: call release() on the
+    result once YOLO and annotation are done with it. The block is allocated
+    here and freed here if the worker call fails or the request is cancelled.
+
+    Args:
+        content: Uploaded bytes
+        detection: Build the YOLO/annotation variant
+        gemini: Build the Gemini payload
+
+    Raises:
+        HTTPException: 413 over the byte/pixel budget, 400 if the image cannot be decoded
+    """
+    start = time.perf_counter()
+    block = detection_block(settings.upload_detection_max_side) if detection else None
+    prepared = None
+    try:
+        prepared = await run_image(
+            prepare_upload,
+            content,
+            settings.upload_detection_max_side if detection else None,
+            settings.upload_gemini_max_side if gemini else None,
+            max_pixels=settings.upload_max_pixels,
+            max_bytes=settings.upload_max_bytes,
+            gemini_quality=settings.upload_gemini_jpeg_quality,
+            shared=block.ref if block else None
+        )
+    except ImageTooLarge as e:
+        upload_stats.reject("image_too_large")
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        upload_stats.reject("undecodable")
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        if block is not None and prepared is None:
+            block.unlink()
+        elif block is not None:
+            # attach() maps the image at its actual size and release() unlinks it
+            block.close()
+
+    upload_stats.observe(len(content), len(prepared.gemini_data or b""), (time.perf_counter() - start) * 1000)
+    return prepared.attach()
+
+
 # ============================================================================
 # Startup and Shutdown Events
 # ============================================================================
@@ -255,6 +358,7 @@ async def startup_event():
     global analyzer, vector_store, embedder, waste_detector
     global analyzer, vector_store, embedder, campaign_manager, banner_generator
     global analyzer, vector_store, embedder, waste_detector, campaign_manager, user_service
+    global embedding_batcher, user_replica, report_search_cache, detection_batcher
 
     
     print("\n" + "=" * 60)
@@ -272,18 +376,29 @@ async def startup_event():
     # Embedder (loads ML model from cache)
     try:
         print("  → Loading embedding model...")
-        embedder = EmbeddingGenerator()
+        embedder = EmbeddingGenerator(lazy=True)
+        embedder.warm_up()  # Single load + warm-up shared with UserService
+        embedding_batcher = EmbeddingBatcher(embedder)
+        metrics_registry.register("embedding_batcher", embedding_batcher)
+        if embedder.cache is not None:
+            metrics_registry.register("embedding_cache", embedder.cache)
         print("  ✅ Embedder ready")
     except Exception as e:
         print(f"  ⚠️  Embedder failed: {e}")
         embedder = None
+        embedding_batcher = None
     
     # Qdrant (connects to cloud) - don't block startup if this fails
     try:
         print("  → Connecting to Qdrant...")
         vector_store = EcoSynkVectorStore()
+        metrics_registry.register("qdrant", vector_store.connection)
         print("  → Setting up collections...")
         vector_store.setup_collections(recreate=False)
+        if settings.report_search_cache_enabled:
+            report_search_cache = SearchResultCache()
+            vector_store.report_search_cache = report_search_cache
+            metrics_registry.register("report_search_cache", report_search_cache)
         print("  ✅ Qdrant ready")
     except Exception as e:
         print(f"  ⚠️  Qdrant connection failed: {e}")
@@ -314,11 +429,14 @@ async def startup_event():
         else:
             print("  → Custom weights not found, using default yolov8n.pt")
             waste_detector.load_model('yolov8n.pt')  # Will auto-download if not present
+        detection_batcher = DetectionBatcher(waste_detector)
+        metrics_registry.register("detection_batcher", detection_batcher)
         print("  ✅ YOLO detector ready")
     except Exception as e:
         print(f"  ⚠️  YOLO detector failed: {e}")
         print("  ⚠️  Will use Gemini-only analysis")
         waste_detector = None
+        detection_batcher = None
 
     # Campaign Manager
     try:
@@ -357,6 +475,22 @@ async def startup_event():
         print(f"  ⚠️  User Service failed: {e}")
         user_service = None
 
+    # In-process users replica (volunteer matching, recommendations, user search)
+    if settings.user_replica_enabled and user_service is not None:
+        try:
+            print("  → Loading users replica...")
+            user_replica = UserReplica(user_service.client)
+            users = await run_io(user_replica.refresh)
+            user_replica.start()
+            user_service.replica = user_replica
+            if vector_store is not None:
+                vector_store.user_replica = user_replica
+            metrics_registry.register("user_replica", user_replica)
+            print(f"  ✅ Users replica ready ({users} users)")
+        except Exception as e:
+            print(f"  ⚠️  Users replica failed, searching Qdrant directly: {e}")
+            user_replica = None
+
     
     print("\n✅ Server startup complete!")
     print(f"📡 API endpoints available at http://{settings.api_host}:{settings.api_port}")
@@ -368,6 +502,14 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("\n👋 Shutting down EcoSynk AI Services...")
+    if embedding_batcher is not None:
+        await embedding_batcher.close()
+    if detection_batcher is not None:
+        await detection_batcher.close()
+    if user_replica is not None:
+        await user_replica.stop()
+    await close_qdrant_connection()
+    shutdown_executors(wait=False)
 
 
 # ============================================================================
@@ -442,7 +584,7 @@ async def geocode_reverse(
     except (TypeError, ValueError) as exc:
         raise HTTPException(status_code=400, detail="Invalid latitude or longitude") from exc
 
-    context = reverse_geocode(rounded_lat, rounded_lon)
+    context = await run_io(reverse_geocode, rounded_lat, rounded_lon)
 
     if not context:
         return {
@@ -480,6 +622,21 @@ async def health_check():
             "qdrant": vector_store is not None,
             "embedder": embedder is not None
         },
+        "executors": get_executors().stats(),
+        "models": model_registry.stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """In-process performance metrics (executor pools, batching histograms)"""
+    return {
+        "status": "success",
+        "metrics": {
+            "executors": get_executors().stats(),
+            **metrics_registry.report()
+        },
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -515,28 +672,23 @@ async def analyze_trash(
         location_label = None
         if location:
             location_data = json.loads(location)
-            location_info = _enrich_location(location_data)
+            location_info = await _enrich_location(location_data)
             if location_info:
                 location_geo = location_info.get('geo')
                 location_context = location_info.get('context')
                 location_label = location_info.get('label')
         
-        # Save uploaded file temporarily (cross-platform)
-        file_extension = Path(file.filename).suffix or ".jpg"
-        temp_fd, temp_path_str = tempfile.mkstemp(suffix=file_extension, prefix="ecosynk_upload_")
-        temp_path = Path(temp_path_str)
-        
-        # Close the file descriptor and write the uploaded content
-        os.close(temp_fd)
-        with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Gemini gets the upload as-is unless it is larger than needed or in a format it does not accept
+        upload = await _prepare_upload(await file.read(), detection=False)
         
         # Analyze with Gemini
-        analysis = analyzer.analyze_trash_image(
-            str(temp_path),
+        analysis = await run_io(
+            analyzer.analyze_trash_image_bytes,
+            upload.gemini_data,
+            upload.gemini_mime_type,
             location=location_geo,
-            user_notes=user_notes
+            user_notes=user_notes,
+            image_name=file.filename
         )
 
         analysis_metadata = analysis.setdefault('metadata', {})
@@ -552,7 +704,7 @@ async def analyze_trash(
             analysis_metadata['location_name'] = location_label
         
         # Generate embedding
-        embedding = embedder.generate_trash_report_embedding(analysis)
+        embedding = await embedding_batcher.generate_trash_report_embedding(analysis)
         
         # Store in Qdrant
         report_id = f"report_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:8]}"
@@ -569,15 +721,12 @@ async def analyze_trash(
             metadata['user_id'] = user_id
         metadata['report_id'] = report_id
         
-        vector_store.store_trash_report(
+        await vector_store.astore_trash_report(
             embedding=embedding,
             metadata=metadata,
             report_id=report_id
         )
         
-        # Cleanup temp file
-        temp_path.unlink()
-        
         # Return response
         response = {
             "status": "success",
@@ -595,6 +744,8 @@ async def analyze_trash(
 
         return response
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print(f"❌ JSON decode error: {e}")
         raise HTTPException(status_code=400, detail="Invalid location JSON")
@@ -629,6 +780,7 @@ async def detect_waste(
             detail="Gemini analyzer not configured. Please set GEMINI_API_KEY"
         )
     
+    upload = None
     try:
         # Parse location if provided
         location_info = None
@@ -637,79 +789,35 @@ async def detect_waste(
         location_label = None
         if location:
             raw_location = json.loads(location)
-            location_info = _enrich_location(raw_location)
+            location_info = await _enrich_location(raw_location)
             if location_info:
                 location_geo = location_info.get('geo')
                 location_context = location_info.get('context')
                 location_label = location_info.get('label')
         
-        # Save uploaded file temporarily
-        file_extension = Path(file.filename).suffix or ".jpg"
-        temp_fd, temp_path_str = tempfile.mkstemp(suffix=file_extension, prefix="ecosynk_detect_")
-        temp_path = Path(temp_path_str)
-        
-        os.close(temp_fd)
-        
-        # Read and convert image to ensure compatibility with OpenCV
-        try:
-            from PIL import Image
-            import io
-            
-            # Read uploaded file
-            content = await file.read()
-            
-            # Open with PIL (supports AVIF, HEIC, WebP, etc.)
-            pil_image = Image.open(io.BytesIO(content))
-            
-            # Convert to RGB if needed
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # Save as JPEG (universally supported by OpenCV)
-            pil_image.save(str(temp_path), 'JPEG', quality=95)
-            print(f"📸 Image converted: {file.filename} -> JPEG for OpenCV compatibility")
-            
-        except Exception as e:
-            print(f"⚠️  PIL conversion failed: {e}, saving as-is")
-            # Fallback: save raw content
-            with open(temp_path, "wb") as f:
-                f.write(content)
+        # Decode the upload once, at reduced size, into the YOLO/annotation and Gemini variants
+        upload = await _prepare_upload(await file.read(), detection=use_yolo and waste_detector is not None)
         
         # Run YOLO detection if available and requested
         detections = []
         detection_summary = {}
         annotated_image_base64 = None
         
-        if use_yolo and waste_detector is not None:
+        if upload.detection_image is not None:
             print(f"🔍 Running YOLOv8 detection on {file.filename}...")
-            detections = waste_detector.detect(str(temp_path))
+            variant_detections = await detection_batcher.detect(upload.detection_image)
+            # Reported (and given to Gemini) in original-image pixels
+            detections = upload.to_original_coordinates(variant_detections)
             detection_summary = waste_detector.get_detection_summary(detections)
             
-            # Generate annotated image only if we have detections and valid image
-            if detections and len(detections) > 0:
+            # Generate annotated image only if we have detections
+            if detections:
                 try:
-                    annotated_path = temp_path.with_suffix('.annotated.jpg')
-                    waste_detector.visualize_detections(
-                        str(temp_path),
-                        detections,
-                        str(annotated_path)
+                    annotated_jpeg = await run_image(
+                        annotate_shared_jpeg, upload.detection_ref, variant_detections, CLASS_COLORS
                     )
-                    
-                    if annotated_path.exists():
-                        print(f"📸 Annotated image created at: {annotated_path}")
-                        print(f"📊 Annotated image size: {annotated_path.stat().st_size} bytes")
-                        
-                        # Convert annotated image to base64
-                        with open(annotated_path, 'rb') as f:
-                            annotated_image_base64 = base64.b64encode(f.read()).decode('utf-8')
-                        
-                        print(f"✅ Annotated image base64 length: {len(annotated_image_base64)}")
-                        
-                        # Cleanup annotated image
-                        annotated_path.unlink()
-                    else:
-                        print("⚠️  Annotated image file not created")
-                        
+                    annotated_image_base64 = base64.b64encode(annotated_jpeg).decode('utf-8')
+                    print(f"✅ Annotated image base64 length: {len(annotated_image_base64)}")
                 except Exception as viz_error:
                     print(f"⚠️  Visualization failed: {viz_error}")
                     # Continue without annotated image
@@ -718,12 +826,18 @@ async def detect_waste(
             
             print(f"✅ YOLO detected {len(detections)} waste items")
         
+        # Free the shared pixels before the (slow) Gemini call
+        upload.release()
+        
         # Analyze with Gemini (enhanced with YOLO context if available)
-        analysis = analyzer.analyze_trash_image(
-            str(temp_path),
+        analysis = await run_io(
+            analyzer.analyze_trash_image_bytes,
+            upload.gemini_data,
+            upload.gemini_mime_type,
             location=location_geo,
             user_notes=user_notes,
-            yolo_detections=detections if detections else None
+            yolo_detections=detections if detections else None,
+            image_name=file.filename
         )
         
         # Merge YOLO summary into analysis
@@ -743,7 +857,7 @@ async def detect_waste(
             analysis_metadata['location_name'] = location_label
 
         # Generate embedding
-        embedding = embedder.generate_trash_report_embedding(analysis)
+        embedding = await embedding_batcher.generate_trash_report_embedding(analysis)
         
         # Store in Qdrant
         report_id = f"report_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:8]}"
@@ -759,15 +873,12 @@ async def detect_waste(
             metadata['user_id'] = user_id
         metadata['report_id'] = report_id
         
-        vector_store.store_trash_report(
+        await vector_store.astore_trash_report(
             embedding=embedding,
             metadata=metadata,
             report_id=report_id
         )
         
-        # Cleanup temp file
-        temp_path.unlink()
-        
         # Return comprehensive response
         response = {
             "status": "success",
@@ -793,6 +904,8 @@ async def detect_waste(
         
         return response
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print(f"❌ JSON decode error: {e}")
         raise HTTPException(status_code=400, detail="Invalid location JSON")
@@ -801,6 +914,9 @@ async def detect_waste(
         print(f"❌ Detection failed: {str(e)}")
         print(f"Stack trace:\n{error_trace}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
+    finally:
+        if upload is not None:
+            upload.release()
 
 
 
@@ -819,8 +935,7 @@ async def detect_waste_live(
 
     start_time = time.perf_counter()
 
-    temp_path: Optional[Path] = None
-
+    frame = None
     try:
         normalized_location = None
         if location:
@@ -830,43 +945,13 @@ async def detect_waste_live(
             except json.JSONDecodeError as decode_error:
                 raise HTTPException(status_code=400, detail="Invalid location JSON") from decode_error
 
-        file_extension = Path(file.filename or "frame.jpg").suffix or ".jpg"
-        temp_fd, temp_path_str = tempfile.mkstemp(suffix=file_extension, prefix="ecosynk_live_")
-        temp_path = Path(temp_path_str)
-        os.close(temp_fd)
-
-        frame_width = None
-        frame_height = None
-
-        raw_bytes = await file.read()
-
-        try:
-            from PIL import Image
-            import io
-
-            pil_image = Image.open(io.BytesIO(raw_bytes))
-            frame_width, frame_height = pil_image.size
-
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-
-            pil_image.save(str(temp_path), 'JPEG', quality=90)
-        except Exception as pil_error:  # noqa: BLE001 - log and fall back
-            print(f"⚠️  Live frame conversion failed: {pil_error}. Saving raw bytes.")
-            with open(temp_path, "wb") as fallback_file:
-                fallback_file.write(raw_bytes)
-
-            if frame_width is None or frame_height is None:
-                try:
-                    import cv2
-
-                    cv_img = cv2.imread(str(temp_path))
-                    if cv_img is not None:
-                        frame_height, frame_width = cv_img.shape[:2]
-                except Exception as cv_error:  # noqa: BLE001 - best effort metadata only
-                    print(f"⚠️  Unable to derive frame dimensions: {cv_error}")
+        frame = await _prepare_upload(await file.read(), gemini=False)
+        frame_width, frame_height = frame.original_size
 
-        detections = waste_detector.detect(str(temp_path))
+        detections = frame.to_original_coordinates(
+            await detection_batcher.detect(frame.detection_image, slo_ms=settings.detection_live_slo_ms)
+        )
+        frame.release()
         detection_summary = waste_detector.get_detection_summary(detections) if include_summary else None
 
         latency_ms = round((time.perf_counter() - start_time) * 1000, 2)
@@ -896,63 +981,85 @@ async def detect_waste_live(
         print(f"Stack trace:\n{error_trace}")
         raise HTTPException(status_code=500, detail=f"Live detection failed: {error}") from error
     finally:
-        if temp_path is not None:
-            try:
-                temp_path.unlink(missing_ok=True)
-            except Exception:
-                pass
+        if frame is not None:
+            frame.release()
 
 
  
+def _search_cache_response(response: Response, etag: str, body: Dict[str, Any]):
+    """
+    Attach the cache entry's ETag to a search response
+
+    No 304 handling: conditional requests only apply to GET/HEAD (RFC 9110), and
+    this search is a POST. Clients can still compare ETags to skip re-rendering.
+    """
+    # Not to be reused without revalidation: a report write can change results at any moment
+    response.headers.update({"ETag": etag, "Cache-Control": "private, no-cache"})
+    return body
+
+
+# Report fields /reports/search reads for its top-level result keys
+SEARCH_RESULT_FIELDS = (
+    "report_id", "timestamp", "location", "primary_material", "cleanup_priority_score", "description",
+    "metadata.report_id", "metadata.analyzed_at", "metadata.location",
+)
+
+
 @app.post("/reports/search")
-async def search_reports(request: ReportSearchRequest):
-    """Semantic search across stored trash reports using Qdrant"""
+async def search_reports(
+    request: ReportSearchRequest,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Payload fields in each result's analysis (comma-separated, '*' for all)")
+):
+    """Semantic search across stored trash reports using Qdrant (cached until the next report write)"""
     if embedder is None or vector_store is None:
         raise HTTPException(status_code=503, detail="Search services are not initialized")
+    projection = _projection(fields, REPORT_FIELDS)
 
     try:
         print(f"🔎 Semantic search query received: '{request.query}'")
-        query_embedding = embedder.generate_query_embedding(request.query)
 
         location_filter = None
         if request.location:
+            lat, lon = request.location.lat, request.location.lon
+            if report_search_cache is not None:
+                # Snapped so every request sharing a cache entry runs the same search
+                lat, lon = snap_to_grid(lat, lon, settings.report_search_cache_grid_degrees)
             location_filter = {
-                'lat': request.location.lat,
-                'lon': request.location.lon,
+                'lat': lat,
+                'lon': lon,
                 'radius_km': request.radius_km
             }
 
-        effective_threshold = request.score_threshold
-        fallback_notes = []
-
-        results = vector_store.find_similar_reports(
+        if report_search_cache is not None:
+            cache_key = report_search_key(
+                request.query, request.limit, request.score_threshold, location_filter, request.time_window_days,
+                fields=projection.spec
+            )
+            # Captured before searching: a write landing mid-search keeps the result out of the cache
+            cache_epoch = report_search_cache.epoch
+            cached = report_search_cache.get(cache_key)
+            if cached is not None:
+                etag, body = cached
+                return _search_cache_response(response, etag, {**body, 'query': request.query})
+
+        query_embedding = await embedding_batcher.generate_query_embedding(request.query)
+
+        # Every fallback tier (lower threshold, then no location) in one batched round trip;
+        # exact item names ("syringe", "tyre") also match through the sparse half of hybrid search
+        search = await vector_store.asearch_reports_with_fallbacks(
             embedding=query_embedding,
             limit=request.limit,
-            score_threshold=effective_threshold,
+            score_threshold=request.score_threshold,
             location_filter=location_filter,
-            time_window_days=request.time_window_days
+            time_window_days=request.time_window_days,
+            query_text=request.query,
+            fields=projection.selector(required=SEARCH_RESULT_FIELDS),
+            with_details=report_details_needed(projection.include)
         )
-
-        if not results and effective_threshold > 0.3:
-            effective_threshold = 0.3
-            results = vector_store.find_similar_reports(
-                embedding=query_embedding,
-                limit=request.limit,
-                score_threshold=effective_threshold,
-                location_filter=location_filter,
-                time_window_days=request.time_window_days
-            )
-            fallback_notes.append("lowered score threshold to 0.30 for broader match")
-
-        if not results and location_filter is not None:
-            results = vector_store.find_similar_reports(
-                embedding=query_embedding,
-                limit=request.limit,
-                score_threshold=effective_threshold,
-                location_filter=None,
-                time_window_days=request.time_window_days
-            )
-            fallback_notes.append("removed location filter to broaden match")
+        results = search['results']
+        effective_threshold = search['effective_score_threshold']
+        fallback_notes = search['fallback_notes']
 
         response_items = []
         for item in results:
@@ -969,7 +1076,7 @@ async def search_reports(request: ReportSearchRequest):
                 'description': data.get('description'),
                 'timestamp': timestamp,
                 'location': location,
-                'analysis': data
+                'analysis': projection.trim(data, required=SEARCH_RESULT_FIELDS)
             })
 
         applied_filters = {
@@ -978,15 +1085,22 @@ async def search_reports(request: ReportSearchRequest):
             'fallback_notes': fallback_notes if fallback_notes else None
         }
 
-        return {
+        body = {
             'status': 'success',
             'query': request.query,
             'results': response_items,
             'count': len(response_items),
             'effective_score_threshold': effective_threshold,
+            # "hybrid": scores are RRF fusion scores and the threshold applies to the dense matches
+            'ranking': 'hybrid' if search['hybrid'] else 'dense',
             'applied_filters': applied_filters
         }
 
+        if report_search_cache is not None:
+            etag = report_search_cache.put(cache_key, body, cache_epoch)
+            return _search_cache_response(response, etag, body)
+        return body
+
     except Exception as e:
         error_trace = traceback.format_exc()
         print(f"❌ Report search failed: {e}")
@@ -1003,10 +1117,10 @@ async def find_volunteers(request: VolunteerMatchRequest):
     """
     try:
         # Generate embedding for the task
-        task_embedding = embedder.generate_trash_report_embedding(request.report_data)
+        task_embedding = await embedding_batcher.generate_trash_report_embedding(request.report_data)
         
         # Search for matching volunteers
-        volunteers = vector_store.find_nearby_volunteers(
+        volunteers = await vector_store.afind_nearby_volunteers(
             task_embedding=task_embedding,
             location={"lat": request.location.lat, "lon": request.location.lon},
             radius_km=request.radius_km,
@@ -1028,23 +1142,33 @@ async def find_volunteers(request: VolunteerMatchRequest):
         raise HTTPException(status_code=500, detail=f"Volunteer search failed: {str(e)}")
 
 
+# Location of v2 (top-level) and legacy (nested) reports
+HOTSPOT_REQUIRED_FIELDS = ("location", "metadata.location")
+
+
 @app.post("/detect-hotspots")
-async def detect_hotspots(request: HotspotDetectionRequest):
+async def detect_hotspots(
+    request: HotspotDetectionRequest,
+    fields: Optional[str] = Query(None, description="Payload fields of past_reports (comma-separated, '*' for all)")
+):
     """
     Detect if a location is a recurring trash hotspot
     
     Searches for similar past reports in the area
     """
+    projection = _projection(fields, REPORT_FIELDS)
     try:
         # Generate embedding
-        embedding = embedder.generate_trash_report_embedding(request.report_data)
+        embedding = await embedding_batcher.generate_trash_report_embedding(request.report_data)
         
         # Find similar reports
-        similar_reports = vector_store.find_similar_reports(
+        similar_reports = await vector_store.afind_similar_reports(
             embedding=embedding,
             limit=20,
             score_threshold=0.6,
-            time_window_days=request.time_window_days
+            time_window_days=request.time_window_days,
+            fields=projection.selector(required=HOTSPOT_REQUIRED_FIELDS),
+            with_details=report_details_needed(projection.include)
         )
         
         # Determine if hotspot
@@ -1055,8 +1179,8 @@ async def detect_hotspots(request: HotspotDetectionRequest):
             # Get unique locations
             locations = []
             for report in similar_reports:
-                loc = report['data'].get('metadata', {}).get('location')
-                if loc and loc.get('lat') and loc.get('lon'):
+                loc = _normalize_payload_location(report['data'])
+                if loc:
                     locations.append(loc)
             
             hotspot_info = {
@@ -1074,6 +1198,8 @@ async def detect_hotspots(request: HotspotDetectionRequest):
                 "recommendation": "Single cleanup should be sufficient",
                 "past_reports": similar_reports
             }
+        for report in similar_reports:
+            report['data'] = projection.trim(report['data'] or {}, required=HOTSPOT_REQUIRED_FIELDS)
         
         return {
             "status": "success",
@@ -1096,7 +1222,7 @@ async def create_volunteer_profile(profile: VolunteerProfileRequest):
     try:
         # Generate embedding from profile
         profile_dict = profile.dict()
-        embedding = embedder.generate_volunteer_profile_embedding(profile_dict)
+        embedding = await embedding_batcher.generate_volunteer_profile_embedding(profile_dict)
         
         # Prepare data for storage
         storage_data = profile_dict.copy()
@@ -1106,7 +1232,7 @@ async def create_volunteer_profile(profile: VolunteerProfileRequest):
         }
         
         # Store in Qdrant
-        user_id = vector_store.store_volunteer_profile(
+        user_id = await vector_store.astore_volunteer_profile(
             embedding=embedding,
             profile_data=storage_data,
             user_id=profile.user_id
@@ -1122,6 +1248,48 @@ async def create_volunteer_profile(profile: VolunteerProfileRequest):
         raise HTTPException(status_code=500, detail=f"Profile creation failed: {str(e)}")
 
 
+# Estimated waste removed per report (kg) by estimated_volume; unknown or missing volumes count as medium
+VOLUME_TO_KG = {
+    "small": 5,
+    "medium": 25,
+    "large": 100,
+    "very_large": 500
+}
+
+
+def _waste_kg(volumes: Dict[Any, int], reports: int) -> float:
+    """Waste removed by `reports` reports whose estimated_volume facet is `volumes`"""
+    known = sum(volumes.values())
+    kg = sum(VOLUME_TO_KG.get(volume, VOLUME_TO_KG["medium"]) * count for volume, count in volumes.items())
+    return kg + max(0, reports - known) * VOLUME_TO_KG["medium"]
+
+
+async def _count_volunteers() -> int:
+    """Points in the users collection (0 without a user service)"""
+    if not user_service:
+        return 0
+    return (await user_service.aclient.count(
+        collection_name=settings.volunteer_profiles_collection,
+        exact=True
+    )).count
+
+
+async def _aggregate_esg_totals() -> Dict[str, Any]:
+    """ESG totals from concurrent Qdrant count/facet requests (a handful, whatever the collection sizes)"""
+    counts, total_volunteers = await asyncio.gather(
+        vector_store.aget_report_impact_counts(high_priority_score=8),
+        _count_volunteers()
+    )
+    return {
+        'total_cleanups': counts['total'],
+        'total_volunteers': total_volunteers,
+        'total_waste_kg': _waste_kg(counts['volumes'], counts['total']),
+        'high_priority_cleanups': counts['high_priority'],
+        'hazardous_waste_removed': _waste_kg(counts['hazardous_volumes'], counts['hazardous']),
+        'recyclable_waste_kg': _waste_kg(counts['recyclable_volumes'], counts['recyclable'])
+    }
+
+
 @app.get("/impact/esg")
 async def get_esg_impact():
     """
@@ -1130,57 +1298,13 @@ async def get_esg_impact():
     Returns aggregate environmental impact data for reporting
     """
     try:
-        # Get all trash reports
-        all_reports = vector_store.client.scroll(
-            collection_name=settings.trash_reports_collection,
-            limit=1000,  # Get up to 1000 reports
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        # Get all volunteers
-        all_volunteers = user_service.client.scroll(
-            collection_name=settings.volunteer_profiles_collection,
-            limit=1000,
-            with_payload=True,
-            with_vectors=False
-        ) if user_service else ([], None)
-        
-        # Calculate metrics
-        total_cleanups = len(all_reports[0])
-        total_volunteers = len(all_volunteers[0])
-        
-        # Estimate waste removed (kg)
-        volume_to_kg = {
-            "small": 5,
-            "medium": 25,
-            "large": 100,
-            "very_large": 500
-        }
-        
-        total_waste_kg = 0
-        high_priority_cleanups = 0
-        hazardous_waste_removed = 0
-        recyclable_waste_kg = 0
-        
-        for point in all_reports[0]:
-            payload = point.payload
-            volume = payload.get('estimated_volume', 'medium')
-            priority = payload.get('cleanup_priority_score', 5)
-            material = payload.get('primary_material', 'other')
-            recyclable = payload.get('recyclable', False)
-            
-            waste_kg = volume_to_kg.get(volume, 25)
-            total_waste_kg += waste_kg
-            
-            if priority >= 8:
-                high_priority_cleanups += 1
-            
-            if material == 'hazardous':
-                hazardous_waste_removed += waste_kg
-            
-            if recyclable:
-                recyclable_waste_kg += waste_kg
+        totals = await _aggregate_esg_totals()
+        total_cleanups = totals['total_cleanups']
+        total_volunteers = totals['total_volunteers']
+        total_waste_kg = totals['total_waste_kg']
+        high_priority_cleanups = totals['high_priority_cleanups']
+        hazardous_waste_removed = totals['hazardous_waste_removed']
+        recyclable_waste_kg = totals['recyclable_waste_kg']
         
         # Calculate volunteer hours (estimate 2 hours per cleanup)
         volunteer_hours = total_cleanups * 2
@@ -1239,37 +1363,11 @@ async def get_esg_impact():
 async def get_stats():
     """Get database statistics"""
     try:
-        # Get actual counts by scrolling through collections
-        trash_reports = vector_store.client.scroll(
-            collection_name=settings.trash_reports_collection,
-            limit=1,
-            with_payload=False,
-            with_vectors=False
+        trash_count, volunteer_count = await asyncio.gather(
+            vector_store.acount_points(settings.trash_reports_collection),
+            _count_volunteers()
         )
         
-        volunteers = user_service.client.scroll(
-            collection_name=settings.volunteer_profiles_collection,
-            limit=1,
-            with_payload=False,
-            with_vectors=False
-        ) if user_service else ([], None)
-        
-        # Count by getting offset
-        trash_count = len(trash_reports[0]) if trash_reports[0] else 0
-        volunteer_count = len(volunteers[0]) if volunteers[0] else 0
-        
-        # Get actual counts using count API
-        try:
-            trash_count = vector_store.client.count(
-                collection_name=settings.trash_reports_collection
-            ).count
-            volunteer_count = user_service.client.count(
-                collection_name=settings.volunteer_profiles_collection
-            ).count if user_service else 0
-        except:
-            # Fallback to scroll if count fails
-            pass
-        
         return {
             "status": "success",
             "statistics": {
@@ -1300,18 +1398,7 @@ async def create_audit_trail(request: AuditTrailRequest):
         # Fetch the original report data from Qdrant
         report_data = None
         try:
-            results = vector_store.client.scroll(
-                collection_name=settings.trash_reports_collection,
-                limit=100,
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            # Find report with matching report_id
-            for point in results[0]:
-                if point.payload.get('report_id') == request.report_id:
-                    report_data = point.payload
-                    break
+            report_data = await vector_store.aget_report_by_id(request.report_id, with_details=True)
         except Exception as e:
             # If we can't fetch, continue without it
             print(f"Warning: Could not fetch report data: {e}")
@@ -1393,20 +1480,14 @@ async def create_campaign(request: CampaignCreateRequest):
         total_priority = 0
         materials = []
         
-        results = vector_store.client.scroll(
-            collection_name=settings.trash_reports_collection,
-            limit=100,
-            with_payload=True,
-            with_vectors=False
-        )
+        hotspot_reports = await vector_store.aget_reports_by_ids(request.hotspot_report_ids)
         
-        for point in results[0]:
-            if point.payload.get('report_id') in request.hotspot_report_ids:
-                reports.append(point.payload)
-                total_priority += point.payload.get('cleanup_priority_score', 5)
-                material = point.payload.get('primary_material')
-                if material and material not in materials:
-                    materials.append(material)
+        for payload in hotspot_reports:
+            reports.append(payload)
+            total_priority += payload.get('cleanup_priority_score', 5)
+            material = payload.get('primary_material')
+            if material and material not in materials:
+                materials.append(material)
         
         if not reports:
             raise HTTPException(status_code=404, detail="No reports found for campaign")
@@ -1460,10 +1541,10 @@ async def create_campaign(request: CampaignCreateRequest):
         
         # Generate embedding from campaign name and materials
         campaign_text = f"{campaign_name} {' '.join(materials)} cleanup campaign"
-        campaign_embedding = embedder.generate_query_embedding(campaign_text)
+        campaign_embedding = await embedding_batcher.generate_query_embedding(campaign_text)
         
         # Store in Qdrant
-        vector_store.store_campaign(
+        await vector_store.astore_campaign(
             embedding=campaign_embedding,
             campaign_data=campaign,
             campaign_id=campaign_id
@@ -1486,70 +1567,120 @@ async def create_campaign(request: CampaignCreateRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create campaign: {str(e)}")
 
 
+async def _analyze_batch_item(index: int, file: UploadFile, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Analyze one image of a batch with Gemini (at most `semaphore` calls run at once)"""
+    try:
+        upload = await _prepare_upload(await file.read(), detection=False)
+        async with semaphore:
+            analysis = await run_io(
+                analyzer.analyze_trash_image_bytes, upload.gemini_data, upload.gemini_mime_type,
+                image_name=file.filename
+            )
+
+        # The analyzer reports failures as a placeholder analysis; those are not stored
+        error = (analysis.get('metadata') or {}).get('error')
+        if error:
+            raise RuntimeError(error)
+
+        analysis['timestamp'] = datetime.utcnow().isoformat()
+        analysis['report_id'] = f"report_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:8]}"
+        analysis.setdefault('metadata', {}).update({
+            'image_name': file.filename,
+            'model_used': settings.gemini_model,
+            'batch_index': index
+        })
+        return {
+            "index": index,
+            "filename": file.filename,
+            "status": "success",
+            "report_id": analysis['report_id'],
+            "analysis": analysis
+        }
+
+    except Exception as e:
+        return {
+            "index": index,
+            "filename": file.filename,
+            "status": "failed",
+            "error": str(e)
+        }
+
+
+async def _store_batch_analyses(results: List[Dict[str, Any]], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Embed successful batch analyses in one batch and store them with one chunked upsert
+
+    Sets each result's 'stored' flag; returns error entries for reports that could not be stored
+    """
+    reports = []
+    for result in results:
+        metadata = dict(result['analysis'])
+        if user_id:
+            metadata['user_id'] = user_id
+        reports.append({"report_id": result['report_id'], "metadata": metadata})
+
+    try:
+        texts = [embedder.build_trash_report_text(report["metadata"]) for report in reports]
+        embeddings = await run_cpu(embedder.batch_generate, texts, show_progress_bar=False)
+        for report, embedding in zip(reports, embeddings):
+            report["embedding"] = embedding
+        outcome = await run_io(vector_store.store_trash_reports_batch, reports)
+    except Exception as e:
+        print(f"❌ Storing batch reports failed: {e}")
+        outcome = {'failed': [{'index': index, 'error': str(e)} for index in range(len(reports))]}
+
+    failed = {entry['index']: entry['error'] for entry in outcome['failed']}
+    errors = []
+    for position, result in enumerate(results):
+        result['stored'] = position not in failed
+        if position in failed:
+            errors.append({
+                "index": result['index'],
+                "filename": result['filename'],
+                "status": "not_stored",
+                "report_id": result['report_id'],
+                "error": failed[position]
+            })
+    return errors
+
+
 @app.post("/analyze-trash/batch")
-async def analyze_trash_batch(files: List[UploadFile] = File(...)):
+async def analyze_trash_batch(
+    files: List[UploadFile] = File(...),
+    user_id: Optional[str] = Form(None, description="User ID the reports are stored under")
+):
     """
     Batch analyze multiple trash images at once
     
-    Processes multiple images in parallel and returns aggregated results.
+    Gemini calls run concurrently (up to ANALYZE_BATCH_CONCURRENCY at a time), then
+    all successful analyses are embedded in one batch and stored as trash reports
+    with one chunked upsert. Results are returned in input order.
     """
+    if analyzer is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Gemini analyzer not configured. Please set GEMINI_API_KEY"
+        )
+    if vector_store is None or embedder is None:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+
     try:
-        if len(files) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 images per batch")
-        
-        results = []
-        errors = []
+        if len(files) > settings.analyze_batch_max_images:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximum {settings.analyze_batch_max_images} images per batch"
+            )
         
-        # Create temp directory
-        temp_dir = Path("/tmp/ecosynk/batch")
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(max(1, settings.analyze_batch_concurrency))
+        outcomes = await asyncio.gather(*(
+            _analyze_batch_item(index, file, semaphore) for index, file in enumerate(files)
+        ))
+        results = [outcome for outcome in outcomes if outcome['status'] == "success"]
+        errors = [outcome for outcome in outcomes if outcome['status'] != "success"]
         
-        for i, file in enumerate(files):
-            temp_path = None
-            try:
-                # Save file temporarily
-                file_extension = Path(file.filename).suffix or ".jpg"
-                temp_path = temp_dir / f"batch_{uuid.uuid4().hex}{file_extension}"
-                
-                with open(temp_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
-                
-                # Analyze with Gemini
-                analysis = analyzer.analyze_trash_image(str(temp_path))
-                
-                # Generate report ID
-                report_id = f"report_{int(datetime.utcnow().timestamp())}_{uuid.uuid4().hex[:8]}"
-                
-                # Add timestamp and metadata
-                analysis['timestamp'] = datetime.utcnow().isoformat()
-                analysis['report_id'] = report_id
-                analysis['metadata'] = {
-                    'analyzed_at': datetime.utcnow().isoformat(),
-                    'image_name': file.filename,
-                    'model_used': settings.gemini_model,
-                    'batch_index': i
-                }
-                
-                results.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "status": "success",
-                    "report_id": report_id,
-                    "analysis": analysis
-                })
-                
-            except Exception as e:
-                errors.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "status": "failed",
-                    "error": str(e)
-                })
-            finally:
-                # Cleanup temp file
-                if temp_path and temp_path.exists():
-                    temp_path.unlink()
+        if results:
+            errors.extend(await _store_batch_analyses(results, user_id))
+            errors.sort(key=lambda entry: entry['index'])
         
         # Aggregate statistics
         total_priority = sum(r['analysis'].get('cleanup_priority_score', 0) for r in results)
@@ -1565,7 +1696,8 @@ async def analyze_trash_batch(files: List[UploadFile] = File(...)):
             "batch_summary": {
                 "total_images": len(files),
                 "successful": len(results),
-                "failed": len(errors),
+                "stored": sum(1 for r in results if r['stored']),
+                "failed": len(files) - len(results),
                 "average_priority": round(avg_priority, 1),
                 "materials_breakdown": materials
             },
@@ -1590,43 +1722,39 @@ async def update_volunteer_availability(user_id: str, available: bool):
         if user_service is None:
             raise HTTPException(status_code=503, detail="User service not initialized")
             
-        # Fetch volunteer profile
-        results = user_service.client.scroll(
+        # Fetch volunteer profile (point ID derives from user_id)
+        point_id = point_id_for(user_id)
+        results = await user_service.aclient.retrieve(
             collection_name=settings.volunteer_profiles_collection,
-            limit=100,
-            with_payload=True,
+            ids=[point_id],
+            with_payload=False,
             with_vectors=False
         )
         
-        volunteer_found = None
-        point_id = None
-        
-        for point in results[0]:
-            if point.payload.get('user_id') == user_id:
-                volunteer_found = point.payload
-                point_id = point.id
-                break
-        
-        if not volunteer_found:
+        if not results:
             raise HTTPException(status_code=404, detail=f"Volunteer {user_id} not found")
         
         # Update availability
-        volunteer_found['available'] = available
-        volunteer_found['last_updated'] = datetime.utcnow().isoformat()
+        updates = {
+            'available': available,
+            'last_updated': datetime.utcnow().isoformat()
+        }
         
-        # Update in Qdrant
-        user_service.client.set_payload(
+        # Update in Qdrant (merges into the existing payload)
+        await user_service.aclient.set_payload(
             collection_name=settings.volunteer_profiles_collection,
-            payload=volunteer_found,
+            payload=updates,
             points=[point_id]
         )
+        if user_replica is not None:
+            user_replica.update_payload([point_id], updates)
         
         return {
             "status": "success",
             "user_id": user_id,
             "available": available,
             "message": f"Volunteer availability updated to {'available' if available else 'unavailable'}",
-            "updated_at": volunteer_found['last_updated']
+            "updated_at": updates['last_updated']
         }
         
     except HTTPException:
@@ -1635,33 +1763,23 @@ async def update_volunteer_availability(user_id: str, available: bool):
         raise HTTPException(status_code=500, detail=f"Failed to update availability: {str(e)}")
 
 
-@app.get("/volunteers")
-async def list_volunteers(
-    limit: int = Query(100, ge=1, le=500),
-    lat: Optional[float] = Query(None, description="Latitude for proximity filtering"),
-    lon: Optional[float] = Query(None, description="Longitude for proximity filtering"),
-    radius_km: float = Query(25.0, ge=0.1, le=500.0, description="Radius for distance filter"),
-    available_only: bool = Query(False, description="Return only active volunteers"),
-):
-    """Return volunteer profiles with optional geo filtering."""
-    try:
-        if user_service is None:
-            raise HTTPException(status_code=503, detail="User service not initialized")
+# Volunteer fields /volunteers reads for filtering, distance and ranking
+VOLUNTEER_REQUIRED_FIELDS = ("user_id", "location", "metadata.location", "available", "past_cleanup_count")
 
-        reference_location = None
-        if lat is not None and lon is not None:
-            reference_location = {"lat": lat, "lon": lon}
 
-        fetch_limit = min(max(limit * 2, 100), 512)
-        results = user_service.client.scroll(
-            collection_name=settings.volunteer_profiles_collection,
-            limit=fetch_limit,
-            with_payload=True,
-            with_vectors=False
-        )
+def _top_volunteers(
+    limit: int,
+    reference_location: Optional[Dict[str, float]],
+    radius_km: float,
+    available_only: bool,
+    projection: Optional[Projection] = None
+) -> List[Dict[str, Any]]:
+    """Scan every volunteer page by page, keeping only the `limit` most experienced matches"""
+    projection = projection or parse_fields(None, VOLUNTEER_FIELDS)
+    selector = projection.selector(required=VOLUNTEER_REQUIRED_FIELDS)
 
-        volunteers: List[Dict[str, Any]] = []
-        for point in results[0]:
+    def matching_volunteers():
+        for point in iter_collection_points(user_service.client, settings.volunteer_profiles_collection, fields=selector):
             payload = point.payload or {}
             location = _normalize_payload_location(payload)
 
@@ -1679,15 +1797,44 @@ async def list_volunteers(
                 if radius_km and distance > radius_km:
                     continue
 
-            volunteer_entry = payload.copy()
-            volunteer_entry.setdefault('user_id', str(point.id))
+            volunteer_entry = projection.trim(payload, required=VOLUNTEER_REQUIRED_FIELDS)
+            volunteer_entry.setdefault('user_id', payload.get('user_id') or str(point.id))
             if distance is not None:
                 volunteer_entry['distance_km'] = round(distance, 2)
 
-            volunteers.append(volunteer_entry)
+            yield payload.get('past_cleanup_count', 0) or 0, volunteer_entry
+
+    top = heapq.nlargest(limit, matching_volunteers(), key=lambda match: match[0])
+    return [volunteer_entry for _, volunteer_entry in top]
+
+
+@app.get("/volunteers")
+async def list_volunteers(
+    limit: int = Query(100, ge=1, le=500),
+    lat: Optional[float] = Query(None, description="Latitude for proximity filtering"),
+    lon: Optional[float] = Query(None, description="Longitude for proximity filtering"),
+    radius_km: float = Query(25.0, ge=0.1, le=500.0, description="Radius for distance filter"),
+    available_only: bool = Query(False, description="Return only active volunteers"),
+    fields: Optional[str] = Query(None, description="Profile fields to return (comma-separated, '*' for all)"),
+):
+    """Return volunteer profiles with optional geo filtering."""
+    try:
+        if user_service is None:
+            raise HTTPException(status_code=503, detail="User service not initialized")
+        projection = _projection(fields, VOLUNTEER_FIELDS)
+
+        reference_location = None
+        if lat is not None and lon is not None:
+            reference_location = {"lat": lat, "lon": lon}
 
-        volunteers.sort(key=lambda v: v.get('past_cleanup_count', 0), reverse=True)
-        volunteers = volunteers[:limit]
+        volunteers = await run_io(
+            _top_volunteers,
+            limit,
+            reference_location,
+            radius_km,
+            available_only,
+            projection
+        )
 
         return {
             "status": "success",
@@ -1707,32 +1854,110 @@ async def list_volunteers(
         raise HTTPException(status_code=500, detail=f"Failed to list volunteers: {str(e)}")
 
 
+@app.post("/trash-reports/bulk")
+async def bulk_ingest_trash_reports(request: BulkReportIngestRequest):
+    """
+    Ingest many already-analyzed trash reports at once
+    
+    Embeddings are generated in one batch and reports are upserted in chunks
+    (uploaded in parallel). Per-item report IDs and failures are returned.
+    """
+    if vector_store is None or embedder is None:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+
+    try:
+        reports = []
+        for item in request.reports:
+            metadata = dict(item.analysis)
+            if item.location:
+                metadata['location'] = {"lat": item.location.lat, "lon": item.location.lon}
+            if item.user_id:
+                metadata['user_id'] = item.user_id
+            if item.timestamp is not None:
+                metadata['timestamp'] = item.timestamp
+            reports.append({
+                "report_id": item.report_id or f"report_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:8]}",
+                "metadata": metadata
+            })
+
+        texts = [embedder.build_trash_report_text(report["metadata"]) for report in reports]
+        embeddings = await run_cpu(embedder.batch_generate, texts, show_progress_bar=False)
+        for report, embedding in zip(reports, embeddings):
+            report["embedding"] = embedding
+
+        result = await run_io(
+            vector_store.store_trash_reports_batch,
+            reports,
+            chunk_size=request.chunk_size,
+            wait=request.wait
+        )
+
+        return {
+            "status": "success" if not result["failed"] else "partial",
+            "submitted": len(reports),
+            "stored": result["stored"],
+            "report_ids": result["report_ids"],
+            "failed": result["failed"],
+            "acknowledged": request.wait
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk ingestion failed: {str(e)}")
+
+
+# Report fields /trash-reports reads for distances and timestamps
+REPORT_LIST_REQUIRED_FIELDS = ("location", "timestamp", "metadata.location", "metadata.analyzed_at", "metadata.timestamp")
+
+
 @app.get("/trash-reports")
 async def list_trash_reports(
     limit: int = Query(50, ge=1, le=500),
     lat: Optional[float] = Query(None, description="Latitude for proximity filtering"),
     lon: Optional[float] = Query(None, description="Longitude for proximity filtering"),
-    radius_km: float = Query(25.0, ge=0.1, le=500.0, description="Radius for distance filter")
+    radius_km: float = Query(25.0, ge=0.1, le=500.0, description="Radius for distance filter"),
+    material: Optional[str] = Query(None, description="Only reports with this primary material"),
+    user_id: Optional[str] = Query(None, description="Only reports submitted by this user"),
+    risk_level: Optional[str] = Query(None, description="Only reports with this environmental risk level"),
+    time_window_days: Optional[int] = Query(None, ge=1, le=3650, description="Only reports from the last N days"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Report fields to return (comma-separated, '*' for all)")
 ):
-    """Return recent trash reports ordered by timestamp."""
+    """Return recent trash reports ordered by timestamp (paginate with next_cursor)."""
     try:
         if vector_store is None:
             raise HTTPException(status_code=503, detail="Vector store not initialized")
+        projection = _projection(fields, REPORT_FIELDS)
 
         reference_location = None
         if lat is not None and lon is not None:
             reference_location = {"lat": lat, "lon": lon}
 
-        fetch_limit = min(max(limit * 2, 100), 512)
-        results = vector_store.client.scroll(
-            collection_name=settings.trash_reports_collection,
-            limit=fetch_limit,
-            with_payload=True,
-            with_vectors=False
+        # Radius, field filters and newest-first ordering all run inside Qdrant
+        scroll_filter = vector_store.build_report_filter(
+            location_filter={**reference_location, "radius_km": radius_km} if reference_location else None,
+            time_window_days=time_window_days,
+            filters={
+                "primary_material": material,
+                "user_id": user_id,
+                "environmental_risk_level": risk_level
+            }
         )
+        try:
+            points, next_cursor = await run_io(
+                vector_store.list_reports_page,
+                scroll_filter=scroll_filter,
+                fields=projection.selector(required=REPORT_LIST_REQUIRED_FIELDS),
+                limit=limit,
+                cursor=cursor,
+                with_details=report_details_needed(projection.include)
+            )
+        except ValueError as cursor_error:
+            raise HTTPException(status_code=400, detail=str(cursor_error))
 
         reports: List[Dict[str, Any]] = []
-        for point in results[0]:
+        for point in points:
             payload = point.payload or {}
             location = _normalize_payload_location(payload)
 
@@ -1744,8 +1969,6 @@ async def list_trash_reports(
                     location['lat'],
                     location['lon']
                 )
-                if radius_km and distance > radius_km:
-                    continue
 
             timestamp = (
                 payload.get('timestamp') or
@@ -1753,7 +1976,7 @@ async def list_trash_reports(
                 payload.get('metadata', {}).get('timestamp')
             )
 
-            report_entry = payload.copy()
+            report_entry = projection.trim(payload, required=REPORT_LIST_REQUIRED_FIELDS)
             if distance is not None:
                 report_entry['distance_km'] = round(distance, 2)
             if timestamp:
@@ -1761,20 +1984,19 @@ async def list_trash_reports(
 
             reports.append(report_entry)
 
-        reports.sort(
-            key=lambda report: _parse_timestamp(report.get('timestamp')) or datetime.min.replace(tzinfo=timezone.utc),
-            reverse=True
-        )
-        reports = reports[:limit]
-
         return {
             "status": "success",
             "count": len(reports),
             "reports": reports,
+            "next_cursor": next_cursor,
             "filters": {
                 "lat": lat,
                 "lon": lon,
-                "radius_km": radius_km if reference_location else None
+                "radius_km": radius_km if reference_location else None,
+                "material": material,
+                "user_id": user_id,
+                "risk_level": risk_level,
+                "time_window_days": time_window_days
             }
         }
 
@@ -1784,53 +2006,67 @@ async def list_trash_reports(
         raise HTTPException(status_code=500, detail=f"Failed to list trash reports: {str(e)}")
 
 
+def _leaderboard_entries(limit: int, projection: Optional[Projection] = None) -> Tuple[List[Tuple[int, Dict[str, Any]]], int]:
+    """Top (cleanup count, entry) pairs plus the total volunteer count, in one streaming pass"""
+    projection = projection or parse_fields(None, LEADERBOARD_FIELDS)
+    required = ("past_cleanup_count",)
+    total = 0
+
+    def entries():
+        nonlocal total
+        for point in iter_collection_points(
+            user_service.client, settings.volunteer_profiles_collection, fields=projection.selector(required)
+        ):
+            payload = point.payload or {}
+            total += 1
+            if projection.label != "default":
+                yield payload.get('past_cleanup_count', 0) or 0, projection.trim(payload, required)
+                continue
+            yield payload.get('past_cleanup_count', 0) or 0, {
+                "user_id": payload.get('user_id', 'unknown'),
+                "name": payload.get('name', 'Unknown'),
+                "past_cleanup_count": payload.get('past_cleanup_count', 0),
+                "experience_level": payload.get('experience_level', 'beginner'),
+                "specializations": payload.get('specializations', []),
+                "available": payload.get('available', True)
+            }
+
+    # Sort by cleanup count
+    top = heapq.nlargest(limit, entries(), key=lambda entry: entry[0])
+    return top, total
+
+
 @app.get("/leaderboard")
-async def get_leaderboard(limit: int = 10):
+async def get_leaderboard(
+    limit: int = 10,
+    fields: Optional[str] = Query(None, description="Profile fields per entry (comma-separated, '*' for all)")
+):
     """
     Get volunteer leaderboard ranked by cleanup count
     
     Shows top volunteers by number of cleanups completed.
     """
+    projection = _projection(fields, LEADERBOARD_FIELDS)
     try:
         if user_service is None:
             raise HTTPException(status_code=503, detail="User service not initialized")
             
-        # Fetch all volunteers
-        results = user_service.client.scroll(
-            collection_name=settings.volunteer_profiles_collection,
-            limit=100,
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        volunteers = []
-        for point in results[0]:
-            payload = point.payload
-            volunteers.append({
-                "user_id": payload.get('user_id', 'unknown'),
-                "name": payload.get('name', 'Unknown'),
-                "past_cleanup_count": payload.get('past_cleanup_count', 0),
-                "experience_level": payload.get('experience_level', 'beginner'),
-                "specializations": payload.get('specializations', []),
-                "available": payload.get('available', True)
-            })
-        
-        # Sort by cleanup count
-        volunteers.sort(key=lambda v: v['past_cleanup_count'], reverse=True)
+        # Stream all volunteers (projected to leaderboard fields), keeping the top `limit`
+        volunteers, total_volunteers = await run_io(_leaderboard_entries, limit, projection)
         
         # Add rankings
         leaderboard = []
-        for i, volunteer in enumerate(volunteers[:limit], 1):
+        for i, (cleanup_count, volunteer) in enumerate(volunteers, 1):
             leaderboard.append({
                 "rank": i,
                 **volunteer,
-                "badge": _get_badge(volunteer['past_cleanup_count'])
+                "badge": _get_badge(cleanup_count)
             })
         
         return {
             "status": "success",
             "leaderboard": leaderboard,
-            "total_volunteers": len(volunteers),
+            "total_volunteers": total_volunteers,
             "generated_at": datetime.utcnow().isoformat()
         }
         
@@ -1853,19 +2089,34 @@ def _get_badge(cleanup_count: int) -> str:
 
 
 @app.get("/campaigns")
-async def get_all_campaigns():
+async def get_all_campaigns(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit to return every campaign)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
     """
     Get all campaigns (active and expired)
     
-    Returns all campaigns stored in the system.
+    Returns all campaigns stored in the system, or one page of them when
+    `limit` is given (follow `next_cursor` for the rest).
     """
     try:
-        campaigns = vector_store.get_all_campaigns()
+        next_cursor = None
+        if limit is None and cursor is None:
+            campaigns = await vector_store.aget_all_campaigns()
+        else:
+            points, next_cursor = await run_io(
+                vector_store.scroll_page,
+                settings.campaigns_collection,
+                limit=limit or 100,
+                cursor=cursor
+            )
+            campaigns = [point.payload for point in points]
         
         return {
             "status": "success",
             "count": len(campaigns),
-            "campaigns": campaigns
+            "campaigns": campaigns,
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -1880,7 +2131,7 @@ async def get_active_campaigns_endpoint():
     Filters out campaigns that have passed their end date.
     """
     try:
-        active_campaigns = vector_store.get_active_campaigns()
+        active_campaigns = await vector_store.aget_active_campaigns()
         
         return {
             "status": "success",
@@ -1901,7 +2152,7 @@ async def get_campaign(campaign_id: str):
     Returns detailed information about a single campaign.
     """
     try:
-        campaign = vector_store.get_campaign_by_id(campaign_id)
+        campaign = await vector_store.aget_campaign_by_id(campaign_id)
         
         if not campaign:
             raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
@@ -1923,7 +2174,7 @@ async def get_campaign(campaign_id: str):
 
 from auth_models import UserRegisterRequest, UserLoginRequest, UserUpdateRequest, FollowUserRequest, UnfollowUserRequest
 
-def get_current_user(authorization: Optional[str] = Header(None)):
+async def get_current_user(authorization: Optional[str] = Header(None)):
     """Extract user from JWT token"""
     if not authorization or not authorization.startswith("Bearer "):
         return None
@@ -1932,7 +2183,7 @@ def get_current_user(authorization: Optional[str] = Header(None)):
     if user_service:
         user_id = user_service.verify_jwt(token)
         if user_id:
-            return user_service.get_user_by_id(user_id)
+            return await user_service.aget_user_by_id(user_id)
     return None
 
 @app.post("/auth/register")
@@ -1942,7 +2193,7 @@ async def register_user(request: UserRegisterRequest):
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        result = user_service.register_user(
+        result = await user_service.aregister_user(
             name=request.name,
             email=request.email,
             password=request.password,
@@ -1975,7 +2226,7 @@ async def login_user(request: UserLoginRequest):
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        result = user_service.login_user(request.email, request.password)
+        result = await user_service.alogin_user(request.email, request.password)
         
         if result["success"]:
             return {
@@ -2011,7 +2262,7 @@ async def follow_user(request: FollowUserRequest, current_user = Depends(get_cur
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        result = user_service.follow_user(
+        result = await user_service.afollow_user(
             follower_id=current_user["user_id"],
             followee_name=request.followee_name
         )
@@ -2038,7 +2289,7 @@ async def unfollow_user(request: UnfollowUserRequest, current_user = Depends(get
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        result = user_service.unfollow_user(
+        result = await user_service.aunfollow_user(
             follower_id=current_user["user_id"],
             followee_id=request.followee_id
         )
@@ -2065,7 +2316,7 @@ async def get_recommended_users(current_user = Depends(get_current_user), limit:
     
     try:
         print(f"Getting recommendations for user: {current_user.get('user_id')}")
-        result = user_service.get_recommended_users(
+        result = await user_service.aget_recommended_users(
             user_id=current_user["user_id"],
             limit=limit
         )
@@ -2095,7 +2346,7 @@ async def search_users(query: str = Query(..., min_length=1), limit: int = Query
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        result = user_service.search_users(query=query, limit=limit)
+        result = await user_service.asearch_users(query=query, limit=limit)
         
         if result["success"]:
             return {
@@ -2115,7 +2366,7 @@ async def get_user_profile(user_id: str):
         raise HTTPException(status_code=503, detail="User service not available")
     
     try:
-        user = user_service.get_user_by_id(user_id)
+        user = await user_service.aget_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -2129,67 +2380,72 @@ async def get_user_profile(user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get profile: {str(e)}")
 
+def _scan_user_campaigns(user_id: str) -> Dict[str, Any]:
+    """Walk every campaign page by page and tally the ones a user created or joined"""
+    stats = {
+        'campaigns_joined': 0,
+        'campaigns_created': 0,
+        'total_area_cleaned': 0,
+        'total_co2_saved': 0,
+        'cities': {}
+    }
+    
+    for point in vector_store.iter_points(
+        settings.campaigns_collection,
+        fields=['created_by', 'volunteers', 'location']
+    ):
+        payload = point.payload or {}
+        
+        # Check if user created this campaign
+        if payload.get('created_by') == user_id:
+            stats['campaigns_created'] += 1
+        
+        # Check if user joined (simplified - would need join tracking)
+        # For now, assume user joined if they appear in volunteers list
+        volunteers = payload.get('volunteers', [])
+        if any(v.get('user_id') == user_id for v in volunteers):
+            stats['campaigns_joined'] += 1
+            
+            # Track cities
+            location = payload.get('location', {})
+            city = location.get('city') or 'Unknown'
+            stats['cities'][city] = stats['cities'].get(city, 0) + 1
+            
+            # Estimate area cleaned (25 sq meters per campaign)
+            stats['total_area_cleaned'] += 25
+            
+            # Estimate CO2 saved (10kg per campaign)
+            stats['total_co2_saved'] += 10
+    
+    return stats
+
+
 @app.get("/users/{user_id}/stats")
 async def get_user_stats(user_id: str):
     """Get user activity statistics"""
     try:
-        # Get all campaigns
-        campaigns_result = vector_store.client.scroll(
-            collection_name=settings.campaigns_collection,
-            limit=1000,
-            with_payload=True,
-            with_vectors=False
-        )
+        if vector_store is None:
+            raise HTTPException(status_code=503, detail="Vector store not initialized")
         
-        # Get all trash reports
-        reports_result = vector_store.client.scroll(
-            collection_name=settings.trash_reports_collection,
-            limit=1000,
-            with_payload=True,
-            with_vectors=False
+        # Stream campaigns (projected to the fields used here)
+        campaign_stats = await run_io(_scan_user_campaigns, user_id)
+        
+        # Count this user's trash reports (filtered on the indexed user_id field)
+        user_reports = await vector_store.acount_points(
+            settings.trash_reports_collection,
+            vector_store.build_report_filter(filters={"user_id": user_id})
         )
         
         # Calculate stats
-        campaigns_joined = 0
-        campaigns_created = 0
+        campaigns_joined = campaign_stats['campaigns_joined']
+        campaigns_created = campaign_stats['campaigns_created']
         donations_made = 0
-        total_area_cleaned = 0
-        total_co2_saved = 0
-        cities = {}
+        total_area_cleaned = campaign_stats['total_area_cleaned']
+        total_co2_saved = campaign_stats['total_co2_saved']
+        cities = campaign_stats['cities']
         
-        # Process campaigns
-        for point in campaigns_result[0]:
-            payload = point.payload or {}
-            
-            # Check if user created this campaign
-            if payload.get('created_by') == user_id:
-                campaigns_created += 1
-            
-            # Check if user joined (simplified - would need join tracking)
-            # For now, assume user joined if they appear in volunteers list
-            volunteers = payload.get('volunteers', [])
-            if any(v.get('user_id') == user_id for v in volunteers):
-                campaigns_joined += 1
-                
-                # Track cities
-                location = payload.get('location', {})
-                city = location.get('city') or 'Unknown'
-                cities[city] = cities.get(city, 0) + 1
-                
-                # Estimate area cleaned (25 sq meters per campaign)
-                total_area_cleaned += 25
-                
-                # Estimate CO2 saved (10kg per campaign)
-                total_co2_saved += 10
-        
-        # Process trash reports for additional stats
-        user_reports = 0
-        for point in reports_result[0]:
-            payload = point.payload or {}
-            if payload.get('user_id') == user_id:
-                user_reports += 1
-                # Add CO2 from individual reports (2kg per report)
-                total_co2_saved += 2
+        # Add CO2 from individual reports (2kg per report)
+        total_co2_saved += 2 * user_reports
         
         # Find most common city
         most_common_city = max(cities.items(), key=lambda x: x[1])[0] if cities else 'None'
@@ -2211,6 +2467,8 @@ async def get_user_stats(user_id: str):
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get user stats: {str(e)}")
 
@@ -2301,7 +2559,8 @@ async def create_campaign_frontend(campaign_data: Dict[str, Any] = Body(...), cu
             and campaign["location"].get("lon") is not None
         ):
             try:
-                context = reverse_geocode(
+                context = await run_io(
+                    reverse_geocode,
                     float(campaign["location"]["lat"]),
                     float(campaign["location"]["lon"]),
                 )
@@ -2339,7 +2598,7 @@ async def create_campaign_frontend(campaign_data: Dict[str, Any] = Body(...), cu
         material_text = " ".join(materials_list)
         campaign_text = f"{campaign_name} {material_text} cleanup campaign"
         try:
-            campaign_embedding = embedder.generate_query_embedding(campaign_text)
+            campaign_embedding = await embedding_batcher.generate_query_embedding(campaign_text)
         except Exception as embedding_error:
             print("⚠️  Campaign embedding failed:")
             traceback.print_exc()
@@ -2347,7 +2606,7 @@ async def create_campaign_frontend(campaign_data: Dict[str, Any] = Body(...), cu
         
         # Store in Qdrant
         try:
-            vector_store.store_campaign(
+            await vector_store.astore_campaign(
                 embedding=campaign_embedding,
                 campaign_data=campaign,
                 campaign_id=campaign_id
@@ -0,0 +1,179 @@
+"""
+Micro-batching for model inference in EcoSynk AI Services
+Coalesces concurrent requests into a single model call on the CPU pool
+(the base of the embedding and YOLO batchers)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from executors import run_cpu
+from metrics import Histogram
+
+# Queued request: (input, caller's future, perf_counter when queued, loop time its answer is due by)
+BatchItem = Tuple[Any, asyncio.Future, float, float]
+
+
+class MicroBatcher:
+    """
+    Groups concurrent requests for a few milliseconds and runs them in one call
+
+    Subclasses implement _process (the blocking batch call, run on the CPU
+    pool) and may override _dispatch_by to send a batch before max_wait_ms
+    runs out, and _record_batch to keep their own counters.
+    """
+
+    # Used in failure messages: "Batched {kind} failed (3 {unit})"
+    kind = "request"
+    unit = "items"
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_wait_ms: float,
+        batch_size_buckets: Sequence[float],
+        queue_wait_buckets: Sequence[float]
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            max_batch_size: Largest batch dispatched at once
+            max_wait_ms: Longest time the first request in a batch waits for company
+            batch_size_buckets: Bucket bounds of the batch size histogram
+            queue_wait_buckets: Bucket bounds (ms) of the queue wait histogram
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self.batch_size_histogram = Histogram(batch_size_buckets)
+        self.queue_wait_histogram = Histogram(queue_wait_buckets)
+        self.batches_dispatched = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Requests taken off the queue by the worker and not answered yet
+        self._batch: List[BatchItem] = []
+
+    async def _submit(self, value: Any, deadline: float = math.inf) -> Any:
+        """
+        Queue one input and wait for its share of the batch result
+
+        Args:
+            value: Input passed to _process along with the rest of its batch
+            deadline: Loop time the answer is due by (used by _dispatch_by overrides)
+
+        Returns:
+            The result _process returned for this input
+        """
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((value, future, time.perf_counter(), deadline))
+        return await future
+
+    def _process(self, values: List[Any]) -> List[Any]:
+        """Run the model on one batch (blocking; one result per input, in order)"""
+        raise NotImplementedError
+
+    def _dispatch_by(self, batch: List[BatchItem]) -> float:
+        """Latest loop time the batch, plus one more request, may wait until (no limit by default)"""
+        return math.inf
+
+    def _record_batch(self, batch: List[BatchItem], seconds: float):
+        """Update subclass counters after a successful batch call that took `seconds`"""
+
+    async def close(self):
+        """Stop the background worker, failing the requests still waiting for it"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        pending = self._batch
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("batcher closed"))
+        self._batch = []
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait histograms plus the batch counter"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches_dispatched": self.batches_dispatched,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_histogram.snapshot(),
+        }
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the worker on the running loop (restarting it if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def _run(self):
+        """Collect requests until the batch is full, the wait budget is spent or _dispatch_by passes"""
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        max_wait = self.max_wait_ms / 1000.0
+
+        while True:
+            batch = [await queue.get()]
+            self._batch = batch
+            wait_until = loop.time() + max_wait
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                remaining = min(wait_until, self._dispatch_by(batch)) - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+            self._batch = []
+
+    async def _dispatch(self, batch: List[BatchItem]):
+        """Run one batch and fan the results back out to the waiting callers"""
+        dispatched_at = time.perf_counter()
+        for _, _, enqueued_at, _ in batch:
+            self.queue_wait_histogram.observe((dispatched_at - enqueued_at) * 1000)
+        self.batch_size_histogram.observe(len(batch))
+
+        values = [value for value, _, _, _ in batch]
+        try:
+            results = await run_cpu(self._process, values)
+        except Exception as e:
+            print(f"❌ Batched {self.kind} failed ({len(values)} {self.unit}): {e}")
+            for _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._record_batch(batch, time.perf_counter() - dispatched_at)
+        self.batches_dispatched += 1
+        for (_, future, _, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -6,7 +6,8 @@ from typing import Dict, List, Optional
 from pydantic import BaseModel
 import uuid
 from embeddings.generator import EmbeddingGenerator
-from qdrant.vector_store import EcoSynkVectorStore
+from qdrant.connection import QdrantConnectionFactory
+from qdrant.vector_store import EcoSynkVectorStore, point_id_for
 
 class CampaignGoals(BaseModel):
     target_funding_usd: float
@@ -44,8 +45,15 @@ class Campaign(BaseModel):
     impact_estimates: ImpactEstimates
 
 class CampaignManager:
-    def __init__(self, vector_store: EcoSynkVectorStore, embedding_generator: EmbeddingGenerator):
+    def __init__(
+        self,
+        vector_store: EcoSynkVectorStore,
+        embedding_generator: EmbeddingGenerator,
+        connection: Optional[QdrantConnectionFactory] = None
+    ):
         self.vector_store = vector_store
+        # Shared pooled client (the vector store's connection unless one is given)
+        self.client = (connection or vector_store.connection).client
         self.embedding_generator = embedding_generator
         self.collection_name = "campaigns"
         self._ensure_collection()
@@ -54,7 +62,7 @@ class CampaignManager:
         """Ensure campaigns collection exists"""
         try:
             from qdrant_client.models import Distance, VectorParams
-            self.vector_store.client.create_collection(
+            self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(size=384, distance=Distance.COSINE)
             )
@@ -93,11 +101,11 @@ class CampaignManager:
         
         # Store in Qdrant
         from qdrant_client.models import PointStruct
-        self.vector_store.client.upsert(
+        self.client.upsert(
             collection_name=self.collection_name,
             points=[
                 PointStruct(
-                    id=campaign_id,
+                    id=point_id_for(campaign_id),
                     vector=embedding,
                     payload=campaign.dict()
                 )
@@ -108,7 +116,7 @@ class CampaignManager:
     
     def get_campaigns(self, limit: int = 10) -> List[Dict]:
         """Get all campaigns"""
-        results = self.vector_store.client.scroll(
+        results = self.client.scroll(
             collection_name=self.collection_name,
             limit=limit,
             with_payload=True,
@@ -119,9 +127,9 @@ class CampaignManager:
     def get_campaign(self, campaign_id: str) -> Optional[Dict]:
         """Get specific campaign"""
         try:
-            result = self.vector_store.client.retrieve(
+            result = self.client.retrieve(
                 collection_name=self.collection_name,
-                ids=[campaign_id],
+                ids=[point_id_for(campaign_id)],
                 with_payload=True
             )
             return result[0].payload if result else None
@@ -147,11 +155,11 @@ class CampaignManager:
         embedding = self.embedding_generator.generate_embedding(text)
         
         from qdrant_client.models import PointStruct
-        self.vector_store.client.upsert(
+        self.client.upsert(
             collection_name=self.collection_name,
             points=[
                 PointStruct(
-                    id=campaign_id,
+                    id=point_id_for(campaign_id),
                     vector=embedding,
                     payload=campaign
                 )
@@ -39,17 +39,107 @@ class Settings(BaseSettings):
     embedding_dimension: int = 384
     gemini_model: str = "gemini-2.5-flash"
     google_imagen_model: str = os.getenv("GOOGLE_IMAGEN_MODEL", "imagen-3.0-light")
+
+    # Embedding Batching & Cache
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+    embedding_cache_max_mb: float = 64.0
+
+    # YOLO Batching: frames from concurrent requests share one predict call. A batch is dispatched when
+    # full, after max wait, or earlier if waiting would push a request past its latency SLO
+    detection_batch_max_size: int = int(os.getenv("DETECTION_BATCH_MAX_SIZE", "8"))
+    detection_batch_max_wait_ms: float = float(os.getenv("DETECTION_BATCH_MAX_WAIT_MS", "10"))
+    detection_live_slo_ms: float = float(os.getenv("DETECTION_LIVE_SLO_MS", "250"))
+    detection_slo_ms: float = float(os.getenv("DETECTION_SLO_MS", "1000"))
+
+    # Embedding Backend ("torch" or "onnx"; ONNX exports are cached under embedding_onnx_dir)
+    embedding_backend: str = os.getenv("EMBEDDING_BACKEND", "torch")
+    embedding_onnx_quantize: bool = parse_bool(os.getenv("EMBEDDING_ONNX_QUANTIZE"), default=True)
+    embedding_onnx_dir: str = os.getenv("EMBEDDING_ONNX_DIR", str(Path(__file__).parent / "models" / "onnx"))
     
     # Qdrant Configuration
     trash_reports_collection: str = "trash_reports"
     volunteer_profiles_collection: str = "users"  # Now using unified users collection
     campaigns_collection: str = "campaigns"
+    qdrant_upsert_chunk_size: int = int(os.getenv("QDRANT_UPSERT_CHUNK_SIZE", "256"))
+    qdrant_upsert_parallelism: int = int(os.getenv("QDRANT_UPSERT_PARALLELISM", "4"))
+
+    # Qdrant Connection (one pooled client pair shared by all services)
+    qdrant_prefer_grpc: bool = parse_bool(os.getenv("QDRANT_PREFER_GRPC"), default=False)
+    qdrant_grpc_port: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    qdrant_http2: bool = parse_bool(os.getenv("QDRANT_HTTP2"), default=True)
+    qdrant_pool_size: int = int(os.getenv("QDRANT_POOL_SIZE", "32"))
+    qdrant_keepalive_seconds: float = float(os.getenv("QDRANT_KEEPALIVE_SECONDS", "60"))
+    qdrant_timeout: int = int(os.getenv("QDRANT_TIMEOUT", "30"))
+    # Per client method timeouts in seconds ("method=seconds,..."); others use qdrant_timeout
+    qdrant_operation_timeouts: str = os.getenv(
+        "QDRANT_OPERATION_TIMEOUTS", "query_points=10,query_batch_points=15,count=10,scroll=30,upsert=60"
+    )
+    # Embedded Qdrant instead of QDRANT_URL: ":memory:" or a storage directory (empty = use the cluster)
+    qdrant_local_path: str = os.getenv("QDRANT_LOCAL_PATH", "")
+
+    # Qdrant Index Tuning (defaults for every collection; see qdrant/tuning.py)
+    qdrant_quantization: str = os.getenv("QDRANT_QUANTIZATION", "none")  # none, scalar or binary
+    qdrant_quantization_always_ram: bool = parse_bool(os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM"), default=True)
+    qdrant_quantization_rescore: bool = parse_bool(os.getenv("QDRANT_QUANTIZATION_RESCORE"), default=True)
+    qdrant_quantization_oversampling: float = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", "2.0"))
+    qdrant_vectors_on_disk: bool = parse_bool(os.getenv("QDRANT_VECTORS_ON_DISK"), default=False)
+    qdrant_hnsw_m: int = int(os.getenv("QDRANT_HNSW_M", "16"))
+    qdrant_hnsw_ef_construct: int = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+    qdrant_hnsw_ef: int = int(os.getenv("QDRANT_HNSW_EF", "128"))  # search-time candidate list size
+    # Per collection overrides, e.g. "trash_reports:quantization=binary,ef=64;users:m=32"
+    qdrant_collection_tuning: str = os.getenv("QDRANT_COLLECTION_TUNING", "")
+    
+    # In-process users replica (NumPy) for volunteer matching, recommendations and user search
+    user_replica_enabled: bool = parse_bool(os.getenv("USER_REPLICA_ENABLED"), default=False)
+    user_replica_refresh_seconds: float = float(os.getenv("USER_REPLICA_REFRESH_SECONDS", "60"))
+    # Searches fall back to Qdrant when the last full reconciliation is older than this
+    user_replica_max_staleness_seconds: float = float(os.getenv("USER_REPLICA_MAX_STALENESS_SECONDS", "300"))
+    
+    # /reports/search result cache (TTL + LRU, emptied whenever a trash report is written)
+    report_search_cache_enabled: bool = parse_bool(os.getenv("REPORT_SEARCH_CACHE_ENABLED"), default=True)
+    report_search_cache_max_entries: int = int(os.getenv("REPORT_SEARCH_CACHE_MAX_ENTRIES", "1024"))
+    report_search_cache_ttl_seconds: float = float(os.getenv("REPORT_SEARCH_CACHE_TTL_SECONDS", "30"))
+    # Search locations are snapped to this grid (degrees, ~110 m) so nearby dashboard queries share entries
+    report_search_cache_grid_degrees: float = float(os.getenv("REPORT_SEARCH_CACHE_GRID_DEGREES", "0.001"))
+    
+    # Hybrid report search: BM25-style sparse vectors stored next to the dense embedding, fused with RRF
+    hybrid_search_enabled: bool = parse_bool(os.getenv("HYBRID_SEARCH_ENABLED"), default=True)
+    report_sparse_vector_name: str = os.getenv("REPORT_SPARSE_VECTOR_NAME", "text")
+    # Candidates the dense and sparse searches each contribute to fusion, per requested result
+    hybrid_prefetch_multiplier: int = int(os.getenv("HYBRID_PREFETCH_MULTIPLIER", "4"))
+    
+    # Trash report payload schema for new writes: 2 keeps indexed fields and the analysis summary on the
+    # point and moves bulky blobs (geocoder context, YOLO output, analysis metadata) to the details
+    # collection; 1 writes the legacy layout. Existing reports move with `migrations.py compact-reports`
+    report_payload_schema: int = int(os.getenv("REPORT_PAYLOAD_SCHEMA", "2"))
+    report_details_collection: str = os.getenv("REPORT_DETAILS_COLLECTION", "trash_report_details")
+    
+    # /analyze-trash/batch: images per request and Gemini calls in flight per request
+    analyze_batch_max_images: int = int(os.getenv("ANALYZE_BATCH_MAX_IMAGES", "50"))
+    analyze_batch_concurrency: int = int(os.getenv("ANALYZE_BATCH_CONCURRENCY", "8"))
+    
+    # Image uploads: bodies over the byte limit are rejected while streaming, images over the pixel
+    # budget before decoding. JPEGs are decoded at reduced size (draft mode) straight into a
+    # detection variant (YOLO and the annotated image) and a Gemini variant (re-encoded as JPEG
+    # when the original is larger or in a format Gemini does not accept)
+    upload_max_bytes: int = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+    upload_max_pixels: int = int(os.getenv("UPLOAD_MAX_PIXELS", "60000000"))
+    upload_detection_max_side: int = int(os.getenv("UPLOAD_DETECTION_MAX_SIDE", "640"))
+    upload_gemini_max_side: int = int(os.getenv("UPLOAD_GEMINI_MAX_SIDE", "1536"))
+    upload_gemini_jpeg_quality: int = int(os.getenv("UPLOAD_GEMINI_JPEG_QUALITY", "85"))
     
     # Search Parameters
     default_search_limit: int = 10
     hotspot_threshold: int = 3
     default_radius_km: float = 5.0
 
+    # Execution Pools (blocking work is kept off the event loop)
+    executor_io_workers: int = int(os.getenv("EXECUTOR_IO_WORKERS", "32"))
+    executor_cpu_workers: int = int(os.getenv("EXECUTOR_CPU_WORKERS", str(os.cpu_count() or 2)))
+    # Worker processes for image transforms (decode, transcode, annotate, encode); 0 runs them on the CPU threads
+    executor_image_workers: int = int(os.getenv("EXECUTOR_IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
     # Geocoding
     geocoding_user_agent: str = os.getenv("GEOCODING_USER_AGENT", "EcoSynk/1.0 (+support@ecosynk.local)")
     geocoding_email: Optional[str] = os.getenv("GEOCODING_EMAIL")
@@ -83,11 +173,13 @@ def validate_config() -> bool:
     if not settings.gemini_api_key or settings.gemini_api_key == "your_gemini_api_key_here":
         missing.append("GEMINI_API_KEY")
     
-    if not settings.qdrant_url or settings.qdrant_url == "https://your-cluster.qdrant.io:6333":
-        missing.append("QDRANT_URL")
-    
-    if not settings.qdrant_api_key or settings.qdrant_api_key == "your_qdrant_api_key_here":
-        missing.append("QDRANT_API_KEY")
+    # Embedded Qdrant (QDRANT_LOCAL_PATH) needs no cluster credentials
+    if not settings.qdrant_local_path:
+        if not settings.qdrant_url or settings.qdrant_url == "https://your-cluster.qdrant.io:6333":
+            missing.append("QDRANT_URL")
+        
+        if not settings.qdrant_api_key or settings.qdrant_api_key == "your_qdrant_api_key_here":
+            missing.append("QDRANT_API_KEY")
     
     if missing:
         print(f"❌ Missing required API keys: {', '.join(missing)}")
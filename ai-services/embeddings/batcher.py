@@ -0,0 +1,87 @@
+"""
+Micro-batching front end for EmbeddingGenerator
+Coalesces concurrent embedding requests into a single batch_generate call
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Any, Dict, List, Optional
+
+from batching import BatchItem, MicroBatcher
+from config import settings
+from embeddings.generator import EmbeddingGenerator
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+QUEUE_WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class EmbeddingBatcher(MicroBatcher):
+    """Groups concurrent embedding requests for a few milliseconds and encodes them together"""
+
+    kind = "embedding"
+    unit = "texts"
+
+    def __init__(
+        self,
+        generator: EmbeddingGenerator,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            generator: EmbeddingGenerator that builds texts and runs batch_generate
+            max_batch_size: Largest batch dispatched at once (uses settings if not provided)
+            max_wait_ms: Longest time the first request in a batch waits for company
+        """
+        super().__init__(
+            max_batch_size or settings.embedding_batch_max_size,
+            max_wait_ms if max_wait_ms is not None else settings.embedding_batch_max_wait_ms,
+            BATCH_SIZE_BUCKETS,
+            QUEUE_WAIT_MS_BUCKETS
+        )
+        self.generator = generator
+        self.texts_encoded = 0
+
+    async def encode(self, text: str) -> List[float]:
+        """
+        Embed a single text, sharing a model call with concurrent requests
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        cached = self.generator.get_cached_embedding(text)
+        if cached is not None:
+            return cached
+        return await self._submit(text)
+
+    async def generate_trash_report_embedding(self, report_data: Dict[str, Any]) -> List[float]:
+        """Batched equivalent of EmbeddingGenerator.generate_trash_report_embedding"""
+        return await self.encode(self.generator.build_trash_report_text(report_data))
+
+    async def generate_volunteer_profile_embedding(self, profile: Dict[str, Any]) -> List[float]:
+        """Batched equivalent of EmbeddingGenerator.generate_volunteer_profile_embedding"""
+        return await self.encode(self.generator.build_volunteer_profile_text(profile))
+
+    async def generate_query_embedding(self, query_text: str) -> List[float]:
+        """Batched equivalent of EmbeddingGenerator.generate_query_embedding"""
+        return await self.encode(query_text)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait histograms plus throughput counters"""
+        return {**super().stats(), "texts_encoded": self.texts_encoded}
+
+    def _process(self, texts: List[str]) -> List[List[float]]:
+        """Encode one batch of texts"""
+        return self.generator.batch_generate(texts, show_progress_bar=False)
+
+    def _record_batch(self, batch: List[BatchItem], seconds: float):
+        """Count the encoded texts"""
+        self.texts_encoded += len(batch)
@@ -0,0 +1,119 @@
+"""
+Content-addressed LRU cache for embedding vectors
+Vectors are stored as compact float32 arrays and evicted by memory footprint
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Rough per-entry bookkeeping cost (dict slot, key string, array header)
+ENTRY_OVERHEAD_BYTES = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def canonicalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different texts share a cache entry"""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def embedding_cache_key(text: str, model_name: str) -> str:
+    """
+    Content address for an embedding
+
+    Args:
+        text: Text that is (or would be) passed to the model
+        model_name: Embedding model name, so switching models never serves stale vectors
+
+    Returns:
+        Hex SHA-256 digest of the model name and canonical text
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonicalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded in-process LRU cache of float32 embedding vectors"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for cached vectors; least recently used entries are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, record_miss: bool = True) -> Optional[np.ndarray]:
+        """
+        Return the cached vector for a key (marking it recently used), or None
+
+        Args:
+            key: Content address from embedding_cache_key
+            record_miss: Count a miss; disable for fast-path probes that fall back to a counted lookup
+        """
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                if record_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: Any):
+        """Store a vector as a read-only float32 array, evicting old entries if over budget"""
+        array = np.array(vector, dtype=np.float32)
+        array.setflags(write=False)
+        size = array.nbytes + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes + ENTRY_OVERHEAD_BYTES
+            self._entries[key] = array
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes + ENTRY_OVERHEAD_BYTES
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached vector"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -9,42 +9,113 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
 from config import settings
+from embeddings.cache import EmbeddingCache, embedding_cache_key
+from embeddings.registry import model_key, model_registry
 
 
 class EmbeddingGenerator:
     """Generate vector embeddings for trash reports and volunteer profiles"""
     
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(self, model_name: Optional[str] = None, lazy: bool = False, backend: Optional[str] = None):
         """
         Initialize the embedding generator
         
         Args:
             model_name: Optional model name (uses settings if not provided)
+            lazy: Defer loading the model until the first encode
+            backend: "torch" or "onnx" (uses settings if not provided)
         """
         self.model_name = model_name or settings.embedding_model
+        self.backend = backend or settings.embedding_backend
+        self.cache_namespace = model_key(self.model_name, self.backend)
         
-        print(f"📥 Loading embedding model: {self.model_name}...")
-        try:
-            self.model = SentenceTransformer(self.model_name)
-            print(f"✅ Model loaded: {self.model_name} ({settings.embedding_dimension}D)")
-        except Exception as e:
-            print(f"❌ Failed to load model: {e}")
-            raise
+        if not lazy:
+            model_registry.get(self.model_name, self.backend)
+        
+        # Content-addressed vector cache (disabled when the budget is 0)
+        cache_bytes = int(settings.embedding_cache_max_mb * 1024 * 1024)
+        self.cache: Optional[EmbeddingCache] = EmbeddingCache(cache_bytes) if cache_bytes > 0 else None
     
-    def generate_trash_report_embedding(self, report_data: Dict[str, Any]) -> List[float]:
+    @property
+    def model(self):
+        """Shared model instance from the process-wide registry (loaded on first use)"""
+        return model_registry.get(self.model_name, self.backend)
+    
+    def warm_up(self):
+        """Load the model and run its one-time warm-up encode"""
+        model_registry.warm_up(self.model_name, self.backend)
+    
+    def encode_texts(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
         """
-        Generate embedding for a trash report
+        Encode texts into float32 vectors, serving repeats from the cache
+        
+        Args:
+            texts: List of text strings
+            show_progress_bar: Show the sentence-transformers progress bar for the model call
+            
+        Returns:
+            Array of shape (len(texts), dimension)
+        """
+        if self.cache is None:
+            return np.asarray(self.model.encode(
+                texts,
+                batch_size=32,
+                show_progress_bar=show_progress_bar,
+                convert_to_numpy=True
+            ), dtype=np.float32)
+        
+        keys = [embedding_cache_key(text, self.cache_namespace) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(key) for key in keys]
+        
+        # Encode each distinct missing text once
+        missing: Dict[str, int] = {}
+        for index, vector in enumerate(vectors):
+            if vector is None and keys[index] not in missing:
+                missing[keys[index]] = index
+        
+        if missing:
+            encoded = self.model.encode(
+                [texts[index] for index in missing.values()],
+                batch_size=32,
+                show_progress_bar=show_progress_bar,
+                convert_to_numpy=True
+            )
+            fresh = {}
+            for key, vector in zip(missing, encoded):
+                self.cache.put(key, vector)
+                fresh[key] = np.asarray(vector, dtype=np.float32)
+            vectors = [vector if vector is not None else fresh[key] for key, vector in zip(keys, vectors)]
+        
+        return np.stack(vectors) if vectors else np.empty((0, settings.embedding_dimension), dtype=np.float32)
+    
+    def get_cached_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Return the cached embedding for a text without touching the model
+        
+        Args:
+            text: Text as it would be passed to the model
+            
+        Returns:
+            Embedding vector, or None on a cache miss
+        """
+        if self.cache is None:
+            return None
+        vector = self.cache.get(embedding_cache_key(text, self.cache_namespace), record_miss=False)
+        return vector.tolist() if vector is not None else None
+    
+    def build_trash_report_text(self, report_data: Dict[str, Any]) -> str:
+        """
+        Build the text representation embedded for a trash report
         Combines multiple features into a rich semantic representation
         
         Args:
             report_data: Dict containing analysis results from Gemini
             
         Returns:
-            List of floats representing the embedding vector
+            Combined text passed to the embedding model
         """
         # Extract relevant fields
         material = report_data.get('primary_material', 'unknown')
@@ -54,6 +125,9 @@ class EmbeddingGenerator:
         risk_level = report_data.get('environmental_risk_level', 'medium')
         priority = report_data.get('cleanup_priority_score', 5)
         
+        # Sort lists so equivalent reports produce identical text (and cache keys)
+        items = sorted(str(item) for item in items) if items else []
+        
         # Create rich text representation
         text_parts = [
             f"Material type: {material}",
@@ -66,27 +140,35 @@ class EmbeddingGenerator:
         
         # Add equipment needs if available
         if 'recommended_equipment' in report_data:
-            equipment = report_data['recommended_equipment']
+            equipment = sorted(str(item) for item in report_data['recommended_equipment'] or [])
             text_parts.append(f"Equipment needed: {', '.join(equipment)}")
         
         # Combine into single text
-        combined_text = ". ".join(text_parts)
-        
-        # Generate embedding
-        embedding = self.model.encode(combined_text, convert_to_numpy=True)
+        return ". ".join(text_parts)
+    
+    def generate_trash_report_embedding(self, report_data: Dict[str, Any]) -> List[float]:
+        """
+        Generate embedding for a trash report
         
-        return embedding.tolist()
+        Args:
+            report_data: Dict containing analysis results from Gemini
+            
+        Returns:
+            List of floats representing the embedding vector
+        """
+        combined_text = self.build_trash_report_text(report_data)
+        return self.encode_texts([combined_text])[0].tolist()
     
-    def generate_volunteer_profile_embedding(self, profile: Dict[str, Any]) -> List[float]:
+    def build_volunteer_profile_text(self, profile: Dict[str, Any]) -> str:
         """
-        Generate embedding for a volunteer profile
+        Build the text representation embedded for a volunteer profile
         Based on skills, experience, and past activities
         
         Args:
             profile: Dict containing volunteer information
             
         Returns:
-            List of floats representing the embedding vector
+            Combined text passed to the embedding model
         """
         # Extract relevant fields
         skills = profile.get('skills', [])
@@ -113,12 +195,20 @@ class EmbeddingGenerator:
             text_parts.append(f"Has equipment: {', '.join(equipment_owned)}")
         
         # Combine into single text
-        combined_text = ". ".join(text_parts)
-        
-        # Generate embedding
-        embedding = self.model.encode(combined_text, convert_to_numpy=True)
+        return ". ".join(text_parts)
+    
+    def generate_volunteer_profile_embedding(self, profile: Dict[str, Any]) -> List[float]:
+        """
+        Generate embedding for a volunteer profile
         
-        return embedding.tolist()
+        Args:
+            profile: Dict containing volunteer information
+            
+        Returns:
+            List of floats representing the embedding vector
+        """
+        combined_text = self.build_volunteer_profile_text(profile)
+        return self.encode_texts([combined_text])[0].tolist()
     
     def generate_query_embedding(self, query_text: str) -> List[float]:
         """
@@ -130,26 +220,23 @@ class EmbeddingGenerator:
         Returns:
             List of floats representing the embedding vector
         """
-        embedding = self.model.encode(query_text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self.encode_texts([query_text])[0].tolist()
     
-    def batch_generate(self, texts: List[str]) -> List[List[float]]:
+    def batch_generate(self, texts: List[str], show_progress_bar: Optional[bool] = None) -> List[List[float]]:
         """
         Generate embeddings for multiple texts efficiently
         
         Args:
             texts: List of text strings
+            show_progress_bar: Force the progress bar on/off (defaults to on for >10 texts)
             
         Returns:
             List of embedding vectors
         """
-        embeddings = self.model.encode(
-            texts, 
-            batch_size=32,
-            show_progress_bar=len(texts) > 10,
-            convert_to_numpy=True
-        )
-        return embeddings.tolist()
+        if show_progress_bar is None:
+            show_progress_bar = len(texts) > 10
+        
+        return self.encode_texts(texts, show_progress_bar=show_progress_bar).tolist()
     
     def similarity_score(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
@@ -0,0 +1,238 @@
+"""
+ONNX Runtime backend for sentence-transformers models
+Exports the model once (optionally int8 dynamic-quantized) and encodes on CPU without PyTorch
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import re
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+    print("⚠️ onnxruntime not installed. ONNX embedding backend disabled.")
+
+from config import settings
+
+MODEL_FILE = "model.onnx"
+POOLING_FILE = "pooling.json"
+
+
+def export_dir_for(model_name: str, quantize: bool, base_dir: Optional[str] = None) -> Path:
+    """
+    Directory holding the exported ONNX graph, tokenizer and pooling config for a model
+
+    Args:
+        model_name: sentence-transformers model name or path
+        quantize: Whether the export is int8 dynamic-quantized
+        base_dir: Export root (uses settings if not provided)
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_")
+    variant = "int8" if quantize else "fp32"
+    return Path(base_dir or settings.embedding_onnx_dir) / safe_name / variant
+
+
+def export_sentence_transformer(model_name: str, output_dir: Path, quantize: bool = True) -> Path:
+    """
+    Export a sentence-transformers model's transformer to ONNX
+
+    Args:
+        model_name: sentence-transformers model name or path
+        output_dir: Directory for model.onnx, the tokenizer and pooling.json
+        quantize: Apply int8 dynamic quantization to the exported weights
+
+    Returns:
+        Path to the exported model.onnx
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    auto_model = transformer.auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    pooling_mode = "mean"
+    normalize = False
+    for module in st_model:
+        name = type(module).__name__
+        if name == "Pooling":
+            pooling_mode = _pooling_mode(module)
+        elif name == "Normalize":
+            normalize = True
+    if pooling_mode not in ("mean", "cls", "max"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling_mode}")
+
+    # Trace with a padded batch so the attention-mask path is part of the graph
+    sample = tokenizer(
+        ["Plastic bottles near the river", "Glass"], padding=True, return_tensors="pt"
+    )
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Positional-argument wrapper returning only the token embeddings"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+
+    fp32_path = output_dir / ("model_fp32.onnx" if quantize else MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(auto_model),
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+
+    model_path = output_dir / MODEL_FILE
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(fp32_path), str(model_path), weight_type=QuantType.QInt8)
+        fp32_path.unlink()
+
+    tokenizer.save_pretrained(str(output_dir))
+    with open(output_dir / POOLING_FILE, "w") as f:
+        json.dump({
+            "pooling_mode": pooling_mode,
+            "normalize": normalize,
+            "max_seq_length": st_model.max_seq_length,
+            "input_names": input_names,
+        }, f, indent=2)
+
+    return model_path
+
+
+def _pooling_mode(pooling: Any) -> str:
+    """Pooling mode of a sentence-transformers Pooling module across library versions"""
+    config = pooling.get_config_dict()
+    if "pooling_mode" in config:
+        return config["pooling_mode"]
+    for flag, mode in (("pooling_mode_cls_token", "cls"), ("pooling_mode_max_tokens", "max"), ("pooling_mode_mean_tokens", "mean")):
+        if config.get(flag):
+            return mode
+    return "mean"
+
+
+class OnnxSentenceEncoder:
+    """Drop-in replacement for SentenceTransformer.encode backed by onnxruntime"""
+
+    def __init__(self, model_name: str, quantize: bool = True, export_dir: Optional[str] = None):
+        """
+        Load (exporting on first use) the ONNX version of a model
+
+        Args:
+            model_name: sentence-transformers model name or path
+            quantize: Use the int8 dynamic-quantized export
+            export_dir: Export root (uses settings if not provided)
+        """
+        if ort is None:
+            raise ImportError("onnxruntime is required for the ONNX embedding backend: pip install -r requirements-onnx.txt")
+
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.model_dir = export_dir_for(model_name, quantize, export_dir)
+        self.model_path = self.model_dir / MODEL_FILE
+
+        if not self.model_path.exists():
+            print(f"📦 Exporting {model_name} to ONNX ({'int8' if quantize else 'fp32'})...")
+            export_sentence_transformer(model_name, self.model_dir, quantize=quantize)
+            print(f"✅ ONNX model saved to {self.model_path}")
+
+        with open(self.model_dir / POOLING_FILE) as f:
+            config = json.load(f)
+        self.pooling_mode = config["pooling_mode"]
+        self.normalize = config["normalize"]
+        self.max_seq_length = config["max_seq_length"]
+        self.input_names = config["input_names"]
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(self.model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+    ) -> np.ndarray:
+        """
+        Encode sentences like SentenceTransformer.encode
+
+        Args:
+            sentences: A single text or a list of texts
+            batch_size: Texts per ONNX Runtime call
+            show_progress_bar: Accepted for API compatibility (no progress bar is shown)
+            convert_to_numpy: Accepted for API compatibility (always returns numpy)
+
+        Returns:
+            float32 array of shape (dimension,) for a single text, else (len(sentences), dimension)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Batch texts of similar length together to minimise padding
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[index] for index in order[start:start + batch_size]]
+            batches.append(self._encode_batch(batch))
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(batches)
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        mask = encoded["attention_mask"].astype(np.float32)[:, :, None]
+
+        if self.pooling_mode == "cls":
+            pooled = hidden[:, 0]
+        elif self.pooling_mode == "max":
+            pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        else:
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+    def memory_bytes(self) -> int:
+        """Size of the ONNX graph and weights on disk"""
+        return self.model_path.stat().st_size
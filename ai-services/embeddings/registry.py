@@ -0,0 +1,153 @@
+"""
+Process-wide registry of embedding models
+Every service resolves its SentenceTransformer (or ONNX encoder) here so each model is loaded once
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sentence_transformers import SentenceTransformer
+
+from config import settings
+
+TORCH_BACKEND = "torch"
+ONNX_BACKEND = "onnx"
+WARM_UP_TEXT = "Warm up: plastic bottles near the river"
+
+
+class ModelRegistry:
+    """Lazily loads and shares embedding models across the process"""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _lock_for(self, model_name: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(model_name, threading.Lock())
+
+    def get(self, model_name: str, backend: Optional[str] = None) -> Any:
+        """
+        Return the shared model instance, loading it on first use
+
+        Args:
+            model_name: sentence-transformers model name or path
+            backend: "torch" or "onnx" (uses settings if not provided)
+
+        Returns:
+            The loaded SentenceTransformer, or an OnnxSentenceEncoder with the same encode API
+        """
+        backend = backend or settings.embedding_backend
+        key = model_key(model_name, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock_for(key):
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            print(f"📥 Loading embedding model: {key}...")
+            started = time.perf_counter()
+            try:
+                if backend == ONNX_BACKEND:
+                    from embeddings.onnx_backend import OnnxSentenceEncoder
+                    model = OnnxSentenceEncoder(model_name, quantize=settings.embedding_onnx_quantize)
+                elif backend == TORCH_BACKEND:
+                    model = SentenceTransformer(model_name)
+                else:
+                    raise ValueError(f"Unknown embedding backend: {backend}")
+            except Exception as e:
+                print(f"❌ Failed to load model: {e}")
+                raise
+            load_seconds = time.perf_counter() - started
+
+            self._info[key] = {
+                "loaded": True,
+                "backend": backend,
+                "load_seconds": round(load_seconds, 3),
+                "memory_mb": _model_memory_mb(model),
+                "warmed_up": False,
+                "warm_up_seconds": None,
+            }
+            self._models[key] = model
+            print(f"✅ Model loaded: {key} in {load_seconds:.2f}s")
+            return model
+
+    def warm_up(self, model_name: str, backend: Optional[str] = None) -> Any:
+        """
+        Load the model and run one throwaway encode, at most once per model
+
+        Args:
+            model_name: sentence-transformers model name or path
+            backend: "torch" or "onnx" (uses settings if not provided)
+
+        Returns:
+            The loaded model
+        """
+        backend = backend or settings.embedding_backend
+        key = model_key(model_name, backend)
+        model = self.get(model_name, backend)
+        with self._lock_for(key):
+            info = self._info[key]
+            if not info["warmed_up"]:
+                started = time.perf_counter()
+                model.encode(WARM_UP_TEXT, convert_to_numpy=True)
+                info["warm_up_seconds"] = round(time.perf_counter() - started, 3)
+                info["warmed_up"] = True
+        return model
+
+    def is_loaded(self, model_name: str, backend: Optional[str] = None) -> bool:
+        """Whether the model has already been loaded"""
+        return model_key(model_name, backend or settings.embedding_backend) in self._models
+
+    def unload(self, model_name: str, backend: Optional[str] = None):
+        """Drop a model from the registry (it is reloaded on next use)"""
+        key = model_key(model_name, backend or settings.embedding_backend)
+        with self._lock_for(key):
+            self._models.pop(key, None)
+            self._info.pop(key, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model load time, warm-up time and parameter memory"""
+        return {name: dict(info) for name, info in self._info.items()}
+
+
+def model_key(model_name: str, backend: Optional[str] = None) -> str:
+    """
+    Registry (and embedding cache) key for a model on a backend
+
+    The torch backend keeps the bare model name; other backends are suffixed so their
+    slightly different vectors never share cache entries with torch ones
+    """
+    backend = backend or settings.embedding_backend
+    if backend == TORCH_BACKEND:
+        return model_name
+    if backend == ONNX_BACKEND:
+        return f"{model_name}@onnx-{'int8' if settings.embedding_onnx_quantize else 'fp32'}"
+    return f"{model_name}@{backend}"
+
+
+def _model_memory_mb(model: Any) -> Optional[float]:
+    """Approximate resident size of a model from its parameters and buffers"""
+    try:
+        if hasattr(model, "memory_bytes"):
+            return round(model.memory_bytes() / (1024 * 1024), 2)
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        total += sum(b.numel() * b.element_size() for b in model.buffers())
+        return round(total / (1024 * 1024), 2)
+    except Exception:
+        return None
+
+
+# Global registry shared by EmbeddingGenerator and UserService
+model_registry = ModelRegistry()
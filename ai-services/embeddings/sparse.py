@@ -0,0 +1,96 @@
+"""
+Local BM25-style sparse vectors for hybrid report search
+Token IDs are stable hashes (no vocabulary to store or ship); documents carry
+BM25 term-frequency weights and queries carry binary term weights, while the
+IDF half of BM25 is applied by Qdrant (sparse vector modifier "idf")
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from qdrant_client.models import SparseVector
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Typical token count of a report text (items, material, description)
+AVERAGE_DOCUMENT_TOKENS = 24.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its near of on or the there this to was were with
+    found some lots lot many various item items
+""".split())
+
+
+def _stem(token: str) -> str:
+    """Minimal plural folding so "tyres" matches "tyre" and "bottles" matches "bottle" """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and plurals folded"""
+    return [_stem(token) for token in _TOKEN_RE.findall((text or "").lower()) if token not in _STOPWORDS]
+
+
+def token_id(token: str) -> int:
+    """Stable 31-bit sparse index for a token (same across processes and releases)"""
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def _sparse(weights: Dict[int, float]) -> Optional[SparseVector]:
+    if not weights:
+        return None
+    indices = sorted(weights)
+    return SparseVector(indices=indices, values=[weights[index] for index in indices])
+
+
+def document_sparse_vector(text: str) -> Optional[SparseVector]:
+    """
+    BM25 document weights for a text
+
+    Args:
+        text: Document text (see report_sparse_text)
+
+    Returns:
+        SparseVector, or None when the text has no indexable tokens
+    """
+    counts = Counter(tokenize(text))
+    length_norm = 1 - BM25_B + BM25_B * sum(counts.values()) / AVERAGE_DOCUMENT_TOKENS
+    weights: Dict[int, float] = {}
+    for token, tf in counts.items():
+        # Hash collisions just merge two terms' weights
+        index = token_id(token)
+        weights[index] = weights.get(index, 0.0) + tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+    return _sparse(weights)
+
+
+def query_sparse_vector(text: str) -> Optional[SparseVector]:
+    """Binary query weights for a search text, or None when it has no indexable tokens"""
+    return _sparse({token_id(token): 1.0 for token in tokenize(text)})
+
+
+def report_sparse_text(report_data: Dict[str, Any]) -> str:
+    """
+    Text indexed for exact-term matching of a trash report
+
+    Specific items are what users search for by name ("syringe", "tyre"), so they
+    are listed twice to outweigh incidental mentions in the description.
+    """
+    items = report_data.get('specific_items') or []
+    if isinstance(items, str):
+        items = [items]
+    parts = [
+        *items,
+        *items,
+        report_data.get('primary_material') or '',
+        report_data.get('description') or '',
+    ]
+    return " ".join(str(part) for part in parts)
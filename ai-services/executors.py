@@ -0,0 +1,180 @@
+"""
+Execution layer for blocking work in EcoSynk AI Services
+Keeps Gemini, Qdrant, geocoding and model inference off the event loop, and
+image transforms (which hold the GIL) off the interpreter entirely
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+
+# Dependency classes with their own thread pools
+IO_POOL = "io"        # Remote calls: Gemini, Qdrant, Nominatim
+CPU_POOL = "cpu"      # Local inference: YOLO, sentence embeddings
+IMAGE_POOL = "image"  # Image transforms: decode, transcode, annotate, encode (worker processes)
+
+
+def _image_pool_context():
+    """
+    Start method for image worker processes
+
+    forkserver forks workers from a single-threaded server process, so they
+    don't inherit the model threads of this process. The server imports the
+    main module once (workers inherit it rather than importing it each):
+    under `uvicorn api_server:app` that is only the uvicorn launcher, but
+    `python api_server.py` or app.py pull the full server stack into it.
+    imaging is preloaded too, so a new worker starts with the image
+    libraries already imported. spawn (the fallback) imports everything per worker.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # "__main__" stays first: without it every worker would import the main module itself
+    context.set_forkserver_preload(["__main__", "imaging"])
+    return context
+
+
+class DependencyExecutors:
+    """Separately sized pools per dependency class"""
+
+    def __init__(
+        self,
+        io_workers: Optional[int] = None,
+        cpu_workers: Optional[int] = None,
+        image_workers: Optional[int] = None
+    ):
+        """
+        Initialize the executor pools
+
+        Args:
+            io_workers: Threads for remote I/O calls (uses settings if not provided)
+            cpu_workers: Threads for CPU inference (uses settings if not provided)
+            image_workers: Processes for image transforms (uses settings if not provided;
+                0 runs them on the CPU threads instead)
+        """
+        if image_workers is None:
+            image_workers = settings.executor_image_workers
+        self._sizes = {
+            IO_POOL: io_workers or settings.executor_io_workers,
+            CPU_POOL: cpu_workers or settings.executor_cpu_workers,
+        }
+        self._pools: Dict[str, Executor] = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"ecosynk-{name}")
+            for name, size in self._sizes.items()
+        }
+        if image_workers > 0:
+            # Workers start on first use
+            self._sizes[IMAGE_POOL] = image_workers
+            self._pools[IMAGE_POOL] = ProcessPoolExecutor(max_workers=image_workers, mp_context=_image_pool_context())
+        self._lock = threading.Lock()
+        self._in_flight = {name: 0 for name in self._pools}
+        self._completed = {name: 0 for name in self._pools}
+
+    async def run(self, pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the named pool and await its result
+
+        Args:
+            pool: Pool name (IO_POOL, CPU_POOL or IMAGE_POOL)
+            func: Blocking callable (picklable, with picklable arguments, for IMAGE_POOL)
+            *args, **kwargs: Arguments forwarded to the callable
+
+        Returns:
+            Whatever the callable returns
+        """
+        if pool not in self._pools:  # Image pool disabled
+            pool = CPU_POOL
+        executor = self._pools[pool]
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+
+        with self._lock:
+            self._in_flight[pool] += 1
+        try:
+            return await loop.run_in_executor(executor, call)
+        finally:
+            with self._lock:
+                self._in_flight[pool] -= 1
+                self._completed[pool] += 1
+
+    async def run_io(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a remote I/O call (Gemini, Qdrant, geocoding) off the event loop"""
+        return await self.run(IO_POOL, func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run CPU-bound inference (YOLO, embeddings) off the event loop"""
+        return await self.run(CPU_POOL, func, *args, **kwargs)
+
+    async def run_image(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run an image transform in a worker process
+
+        Arguments and results are pickled; pass pixel buffers as shared memory
+        (see imaging.SharedImage) rather than arrays.
+        """
+        return await self.run(IMAGE_POOL, func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Current pool sizes and activity counters (queued: calls waiting for a free worker)"""
+        with self._lock:
+            return {
+                name: {
+                    "workers": self._sizes[name],
+                    "in_flight": self._in_flight[name],
+                    "queued": max(0, self._in_flight[name] - self._sizes[name]),
+                    "completed": self._completed[name],
+                }
+                for name in self._pools
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down all pools"""
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+
+_executors: Optional[DependencyExecutors] = None
+_executors_lock = threading.Lock()
+
+
+def get_executors() -> DependencyExecutors:
+    """Return the process-wide executor pools, creating them on first use"""
+    global _executors
+    if _executors is None:
+        with _executors_lock:
+            if _executors is None:
+                _executors = DependencyExecutors()
+    return _executors
+
+
+def shutdown_executors(wait: bool = True):
+    """Shut down the process-wide executor pools if they were created"""
+    global _executors
+    with _executors_lock:
+        if _executors is not None:
+            _executors.shutdown(wait=wait)
+            _executors = None
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a remote I/O call on the shared I/O pool"""
+    return await get_executors().run_io(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound inference on the shared CPU pool"""
+    return await get_executors().run_cpu(func, *args, **kwargs)
+
+
+async def run_image(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run an image transform on the shared image worker processes"""
+    return await get_executors().run_image(func, *args, **kwargs)
@@ -111,29 +111,65 @@ Important:
         Returns:
             Dict containing analysis results with metadata
         """
+        image_path_obj = Path(image_path)
         try:
             # Read and validate image
-            image_path_obj = Path(image_path)
             if not image_path_obj.exists():
                 raise FileNotFoundError(f"Image not found: {image_path}")
             
             # Read image data
             with open(image_path, 'rb') as f:
                 image_data = f.read()
+        except Exception as e:
+            print(f"❌ Error analyzing image: {e}")
+            return self._create_error_response(str(e), image_path)
+        
+        # Determine MIME type (normalize .jpg to .jpeg)
+        file_ext = image_path_obj.suffix[1:].lower()
+        if file_ext == 'jpg':
+            file_ext = 'jpeg'
+        
+        return self.analyze_trash_image_bytes(
+            image_data,
+            f"image/{file_ext}",
+            location=location,
+            user_notes=user_notes,
+            yolo_detections=yolo_detections,
+            image_name=image_path_obj.name
+        )
+    
+    def analyze_trash_image_bytes(
+        self,
+        image_data: bytes,
+        mime_type: str,
+        location: Optional[Dict[str, float]] = None,
+        user_notes: Optional[str] = None,
+        yolo_detections: Optional[List[Dict[str, Any]]] = None,
+        image_name: str = "upload"
+    ) -> Dict[str, Any]:
+        """
+        Analyze an in-memory trash image and return structured data
+        
+        Args:
+            image_data: Encoded image bytes (e.g. straight from the upload)
+            mime_type: MIME type of image_data (e.g. "image/jpeg")
+            location: Optional dict with 'lat' and 'lon' keys
+            user_notes: Optional user-provided context
+            yolo_detections: Optional YOLOv8 detection results for enhanced analysis
+            image_name: Name recorded in the analysis metadata
             
+        Returns:
+            Dict containing analysis results with metadata
+        """
+        response_text = ""
+        try:
             # Prepare prompt with YOLO context if available
             prompt = self._create_analysis_prompt(yolo_detections=yolo_detections)
             if user_notes:
                 prompt += f"\n\nUser notes: {user_notes}"
             
             # Call Gemini API
-            print(f"🔍 Analyzing image: {image_path_obj.name}...")
-            
-            # Determine MIME type (normalize .jpg to .jpeg)
-            file_ext = image_path_obj.suffix[1:].lower()
-            if file_ext == 'jpg':
-                file_ext = 'jpeg'
-            mime_type = f"image/{file_ext}"
+            print(f"🔍 Analyzing image: {image_name}...")
             
             # Create content with image
             response = self.model.generate_content([
@@ -160,7 +196,7 @@ Important:
             # Add metadata
             analysis['metadata'] = {
                 'analyzed_at': datetime.utcnow().isoformat(),
-                'image_name': image_path_obj.name,
+                'image_name': image_name,
                 'model_used': settings.gemini_model,
                 'location': location or {'lat': None, 'lon': None},
                 'user_notes': user_notes
@@ -173,11 +209,11 @@ Important:
         except json.JSONDecodeError as e:
             print(f"❌ Failed to parse Gemini response as JSON: {e}")
             print(f"Raw response: {response_text[:500]}")
-            return self._create_error_response("Failed to parse AI response", image_path)
+            return self._create_error_response("Failed to parse AI response", image_name)
             
         except Exception as e:
             print(f"❌ Error analyzing image: {e}")
-            return self._create_error_response(str(e), image_path)
+            return self._create_error_response(str(e), image_name)
     
     def _create_error_response(self, error: str, image_path: str) -> Dict[str, Any]:
         """Create a fallback response when analysis fails"""
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import io
 import random
@@ -10,6 +9,8 @@ from dataclasses import dataclass
 from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
+
+from executors import run_image, run_io
 import hashlib
 
 
@@ -50,32 +51,12 @@ class CampaignBannerGenerator:
     ) -> BannerResult:
         """Asynchronously generate a banner image and return a base64 data URL."""
 
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(  # type: ignore[arg-type]
-            None,
-            self._generate_banner_sync,
-            prompt,
-            negative_prompt,
-            aspect_ratio,
-        )
-
-    def _generate_banner_sync(
-        self,
-        prompt: str,
-        negative_prompt: Optional[str],
-        aspect_ratio: str,
-    ) -> BannerResult:
         if not prompt:
             raise ValueError("Prompt is required for banner generation")
 
-        response = self._invoke_image_generation(prompt, negative_prompt, aspect_ratio)
-        try:
-            image_payload = self._extract_first_image_payload(response)
-        except RuntimeError as exc:
-            raise RuntimeError("Imagen response did not include image data") from exc
-
-        image_bytes = self._extract_image_bytes(image_payload)
-        optimized_bytes = self._optimise_banner_bytes(image_bytes)
+        image_bytes = await run_io(self._fetch_banner_bytes, prompt, negative_prompt, aspect_ratio)
+        # Resize and re-encode in an image worker process
+        optimized_bytes = await run_image(CampaignBannerGenerator._optimise_banner_bytes, image_bytes)
         base64_payload = base64.b64encode(optimized_bytes).decode("utf-8")
         data_url = f"data:image/jpeg;base64,{base64_payload}"
 
@@ -86,6 +67,20 @@ class CampaignBannerGenerator:
             negative_prompt=negative_prompt,
         )
 
+    def _fetch_banner_bytes(
+        self,
+        prompt: str,
+        negative_prompt: Optional[str],
+        aspect_ratio: str,
+    ) -> bytes:
+        response = self._invoke_image_generation(prompt, negative_prompt, aspect_ratio)
+        try:
+            image_payload = self._extract_first_image_payload(response)
+        except RuntimeError as exc:
+            raise RuntimeError("Imagen response did not include image data") from exc
+
+        return self._extract_image_bytes(image_payload)
+
     def _invoke_image_generation(
         self,
         prompt: str,
@@ -0,0 +1,439 @@
+"""
+In-memory image handling for uploads
+An upload is decoded once, at reduced size when it is larger than any consumer
+needs (JPEG draft mode decodes straight to 1/2, 1/4 or 1/8 scale), into
+right-sized variants for YOLO detection/annotation and for Gemini, so the
+request path never writes or re-reads the image on disk
+
+These transforms run in the image worker processes (executors.run_image);
+decoded pixels are handed between processes in shared memory (SharedImage)
+"""
+
+import io
+import math
+import weakref
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import cv2
+import numpy as np
+from fastapi import HTTPException
+from PIL import Image, ImageOps
+
+# Upload formats Gemini accepts as-is; anything else is sent re-encoded as JPEG
+GEMINI_MIME_TYPES = ("image/jpeg", "image/png", "image/webp", "image/heic", "image/heif")
+
+# EXIF orientations that swap width and height
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+class ImageTooLarge(ValueError):
+    """Upload over the configured byte or pixel budget"""
+
+
+def sniff_image_mime_type(content: bytes) -> Optional[str]:
+    """MIME type of an image from its magic bytes (None if unrecognized)"""
+    if content.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if content.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    if content[4:8] == b"ftyp":
+        brand = content[8:12]
+        if brand in (b"heic", b"heix", b"heim", b"heis"):
+            return "image/heic"
+        if brand in (b"mif1", b"msf1", b"heif"):
+            return "image/heif"
+        if brand in (b"avif", b"avis"):
+            return "image/avif"
+    if content[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return None
+
+
+def _fit(image: Image.Image, max_side: Optional[int]) -> Image.Image:
+    """Downscale so the long side is at most max_side (reduce() first for large factors)"""
+    width, height = image.size
+    if not max_side or max(width, height) <= max_side:
+        return image
+    scale = max_side / max(width, height)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def _open_reduced(content: bytes, max_side: Optional[int], max_pixels: Optional[int]) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Decode an upload with PIL at no more than about max_side on its long side
+
+    Returns:
+        (upright RGB image, original (width, height) after EXIF orientation)
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        # Only the header has been read so far: check the budget before decoding anything
+        width, height = image.size
+        if max_pixels and width * height > max_pixels:
+            raise ImageTooLarge(
+                f"Image is {width}x{height} ({width * height / 1e6:.1f} MP), the limit is {max_pixels / 1e6:.1f} MP"
+            )
+        if image.getexif().get(0x0112) in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+
+        if max_side and image.format == "JPEG" and max(width, height) > max_side:
+            # DCT-domain downscale to the smallest 1/2, 1/4 or 1/8 scale still at least the target size
+            scale = max_side / max(width, height)
+            image.draft("RGB", (math.ceil(image.size[0] * scale), math.ceil(image.size[1] * scale)))
+        upright = ImageOps.exif_transpose(image).convert("RGB")
+    return _fit(upright, max_side), (width, height)
+
+
+def _to_bgr(image: Image.Image, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """BGR copy of an RGB image, written into `out` when given"""
+    rgb = np.asarray(image)
+    if out is None:
+        return np.ascontiguousarray(rgb[:, :, ::-1])
+    np.copyto(out, rgb[:, :, ::-1])
+    return out
+
+
+@dataclass(frozen=True)
+class SharedImageRef:
+    """Picklable handle of an image array in a shared memory block"""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str = "|u1"
+
+
+class SharedImage:
+    """
+    Image array backed by a named shared memory block
+
+    Worker processes attach to the block by name, so pixel buffers cross the
+    process boundary as a SharedImageRef instead of being pickled and copied.
+    Blocks are allocated and unlinked by the requesting process, so a worker
+    call that fails or is abandoned never leaves one behind.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str = "|u1"):
+        self._block = block
+        self.ref = SharedImageRef(block.name, tuple(shape), np.dtype(dtype).str)
+        self.array: Optional[np.ndarray] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        # Unmap only once the array and every view of it (which all reference it) are gone,
+        # e.g. after a model drops its last input batch
+        weakref.finalize(self.array, block.close)
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype: str = "|u1") -> "SharedImage":
+        """Allocate a new block for an array of this shape"""
+        size = max(1, math.prod(shape) * np.dtype(dtype).itemsize)
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype)
+
+    @classmethod
+    def attach(cls, ref: SharedImageRef) -> "SharedImage":
+        """Map an existing block"""
+        return cls(shared_memory.SharedMemory(name=ref.name), ref.shape, ref.dtype)
+
+    @classmethod
+    def from_array(cls, pixels: np.ndarray) -> "SharedImage":
+        """Copy an array into a new block"""
+        shared = cls.create(pixels.shape, pixels.dtype.str)
+        np.copyto(shared.array, pixels)
+        return shared
+
+    def close(self):
+        """Drop this handle's array; the block is unmapped once no views of it remain"""
+        self.array = None
+
+    def unlink(self):
+        """Unmap and free the block"""
+        self.close()
+        self._block.unlink()
+
+    def __enter__(self) -> "SharedImage":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.unlink()
+
+
+def detection_block(max_side: int) -> SharedImage:
+    """Shared block that fits a detection image of up to max_side pixels a side (see prepare_upload)"""
+    return SharedImage.create((max_side, max_side, 3))
+
+
+def decode_image(content: bytes) -> np.ndarray:
+    """
+    Decode uploaded bytes at full resolution into a BGR uint8 array (OpenCV/YOLO layout)
+
+    PIL is tried first for its wider format support (AVIF, HEIC, WebP, ... with
+    the matching plugins), then OpenCV. EXIF orientation is applied.
+
+    Raises:
+        ValueError: If neither can decode the bytes
+    """
+    try:
+        image, _ = _open_reduced(content, None, None)
+        return _to_bgr(image)
+    except Exception as pil_error:
+        pixels = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if pixels is None:
+            raise ValueError(f"Unsupported or corrupt image: {pil_error}")
+        return pixels
+
+
+def encode_jpeg(pixels: np.ndarray, quality: int = 90) -> bytes:
+    """Encode a BGR array as JPEG bytes"""
+    ok, buffer = cv2.imencode(".jpg", pixels, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+@dataclass
+class PreparedUpload:
+    """An upload decoded once, with a right-sized variant per consumer"""
+
+    original_size: Tuple[int, int]  # (width, height), upright
+    detection_image: Optional[np.ndarray]  # BGR, for YOLO and annotation
+    gemini_data: Optional[bytes]
+    gemini_mime_type: Optional[str]
+    # Set instead of detection_image when prepared with shared=True, until attach()
+    detection_ref: Optional[SharedImageRef] = None
+    _shared: Optional[SharedImage] = field(default=None, repr=False, compare=False)
+    _released: bool = field(default=False, repr=False, compare=False)
+
+    @property
+    def detection_scale(self) -> float:
+        """Original pixels per detection-image pixel"""
+        if self.detection_ref is not None:
+            return self.original_size[0] / self.detection_ref.shape[1]
+        if self.detection_image is None:
+            return 1.0
+        return self.original_size[0] / self.detection_image.shape[1]
+
+    def attach(self) -> "PreparedUpload":
+        """Map a shared detection image into this process as detection_image"""
+        if self.detection_ref is not None and self._shared is None:
+            self._shared = SharedImage.attach(self.detection_ref)
+            self.detection_image = self._shared.array
+        return self
+
+    def release(self):
+        """Free the shared detection image, if any (detection_image is no longer usable)"""
+        if self.detection_ref is None or self._released:
+            return
+        shared = self._shared or SharedImage.attach(self.detection_ref)
+        self._shared = None
+        self._released = True
+        self.detection_image = None
+        shared.unlink()
+
+    def to_original_coordinates(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copies of detections on the detection image with bboxes in original-image pixels"""
+        scale = self.detection_scale
+        if scale == 1.0:
+            return detections
+        return [
+            {**detection, 'bbox': {key: value * scale for key, value in detection['bbox'].items()}}
+            for detection in detections
+        ]
+
+
+def prepare_upload(
+    content: bytes,
+    detection_max_side: Optional[int],
+    gemini_max_side: Optional[int],
+    max_pixels: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    gemini_quality: int = 85,
+    shared: Optional[SharedImageRef] = None
+) -> PreparedUpload:
+    """
+    Decode an upload once into the variants the request needs
+
+    JPEGs are decoded in draft mode directly at about the largest size needed,
+    so a 48 MP photo never exists in memory at full resolution; other formats
+    are decoded fully and reduced.
+
+    Args:
+        content: Uploaded bytes
+        detection_max_side: Long side of the YOLO/annotation variant (None: not needed)
+        gemini_max_side: Long side of the Gemini variant (None: not needed)
+        max_pixels: Reject images with more pixels than this (checked before decoding)
+        max_bytes: Reject uploads larger than this
+        gemini_quality: JPEG quality of a re-encoded Gemini variant
+        shared: Block from detection_block(detection_max_side) to write the
+            detection image into, returned as detection_ref (for calls from a
+            worker process; see PreparedUpload.attach). The caller owns the block.
+
+    Returns:
+        PreparedUpload. Gemini gets the upload unchanged when its format is
+        accepted and it is no larger than gemini_max_side.
+
+    Raises:
+        ImageTooLarge: Over the byte or pixel budget
+        ValueError: If the upload cannot be decoded
+    """
+    if max_bytes and len(content) > max_bytes:
+        raise ImageTooLarge(f"Upload is {len(content) / 1e6:.1f} MB, the limit is {max_bytes / 1e6:.1f} MB")
+
+    sides = [side for side in (detection_max_side, gemini_max_side) if side]
+    try:
+        image, original_size = _open_reduced(content, max(sides) if sides else None, max_pixels)
+    except ImageTooLarge:
+        raise
+    except Exception as pil_error:
+        pixels = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if pixels is None:
+            raise ValueError(f"Unsupported or corrupt image: {pil_error}")
+        height, width = pixels.shape[:2]
+        if max_pixels and width * height > max_pixels:
+            raise ImageTooLarge(f"Image is {width}x{height}, the limit is {max_pixels / 1e6:.1f} MP")
+        original_size = (width, height)
+        image = _fit(Image.fromarray(pixels[:, :, ::-1]), max(sides) if sides else None)
+
+    detection_image = detection_ref = None
+    if detection_max_side:
+        variant = _fit(image, detection_max_side)
+        if shared is not None:
+            detection_ref = SharedImageRef(shared.name, (variant.height, variant.width, 3), shared.dtype)
+            if math.prod(detection_ref.shape) > math.prod(shared.shape):
+                raise ValueError(f"Detection image {variant.width}x{variant.height} does not fit the shared block")
+            block = SharedImage.attach(detection_ref)
+            _to_bgr(variant, block.array)
+            block.close()
+        else:
+            detection_image = _to_bgr(variant)
+
+    gemini_data = gemini_mime_type = None
+    if gemini_max_side:
+        mime_type = sniff_image_mime_type(content)
+        if mime_type in GEMINI_MIME_TYPES and max(original_size) <= gemini_max_side:
+            gemini_data, gemini_mime_type = content, mime_type
+        else:
+            buffer = io.BytesIO()
+            _fit(image, gemini_max_side).save(buffer, "JPEG", quality=gemini_quality)
+            gemini_data, gemini_mime_type = buffer.getvalue(), "image/jpeg"
+
+    return PreparedUpload(
+        original_size=original_size,
+        detection_image=detection_image,
+        gemini_data=gemini_data,
+        gemini_mime_type=gemini_mime_type,
+        detection_ref=detection_ref
+    )
+
+
+def draw_detections(
+    image: np.ndarray,
+    detections: List[Dict[str, Any]],
+    colors: Mapping[str, Tuple[int, int, int]]
+) -> np.ndarray:
+    """
+    Draw bounding boxes and labels on a copy of a BGR image
+
+    Args:
+        image: BGR image array
+        detections: Detections with bbox, class and confidence (see WasteDetector.detect)
+        colors: BGR color per class (white for others)
+
+    Returns:
+        Annotated BGR image array
+    """
+    img = image.copy()
+
+    for det in detections:
+        bbox = det['bbox']
+        class_name = det['class']
+        color = colors.get(class_name, (255, 255, 255))
+
+        x1, y1 = int(bbox['x1']), int(bbox['y1'])
+        x2, y2 = int(bbox['x2']), int(bbox['y2'])
+        cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+
+        # Label on a filled background above the box
+        label = f"{class_name} {det['confidence']:.2f}"
+        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+        cv2.rectangle(img, (x1, y1 - label_size[1] - 10), (x1 + label_size[0], y1), color, -1)
+        cv2.putText(img, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
+
+    return img
+
+
+def annotate_shared_jpeg(
+    ref: SharedImageRef,
+    detections: List[Dict[str, Any]],
+    colors: Mapping[str, Tuple[int, int, int]],
+    quality: int = 90
+) -> bytes:
+    """Annotated JPEG of a shared image (for worker processes; the block is left in place)"""
+    shared = SharedImage.attach(ref)
+    try:
+        return encode_jpeg(draw_detections(shared.array, detections, colors), quality)
+    finally:
+        shared.close()
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware rejecting oversized request bodies on upload endpoints
+
+    A declared Content-Length over the limit is answered with 413 before any of
+    the body is read; chunked bodies are counted as they stream in and
+    abandoned with 413 as soon as they pass the limit.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        limits: Mapping[str, int],
+        on_reject: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI app
+            limits: Exact request path -> maximum body size in bytes
+            on_reject: Called with the path of each rejected request
+        """
+        self.app = app
+        self.limits = dict(limits)
+        self.on_reject = on_reject
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body is larger than {limit / 1e6:.1f} MB"
+        declared = dict(scope.get("headers") or []).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            if self.on_reject:
+                self.on_reject(scope["path"])
+            await send({
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json"), (b"connection", b"close")],
+            })
+            await send({"type": "http.response.body", "body": b'{"detail": "%s"}' % detail.encode()})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    if self.on_reject:
+                        self.on_reject(scope["path"])
+                    # Re-raised by FastAPI's body parsing and answered by its exception handler
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,219 @@
+"""
+Lightweight in-process metrics for EcoSynk AI Services
+Histograms and counters exposed through the /metrics endpoint
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts, Prometheus-style bounds)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize the histogram
+
+        Args:
+            buckets: Upper bounds of the buckets, in ascending order
+        """
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record a single observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return count, sum, mean and cumulative bucket counts"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[f"le_{bound:g}"] = running
+        cumulative["le_inf"] = running + counts[-1]
+
+        return {
+            "count": total,
+            "sum": round(value_sum, 4),
+            "mean": round(value_sum / total, 4) if total else 0.0,
+            "buckets": cumulative,
+        }
+
+
+# Response body sizes in bytes
+RESPONSE_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class ResponseSizeStats:
+    """Response body size histograms per endpoint and variant (e.g. payload projection)"""
+
+    def __init__(self, buckets: Sequence[float] = RESPONSE_SIZE_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, variant: str, size_bytes: int):
+        """Record the size of one response"""
+        with self._lock:
+            variants = self._histograms.setdefault(endpoint, {})
+            histogram = variants.get(variant)
+            if histogram is None:
+                histogram = variants[variant] = Histogram(self.buckets)
+        histogram.observe(size_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size histograms as {endpoint: {variant: snapshot}}"""
+        with self._lock:
+            endpoints = {endpoint: dict(variants) for endpoint, variants in self._histograms.items()}
+        return {
+            endpoint: {variant: histogram.snapshot() for variant, histogram in variants.items()}
+            for endpoint, variants in endpoints.items()
+        }
+
+
+class ResponseSizeMiddleware:
+    """
+    ASGI middleware recording successful response body sizes for selected paths
+
+    Counts bytes as they are sent, so responses are never buffered.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        stats: ResponseSizeStats,
+        paths: Sequence[str],
+        variant: Callable[[Dict[str, Any]], str] = lambda scope: "all"
+    ):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI app
+            stats: Where sizes are recorded
+            paths: Exact request paths to measure
+            variant: Variant label for a request, from its ASGI scope
+        """
+        self.app = app
+        self.stats = stats
+        self.paths = frozenset(paths)
+        self.variant = variant
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 0
+        size = 0
+
+        async def measured_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if not message.get("more_body", False) and 200 <= status < 300:
+                    self.stats.observe(scope["path"], self.variant(scope), size)
+            await send(message)
+
+        await self.app(scope, receive, measured_send)
+
+
+# Image preparation time in milliseconds
+UPLOAD_PREPARE_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class UploadStats:
+    """Per-request image upload sizes, preparation time and rejections"""
+
+    def __init__(
+        self,
+        size_buckets: Sequence[float] = RESPONSE_SIZE_BUCKETS,
+        time_buckets: Sequence[float] = UPLOAD_PREPARE_MS_BUCKETS
+    ):
+        self.upload_bytes = Histogram(size_buckets)
+        self.gemini_bytes = Histogram(size_buckets)
+        self.prepare_ms = Histogram(time_buckets)
+        self._rejected: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, upload_bytes: int, gemini_bytes: int, prepare_ms: float):
+        """Record one prepared upload"""
+        self.upload_bytes.observe(upload_bytes)
+        self.gemini_bytes.observe(gemini_bytes)
+        self.prepare_ms.observe(prepare_ms)
+
+    def reject(self, reason: str):
+        """Count an upload rejected for `reason`"""
+        with self._lock:
+            self._rejected[reason] = self._rejected.get(reason, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rejected = dict(self._rejected)
+        return {
+            "upload_bytes": self.upload_bytes.snapshot(),
+            "gemini_bytes": self.gemini_bytes.snapshot(),
+            "prepare_ms": self.prepare_ms.snapshot(),
+            "rejected": rejected,
+        }
+
+
+class MetricsRegistry:
+    """Named collection of metric providers reported together"""
+
+    def __init__(self):
+        self._providers: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, provider: Any):
+        """
+        Register a metrics provider
+
+        Args:
+            name: Section name in the metrics report
+            provider: Object with a stats() method or a zero-argument callable
+        """
+        with self._lock:
+            self._providers[name] = provider
+
+    def unregister(self, name: str):
+        """Remove a metrics provider if present"""
+        with self._lock:
+            self._providers.pop(name, None)
+
+    def report(self, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Collect stats from every (or the selected) registered provider"""
+        with self._lock:
+            providers = dict(self._providers)
+
+        report: Dict[str, Any] = {}
+        for name, provider in providers.items():
+            if names is not None and name not in names:
+                continue
+            try:
+                report[name] = provider.stats() if hasattr(provider, "stats") else provider()
+            except Exception as e:  # noqa: BLE001 - a broken provider must not break /metrics
+                report[name] = {"error": str(e)}
+        return report
+
+
+# Global registry used by the API server
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,128 @@
+"""
+Payload projection for list and search endpoints
+Turns the `fields=` query parameter into a Qdrant with_payload selector so only
+the requested payload fields are read from Qdrant and sent to the client
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from qdrant_client.models import PayloadSelectorExclude
+
+# Never returned, whatever the projection
+PRIVATE_FIELDS = ("password_hash",)
+
+# Compact default projections (what the frontend reads); "fields=*" returns the full payload
+REPORT_FIELDS = (
+    "report_id", "timestamp", "user_id", "location", "location_name",
+    "primary_material", "estimated_volume", "specific_items", "description",
+    "cleanup_priority_score", "environmental_risk_level", "recyclable",
+    "recommended_equipment", "confidence_score",
+    # Legacy reports keep these under the nested analysis metadata; v2 reports rebuild them from top-level fields
+    "metadata.analyzed_at", "metadata.location",
+)
+VOLUNTEER_FIELDS = (
+    "user_id", "name", "username", "bio", "profile_picture_url", "location",
+    "available", "skills", "experience_level", "materials_expertise", "specializations",
+    "equipment_owned", "past_cleanup_count", "hours_contributed", "badge",
+    "impact_points", "activity_streak", "total_items_removed", "co2_saved", "created_at",
+)
+LEADERBOARD_FIELDS = ("user_id", "name", "past_cleanup_count", "experience_level", "specializations", "available")
+
+_FIELD_RE = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+
+def _top_level(paths: Sequence[str]) -> set:
+    return {path.split(".", 1)[0] for path in paths}
+
+
+class Projection:
+    """Parsed `fields=` parameter: which payload fields to fetch and return"""
+
+    def __init__(self, include: Optional[Sequence[str]] = None, exclude: Sequence[str] = (), label: str = "default"):
+        """
+        Initialize the projection
+
+        Args:
+            include: Payload fields to return (None = the full payload)
+            exclude: Fields dropped from the full payload (only used when include is None)
+            label: "default", "custom" or "full", for response-size metrics
+        """
+        self.include = None if include is None else [field for field in dict.fromkeys(include) if field not in PRIVATE_FIELDS]
+        self.exclude = list(dict.fromkeys(exclude))
+        self.label = label
+
+    @property
+    def spec(self) -> str:
+        """Canonical form, e.g. for cache keys"""
+        if self.include is None:
+            return "*" + "".join(f",-{field}" for field in sorted(self.exclude))
+        return ",".join(sorted(self.include))
+
+    def selector(self, required: Sequence[str] = ()) -> Union[List[str], PayloadSelectorExclude]:
+        """
+        with_payload value for Qdrant
+
+        Args:
+            required: Fields the endpoint reads itself (distance, ordering, ...),
+                fetched even if not requested; trim() removes them again
+        """
+        if self.include is None:
+            return PayloadSelectorExclude(exclude=[
+                *PRIVATE_FIELDS, *(field for field in self.exclude if field not in required)
+            ])
+        return list(dict.fromkeys([*self.include, *required]))
+
+    def trim(self, payload: Dict[str, Any], required: Sequence[str] = ()) -> Dict[str, Any]:
+        """Copy of a fetched payload without the fields that were only fetched because they were required"""
+        if self.include is None:
+            extra = _top_level([field for field in self.exclude if field in required])
+        else:
+            extra = _top_level(required) - _top_level(self.include)
+        extra.update(PRIVATE_FIELDS)
+        return {key: value for key, value in payload.items() if key not in extra}
+
+
+def parse_fields(fields: Optional[str], default: Sequence[str]) -> Projection:
+    """
+    Parse a `fields=` query parameter
+
+    Args:
+        fields: Comma-separated payload fields ("report_id,location,metadata.analyzed_at");
+            "*" returns the full payload, and "-name" entries (with no plain ones)
+            drop fields from it. None or empty selects the endpoint default.
+        default: The endpoint's compact default projection
+
+    Returns:
+        Projection
+
+    Raises:
+        ValueError: For malformed field names
+    """
+    tokens = [token.strip() for token in (fields or "").split(",") if token.strip()]
+    if not tokens:
+        return Projection(include=default, label="default")
+
+    include: List[str] = []
+    exclude: List[str] = []
+    full = False
+    for token in tokens:
+        if token == "*":
+            full = True
+            continue
+        name = token[1:] if token.startswith("-") else token
+        if not _FIELD_RE.match(name):
+            raise ValueError(f"Invalid field name: {token!r}")
+        (exclude if token.startswith("-") else include).append(name)
+
+    if include and not full:
+        return Projection(include=include, label="custom")
+    return Projection(exclude=exclude, label="full" if full and not exclude else "custom")
+
+
+def projection_label(fields: Optional[str]) -> str:
+    """Metrics label for a raw `fields=` value without validating it"""
+    tokens = [token.strip() for token in (fields or "").split(",") if token.strip()]
+    if not tokens:
+        return "default"
+    return "full" if tokens == ["*"] else "custom"
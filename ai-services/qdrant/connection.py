@@ -0,0 +1,434 @@
+"""
+Shared Qdrant connection layer for EcoSynk
+One pooled client pair (sync + async, HTTP/2 REST or gRPC) used by every service,
+or an embedded local Qdrant (in-memory or on disk) when QDRANT_LOCAL_PATH is set
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from config import settings
+from executors import run_io
+from metrics import Histogram
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Request latency buckets (milliseconds)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Client methods that are not Qdrant requests
+_UNTRACKED_METHODS = {"close"}
+
+# qdrant_client disables keep-alive for these hosts; so do we
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def parse_operation_timeouts(spec: str) -> Dict[str, int]:
+    """
+    Parse per-operation timeouts from "operation=seconds" pairs
+
+    Args:
+        spec: Comma-separated pairs, e.g. "query_points=10,scroll=30"
+
+    Returns:
+        Dict of client method name -> timeout in seconds
+    """
+    timeouts: Dict[str, int] = {}
+    for pair in (spec or "").split(","):
+        name, _, seconds = pair.partition("=")
+        if not name.strip() or not seconds.strip():
+            continue
+        try:
+            timeouts[name.strip()] = max(1, int(float(seconds)))
+        except ValueError:
+            print(f"⚠️  Ignoring invalid Qdrant timeout '{pair.strip()}'")
+    return timeouts
+
+
+class ConnectionStats:
+    """Per-operation request latency plus HTTP connection reuse counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._streams = weakref.WeakSet()
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def observe(self, operation: str, elapsed_ms: float, failed: bool):
+        """Record one client call"""
+        with self._lock:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = Histogram(LATENCY_BUCKETS_MS)
+            if failed:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+        histogram.observe(elapsed_ms)
+
+    def observe_response(self, response: httpx.Response):
+        """Count whether a REST response came over a new or a reused connection"""
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        with self._lock:
+            if stream in self._streams:
+                self.reused_connections += 1
+            else:
+                self._streams.add(stream)
+                self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Connection reuse ratio and per-operation latency/error counts"""
+        with self._lock:
+            operations = dict(self._latency)
+            errors = dict(self._errors)
+            new, reused = self.new_connections, self.reused_connections
+
+        total = new + reused
+        return {
+            "connections": {
+                "opened": new,
+                "reused": reused,
+                "reuse_ratio": round(reused / total, 4) if total else 0.0,
+            },
+            "operations": {
+                name: {**histogram.snapshot(), "errors": errors.get(name, 0)}
+                for name, histogram in sorted(operations.items())
+            },
+        }
+
+
+class InstrumentedClient:
+    """
+    Proxy around a QdrantClient or AsyncQdrantClient
+
+    Applies the configured per-operation timeout (as the call's `timeout`
+    argument, unless the caller passes one) and records every call's latency.
+    Everything else is delegated to the wrapped client.
+    """
+
+    def __init__(self, client: Any, stats: ConnectionStats, timeouts: Dict[str, int]):
+        self._client = client
+        self._stats = stats
+        self._timeouts = timeouts
+        self._wrapped: Dict[str, Callable] = {}
+
+    @property
+    def wrapped_client(self) -> Any:
+        """The underlying qdrant_client instance"""
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if name.startswith("_") or name in _UNTRACKED_METHODS or not callable(attribute):
+            return attribute
+        wrapped = self._wrapped.get(name)
+        if wrapped is None:
+            wrapped = self._wrapped[name] = self._instrument(name, attribute)
+        return wrapped
+
+    def _instrument(self, name: str, method: Callable) -> Callable:
+        timeout = self._timeouts.get(name)
+        try:
+            takes_timeout = timeout is not None and "timeout" in inspect.signature(method).parameters
+        except (TypeError, ValueError):
+            takes_timeout = False
+        stats = self._stats
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def call_async(*args, **kwargs):
+                if takes_timeout and kwargs.get("timeout") is None:
+                    kwargs["timeout"] = timeout
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await method(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    stats.observe(name, (time.perf_counter() - start) * 1000, failed)
+            return call_async
+
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            if takes_timeout and kwargs.get("timeout") is None:
+                kwargs["timeout"] = timeout
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.observe(name, (time.perf_counter() - start) * 1000, failed)
+        return call
+
+
+class LocalClient:
+    """
+    Embedded QdrantClient (":memory:" or a storage path) made safe to share
+
+    The local engine keeps its points in plain Python structures, so calls
+    are serialized with a lock (the store's batch upserts and the I/O pool
+    call it from several threads).
+    """
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        return call
+
+
+class AsyncLocalClient:
+    """
+    Async view of a LocalClient
+
+    A second embedded client would not see the first one's data (and cannot
+    open the same path), so async callers share the sync engine and run its
+    calls on the I/O pool.
+    """
+
+    def __init__(self, client: LocalClient):
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await run_io(attribute, *args, **kwargs)
+        return call
+
+    async def close(self):
+        """The shared engine is closed with the sync client"""
+
+
+class QdrantConnectionFactory:
+    """Owns the pooled Qdrant clients shared by the vector store, UserService and CampaignManager"""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        prefer_grpc: Optional[bool] = None,
+        grpc_port: Optional[int] = None,
+        http2: Optional[bool] = None,
+        pool_size: Optional[int] = None,
+        keepalive_seconds: Optional[float] = None,
+        timeout: Optional[int] = None,
+        operation_timeouts: Optional[Dict[str, int]] = None,
+        local_path: Optional[str] = None
+    ):
+        """
+        Configure the connection (clients are created on first use)
+
+        Args:
+            url: Qdrant cluster URL (uses settings if not provided)
+            api_key: Qdrant API key (uses settings if not provided)
+            prefer_grpc: Use gRPC for every operation that supports it
+            grpc_port: gRPC port of the cluster
+            http2: Use HTTP/2 for REST requests (needs the `h2` package)
+            pool_size: Maximum pooled REST connections per client
+            keepalive_seconds: Idle time before a pooled connection (or gRPC ping) expires
+            timeout: Default request timeout in seconds
+            operation_timeouts: Per client method timeouts in seconds (e.g. {"query_points": 10})
+            local_path: ":memory:" or a storage directory for an embedded Qdrant
+                (uses settings if not provided; "" forces the remote cluster)
+        """
+        self.url = url or settings.qdrant_url
+        self.api_key = api_key or settings.qdrant_api_key
+        self.prefer_grpc = settings.qdrant_prefer_grpc if prefer_grpc is None else prefer_grpc
+        self.grpc_port = grpc_port or settings.qdrant_grpc_port
+        self.http2 = settings.qdrant_http2 if http2 is None else http2
+        self.pool_size = pool_size or settings.qdrant_pool_size
+        self.keepalive_seconds = settings.qdrant_keepalive_seconds if keepalive_seconds is None else keepalive_seconds
+        self.timeout = timeout or settings.qdrant_timeout
+        self.operation_timeouts = (
+            parse_operation_timeouts(settings.qdrant_operation_timeouts)
+            if operation_timeouts is None else dict(operation_timeouts)
+        )
+        self.local_path = settings.qdrant_local_path if local_path is None else local_path
+
+        if self.http2 and not HTTP2_AVAILABLE:
+            print("⚠️  HTTP/2 requested for Qdrant but the 'h2' package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+        self.connection_stats = ConnectionStats()
+        self._client: Optional[InstrumentedClient] = None
+        self._aclient: Optional[InstrumentedClient] = None
+        self._local: Optional[LocalClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_local(self) -> bool:
+        """Whether this connection runs an embedded Qdrant instead of calling a cluster"""
+        return bool(self.local_path)
+
+    @property
+    def location(self) -> str:
+        """Cluster URL, or the embedded storage location"""
+        return f"local:{self.local_path}" if self.is_local else self.url
+
+    @property
+    def transport(self) -> str:
+        """Transport used for requests: local, grpc, http2 or http1.1"""
+        if self.is_local:
+            return "local"
+        if self.prefer_grpc:
+            return "grpc"
+        return "http2" if self.http2 else "http1.1"
+
+    @property
+    def keepalive_enabled(self) -> bool:
+        """Whether idle REST connections are kept in the pool"""
+        return self.keepalive_seconds > 0 and urlparse(self.url).hostname not in _LOCAL_HOSTS
+
+    def _client_kwargs(self, asynchronous: bool) -> Dict[str, Any]:
+        stats = self.connection_stats
+        if asynchronous:
+            async def on_response(response):
+                stats.observe_response(response)
+        else:
+            on_response = stats.observe_response
+
+        kwargs: Dict[str, Any] = {
+            "url": self.url,
+            "api_key": self.api_key,
+            "timeout": self.timeout,
+            "prefer_grpc": self.prefer_grpc,
+            "grpc_port": self.grpc_port,
+            "http2": self.http2,
+            "limits": httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size if self.keepalive_enabled else 0,
+                keepalive_expiry=self.keepalive_seconds
+            ),
+            "event_hooks": {"response": [on_response]},
+        }
+        if self.prefer_grpc:
+            kwargs["grpc_options"] = {
+                "grpc.keepalive_time_ms": int(self.keepalive_seconds * 1000),
+                "grpc.keepalive_permit_without_calls": 1,
+            }
+        return kwargs
+
+    def _local_client(self) -> LocalClient:
+        # Called with self._lock held
+        if self._local is None:
+            if self.local_path == ":memory:":
+                engine = QdrantClient(location=":memory:")
+            else:
+                os.makedirs(self.local_path, exist_ok=True)
+                engine = QdrantClient(path=self.local_path)
+            self._local = LocalClient(engine)
+            print(f"✅ Embedded Qdrant ready at {self.location}")
+        return self._local
+
+    @property
+    def client(self) -> InstrumentedClient:
+        """Shared synchronous client"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if self.is_local:
+                        raw = self._local_client()
+                    else:
+                        raw = QdrantClient(**self._client_kwargs(asynchronous=False))
+                        print(f"✅ Qdrant client ready ({self.transport}, pool={self.pool_size}) at {self.url}")
+                    self._client = InstrumentedClient(raw, self.connection_stats, self.operation_timeouts)
+        return self._client
+
+    @property
+    def aclient(self) -> InstrumentedClient:
+        """Shared AsyncQdrantClient (for callers on the event loop)"""
+        if self._aclient is None:
+            with self._lock:
+                if self._aclient is None:
+                    if self.is_local:
+                        raw = AsyncLocalClient(self._local_client())
+                    else:
+                        raw = AsyncQdrantClient(**self._client_kwargs(asynchronous=True))
+                    self._aclient = InstrumentedClient(raw, self.connection_stats, self.operation_timeouts)
+        return self._aclient
+
+    def stats(self) -> Dict[str, Any]:
+        """Transport settings, connection reuse and per-operation latency"""
+        return {
+            "transport": self.transport,
+            "location": self.location,
+            "pool_size": self.pool_size,
+            "keepalive_seconds": self.keepalive_seconds if self.keepalive_enabled else 0,
+            **self.connection_stats.snapshot(),
+        }
+
+    def close(self):
+        """Close the sync client (the async one needs aclose) and any embedded engine"""
+        with self._lock:
+            client, self._client = self._client, None
+            local, self._local = self._local, None
+        if client is not None:
+            client.close()
+        elif local is not None:
+            local.close()
+
+    async def aclose(self):
+        """Close both clients"""
+        with self._lock:
+            aclient, self._aclient = self._aclient, None
+        if aclient is not None:
+            await aclient.close()
+        self.close()
+
+
+_connection: Optional[QdrantConnectionFactory] = None
+_connection_lock = threading.Lock()
+
+
+def get_qdrant_connection() -> QdrantConnectionFactory:
+    """Return the process-wide Qdrant connection, creating it on first use"""
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                _connection = QdrantConnectionFactory()
+    return _connection
+
+
+async def close_qdrant_connection():
+    """Close the process-wide Qdrant connection if it was created"""
+    global _connection
+    with _connection_lock:
+        connection, _connection = _connection, None
+    if connection is not None:
+        await connection.aclose()
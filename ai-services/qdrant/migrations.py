@@ -0,0 +1,677 @@
+"""
+One-off data migrations for EcoSynk Qdrant collections
+
+Usage:
+    python ai-services/qdrant/migrations.py backfill-report-fields [--batch-size 256] [--dry-run]
+    python ai-services/qdrant/migrations.py deterministic-ids [--batch-size 256] [--dry-run]
+    python ai-services/qdrant/migrations.py apply-tuning [--collection NAME ...] [--wait] [--dry-run]
+    python ai-services/qdrant/migrations.py enable-hybrid [--batch-size 256] [--dry-run]
+    python ai-services/qdrant/migrations.py compact-reports [--batch-size 256] [--dry-run]
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client.models import (
+    BinaryQuantization, CollectionStatus, CreateAlias, CreateAliasOperation, DeleteAlias, DeleteAliasOperation,
+    OverwritePayloadOperation, PointStruct, PointVectors, ScalarQuantization, SetPayload, SetPayloadOperation
+)
+
+from config import settings
+from embeddings.sparse import document_sparse_vector, report_sparse_text
+from qdrant.vector_store import (
+    EcoSynkVectorStore,
+    TIMESTAMP_EPOCH_FIELD,
+    UNKNOWN_TIMESTAMP_EPOCH,
+    collection_aliases,
+    has_report_sparse_vector,
+    normalize_report_location,
+    point_id_for,
+    report_sparse_vectors_config,
+    timestamp_to_epoch,
+)
+from qdrant.report_schema import REPORT_SCHEMA_V2, compact_report_payload, payload_bytes, report_schema_version
+from qdrant.tuning import CollectionTuning, collection_tuning
+
+# Collection -> payload field holding the business ID its point IDs derive from
+DETERMINISTIC_ID_FIELDS = {
+    settings.trash_reports_collection: "report_id",
+    settings.volunteer_profiles_collection: "user_id",
+    settings.campaigns_collection: "campaign_id",
+}
+
+
+def _report_field_updates(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Indexed top-level fields missing from a stored report payload"""
+    updates: Dict[str, Any] = {}
+    nested = payload.get('metadata') if isinstance(payload.get('metadata'), dict) else {}
+
+    if payload.get(TIMESTAMP_EPOCH_FIELD) is None:
+        epoch = timestamp_to_epoch(payload.get('timestamp') or nested.get('analyzed_at') or nested.get('timestamp'))
+        updates[TIMESTAMP_EPOCH_FIELD] = epoch if epoch is not None else UNKNOWN_TIMESTAMP_EPOCH
+
+    if not payload.get('report_id') and nested.get('report_id'):
+        updates['report_id'] = nested['report_id']
+
+    if not isinstance(payload.get('location'), dict) or payload['location'].get('lat') is None:
+        location = normalize_report_location(payload)
+        if location:
+            updates['location'] = location
+
+    return updates
+
+
+def backfill_report_index_fields(
+    store: EcoSynkVectorStore,
+    batch_size: int = 256,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Add the indexed fields (epoch timestamp, top-level report_id/location) to existing reports
+
+    Creates the payload indexes first, then pages through the collection and
+    sets only the missing fields, one batched update request per page.
+    Reports without a parseable timestamp get UNKNOWN_TIMESTAMP_EPOCH, so
+    they are listed as the oldest instead of dropping out of ordered listings.
+    setup_collections runs this automatically when reports need it.
+
+    Args:
+        store: Connected vector store
+        batch_size: Points per scroll page and per update request
+        dry_run: Count what would change without writing
+
+    Returns:
+        Dict with 'scanned', 'updated' and 'missing_timestamp' counts
+    """
+    collection = settings.trash_reports_collection
+    if not dry_run:
+        store._ensure_report_indexes()
+
+    scanned = updated = missing_timestamp = 0
+    offset: Optional[Any] = None
+
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+
+        operations = []
+        for point in points:
+            payload = point.payload or {}
+            updates = _report_field_updates(payload)
+            if updates.get(TIMESTAMP_EPOCH_FIELD) == UNKNOWN_TIMESTAMP_EPOCH:
+                missing_timestamp += 1
+            if updates:
+                operations.append(SetPayloadOperation(
+                    set_payload=SetPayload(payload=updates, points=[point.id])
+                ))
+
+        scanned += len(points)
+        updated += len(operations)
+        if operations and not dry_run:
+            store.client.batch_update_points(collection_name=collection, update_operations=operations)
+
+        print(f"   … scanned {scanned} reports, {updated} need updates")
+        if offset is None:
+            break
+
+    verb = "Would update" if dry_run else "Updated"
+    print(f"✅ {verb} {updated}/{scanned} reports ({missing_timestamp} without a parseable timestamp)")
+    return {'scanned': scanned, 'updated': updated, 'missing_timestamp': missing_timestamp}
+
+
+def _recency_key(payload: Dict[str, Any]) -> str:
+    """Sort key preferring the most recently written duplicate"""
+    return str(
+        payload.get('last_updated') or payload.get('updated_at') or
+        payload.get('timestamp') or payload.get('created_at') or ''
+    )
+
+
+def rewrite_point_ids(
+    store: EcoSynkVectorStore,
+    collection: str,
+    id_field: str,
+    batch_size: int = 256,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Move points onto IDs derived from their business ID (see point_id_for)
+
+    Duplicates of the same business ID (e.g. a volunteer profiled twice, or a
+    volunteer profile next to the registered account) are merged into one point:
+    payloads are layered oldest to newest and the newest point's vector is kept.
+    Points without the ID field are left alone.
+
+    Args:
+        store: Connected vector store
+        collection: Collection to rewrite
+        id_field: Payload field holding the business ID
+        batch_size: Points per scroll page, retrieve and write request
+        dry_run: Count what would change without writing
+
+    Returns:
+        Dict with 'scanned', 'moved', 'duplicates_removed' and 'without_id' counts
+    """
+    # Pass 1: group point IDs by their deterministic target (payloads only)
+    groups: Dict[str, List[Tuple[Tuple[str, bool], Any]]] = {}
+    scanned = without_id = 0
+    offset: Optional[Any] = None
+
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+        for point in points:
+            payload = point.payload or {}
+            business_id = payload.get(id_field)
+            if not business_id:
+                without_id += 1
+                continue
+            target = point_id_for(business_id)
+            # Newest write wins; a point already at the target ID wins ties
+            order = (_recency_key(payload), str(point.id) == target)
+            groups.setdefault(target, []).append((order, point.id))
+        scanned += len(points)
+        if offset is None:
+            break
+
+    pending = {
+        target: [point_id for _, point_id in sorted(members, key=lambda member: member[0])]
+        for target, members in groups.items()
+        if len(members) > 1 or str(members[0][1]) != target
+    }
+    moved = sum(1 for members in pending.values() if all(str(point_id) != target for point_id in members))
+    duplicates_removed = sum(len(members) - 1 for members in pending.values())
+
+    # Pass 2: write each merged point at its target ID, then drop the old IDs
+    if not dry_run:
+        targets = list(pending)
+        for start in range(0, len(targets), batch_size):
+            chunk = targets[start:start + batch_size]
+            sources = store.client.retrieve(
+                collection_name=collection,
+                ids=[point_id for target in chunk for point_id in pending[target]],
+                with_payload=True,
+                with_vectors=True
+            )
+            by_id = {str(point.id): point for point in sources}
+
+            merged_points = []
+            old_ids = []
+            for target in chunk:
+                members = [by_id[str(point_id)] for point_id in pending[target] if str(point_id) in by_id]
+                if not members:
+                    continue
+                payload: Dict[str, Any] = {}
+                for member in members:
+                    payload.update(member.payload or {})
+                merged_points.append(PointStruct(id=target, vector=members[-1].vector, payload=payload))
+                old_ids.extend(member.id for member in members if str(member.id) != target)
+
+            store.client.upsert(collection_name=collection, points=merged_points)
+            if old_ids:
+                store.client.delete(collection_name=collection, points_selector=old_ids)
+
+    verb = "Would move" if dry_run else "Moved"
+    print(f"✅ {collection}: {verb} {moved}/{scanned} points, "
+          f"{duplicates_removed} duplicates merged, {without_id} without {id_field}")
+    return {
+        'scanned': scanned,
+        'moved': moved,
+        'duplicates_removed': duplicates_removed,
+        'without_id': without_id,
+    }
+
+
+def _tuning_changes(info: Any, tuning: CollectionTuning) -> Dict[str, Tuple[Any, Any]]:
+    """Settings of a collection (from get_collection) that differ from the target tuning"""
+    vectors = info.config.params.vectors
+    on_disk = bool(getattr(vectors, 'on_disk', None))
+    hnsw = info.config.hnsw_config
+    quantization_config = info.config.quantization_config
+    if isinstance(quantization_config, ScalarQuantization):
+        quantization = "scalar"
+        always_ram = bool(quantization_config.scalar.always_ram)
+    elif isinstance(quantization_config, BinaryQuantization):
+        quantization = "binary"
+        always_ram = bool(quantization_config.binary.always_ram)
+    else:
+        quantization, always_ram = "none", tuning.always_ram
+
+    current = {
+        'quantization': quantization,
+        'always_ram': always_ram,
+        'on_disk': on_disk,
+        'm': hnsw.m,
+        'ef_construct': hnsw.ef_construct,
+    }
+    target = tuning.describe()
+    return {name: (value, target[name]) for name, value in current.items() if value != target[name]}
+
+
+def apply_collection_tuning(
+    store: EcoSynkVectorStore,
+    collection: str,
+    wait: bool = False,
+    dry_run: bool = False,
+    poll_seconds: float = 5.0
+) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Move an existing collection onto its configured quantization, on-disk and HNSW settings
+
+    Qdrant applies the update online: the collection keeps serving reads and
+    writes while the optimizer rebuilds segments (status yellow until done).
+    Search-time settings (ef, rescore, oversampling) need no migration.
+
+    Args:
+        store: Connected vector store
+        collection: Collection to update
+        wait: Poll until the collection is green again
+        dry_run: Report the differences without updating
+        poll_seconds: Interval between status checks when waiting
+
+    Returns:
+        Dict of setting -> (current, target) for every setting that differed
+    """
+    tuning = collection_tuning(collection)
+    changes = _tuning_changes(store.client.get_collection(collection), tuning)
+
+    if not changes:
+        print(f"✓ {collection}: already matches its tuning")
+        return changes
+
+    summary = ", ".join(f"{name} {old} → {new}" for name, (old, new) in changes.items())
+    if dry_run:
+        print(f"📋 {collection}: would change {summary}")
+        return changes
+
+    print(f"🔧 {collection}: changing {summary}")
+    store.client.update_collection(collection_name=collection, **tuning.update_collection_kwargs())
+
+    if wait:
+        while True:
+            info = store.client.get_collection(collection)
+            if info.status == CollectionStatus.GREEN:
+                break
+            print(f"   … {collection} is {info.status.value}, optimizer rebuilding ({info.indexed_vectors_count or 0} vectors indexed)")
+            time.sleep(poll_seconds)
+    print(f"✅ {collection}: tuning applied")
+    return changes
+
+
+def _report_vectors_with_sparse(point: Any) -> Dict[str, Any]:
+    """Named vectors of a stored report with its sparse vector computed from the payload"""
+    vectors = dict(point.vector) if isinstance(point.vector, dict) else {"": point.vector}
+    sparse = document_sparse_vector(report_sparse_text(point.payload or {}))
+    if sparse is not None:
+        vectors[settings.report_sparse_vector_name] = sparse
+    return vectors
+
+
+def _copy_report_points(store: EcoSynkVectorStore, points: List[Any], target: str):
+    """Upsert report points into another collection, adding sparse vectors"""
+    if points:
+        store.client.upsert(
+            collection_name=target,
+            points=[
+                PointStruct(id=point.id, vector=_report_vectors_with_sparse(point), payload=point.payload)
+                for point in points
+            ]
+        )
+
+
+def _copy_reports(store: EcoSynkVectorStore, source: str, target: str, batch_size: int) -> int:
+    """Copy every report point from one collection to another, adding sparse vectors"""
+    copied = 0
+    offset: Optional[Any] = None
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        _copy_report_points(store, points, target)
+        copied += len(points)
+        print(f"   … copied {copied} reports to {target}")
+        if offset is None:
+            return copied
+
+
+def _copy_missing_reports(store: EcoSynkVectorStore, source: str, target: str, batch_size: int) -> int:
+    """Copy the reports of `source` that `target` lacks (written since the bulk copy), by point ID"""
+    copied = 0
+    offset: Optional[Any] = None
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        ids = [point.id for point in points]
+        present = {str(point.id) for point in store.client.retrieve(target, ids=ids, with_payload=False)} if ids else set()
+        missing = [point_id for point_id in ids if str(point_id) not in present]
+        if missing:
+            _copy_report_points(
+                store, store.client.retrieve(source, ids=missing, with_payload=True, with_vectors=True), target
+            )
+            copied += len(missing)
+        if offset is None:
+            return copied
+
+
+def _catch_up_reports(store: EcoSynkVectorStore, source: str, target: str, batch_size: int) -> int:
+    """Copy reports written to `source` during a copy until a pass finds none left"""
+    total = 0
+    while True:
+        copied = _copy_missing_reports(store, source, target, batch_size)
+        total += copied
+        if not copied:
+            return total
+        print(f"   … caught up {copied} reports written during the copy")
+
+
+def _point_alias(store: EcoSynkVectorStore, alias: str, collection: str, replace: bool):
+    """Point `alias` at `collection` in one atomic alias update"""
+    operations: List[Any] = []
+    if replace:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    operations.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=collection, alias_name=alias)))
+    store.client.update_collection_aliases(change_aliases_operations=operations)
+
+
+def _backfill_sparse_vectors(store: EcoSynkVectorStore, collection: str, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """Add sparse vectors to reports stored without one (e.g. while hybrid search was disabled)"""
+    scanned = updated = 0
+    offset: Optional[Any] = None
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=[settings.report_sparse_vector_name]
+        )
+        missing = []
+        for point in points:
+            if isinstance(point.vector, dict) and point.vector.get(settings.report_sparse_vector_name):
+                continue
+            sparse = document_sparse_vector(report_sparse_text(point.payload or {}))
+            if sparse is not None:
+                missing.append(PointVectors(id=point.id, vector={settings.report_sparse_vector_name: sparse}))
+        scanned += len(points)
+        updated += len(missing)
+        if missing and not dry_run:
+            store.client.update_vectors(collection_name=collection, points=missing)
+        if offset is None:
+            return {'scanned': scanned, 'updated': updated}
+
+
+def enable_hybrid_search(
+    store: EcoSynkVectorStore,
+    batch_size: int = 256,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Give existing trash reports the sparse vector used by hybrid search
+
+    Qdrant cannot add a vector to an existing collection, so a collection
+    without one is rebuilt into `<collection>_hybrid` (points copied with
+    sparse vectors computed from their payloads) while it keeps serving
+    reads and writes. Reports written during the copy are caught up by point
+    ID, then the collection name becomes an alias of the rebuild. When the
+    name is already an alias the switch is atomic and the old collection is
+    caught up once more after it; a plain collection has to be dropped before
+    its name can become an alias, so only writes landing between the last
+    catch-up pass and that switch (milliseconds) can be lost. An interrupted
+    run resumes: if it stopped after dropping the old collection the alias
+    is created from the rebuild, otherwise the rebuild starts over. A
+    collection that already has the sparse vector only gets it added to
+    points missing it.
+
+    Running servers notice the switch within SPARSE_VECTOR_RECHECK_SECONDS,
+    no restart needed; reports they store in the meantime are dense-only,
+    so run the migration once more after that to give them the sparse vector.
+
+    Args:
+        store: Connected vector store
+        batch_size: Points per scroll page and per write request
+        dry_run: Report what would change without writing
+
+    Returns:
+        Dict with 'rebuilt' (whether the collection was recreated), 'scanned' and 'updated' counts
+    """
+    if not settings.hybrid_search_enabled:
+        raise ValueError("Hybrid search is disabled (HYBRID_SEARCH_ENABLED=false)")
+
+    collection = settings.trash_reports_collection
+    rebuild = f"{collection}_hybrid"
+    # Where earlier versions of this migration staged the copy
+    staging = f"{collection}_hybrid_staging"
+
+    if not store.client.collection_exists(collection):
+        # A previous run stopped between dropping the old collection and creating the alias
+        source = next((name for name in (rebuild, staging) if store.client.collection_exists(name)), None)
+        if source is None:
+            raise ValueError(f"Collection {collection} does not exist")
+        if dry_run:
+            print(f"✅ {collection}: Would point the alias at {source} (left by an interrupted run)")
+            return {'rebuilt': False, 'scanned': 0, 'updated': 0}
+        print(f"🔁 {collection} is missing: resuming from {source}")
+        _point_alias(store, collection, source, replace=False)
+        store._ensure_report_indexes()
+
+    info = store.client.get_collection(collection)
+
+    if has_report_sparse_vector(info):
+        if store.client.collection_exists(staging) and collection_aliases(store.client).get(collection) != staging and not dry_run:
+            # An earlier version stopped while copying back from staging
+            print(f"🔁 Resuming from {staging}")
+            _copy_missing_reports(store, staging, collection, batch_size)
+            store.client.delete_collection(staging)
+        counts = _backfill_sparse_vectors(store, collection, batch_size, dry_run)
+        store.report_sparse_vectors = True
+        verb = "Would add" if dry_run else "Added"
+        print(f"✅ {collection}: {verb} sparse vectors to {counts['updated']}/{counts['scanned']} reports")
+        return {'rebuilt': False, **counts}
+
+    points = info.points_count or 0
+    if dry_run:
+        print(f"✅ {collection}: Would rebuild with sparse vector '{settings.report_sparse_vector_name}' ({points} reports)")
+        return {'rebuilt': False, 'scanned': points, 'updated': points}
+
+    # The live name is either a plain collection or an alias of a dense-only one
+    aliased = collection_aliases(store.client).get(collection)
+    vectors = info.config.params.vectors
+    if store.client.collection_exists(rebuild):
+        store.client.delete_collection(rebuild)  # Partial copy from an interrupted run
+    store.client.create_collection(
+        collection_name=rebuild,
+        sparse_vectors_config=report_sparse_vectors_config(),
+        **collection_tuning(collection).create_collection_kwargs(size=vectors.size)
+    )
+    store._ensure_report_indexes(rebuild)
+    print(f"📦 Copying {points} reports to {rebuild}")
+    copied = _copy_reports(store, collection, rebuild, batch_size)
+    copied += _catch_up_reports(store, collection, rebuild, batch_size)
+
+    if aliased:
+        _point_alias(store, collection, rebuild, replace=True)
+        copied += _copy_missing_reports(store, aliased, rebuild, batch_size)
+        store.client.delete_collection(aliased)
+    else:
+        print(f"🔀 Replacing {collection} with an alias of {rebuild}")
+        store.client.delete_collection(collection)
+        _point_alias(store, collection, rebuild, replace=False)
+    store.report_sparse_vectors = True
+    store._reports_changed()
+
+    print(f"✅ {collection}: rebuilt for hybrid search ({copied} reports)")
+    return {'rebuilt': True, 'scanned': copied, 'updated': copied}
+
+
+def compact_report_payloads(
+    store: EcoSynkVectorStore,
+    batch_size: int = 256,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Rewrite legacy (v1) trash report payloads in the compact v2 schema
+
+    Streams the collection one scroll page at a time: each page's details are
+    written to the details collection first, then the report payloads are
+    overwritten in one batched update, so an interrupted run leaves every
+    report readable and simply resumes (v2 reports are skipped). Vectors and
+    point IDs are untouched.
+
+    Args:
+        store: Connected vector store
+        batch_size: Points per scroll page and per write request
+        dry_run: Measure the savings without writing
+
+    Returns:
+        Dict with 'scanned' and 'migrated' counts, and the reports' payload
+        sizes in bytes before and after ('bytes_before', 'bytes_after')
+    """
+    collection = settings.trash_reports_collection
+    if not dry_run:
+        store._ensure_report_details_collection()
+
+    scanned = migrated = bytes_before = bytes_after = 0
+    offset: Optional[Any] = None
+
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+
+        details_points = []
+        operations = []
+        for point in points:
+            payload = point.payload or {}
+            size = payload_bytes(payload)
+            bytes_before += size
+            if report_schema_version(payload) >= REPORT_SCHEMA_V2:
+                bytes_after += size
+                continue
+            compact, details = compact_report_payload(payload)
+            bytes_after += payload_bytes(compact)
+            report_id = compact.get('report_id')
+            if details:
+                details_points.append(PointStruct(
+                    id=point_id_for(report_id) if report_id else point.id,
+                    vector={},
+                    payload={'report_id': report_id, **details}
+                ))
+            operations.append(OverwritePayloadOperation(
+                overwrite_payload=SetPayload(payload=compact, points=[point.id])
+            ))
+
+        scanned += len(points)
+        migrated += len(operations)
+        if operations and not dry_run:
+            if details_points:
+                store.client.upsert(collection_name=settings.report_details_collection, points=details_points)
+            store.client.batch_update_points(collection_name=collection, update_operations=operations)
+
+        print(f"   … scanned {scanned} reports, {migrated} in the legacy schema")
+        if offset is None:
+            break
+
+    if migrated and not dry_run:
+        store._reports_changed()
+    saved = 1 - bytes_after / bytes_before if bytes_before else 0.0
+    verb = "Would compact" if dry_run else "Compacted"
+    print(f"✅ {verb} {migrated}/{scanned} reports: payloads {bytes_before:,} → {bytes_after:,} bytes ({saved:.0%} smaller)")
+    return {'scanned': scanned, 'migrated': migrated, 'bytes_before': bytes_before, 'bytes_after': bytes_after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EcoSynk Qdrant migrations")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subcommands.add_parser(
+        "backfill-report-fields",
+        help="Create report payload indexes and backfill timestamp_epoch/report_id/location"
+    )
+    backfill.add_argument("--batch-size", type=int, default=256)
+    backfill.add_argument("--dry-run", action="store_true")
+
+    deterministic = subcommands.add_parser(
+        "deterministic-ids",
+        help="Rewrite report, volunteer and campaign points onto IDs derived from their business IDs"
+    )
+    deterministic.add_argument("--batch-size", type=int, default=256)
+    deterministic.add_argument("--dry-run", action="store_true")
+
+    tuning = subcommands.add_parser(
+        "apply-tuning",
+        help="Apply the configured quantization, on-disk and HNSW settings to existing collections"
+    )
+    tuning.add_argument("--collection", action="append", help="Collection to update (default: all EcoSynk collections)")
+    tuning.add_argument("--wait", action="store_true", help="Wait until the optimizer has rebuilt each collection")
+    tuning.add_argument("--dry-run", action="store_true")
+
+    hybrid = subcommands.add_parser(
+        "enable-hybrid",
+        help="Add the sparse vector used by hybrid search to the trash reports collection"
+    )
+    hybrid.add_argument("--batch-size", type=int, default=256)
+    hybrid.add_argument("--dry-run", action="store_true")
+
+    compact = subcommands.add_parser(
+        "compact-reports",
+        help="Rewrite legacy trash report payloads in the compact v2 schema (blobs move to the details collection)"
+    )
+    compact.add_argument("--batch-size", type=int, default=256)
+    compact.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+    store = EcoSynkVectorStore()
+
+    if args.command == "backfill-report-fields":
+        backfill_report_index_fields(store, batch_size=args.batch_size, dry_run=args.dry_run)
+    elif args.command == "deterministic-ids":
+        existing = {c.name for c in store.client.get_collections().collections} | set(collection_aliases(store.client))
+        for collection, id_field in DETERMINISTIC_ID_FIELDS.items():
+            if collection in existing:
+                rewrite_point_ids(store, collection, id_field, batch_size=args.batch_size, dry_run=args.dry_run)
+    elif args.command == "apply-tuning":
+        existing = {c.name for c in store.client.get_collections().collections} | set(collection_aliases(store.client))
+        for collection in args.collection or [
+            settings.trash_reports_collection, settings.volunteer_profiles_collection, settings.campaigns_collection
+        ]:
+            if collection in existing:
+                apply_collection_tuning(store, collection, wait=args.wait, dry_run=args.dry_run)
+            else:
+                print(f"⚠️  Collection not found: {collection}")
+    elif args.command == "enable-hybrid":
+        enable_hybrid_search(store, batch_size=args.batch_size, dry_run=args.dry_run)
+    elif args.command == "compact-reports":
+        compact_report_payloads(store, batch_size=args.batch_size, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
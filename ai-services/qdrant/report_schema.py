@@ -0,0 +1,157 @@
+"""
+Trash report payload schemas
+
+v1 (legacy) payloads are the Gemini analysis as returned, plus copies of the
+location, the raw geocoder context and the YOLO summary, several of them also
+nested under `metadata`. v2 payloads keep only the indexed filter fields and
+the analysis summary at top level; bulky blobs move to the report details
+collection (same point ID, no vectors) and are joined back on demand.
+"""
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+REPORT_SCHEMA_FIELD = "schema_version"
+REPORT_SCHEMA_V2 = 2
+
+# Top-level fields of a v2 report point: indexed filters plus the analysis summary lists and search show
+REPORT_SUMMARY_FIELDS = frozenset((
+    REPORT_SCHEMA_FIELD, "report_id", "timestamp", "timestamp_epoch", "user_id",
+    "location", "location_name", "analyzed_at",
+    "primary_material", "estimated_volume", "specific_items", "description",
+    "cleanup_priority_score", "environmental_risk_level", "recyclable", "requires_special_handling",
+    "recommended_equipment", "estimated_cleanup_time_minutes", "confidence_score",
+))
+
+# Nested analysis metadata that repeats a top-level field (not stored again in v2)
+_DUPLICATED_METADATA = ("report_id", "location", "location_name", "location_context")
+
+# Nested analysis metadata lifted to the top level of a v2 point, so default projections need no details join
+_LIFTED_METADATA = ("analyzed_at",)
+
+# Nested v1 fields expand_report_payload rebuilds from a v2 point alone
+_REBUILT_METADATA = ("location", "location_name", *_LIFTED_METADATA)
+
+
+def report_schema_version(payload: Optional[Dict[str, Any]]) -> int:
+    """Schema version of a stored report payload (1 when unversioned)"""
+    try:
+        return int((payload or {}).get(REPORT_SCHEMA_FIELD) or 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def compact_report_payload(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a report payload into its v2 point payload and its details blob
+
+    Summary fields and other top-level scalars stay on the point; lists and
+    objects (geocoder context, YOLO output, ...) and the nested analysis
+    metadata go to the details, minus the copies of top-level fields;
+    metadata.analyzed_at is lifted to a top-level `analyzed_at`.
+
+    Args:
+        payload: Prepared v1 payload (see vector_store._prepare_report_payload)
+
+    Returns:
+        (compact payload, details); details is empty when nothing bulky was found.
+        v2 payloads are returned unchanged with empty details.
+    """
+    if report_schema_version(payload) >= REPORT_SCHEMA_V2:
+        return dict(payload), {}
+
+    compact: Dict[str, Any] = {REPORT_SCHEMA_FIELD: REPORT_SCHEMA_V2}
+    details: Dict[str, Any] = {}
+    for key, value in payload.items():
+        if key == "metadata" and isinstance(value, dict):
+            continue
+        if key in REPORT_SUMMARY_FIELDS or _is_scalar(value):
+            compact[key] = value
+        else:
+            details[key] = value
+
+    nested = payload.get("metadata")
+    if isinstance(nested, dict):
+        for key in _LIFTED_METADATA:
+            if key in nested:
+                compact[key] = nested[key]
+        metadata = {
+            key: value for key, value in nested.items()
+            # The top-level location is the normalized copy of metadata.location
+            if not (key in _DUPLICATED_METADATA and (key in payload or key == "location")) and key not in _LIFTED_METADATA
+        }
+        if metadata:
+            details["metadata"] = metadata
+    return compact, details
+
+
+def expand_report_payload(payload: Dict[str, Any], details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    v1-shaped view of a stored report, for readers that expect nested `metadata`
+
+    Args:
+        payload: Stored report payload (v1 payloads are returned unchanged)
+        details: The report's details blob, if fetched
+
+    Returns:
+        Report dict with the details merged in and `metadata` carrying
+        location, location_name and location_context as in v1
+    """
+    if report_schema_version(payload) < REPORT_SCHEMA_V2:
+        return payload
+
+    details = details or {}
+    report = dict(payload)
+    report.update({key: value for key, value in details.items() if key not in ("metadata", "report_id")})
+    metadata = dict(details.get("metadata") or {})
+    for key in _LIFTED_METADATA:
+        if key in report:
+            metadata.setdefault(key, report.pop(key))
+    for key in ("location", "location_name", "location_context"):
+        if key in report:
+            metadata.setdefault(key, report[key])
+    report["metadata"] = metadata
+    return report
+
+
+def report_details_needed(fields: Optional[Sequence[str]]) -> bool:
+    """
+    Whether reading these payload fields of a v2 report needs its details blob
+
+    Args:
+        fields: Requested payload paths (None = the full payload)
+
+    Returns:
+        False when summary fields and the metadata rebuilt from them
+        (metadata.location, metadata.location_name, metadata.analyzed_at) cover the request
+    """
+    if fields is None:
+        return True
+    for field in fields:
+        top, _, nested = field.partition(".")
+        if top == "metadata":
+            if nested.split(".", 1)[0] not in _REBUILT_METADATA:
+                return True
+        elif top not in REPORT_SUMMARY_FIELDS:
+            return True
+    return False
+
+
+def report_summary_sources(fields: Sequence[str]) -> Tuple[str, ...]:
+    """Top-level v2 fields expand_report_payload needs to rebuild the requested metadata paths"""
+    sources = [REPORT_SCHEMA_FIELD]
+    for field in fields:
+        top, _, nested = field.partition(".")
+        key = nested.split(".", 1)[0]
+        if top == "metadata" and key in _REBUILT_METADATA:
+            sources.append(key)
+    return tuple(dict.fromkeys(sources))
+
+
+def payload_bytes(payload: Optional[Dict[str, Any]]) -> int:
+    """JSON size of a payload, as stored and as sent on scroll/search responses"""
+    return len(json.dumps(payload or {}, separators=(",", ":"), default=str).encode("utf-8"))
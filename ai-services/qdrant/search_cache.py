@@ -0,0 +1,196 @@
+"""
+Result cache for semantic trash report search
+TTL + LRU cache of finished /reports/search responses, invalidated by an ingest
+epoch: every trash report write bumps the epoch, which empties the cache and
+stops searches that were already running from storing what they found
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import settings
+from embeddings.cache import canonicalize_text
+
+
+def snap_to_grid(lat: float, lon: float, grid_degrees: float) -> Tuple[float, float]:
+    """Round a coordinate to the nearest grid point (grid_degrees <= 0 leaves it unchanged)"""
+    if grid_degrees <= 0:
+        return lat, lon
+    return (
+        round(round(lat / grid_degrees) * grid_degrees, 6),
+        round(round(lon / grid_degrees) * grid_degrees, 6),
+    )
+
+
+def report_search_key(
+    query: str,
+    limit: int,
+    score_threshold: float,
+    location_filter: Optional[Dict[str, float]] = None,
+    time_window_days: Optional[int] = None,
+    fields: str = ""
+) -> str:
+    """
+    Cache key for a report search
+
+    Args:
+        query: Search text; whitespace and case are normalized (the embedding model is uncased)
+        limit: Maximum number of results
+        score_threshold: Requested minimum similarity
+        location_filter: Optional {lat, lon, radius_km}, already snapped to the cache grid
+        time_window_days: Optional time window
+        fields: Canonical payload projection (see projection.Projection.spec)
+
+    Returns:
+        Hex SHA-256 digest of the normalized parameters
+    """
+    parts = {
+        "query": canonicalize_text(query).casefold(),
+        "limit": limit,
+        "score_threshold": round(score_threshold, 4),
+        "location": location_filter,
+        "time_window_days": time_window_days,
+        "fields": fields,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def response_etag(response: Any) -> str:
+    """
+    Weak ETag for a JSON response body
+
+    Derived from the content rather than the epoch, so it is stable across worker
+    processes. Weak because responses sharing a cache entry may echo the query
+    text with different whitespace or case.
+    """
+    body = json.dumps(response, sort_keys=True, default=str).encode("utf-8")
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class SearchResultCache:
+    """Bounded TTL + LRU cache of search responses with epoch-based invalidation"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entry budget; least recently used entries are evicted beyond it (uses settings if not provided)
+            ttl_seconds: Entry lifetime; bounds staleness from writes this process never sees,
+                such as other workers or migrations (uses settings if not provided)
+            clock: Monotonic time source
+        """
+        self.max_entries = max(1, max_entries or settings.report_search_cache_max_entries)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.report_search_cache_ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, etag, response)
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.discarded = 0
+
+    @property
+    def epoch(self) -> int:
+        """Current ingest generation; capture it before searching and pass it to put()"""
+        return self._epoch
+
+    def bump_epoch(self) -> int:
+        """Record that trash reports changed: drop every entry and reject in-flight results"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self.invalidations += 1
+            return self._epoch
+
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        """
+        Return (etag, response) for a live entry (marking it recently used), or None
+
+        Args:
+            key: Key from report_search_key
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, etag, response = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return etag, response
+
+    def put(self, key: str, response: Any, epoch: int) -> str:
+        """
+        Store a response computed at the given epoch
+
+        Args:
+            key: Key from report_search_key
+            response: JSON-serializable response (treated as immutable once stored)
+            epoch: Value of `epoch` captured before the search started; if a write
+                happened since, the response may predate it and is not stored
+
+        Returns:
+            The response ETag (also returned when the response was discarded)
+        """
+        etag = response_etag(response)
+        with self._lock:
+            if epoch != self._epoch:
+                self.discarded += 1
+                return etag
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl_seconds, etag, response)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return etag
+
+    def clear(self):
+        """Drop every cached response (without changing the epoch)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, invalidations and size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "epoch": self._epoch,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "discarded": self.discarded,
+            }
@@ -0,0 +1,189 @@
+"""
+Per-collection vector index tuning for EcoSynk Qdrant collections
+Quantization (with rescoring), on-disk original vectors and HNSW parameters
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Any, Dict, Optional, Union
+
+from qdrant_client.models import (
+    BinaryQuantization, BinaryQuantizationConfig,
+    Disabled, Distance, HnswConfigDiff,
+    QuantizationSearchParams, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    SearchParams, VectorParams, VectorParamsDiff
+)
+
+from config import parse_bool, settings
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+# Override keys accepted in QDRANT_COLLECTION_TUNING -> (attribute, parser)
+_OVERRIDE_KEYS = {
+    "quantization": ("quantization", str),
+    "always_ram": ("always_ram", parse_bool),
+    "rescore": ("rescore", parse_bool),
+    "oversampling": ("oversampling", float),
+    "on_disk": ("on_disk", parse_bool),
+    "m": ("m", int),
+    "ef_construct": ("ef_construct", int),
+    "ef": ("ef", int),
+}
+
+QuantizationConfig = Union[ScalarQuantization, BinaryQuantization, None]
+
+
+class CollectionTuning:
+    """Index and search settings for one collection"""
+
+    def __init__(
+        self,
+        quantization: str = "none",
+        always_ram: bool = True,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+        on_disk: bool = False,
+        m: int = 16,
+        ef_construct: int = 100,
+        ef: int = 128
+    ):
+        """
+        Args:
+            quantization: "none", "scalar" (int8) or "binary"
+            always_ram: Keep quantized vectors in RAM (even when originals are on disk)
+            rescore: Re-rank quantized candidates with the original vectors
+            oversampling: Candidates fetched per requested result before rescoring
+            on_disk: Store original vectors on disk (memmap) instead of RAM
+            m: HNSW edges per node
+            ef_construct: HNSW candidate list size while building the graph
+            ef: HNSW candidate list size at search time
+        """
+        quantization = quantization.lower()
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization '{quantization}' (expected one of {', '.join(QUANTIZATION_MODES)})")
+        self.quantization = quantization
+        self.always_ram = always_ram
+        self.rescore = rescore
+        self.oversampling = oversampling
+        self.on_disk = on_disk
+        self.m = m
+        self.ef_construct = ef_construct
+        self.ef = ef
+
+    def vectors_config(self, size: Optional[int] = None) -> VectorParams:
+        """Vector params for create_collection"""
+        return VectorParams(
+            size=size or settings.embedding_dimension,
+            distance=Distance.COSINE,
+            on_disk=self.on_disk
+        )
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        """HNSW graph params for create_collection/update_collection"""
+        return HnswConfigDiff(m=self.m, ef_construct=self.ef_construct)
+
+    def quantization_config(self) -> QuantizationConfig:
+        """Quantization params for create_collection (None when disabled)"""
+        if self.quantization == "scalar":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=self.always_ram
+            ))
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=self.always_ram))
+        return None
+
+    def create_collection_kwargs(self, size: Optional[int] = None) -> Dict[str, Any]:
+        """Keyword arguments for client.create_collection (besides collection_name)"""
+        return {
+            "vectors_config": self.vectors_config(size),
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config(),
+        }
+
+    def update_collection_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for client.update_collection that move a collection onto these settings"""
+        return {
+            # "" is the default (unnamed) vector
+            "vectors_config": {"": VectorParamsDiff(on_disk=self.on_disk)},
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config() or Disabled.DISABLED,
+        }
+
+    def search_params(self) -> SearchParams:
+        """Search-time params for query_points"""
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        return SearchParams(hnsw_ef=self.ef, quantization=quantization)
+
+    def describe(self) -> Dict[str, Any]:
+        """Plain dict of the settings (for logs and /metrics)"""
+        return {
+            "quantization": self.quantization,
+            "always_ram": self.always_ram,
+            "rescore": self.rescore,
+            "oversampling": self.oversampling,
+            "on_disk": self.on_disk,
+            "m": self.m,
+            "ef_construct": self.ef_construct,
+            "ef": self.ef,
+        }
+
+
+def parse_collection_overrides(spec: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse per-collection overrides from "collection:key=value,...;collection:..."
+
+    Args:
+        spec: Override string, e.g. "trash_reports:quantization=binary,ef=64;users:m=32"
+
+    Returns:
+        Dict of collection name -> CollectionTuning keyword arguments
+    """
+    overrides: Dict[str, Dict[str, Any]] = {}
+    for block in (spec or "").split(";"):
+        collection, _, pairs = block.partition(":")
+        collection = collection.strip()
+        if not collection:
+            continue
+        values = overrides.setdefault(collection, {})
+        for pair in pairs.split(","):
+            key, _, value = pair.partition("=")
+            key, value = key.strip(), value.strip()
+            if not key or not value:
+                continue
+            if key not in _OVERRIDE_KEYS:
+                print(f"⚠️  Ignoring unknown tuning key '{key}' for collection '{collection}'")
+                continue
+            attribute, parse = _OVERRIDE_KEYS[key]
+            try:
+                values[attribute] = parse(value)
+            except ValueError:
+                print(f"⚠️  Ignoring invalid tuning value '{pair.strip()}' for collection '{collection}'")
+    return overrides
+
+
+def collection_tuning(collection_name: str) -> CollectionTuning:
+    """Tuning for a collection: global settings plus its QDRANT_COLLECTION_TUNING overrides"""
+    values: Dict[str, Any] = {
+        "quantization": settings.qdrant_quantization,
+        "always_ram": settings.qdrant_quantization_always_ram,
+        "rescore": settings.qdrant_quantization_rescore,
+        "oversampling": settings.qdrant_quantization_oversampling,
+        "on_disk": settings.qdrant_vectors_on_disk,
+        "m": settings.qdrant_hnsw_m,
+        "ef_construct": settings.qdrant_hnsw_ef_construct,
+        "ef": settings.qdrant_hnsw_ef,
+    }
+    values.update(parse_collection_overrides(settings.qdrant_collection_tuning).get(collection_name, {}))
+    return CollectionTuning(**values)
+
+
+def search_params_for(collection_name: str) -> SearchParams:
+    """Search-time params for a collection"""
+    return collection_tuning(collection_name).search_params()
@@ -0,0 +1,381 @@
+"""
+In-process read replica of the users collection
+Holds every user vector in one contiguous float32 NumPy matrix (plus the
+location, availability and experience columns used for filtering) so volunteer
+matching, recommendations and user search run without a network round trip
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import copy
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qdrant_client.models import Record, ScoredPoint
+
+from config import settings
+from executors import run_io
+from qdrant.vector_store import iter_collection_points
+
+EARTH_RADIUS_KM = 6371.0
+
+# Payload fields never copied into the replica
+_PRIVATE_FIELDS = ("password_hash",)
+
+
+def _float_or_nan(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+class UserReplica:
+    """
+    NumPy copy of the users collection, kept fresh by write-through and periodic reconciliation
+
+    Writes made through UserService and the vector store are applied
+    incrementally (upsert/update_payload/remove). A background task re-reads the
+    whole collection every `refresh_seconds` to pick up writes from other
+    processes; once the last full read is older than `max_staleness_seconds`
+    the replica reports itself stale and callers fall back to Qdrant.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        collection_name: Optional[str] = None,
+        refresh_seconds: Optional[float] = None,
+        max_staleness_seconds: Optional[float] = None
+    ):
+        """
+        Initialize an empty replica (call refresh() to load it)
+
+        Args:
+            client: Qdrant client used for reconciliation scrolls
+            collection_name: Users collection (uses settings if not provided)
+            refresh_seconds: Interval between background reconciliations
+            max_staleness_seconds: Age of the last reconciliation after which searches fall back to Qdrant
+        """
+        self.client = client
+        self.collection_name = collection_name or settings.volunteer_profiles_collection
+        self.refresh_seconds = refresh_seconds or settings.user_replica_refresh_seconds
+        self.max_staleness_seconds = max_staleness_seconds or settings.user_replica_max_staleness_seconds
+
+        self._lock = threading.RLock()
+        self._reset(settings.embedding_dimension, capacity=0)
+        self._synced_at: Optional[float] = None
+        # Writes seen while a reconciliation scroll is running (replayed onto its result)
+        self._journal: Optional[List[Tuple[str, tuple]]] = None
+
+        self.searches = 0
+        self.fallbacks = 0
+        self.refreshes = 0
+        self.last_refresh_ms = 0.0
+
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _reset(self, dim: int, capacity: int):
+        self._dim = dim
+        self._count = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._payloads: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._lat = np.full(capacity, np.nan)
+        self._lon = np.full(capacity, np.nan)
+        self._experience = np.full(capacity, np.nan)
+        self._available = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, needed: int):
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        extra = capacity - len(self._vectors)
+        self._vectors = np.vstack([self._vectors, np.zeros((extra, self._dim), dtype=np.float32)])
+        self._lat = np.concatenate([self._lat, np.full(extra, np.nan)])
+        self._lon = np.concatenate([self._lon, np.full(extra, np.nan)])
+        self._experience = np.concatenate([self._experience, np.full(extra, np.nan)])
+        self._available = np.concatenate([self._available, np.zeros(extra, dtype=bool)])
+
+    def _write_row(self, row: int, vector: Optional[Sequence[float]], payload: Dict[str, Any]):
+        if vector is not None:
+            array = np.asarray(vector, dtype=np.float32)
+            norm = float(np.linalg.norm(array))
+            # Cosine collection: store unit vectors so a dot product is the Qdrant score
+            self._vectors[row] = array / norm if norm else array
+        location = payload.get("location")
+        location = location if isinstance(location, dict) else {}
+        self._lat[row] = _float_or_nan(location.get("lat"))
+        self._lon[row] = _float_or_nan(location.get("lon"))
+        self._experience[row] = _float_or_nan(payload.get("experience_level"))
+        self._available[row] = payload.get("available") is True
+        self._payloads[row] = payload
+
+    def _apply_upsert(self, point_id: str, vector: Optional[Sequence[float]], payload: Dict[str, Any]):
+        payload = {k: v for k, v in (payload or {}).items() if k not in _PRIVATE_FIELDS}
+        row = self._rows.get(point_id)
+        if row is None:
+            if vector is None:
+                # Without a vector the user cannot be ranked; the next reconciliation picks it up
+                return
+            if len(vector) != self._dim:
+                if self._count:
+                    return
+                self._reset(len(vector), capacity=0)
+            row = self._count
+            self._grow(row + 1)
+            self._ids.append(point_id)
+            self._payloads.append({})
+            self._rows[point_id] = row
+            self._count += 1
+        self._write_row(row, vector, payload)
+
+    def _apply_update_payload(self, point_id: str, payload: Dict[str, Any]):
+        row = self._rows.get(point_id)
+        if row is not None:
+            merged = dict(self._payloads[row])
+            merged.update({k: v for k, v in payload.items() if k not in _PRIVATE_FIELDS})
+            self._write_row(row, None, merged)
+
+    def _apply_remove(self, point_id: str):
+        row = self._rows.pop(point_id, None)
+        if row is None:
+            return
+        last = self._count - 1
+        if row != last:
+            # Move the last row into the hole so the matrix stays contiguous
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+            self._payloads[row] = self._payloads[last]
+            self._vectors[row] = self._vectors[last]
+            self._lat[row] = self._lat[last]
+            self._lon[row] = self._lon[last]
+            self._experience[row] = self._experience[last]
+            self._available[row] = self._available[last]
+        self._ids.pop()
+        self._payloads.pop()
+        self._count -= 1
+
+    def _record(self, operation: str, *args):
+        with self._lock:
+            getattr(self, f"_apply_{operation}")(*args)
+            if self._journal is not None:
+                self._journal.append((operation, args))
+
+    # ------------------------------------------------------------------
+    # Incremental sync (called after successful writes)
+    # ------------------------------------------------------------------
+
+    def upsert(self, points: Iterable[Any]):
+        """Apply upserted points (PointStruct or Record with id, vector and payload)"""
+        for point in points:
+            self._record("upsert", str(point.id), point.vector, point.payload or {})
+
+    def update_payload(self, point_ids: Iterable[Any], payload: Dict[str, Any]):
+        """Apply a set_payload (merge) to existing points"""
+        for point_id in point_ids:
+            self._record("update_payload", str(point_id), dict(payload))
+
+    def remove(self, point_ids: Iterable[Any]):
+        """Apply deleted points"""
+        for point_id in point_ids:
+            self._record("remove", str(point_id))
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def refresh(self, page_size: int = 512) -> int:
+        """
+        Re-read the whole collection and swap it in (writes made meanwhile are replayed)
+
+        Returns:
+            Number of users in the replica
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._journal = []
+        try:
+            points = list(iter_collection_points(
+                self.client, self.collection_name, page_size=page_size, with_vectors=True
+            ))
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            journal, self._journal = self._journal, None
+            vectors = [point for point in points if point.vector is not None]
+            dim = len(vectors[0].vector) if vectors else self._dim
+            self._reset(dim, capacity=len(vectors))
+            for point in vectors:
+                self._apply_upsert(str(point.id), point.vector, point.payload or {})
+            for operation, args in journal:
+                getattr(self, f"_apply_{operation}")(*args)
+            self._synced_at = time.monotonic()
+            self.refreshes += 1
+            self.last_refresh_ms = (time.perf_counter() - start) * 1000
+            return self._count
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the last full reconciliation is recent enough to serve reads"""
+        return self._synced_at is not None and time.monotonic() - self._synced_at <= self.max_staleness_seconds
+
+    def serves_reads(self) -> bool:
+        """is_fresh, counting a fallback to Qdrant when it is not"""
+        if self.is_fresh:
+            return True
+        self.fallbacks += 1
+        return False
+
+    def start(self):
+        """Start periodic reconciliation on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop periodic reconciliation"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await run_io(self.refresh)
+            except Exception as e:
+                print(f"⚠️  User replica reconciliation failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, point_id: Any) -> Optional[Record]:
+        """A user's payload and (unit) vector, or None if not replicated"""
+        with self._lock:
+            row = self._rows.get(str(point_id))
+            if row is None:
+                return None
+            # Deep copy: callers edit nested lists (following/followers) before writing back
+            return Record(id=self._ids[row], payload=copy.deepcopy(self._payloads[row]), vector=self._vectors[row].tolist())
+
+    def points(self) -> Iterator[Record]:
+        """Every replicated user (payload only), in storage order"""
+        with self._lock:
+            snapshot = list(zip(self._ids, self._payloads))
+        for point_id, payload in snapshot:
+            yield Record(id=point_id, payload=payload)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        location: Optional[Dict[str, float]] = None,
+        radius_km: Optional[float] = None,
+        available: Optional[bool] = None,
+        min_experience: Optional[float] = None
+    ) -> List[ScoredPoint]:
+        """
+        Cosine top-k over the replica with optional geo/availability/experience filters
+
+        Mirrors query_points on the users collection (scores are cosine
+        similarities; filters match _volunteer_filter's conditions).
+
+        Args:
+            vector: Query vector
+            limit: Maximum number of results
+            score_threshold: Minimum similarity score
+            location: Dict with 'lat' and 'lon' (only users within radius_km match)
+            radius_km: Geo radius for location
+            available: Only users whose 'available' field is True
+            min_experience: Minimum numeric experience_level
+
+        Returns:
+            ScoredPoints ordered by score, highest first
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            self.searches += 1
+            n = self._count
+            if n == 0 or limit <= 0 or len(query) != self._dim:
+                return []
+
+            scores = self._vectors[:n] @ query
+            mask = np.ones(n, dtype=bool)
+            if score_threshold is not None:
+                mask &= scores >= score_threshold
+            if available:
+                mask &= self._available[:n]
+            if min_experience is not None:
+                with np.errstate(invalid="ignore"):
+                    mask &= self._experience[:n] >= float(min_experience)
+            if location and location.get('lat') and location.get('lon') and radius_km is not None:
+                mask &= self._distances_km(location['lat'], location['lon'], n) <= radius_km
+
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+            return [
+                ScoredPoint(id=self._ids[row], version=0, score=float(scores[row]), payload=dict(self._payloads[row]))
+                for row in candidates
+            ]
+
+    def _distances_km(self, lat: float, lon: float, n: int) -> np.ndarray:
+        """Haversine distance from (lat, lon) to every row (NaN rows compare False)"""
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self._lat[:n]), np.radians(self._lon[:n])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, memory and freshness of the replica"""
+        with self._lock:
+            count = self._count
+            vector_bytes = self._vectors.nbytes
+            age = None if self._synced_at is None else round(time.monotonic() - self._synced_at, 1)
+        return {
+            "users": count,
+            "dimension": self._dim,
+            "vector_bytes": vector_bytes,
+            "fresh": self.is_fresh,
+            "seconds_since_refresh": age,
+            "refresh_seconds": self.refresh_seconds,
+            "max_staleness_seconds": self.max_staleness_seconds,
+            "refreshes": self.refreshes,
+            "last_refresh_ms": round(self.last_refresh_ms, 2),
+            "searches": self.searches,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def readable_replica(replica: Optional[UserReplica]) -> Optional[UserReplica]:
+    """The replica if one is attached and fresh enough to serve reads, else None (use Qdrant)"""
+    if replica is not None and replica.serves_reads():
+        return replica
+    return None
@@ -8,57 +8,210 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import math
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
-from qdrant_client import QdrantClient
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Sequence, Tuple, Union
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
-    Distance, VectorParams, PointStruct, 
-    Filter, FieldCondition, MatchValue, Range,
+    PointStruct,
+    Filter, FieldCondition, MatchAny, MatchValue, Range,
     GeoBoundingBox, GeoPoint, GeoRadius,
-    PayloadSchemaType
+    PayloadSchemaType, Record, OrderBy, Direction, QueryRequest,
+    Fusion, FusionQuery, Modifier, Prefetch, SparseVector, SparseVectorParams, PayloadSelectorExclude,
+    IsEmptyCondition, PayloadField
 )
 
 from config import settings
+from embeddings.sparse import document_sparse_vector, query_sparse_vector, report_sparse_text
+from qdrant.connection import QdrantConnectionFactory, get_qdrant_connection
+from qdrant.report_schema import (
+    REPORT_SCHEMA_V2, compact_report_payload, expand_report_payload, report_details_needed,
+    report_schema_version, report_summary_sources
+)
+from qdrant.tuning import collection_tuning, search_params_for
+
+# Epoch-seconds copy of `timestamp`, written at store time so time windows can be range-filtered
+TIMESTAMP_EPOCH_FIELD = "timestamp_epoch"
+
+# timestamp_epoch of reports whose timestamp cannot be parsed: listed as the oldest
+# (ordering by timestamp_epoch skips points without the field)
+UNKNOWN_TIMESTAMP_EPOCH = 0
+
+# Payload indexes on the trash reports collection (field -> schema)
+REPORT_PAYLOAD_INDEXES = {
+    "location": PayloadSchemaType.GEO,
+    TIMESTAMP_EPOCH_FIELD: PayloadSchemaType.INTEGER,
+    "primary_material": PayloadSchemaType.KEYWORD,
+    "user_id": PayloadSchemaType.KEYWORD,
+    "report_id": PayloadSchemaType.KEYWORD,
+    "environmental_risk_level": PayloadSchemaType.KEYWORD,
+    # Facet/count dimensions of the ESG impact aggregation
+    "estimated_volume": PayloadSchemaType.KEYWORD,
+    "recyclable": PayloadSchemaType.BOOL,
+    "cleanup_priority_score": PayloadSchemaType.FLOAT,
+}
+
+# Namespace for point IDs derived from report/campaign/user IDs (never change: existing points depend on it)
+POINT_ID_NAMESPACE = uuid.UUID("a1c5ce6a-27f4-4c2a-86fa-7f416e0db91a")
+
+# Score threshold /reports/search falls back to when the requested one finds nothing
+FALLBACK_SCORE_THRESHOLD = 0.3
+
+# Payload projection: field names (or nested paths), a Qdrant exclude selector, False for none, None for all
+PayloadFields = Optional[Union[Sequence[str], bool, PayloadSelectorExclude]]
+
+# Distinct values returned per facet request (report facets have a handful)
+FACET_VALUE_LIMIT = 100
+
+# Seconds before a dense-only reports collection is inspected again (`enable-hybrid` may have
+# switched it to a rebuild with the sparse vector while this process was running)
+SPARSE_VECTOR_RECHECK_SECONDS = 60
+
+# Keyword fields accepted in report filters
+REPORT_KEYWORD_FILTERS = ("primary_material", "user_id", "report_id", "environmental_risk_level")
 
 
 class EcoSynkVectorStore:
     """Qdrant vector database manager for EcoSynk"""
     
-    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None):
+    # Optional in-process replica of the users collection (attached by the API server)
+    user_replica = None
+    
+    # Optional /reports/search result cache, invalidated on every report write (see qdrant.search_cache)
+    report_search_cache = None
+    
+    # Whether the trash reports collection has the sparse vector for hybrid search (None: not checked yet)
+    report_sparse_vectors: Optional[bool] = None
+    report_sparse_checked_at: float = 0.0
+    
+    # Whether this store has made sure the report details collection (v2 payload blobs) exists
+    report_details_ready: bool = False
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        connection: Optional[QdrantConnectionFactory] = None
+    ):
         """
         Initialize Qdrant client
         
         Args:
             url: Qdrant cluster URL (uses settings if not provided)
             api_key: Qdrant API key (uses settings if not provided)
+            connection: Connection to use (defaults to the shared process-wide one,
+                which is an embedded Qdrant when QDRANT_LOCAL_PATH is set, or a
+                dedicated one when url/api_key differ from settings)
         """
-        self.url = url or settings.qdrant_url
-        self.api_key = api_key or settings.qdrant_api_key
+        if connection is None and settings.qdrant_local_path and not (url or api_key):
+            # Embedded Qdrant (QDRANT_LOCAL_PATH): no cluster credentials needed
+            connection = get_qdrant_connection()
         
-        if not self.url or "your-cluster" in self.url:
-            raise ValueError(
-                "Qdrant URL not configured. "
-                "Set QDRANT_URL in your .env file"
-            )
+        if connection is None:
+            self.url = url or settings.qdrant_url
+            self.api_key = api_key or settings.qdrant_api_key
+            
+            if not self.url or "your-cluster" in self.url:
+                raise ValueError(
+                    "Qdrant URL not configured. "
+                    "Set QDRANT_URL in your .env file"
+                )
+            
+            if not self.api_key or self.api_key == "your_qdrant_api_key_here":
+                raise ValueError(
+                    "Qdrant API key not configured. "
+                    "Set QDRANT_API_KEY in your .env file"
+                )
+            
+            if (self.url, self.api_key) == (settings.qdrant_url, settings.qdrant_api_key) and not settings.qdrant_local_path:
+                connection = get_qdrant_connection()
+            else:
+                connection = QdrantConnectionFactory(url=self.url, api_key=self.api_key, local_path="")
         
-        if not self.api_key or self.api_key == "your_qdrant_api_key_here":
-            raise ValueError(
-                "Qdrant API key not configured. "
-                "Set QDRANT_API_KEY in your .env file"
-            )
+        self.connection = connection
+        self.url = connection.url
+        self.api_key = connection.api_key
         
         try:
-            self.client = QdrantClient(
-                url=self.url,
-                api_key=self.api_key,
-                timeout=30
-            )
-            print(f"✅ Connected to Qdrant at {self.url}")
+            self.client = connection.client
+            # Async client for callers on the event loop (the API server awaits the a* methods)
+            self.aclient = connection.aclient
+            print(f"✅ Connected to Qdrant at {connection.location}")
         except Exception as e:
             print(f"❌ Failed to connect to Qdrant: {e}")
             raise
     
+    def _readable_user_replica(self):
+        """The attached users replica if it is fresh enough to serve reads (see qdrant.user_replica)"""
+        replica = self.user_replica
+        if replica is not None and replica.serves_reads():
+            return replica
+        return None
+    
+    def _reports_changed(self):
+        """Bump the report search cache epoch after a trash report write (even a failed one)"""
+        if self.report_search_cache is not None:
+            self.report_search_cache.bump_epoch()
+    
+    def _sparse_vectors_check_due(self) -> bool:
+        """Whether the reports collection should be inspected for the sparse vector (again)"""
+        if self.report_sparse_vectors is None:
+            return True
+        # Once present the sparse vector stays; a dense-only answer expires
+        return not self.report_sparse_vectors and (
+            time.monotonic() - self.report_sparse_checked_at >= SPARSE_VECTOR_RECHECK_SECONDS
+        )
+    
+    def _reports_have_sparse_vectors(self) -> bool:
+        """Whether report writes and searches use the sparse vector (dense-only answers are rechecked periodically)"""
+        if not settings.hybrid_search_enabled:
+            return False
+        if self._sparse_vectors_check_due():
+            try:
+                info = self.client.get_collection(settings.trash_reports_collection)
+            except Exception as e:
+                print(f"⚠️  Could not inspect {settings.trash_reports_collection}: {e}")
+                return False
+            self.report_sparse_vectors = has_report_sparse_vector(info)
+            self.report_sparse_checked_at = time.monotonic()
+        return self.report_sparse_vectors
+    
+    def _ensure_report_details_collection(self):
+        """Create the vector-less collection holding v2 report details, if missing"""
+        if self.report_details_ready:
+            return
+        if not self.client.collection_exists(settings.report_details_collection):
+            self.client.create_collection(collection_name=settings.report_details_collection, vectors_config={})
+            print(f"✅ Created: {settings.report_details_collection} (report details, no vectors)")
+        self.report_details_ready = True
+    
+    async def _aensure_report_details_collection(self):
+        """Async variant of _ensure_report_details_collection"""
+        if self.report_details_ready:
+            return
+        if not await self.aclient.collection_exists(settings.report_details_collection):
+            await self.aclient.create_collection(collection_name=settings.report_details_collection, vectors_config={})
+            print(f"✅ Created: {settings.report_details_collection} (report details, no vectors)")
+        self.report_details_ready = True
+    
+    async def _areports_have_sparse_vectors(self) -> bool:
+        """Async variant of _reports_have_sparse_vectors"""
+        if not settings.hybrid_search_enabled:
+            return False
+        if self._sparse_vectors_check_due():
+            try:
+                info = await self.aclient.get_collection(settings.trash_reports_collection)
+            except Exception as e:
+                print(f"⚠️  Could not inspect {settings.trash_reports_collection}: {e}")
+                return False
+            self.report_sparse_vectors = has_report_sparse_vector(info)
+            self.report_sparse_checked_at = time.monotonic()
+        return self.report_sparse_vectors
+    
     def setup_collections(self, recreate: bool = False):
         """
         Create or recreate collections for trash reports and volunteer profiles
@@ -67,41 +220,42 @@ class EcoSynkVectorStore:
             recreate: If True, delete and recreate collections (WARNING: deletes all data)
         """
         try:
-            collections = self.client.get_collections().collections
-            existing_names = [c.name for c in collections]
+            # Aliases count as collections (the reports collection becomes one after `enable-hybrid`)
+            aliases = collection_aliases(self.client)
+            existing_names = [c.name for c in self.client.get_collections().collections] + list(aliases)
             
             # Trash Reports Collection
             if settings.trash_reports_collection in existing_names:
                 if recreate:
                     print(f"🗑️  Deleting existing collection: {settings.trash_reports_collection}")
-                    self.client.delete_collection(settings.trash_reports_collection)
+                    # Deleting the aliased collection drops the alias with it
+                    self.client.delete_collection(
+                        aliases.get(settings.trash_reports_collection, settings.trash_reports_collection)
+                    )
+                    if self.client.collection_exists(settings.report_details_collection):
+                        self.client.delete_collection(settings.report_details_collection)
+                    self.report_details_ready = False
+                    self._reports_changed()
                 else:
                     print(f"✓ Collection already exists: {settings.trash_reports_collection}")
             
             if recreate or settings.trash_reports_collection not in existing_names:
                 print(f"📦 Creating collection: {settings.trash_reports_collection}")
+                tuning = collection_tuning(settings.trash_reports_collection)
                 self.client.create_collection(
                     collection_name=settings.trash_reports_collection,
-                    vectors_config=VectorParams(
-                        size=settings.embedding_dimension,
-                        distance=Distance.COSINE
-                    )
+                    sparse_vectors_config=report_sparse_vectors_config(),
+                    **tuning.create_collection_kwargs()
                 )
-                print(f"✅ Created: {settings.trash_reports_collection}")
+                print(f"✅ Created: {settings.trash_reports_collection} ({tuning.quantization} quantization, m={tuning.m})")
 
-            try:
-                self.client.create_payload_index(
-                    collection_name=settings.trash_reports_collection,
-                    field_name="location",
-                    field_schema=PayloadSchemaType.GEO
-                )
-                print(f"   ✓ Configured geo-point index for report location field")
-            except Exception as e:
-                message = str(e).lower()
-                if "already exists" in message:
-                    print(f"   ✓ Geo index already present for report location")
-                else:
-                    print(f"   ⚠️  Could not create trash report geo-index: {e}")
+            self._ensure_report_indexes()
+            self._backfill_report_fields()
+            self._ensure_report_details_collection()
+            self.report_sparse_vectors = None
+            if settings.hybrid_search_enabled and not self._reports_have_sparse_vectors():
+                print(f"⚠️  {settings.trash_reports_collection} has no sparse vector, report search stays dense-only "
+                      f"(run `python ai-services/qdrant/migrations.py enable-hybrid`)")
             
             # Users Collection (handled by UserService)
             if "users" in existing_names:
@@ -119,14 +273,12 @@ class EcoSynkVectorStore:
             
             if recreate or "campaigns" not in existing_names:
                 print(f"📦 Creating collection: campaigns")
+                tuning = collection_tuning("campaigns")
                 self.client.create_collection(
                     collection_name="campaigns",
-                    vectors_config=VectorParams(
-                        size=settings.embedding_dimension,
-                        distance=Distance.COSINE
-                    )
+                    **tuning.create_collection_kwargs()
                 )
-                print(f"✅ Created: campaigns")
+                print(f"✅ Created: campaigns ({tuning.quantization} quantization, m={tuning.m})")
             
             print("\n🎉 All collections ready!")
             
@@ -134,6 +286,103 @@ class EcoSynkVectorStore:
             print(f"❌ Error setting up collections: {e}")
             raise
     
+    def _ensure_report_indexes(self, collection: Optional[str] = None):
+        """Create the payload indexes used to filter trash reports server-side (in `collection` if given)"""
+        for field_name, schema in REPORT_PAYLOAD_INDEXES.items():
+            try:
+                self.client.create_payload_index(
+                    collection_name=collection or settings.trash_reports_collection,
+                    field_name=field_name,
+                    field_schema=schema
+                )
+                print(f"   ✓ Configured {schema.value} index for report field '{field_name}'")
+            except Exception as e:
+                message = str(e).lower()
+                if "already exists" in message:
+                    print(f"   ✓ Index already present for report field '{field_name}'")
+                else:
+                    print(f"   ⚠️  Could not create trash report index on '{field_name}': {e}")
+    
+    def _backfill_report_fields(self):
+        """
+        Backfill the indexed report fields if some stored reports predate them
+
+        Listing orders by timestamp_epoch and filters on the top-level location,
+        so reports missing those would silently drop out of GET /trash-reports.
+        Counting them is one indexed request; the backfill only runs when needed.
+        """
+        missing = self.client.count(
+            collection_name=settings.trash_reports_collection,
+            count_filter=_unbackfilled_report_filter(),
+            exact=True
+        ).count
+        if not missing:
+            return
+        print(f"🔧 {missing} trash reports lack indexed fields, backfilling")
+        # Imported here: migrations builds on this module
+        from qdrant.migrations import backfill_report_index_fields
+        backfill_report_index_fields(self)
+    
+    def build_report_filter(
+        self,
+        location_filter: Optional[Dict[str, Any]] = None,
+        time_window_days: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Filter]:
+        """
+        Build a Qdrant filter for trash reports from indexed payload fields
+        
+        Args:
+            location_filter: Optional dict with 'lat', 'lon' and 'radius_km'
+            time_window_days: Only include reports from the last N days
+            filters: Exact matches on primary_material, user_id, report_id or
+                environmental_risk_level (a list value matches any of its items)
+            
+        Returns:
+            Filter, or None when there are no conditions
+        """
+        conditions = []
+        
+        if location_filter:
+            lat = location_filter.get('lat')
+            lon = location_filter.get('lon')
+            radius_km = location_filter.get('radius_km', 5.0)
+            if lat is not None and lon is not None:
+                try:
+                    conditions.append(
+                        FieldCondition(
+                            key="location",
+                            geo_radius=GeoRadius(
+                                center=GeoPoint(lat=lat, lon=lon),
+                                radius=radius_km * 1000
+                            )
+                        )
+                    )
+                    print(f"   Using geo filter for reports: {radius_km}km radius")
+                except Exception as geo_error:
+                    print(f"   ⚠️  Failed to apply geo filter: {geo_error}")
+        
+        if time_window_days:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=time_window_days)
+            conditions.append(
+                FieldCondition(
+                    key=TIMESTAMP_EPOCH_FIELD,
+                    range=Range(gte=int(cutoff.timestamp()))
+                )
+            )
+        
+        for key in REPORT_KEYWORD_FILTERS:
+            value = (filters or {}).get(key)
+            if value is None or value == '' or value == []:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                match = MatchAny(any=[str(item) for item in value])
+            else:
+                match = MatchValue(value=str(value))
+            conditions.append(FieldCondition(key=key, match=match))
+        
+        return Filter(must=conditions) if conditions else None
+    
     def store_trash_report(
         self, 
         embedding: List[float],
@@ -155,36 +404,29 @@ class EcoSynkVectorStore:
             report_id = str(uuid.uuid4())
         
         try:
-            # Add timestamp if not present
-            if 'timestamp' not in metadata:
-                metadata['timestamp'] = datetime.now(timezone.utc).isoformat()
-            
-            # Store the report_id in metadata for retrieval
-            metadata['report_id'] = report_id
-
-            # Ensure location is available at top-level for geo queries
-            location = metadata.get('location')
-            if not location or location.get('lat') is None or location.get('lon') is None:
-                nested_location = metadata.get('metadata', {}).get('location') if isinstance(metadata.get('metadata'), dict) else None
-                if nested_location and nested_location.get('lat') is not None and nested_location.get('lon') is not None:
-                    try:
-                        metadata['location'] = {
-                            'lat': float(nested_location['lat']),
-                            'lon': float(nested_location['lon'])
-                        }
-                    except (TypeError, ValueError):
-                        pass  # Leave location unset if conversion fails
+            _prepare_report_payload(metadata, report_id)
+            payload, details = _split_report_payload(metadata)
             
             point = PointStruct(
-                id=str(uuid.uuid4()),  # Use UUID for Qdrant
-                vector=embedding,
-                payload=metadata
+                id=point_id_for(report_id),
+                vector=_report_vectors(embedding, metadata, self._reports_have_sparse_vectors()),
+                payload=payload
             )
             
-            self.client.upsert(
-                collection_name=settings.trash_reports_collection,
-                points=[point]
-            )
+            try:
+                if details:
+                    # Details first, so a v2 report is never visible without them
+                    self._ensure_report_details_collection()
+                    self.client.upsert(
+                        collection_name=settings.report_details_collection,
+                        points=[_report_details_point(report_id, details)]
+                    )
+                self.client.upsert(
+                    collection_name=settings.trash_reports_collection,
+                    points=[point]
+                )
+            finally:
+                self._reports_changed()
             
             print(f"✅ Stored report: {report_id}")
             return report_id
@@ -193,13 +435,170 @@ class EcoSynkVectorStore:
             print(f"❌ Error storing report: {e}")
             raise
     
+    def store_trash_reports_batch(
+        self,
+        reports: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        wait: bool = True,
+        parallel: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Store many trash reports with chunked upserts
+        
+        Args:
+            reports: Items with 'embedding', 'metadata' and an optional 'report_id'
+            chunk_size: Points per upsert request (uses settings if not provided)
+            wait: Wait for Qdrant to apply each chunk; False returns once chunks are accepted
+            parallel: Chunks uploaded concurrently (uses settings if not provided)
+            
+        Returns:
+            Dict with per-item 'report_ids' (None where the item failed), 'stored' count
+            and 'failed' entries of {index, report_id, error}
+        """
+        chunk_size = max(1, chunk_size or settings.qdrant_upsert_chunk_size)
+        parallel = max(1, parallel or settings.qdrant_upsert_parallelism)
+        
+        report_ids: List[Optional[str]] = [None] * len(reports)
+        failed: List[Dict[str, Any]] = []
+        points: List[PointStruct] = []
+        details_points: List[Optional[PointStruct]] = []
+        indices: List[int] = []
+        sparse = self._reports_have_sparse_vectors()
+        
+        # Normalize every report up front; bad items are reported, not fatal
+        for index, item in enumerate(reports):
+            report_id = item.get('report_id') or str(uuid.uuid4())
+            try:
+                embedding = item.get('embedding')
+                if not embedding or len(embedding) != settings.embedding_dimension:
+                    raise ValueError(
+                        f"embedding must have {settings.embedding_dimension} dimensions"
+                    )
+                metadata = dict(item.get('metadata') or {})
+                _prepare_report_payload(metadata, report_id)
+                payload, details = _split_report_payload(metadata)
+                points.append(PointStruct(
+                    id=point_id_for(report_id),
+                    vector=_report_vectors(list(embedding), metadata, sparse),
+                    payload=payload
+                ))
+                details_points.append(_report_details_point(report_id, details) if details else None)
+                indices.append(index)
+                report_ids[index] = report_id
+            except Exception as e:
+                failed.append({'index': index, 'report_id': report_id, 'error': str(e)})
+        
+        chunks = [
+            (points[start:start + chunk_size], indices[start:start + chunk_size], details_points[start:start + chunk_size])
+            for start in range(0, len(points), chunk_size)
+        ]
+        if any(details_points):
+            self._ensure_report_details_collection()
+        
+        def upload(chunk_points: List[PointStruct], chunk_details: List[Optional[PointStruct]]):
+            chunk_details = [point for point in chunk_details if point is not None]
+            if chunk_details:
+                self.client.upsert(
+                    collection_name=settings.report_details_collection,
+                    points=chunk_details,
+                    wait=True
+                )
+            self.client.upsert(
+                collection_name=settings.trash_reports_collection,
+                points=chunk_points,
+                wait=wait
+            )
+        
+        if parallel > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(parallel, len(chunks))) as pool:
+                outcomes = list(pool.map(lambda chunk: _capture_error(upload, chunk[0], chunk[2]), chunks))
+        else:
+            outcomes = [_capture_error(upload, chunk_points, chunk_details) for chunk_points, _, chunk_details in chunks]
+        if chunks:
+            # With wait=False Qdrant may apply chunks after this; the cache TTL bounds that window
+            self._reports_changed()
+        
+        for (chunk_points, chunk_indices, _), error in zip(chunks, outcomes):
+            if error is None:
+                continue
+            print(f"❌ Error storing report chunk ({len(chunk_points)} reports): {error}")
+            for index in chunk_indices:
+                failed.append({'index': index, 'report_id': report_ids[index], 'error': str(error)})
+                report_ids[index] = None
+        
+        failed.sort(key=lambda entry: entry['index'])
+        stored = len(reports) - len(failed)
+        print(f"✅ Stored {stored}/{len(reports)} reports in {len(chunks)} chunk(s)")
+        return {
+            'report_ids': report_ids,
+            'stored': stored,
+            'failed': failed
+        }
+    
+    def get_reports_by_ids(self, report_ids: List[str], with_details: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch trash reports by report ID with a single point retrieve
+        
+        Args:
+            report_ids: Business report IDs
+            with_details: Also join v2 reports with their details (geocoder context,
+                YOLO output, analysis metadata) with one more retrieve
+            
+        Returns:
+            Reports that exist, in the order requested, in the v1 shape (see
+            report_schema.expand_report_payload) whichever schema they are stored in
+        """
+        if not report_ids:
+            return []
+        try:
+            points = self.client.retrieve(
+                collection_name=settings.trash_reports_collection,
+                ids=[point_id_for(report_id) for report_id in report_ids],
+                with_payload=True,
+                with_vectors=False
+            )
+            by_id = {str(point.id): point.payload for point in points}
+            details = self._fetch_report_details(by_id) if with_details else {}
+            return _expand_reports(report_ids, by_id, details)
+        except Exception as e:
+            print(f"❌ Error fetching reports: {e}")
+            return []
+    
+    def _fetch_report_details(self, payloads_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Details blobs of the v2 reports among fetched payloads, in one retrieve
+        
+        Returns:
+            Details by point ID; empty if the details collection cannot be read,
+            so callers fall back to the summary
+        """
+        detail_ids = _report_detail_ids(payloads_by_id)
+        if not detail_ids:
+            return {}
+        try:
+            points = self.client.retrieve(
+                collection_name=settings.report_details_collection, ids=detail_ids, with_payload=True
+            )
+        except Exception as e:
+            print(f"⚠️  Could not read report details: {e}")
+            return {}
+        return {str(point.id): point.payload for point in points}
+    
+    def get_report_by_id(self, report_id: str, with_details: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a specific trash report by report ID"""
+        reports = self.get_reports_by_ids([report_id], with_details=with_details)
+        return reports[0] if reports else None
+    
     def find_similar_reports(
         self,
         embedding: List[float],
         limit: int = 10,
         score_threshold: float = 0.7,
         location_filter: Optional[Dict[str, Any]] = None,
-        time_window_days: Optional[int] = None
+        time_window_days: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """
         Find similar trash reports (for hotspot detection)
@@ -210,74 +609,36 @@ class EcoSynkVectorStore:
             score_threshold: Minimum similarity score (0-1)
             location_filter: Optional geographic filter
             time_window_days: Optional filter for recent reports
+            filters: Optional exact matches on indexed fields (see build_report_filter)
+            fields: Payload fields to return (all if None)
+            with_details: Join v2 reports with their details (None = when `fields` needs them)
             
         Returns:
-            List of similar reports with scores
+            List of similar reports with scores, each report in the v1 shape
+            (see report_schema.expand_report_payload)
         """
         try:
-            conditions = []
-
-            if location_filter:
-                lat = location_filter.get('lat')
-                lon = location_filter.get('lon')
-                radius_km = location_filter.get('radius_km', 5.0)
-                if lat is not None and lon is not None:
-                    try:
-                        conditions.append(
-                            FieldCondition(
-                                key="location",
-                                geo_radius=GeoRadius(
-                                    center=GeoPoint(lat=lat, lon=lon),
-                                    radius=radius_km * 1000
-                                )
-                            )
-                        )
-                        print(f"   Using geo filter for reports: {radius_km}km radius")
-                    except Exception as geo_error:
-                        print(f"   ⚠️  Failed to apply geo filter: {geo_error}")
-
-            query_filter = Filter(must=conditions) if conditions else None
+            query_filter = self.build_report_filter(
+                location_filter=location_filter,
+                time_window_days=time_window_days,
+                filters=filters
+            )
 
-            # Note: Time filtering done in post-processing because timestamps are strings
+            # All conditions run inside Qdrant, so exactly `limit` points are fetched
             results = self.client.query_points(
                 collection_name=settings.trash_reports_collection,
                 query=embedding,
-                limit=limit * 2,  # Get more results for post-filtering
+                search_params=search_params_for(settings.trash_reports_collection),
+                limit=limit,
                 score_threshold=score_threshold,
-                query_filter=query_filter
+                query_filter=query_filter,
+                with_payload=_report_payload_selector(fields)
             ).points
             
-            # Format results and apply time filter in post-processing
-            formatted_results = []
-            
-            # Calculate cutoff date if time filter specified
-            cutoff_date = None
-            if time_window_days:
-                cutoff_date = datetime.now(timezone.utc) - timedelta(days=time_window_days)
-            
-            for result in results:
-                # Apply time filter if specified
-                if cutoff_date:
-                    timestamp_str = result.payload.get('timestamp') or result.payload.get('metadata', {}).get('analyzed_at')
-                    if timestamp_str:
-                        try:
-                            report_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                            if report_date.tzinfo is None:
-                                report_date = report_date.replace(tzinfo=timezone.utc)
-                            if report_date < cutoff_date:
-                                continue  # Skip reports older than cutoff
-                        except:
-                            pass  # If parsing fails, include the report
-                
-                formatted_results.append({
-                    'id': result.id,
-                    'score': result.score,
-                    'data': result.payload
-                })
-                
-                # Stop when we have enough results
-                if len(formatted_results) >= limit:
-                    break
+            details = {}
+            if _wants_report_details(fields, with_details):
+                details = self._fetch_report_details({str(result.id): result.payload for result in results})
+            formatted_results = _format_report_matches(results, details, fields)
             
             print(f"🔍 Found {len(formatted_results)} similar reports")
             return formatted_results
@@ -286,6 +647,151 @@ class EcoSynkVectorStore:
             print(f"❌ Error searching reports: {e}")
             return []
     
+    def _report_query_requests(
+        self,
+        embedding: List[float],
+        searches: List[Dict[str, Any]],
+        limit: int,
+        sparse_query: Optional[SparseVector] = None,
+        fields: PayloadFields = None
+    ) -> List[QueryRequest]:
+        """
+        One QueryRequest per search (keys: score_threshold, location_filter, time_window_days, filters)
+        
+        With a sparse query each request fuses a dense and a sparse prefetch with
+        RRF; the score threshold then applies to the dense candidates only, so
+        exact term matches are found however low their cosine similarity.
+        """
+        params = search_params_for(settings.trash_reports_collection)
+        prefetch_limit = limit * max(1, settings.hybrid_prefetch_multiplier)
+        requests = []
+        for search in searches:
+            query_filter = self.build_report_filter(
+                location_filter=search.get('location_filter'),
+                time_window_days=search.get('time_window_days'),
+                filters=search.get('filters')
+            )
+            if sparse_query is None:
+                requests.append(QueryRequest(
+                    query=embedding,
+                    filter=query_filter,
+                    params=params,
+                    score_threshold=search.get('score_threshold'),
+                    limit=limit,
+                    with_payload=_report_payload_selector(fields)
+                ))
+                continue
+            requests.append(QueryRequest(
+                prefetch=[
+                    Prefetch(
+                        query=embedding,
+                        filter=query_filter,
+                        params=params,
+                        score_threshold=search.get('score_threshold'),
+                        limit=prefetch_limit
+                    ),
+                    Prefetch(
+                        query=sparse_query,
+                        using=settings.report_sparse_vector_name,
+                        filter=query_filter,
+                        limit=prefetch_limit
+                    ),
+                ],
+                query=FusionQuery(fusion=Fusion.RRF),
+                limit=limit,
+                with_payload=_report_payload_selector(fields)
+            ))
+        return requests
+    
+    def _report_sparse_query(self, query_text: Optional[str]) -> Optional[SparseVector]:
+        """Sparse query vector for hybrid report search, or None to search dense-only"""
+        if not query_text or not self._reports_have_sparse_vectors():
+            return None
+        return query_sparse_vector(query_text)
+    
+    def find_similar_reports_batch(
+        self,
+        embedding: List[float],
+        searches: List[Dict[str, Any]],
+        limit: int = 10,
+        sparse_query: Optional[SparseVector] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several report searches for one embedding in a single round trip
+        (plus one details retrieve for all of them when v2 reports need joining)
+        
+        Args:
+            embedding: Query vector
+            searches: Dicts of find_similar_reports arguments (score_threshold,
+                location_filter, time_window_days, filters)
+            limit: Maximum number of results per search
+            sparse_query: Optional sparse query vector; when given, results are
+                ranked by RRF fusion of dense and sparse matches
+            fields: Payload fields to return (all if None)
+            with_details: Join v2 reports with their details (None = when `fields` needs them)
+            
+        Returns:
+            One result list per search, formatted like find_similar_reports
+        """
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=settings.trash_reports_collection,
+                requests=self._report_query_requests(embedding, searches, limit, sparse_query, fields)
+            )
+            details = {}
+            if _wants_report_details(fields, with_details):
+                details = self._fetch_report_details(_match_payloads(responses))
+            return [_format_report_matches(response.points, details, fields) for response in responses]
+            
+        except Exception as e:
+            print(f"❌ Error searching reports: {e}")
+            return [[] for _ in searches]
+    
+    def search_reports_with_fallbacks(
+        self,
+        embedding: List[float],
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        location_filter: Optional[Dict[str, Any]] = None,
+        time_window_days: Optional[int] = None,
+        query_text: Optional[str] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Report search that broadens itself when nothing matches, in one round trip
+        
+        Tiers, first non-empty wins: the requested threshold; the threshold
+        lowered to FALLBACK_SCORE_THRESHOLD; then without the location filter.
+        For dense-only search, results at the requested threshold are the top of
+        the lowered-threshold search, so both come from one query; the
+        no-location tier is batched alongside it.
+        
+        Args:
+            embedding: Query vector
+            limit: Maximum number of results
+            score_threshold: Requested minimum similarity score
+            location_filter: Optional dict with 'lat', 'lon' and 'radius_km'
+            time_window_days: Optional filter for recent reports
+            query_text: Search text; enables hybrid (sparse + dense, RRF-fused)
+                ranking when the collection has sparse vectors
+            fields: Payload fields to return (all if None)
+            with_details: Join v2 reports with their details (None = when `fields` needs them)
+            
+        Returns:
+            Dict with 'results', 'effective_score_threshold', 'fallback_notes'
+            and 'hybrid' (whether results are RRF-fused; scores are then fusion scores)
+        """
+        sparse_query = self._report_sparse_query(query_text)
+        hybrid = sparse_query is not None
+        searches = _fallback_searches(score_threshold, location_filter, time_window_days, hybrid)
+        tiers = self.find_similar_reports_batch(
+            embedding, searches, limit=limit, sparse_query=sparse_query, fields=fields, with_details=with_details
+        )
+        return _select_fallback_tier(tiers, score_threshold, hybrid)
+    
     def store_volunteer_profile(
         self,
         embedding: List[float],
@@ -295,10 +801,14 @@ class EcoSynkVectorStore:
         """
         Store a volunteer profile with vector embedding
         
+        The point ID is derived from the user ID, so re-profiling a volunteer
+        overwrites their profile (keeping account fields such as email) instead
+        of adding a duplicate.
+        
         Args:
             embedding: Vector embedding of skills/experience
             profile_data: Volunteer information
-            user_id: Optional custom ID (for reference in metadata)
+            user_id: Optional custom ID (auto-generated if not provided)
             
         Returns:
             The user ID (as string)
@@ -307,23 +817,25 @@ class EcoSynkVectorStore:
             user_id = str(uuid.uuid4())
         
         try:
-            # Ensure required fields
-            if 'created_at' not in profile_data:
-                profile_data['created_at'] = datetime.now(timezone.utc).isoformat()
-            
-            # Store the user_id in metadata for retrieval
-            profile_data['user_id'] = user_id
-            
+            point_id = point_id_for(user_id)
+            existing = self.client.retrieve(
+                collection_name=settings.volunteer_profiles_collection,
+                ids=[point_id],
+                with_payload=True,
+                with_vectors=False
+            )
             point = PointStruct(
-                id=str(uuid.uuid4()),  # Use UUID for Qdrant
+                id=point_id,
                 vector=embedding,
-                payload=profile_data
+                payload=_volunteer_payload(existing, profile_data, user_id)
             )
             
             self.client.upsert(
                 collection_name=settings.volunteer_profiles_collection,
                 points=[point]
             )
+            if self.user_replica is not None:
+                self.user_replica.upsert([point])
             
             print(f"✅ Stored volunteer profile: {user_id}")
             return user_id
@@ -356,99 +868,129 @@ class EcoSynkVectorStore:
             List of matched volunteers with scores
         """
         try:
-            # Build filter conditions
-            conditions = []
-            
-            # Geographic filter using Qdrant's geo-radius
-            if location and location.get('lat') and location.get('lon'):
-                try:
-                    conditions.append(
-                        FieldCondition(
-                            key="location",
-                            geo_radius=GeoRadius(
-                                center=GeoPoint(
-                                    lon=location['lon'],
-                                    lat=location['lat']
-                                ),
-                                radius=radius_km * 1000  # Convert to meters
-                            )
-                        )
-                    )
-                    print(f"   Using Qdrant geo-filter: {radius_km}km radius")
-                except Exception as e:
-                    print(f"   ⚠️  Geo-filter failed, using post-processing: {e}")
-            
-            # Additional filters
-            if filters:
-                if filters.get('available'):
-                    conditions.append(
-                        FieldCondition(
-                            key="available",
-                            match=MatchValue(value=True)
-                        )
-                    )
-                
-                if filters.get('min_experience_level'):
-                    conditions.append(
-                        FieldCondition(
-                            key="experience_level",
-                            range=Range(gte=filters['min_experience_level'])
-                        )
-                    )
-            
-            query_filter = Filter(must=conditions) if conditions else None
-            
-            results = self.client.query_points(
-                collection_name=settings.volunteer_profiles_collection,
-                query=task_embedding,
-                limit=limit,
-                score_threshold=min_match_score,
-                query_filter=query_filter
-            ).points
-            
-            # Format results and filter by distance (post-processing)
-            import math
-            
-            def calculate_distance(lat1, lon1, lat2, lon2):
-                """Calculate distance in km using Haversine formula"""
-                R = 6371  # Earth's radius in km
-                dlat = math.radians(lat2 - lat1)
-                dlon = math.radians(lon2 - lon1)
-                a = (math.sin(dlat/2) * math.sin(dlat/2) +
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-                     math.sin(dlon/2) * math.sin(dlon/2))
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                return R * c
-            
-            formatted_results = []
-            for result in results:
-                volunteer_data = result.payload.copy()
-                volunteer_data['match_score'] = result.score
-                volunteer_data['user_id'] = result.id
-                
-                # Calculate distance if location provided
-                if location and location.get('lat') and location.get('lon'):
-                    vol_loc = volunteer_data.get('location', {})
-                    if vol_loc.get('lat') and vol_loc.get('lon'):
-                        distance = calculate_distance(
-                            location['lat'], location['lon'],
-                            vol_loc['lat'], vol_loc['lon']
-                        )
-                        volunteer_data['distance_km'] = round(distance, 2)
-                        
-                        # Filter by radius
-                        if distance > radius_km:
-                            continue
-                
-                formatted_results.append(volunteer_data)
-            
+            replica = self._readable_user_replica()
+            if replica:
+                results = _replica_volunteer_search(replica, task_embedding, location, radius_km, limit, min_match_score, filters)
+            else:
+                results = self.client.query_points(
+                    collection_name=settings.volunteer_profiles_collection,
+                    query=task_embedding,
+                    search_params=search_params_for(settings.volunteer_profiles_collection),
+                    limit=limit,
+                    score_threshold=min_match_score,
+                    query_filter=_volunteer_filter(location, radius_km, filters)
+                ).points
+
+            formatted_results = _format_volunteer_matches(results, location, radius_km)
             print(f"👥 Found {len(formatted_results)} matching volunteers")
             return formatted_results
-            
+
         except Exception as e:
             print(f"❌ Error searching volunteers: {e}")
             return []
     
+    def iter_points(
+        self,
+        collection: str,
+        scroll_filter: Optional[Filter] = None,
+        fields: PayloadFields = None,
+        page_size: int = 256,
+        offset: Optional[Any] = None
+    ) -> Iterator[Record]:
+        """
+        Lazily iterate over every point in a collection (see iter_collection_points)
+        
+        Args:
+            collection: Collection name
+            scroll_filter: Optional Qdrant filter
+            fields: Payload fields to return (all if None, none if False)
+            page_size: Points fetched per scroll request
+            offset: Point ID to resume from (a cursor returned by scroll_page)
+        """
+        return iter_collection_points(self.client, collection, scroll_filter, fields, page_size, offset)
+    
+    def scroll_page(
+        self,
+        collection: str,
+        scroll_filter: Optional[Filter] = None,
+        fields: PayloadFields = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Record], Optional[str]]:
+        """
+        Fetch one page of points for cursor-based API pagination
+        
+        Args:
+            collection: Collection name
+            scroll_filter: Optional Qdrant filter
+            fields: Payload fields to return (all if None, none if False)
+            limit: Page size
+            cursor: Cursor from the previous page (None for the first page)
+            
+        Returns:
+            Tuple of (points, next cursor or None when exhausted)
+        """
+        points, next_offset = self.client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=limit,
+            offset=cursor or None,
+            with_payload=_payload_selector(fields),
+            with_vectors=False
+        )
+        return points, (str(next_offset) if next_offset is not None else None)
+    
+    def list_reports_page(
+        self,
+        scroll_filter: Optional[Filter] = None,
+        fields: PayloadFields = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        with_details: Optional[bool] = None
+    ) -> Tuple[List[Record], Optional[str]]:
+        """
+        Fetch one page of trash reports, newest first
+        
+        Ordering uses the indexed timestamp_epoch field, so the cursor is
+        "<epoch>:<n>" - resume at that timestamp, skipping the n reports with
+        the same timestamp that were already returned.
+        
+        Args:
+            with_details: Join v2 reports with their details (None = when `fields` needs them)
+        
+        Returns:
+            Tuple of (points with payloads in the v1 shape, next cursor or None when exhausted)
+        """
+        start_from = None
+        skip = 0
+        if cursor:
+            try:
+                epoch, _, seen = cursor.partition(':')
+                start_from, skip = int(epoch), int(seen or 0)
+            except ValueError:
+                raise ValueError(f"Invalid cursor: {cursor}")
+        
+        points, _ = self.client.scroll(
+            collection_name=settings.trash_reports_collection,
+            scroll_filter=scroll_filter,
+            limit=limit + skip + 1,
+            order_by=OrderBy(key=TIMESTAMP_EPOCH_FIELD, direction=Direction.DESC, start_from=start_from),
+            with_payload=_report_payload_selector(fields),
+            with_vectors=False
+        )
+        page = points[skip:skip + limit]
+        details = {}
+        if _wants_report_details(fields, with_details):
+            details = self._fetch_report_details({str(point.id): point.payload for point in page})
+        for point in page:
+            point.payload = _expand_report_result(point.payload, details.get(str(point.id)), fields)
+        if len(points) <= skip + limit or not page:
+            return page, None
+        
+        last_epoch = int(page[-1].order_value)
+        same_epoch = sum(1 for point in points[:skip + limit] if int(point.order_value) == last_epoch)
+        return page, f"{last_epoch}:{same_epoch}"
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about stored data"""
         try:
@@ -476,10 +1018,38 @@ class EcoSynkVectorStore:
             print(f"❌ Error getting stats: {e}")
             return {}
     
-    def store_campaign(
+    def count_points(self, collection: str, query_filter: Optional[Filter] = None) -> int:
+        """Exact number of points in a collection matching an optional filter (one count request)"""
+        return self.client.count(collection_name=collection, count_filter=query_filter, exact=True).count
+    
+    def facet_counts(
         self,
-        embedding: List[float],
-        campaign_data: Dict[str, Any],
+        collection: str,
+        key: str,
+        query_filter: Optional[Filter] = None,
+        limit: int = FACET_VALUE_LIMIT
+    ) -> Dict[Any, int]:
+        """
+        Points per value of an indexed payload field (one facet request)
+        
+        Args:
+            collection: Collection to aggregate
+            key: Payload field (needs a keyword/integer/bool index on a Qdrant server)
+            query_filter: Only count points matching this filter
+            limit: Most frequent values returned; rarer values are left out
+            
+        Returns:
+            Dict of value -> point count (points without the field are not counted)
+        """
+        response = self.client.facet(
+            collection_name=collection, key=key, facet_filter=query_filter, limit=limit, exact=True
+        )
+        return {hit.value: hit.count for hit in response.hits}
+    
+    def store_campaign(
+        self,
+        embedding: List[float],
+        campaign_data: Dict[str, Any],
         campaign_id: str
     ) -> str:
         """
@@ -494,8 +1064,9 @@ class EcoSynkVectorStore:
             The campaign ID
         """
         try:
-            # Use UUID for Qdrant point ID, store campaign_id in payload
-            point_id = str(uuid.uuid4())
+            # Point ID is derived from campaign_id so lookups are a single retrieve
+            point_id = point_id_for(campaign_id)
+            campaign_data.setdefault('campaign_id', campaign_id)
             
             self.client.upsert(
                 collection_name="campaigns",
@@ -518,15 +1089,7 @@ class EcoSynkVectorStore:
     def get_all_campaigns(self) -> List[Dict[str, Any]]:
         """Get all campaigns from Qdrant"""
         try:
-            results = self.client.scroll(
-                collection_name="campaigns",
-                limit=100,
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            campaigns = [point.payload for point in results[0]]
-            return campaigns
+            return [point.payload for point in self.iter_points("campaigns")]
             
         except Exception as e:
             print(f"❌ Error fetching campaigns: {e}")
@@ -535,26 +1098,14 @@ class EcoSynkVectorStore:
     def get_active_campaigns(self) -> List[Dict[str, Any]]:
         """Get all active campaigns (not expired, status='active')"""
         try:
-            all_campaigns = self.get_all_campaigns()
             now = datetime.now(timezone.utc)
-            
-            active = []
-            for campaign in all_campaigns:
-                try:
-                    end_date_str = campaign.get('timeline', {}).get('end_date')
-                    if not end_date_str:
-                        continue
-                    
-                    end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
-                    if end_date.tzinfo is None:
-                        end_date = end_date.replace(tzinfo=timezone.utc)
-                    status = campaign.get('status', 'unknown')
-                    
-                    if end_date > now and status == 'active':
-                        active.append(campaign)
-                except:
-                    continue
-            
+
+            # Stream campaigns page by page, keeping only the active ones
+            active = [
+                point.payload for point in self.iter_points("campaigns")
+                if _is_active_campaign(point.payload, now)
+            ]
+
             # Sort by creation date (newest first)
             active.sort(key=lambda c: c.get('created_at', ''), reverse=True)
             return active
@@ -566,16 +1117,898 @@ class EcoSynkVectorStore:
     def get_campaign_by_id(self, campaign_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific campaign by ID"""
         try:
-            all_campaigns = self.get_all_campaigns()
-            for campaign in all_campaigns:
-                if campaign.get('campaign_id') == campaign_id:
-                    return campaign
+            points = self.client.retrieve(
+                collection_name="campaigns",
+                ids=[point_id_for(campaign_id)],
+                with_payload=True,
+                with_vectors=False
+            )
+            return points[0].payload if points else None
+        except Exception as e:
+            print(f"❌ Error fetching campaign: {e}")
             return None
+
+    # ------------------------------------------------------------------
+    # Async variants (AsyncQdrantClient), awaited directly by the API server
+    # so concurrent requests overlap their Qdrant round trips
+    # ------------------------------------------------------------------
+
+    async def astore_trash_report(
+        self,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+        report_id: Optional[str] = None
+    ) -> str:
+        """Async variant of store_trash_report"""
+        if report_id is None:
+            report_id = str(uuid.uuid4())
+
+        try:
+            _prepare_report_payload(metadata, report_id)
+            payload, details = _split_report_payload(metadata)
+            vector = _report_vectors(embedding, metadata, await self._areports_have_sparse_vectors())
+            try:
+                if details:
+                    await self._aensure_report_details_collection()
+                    await self.aclient.upsert(
+                        collection_name=settings.report_details_collection,
+                        points=[_report_details_point(report_id, details)]
+                    )
+                await self.aclient.upsert(
+                    collection_name=settings.trash_reports_collection,
+                    points=[PointStruct(id=point_id_for(report_id), vector=vector, payload=payload)]
+                )
+            finally:
+                self._reports_changed()
+
+            print(f"✅ Stored report: {report_id}")
+            return report_id
+
+        except Exception as e:
+            print(f"❌ Error storing report: {e}")
+            raise
+
+    async def aget_reports_by_ids(self, report_ids: List[str], with_details: bool = False) -> List[Dict[str, Any]]:
+        """Async variant of get_reports_by_ids"""
+        if not report_ids:
+            return []
+        try:
+            points = await self.aclient.retrieve(
+                collection_name=settings.trash_reports_collection,
+                ids=[point_id_for(report_id) for report_id in report_ids],
+                with_payload=True,
+                with_vectors=False
+            )
+            by_id = {str(point.id): point.payload for point in points}
+            details = await self._afetch_report_details(by_id) if with_details else {}
+            return _expand_reports(report_ids, by_id, details)
+        except Exception as e:
+            print(f"❌ Error fetching reports: {e}")
+            return []
+
+    async def _afetch_report_details(self, payloads_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Async variant of _fetch_report_details"""
+        detail_ids = _report_detail_ids(payloads_by_id)
+        if not detail_ids:
+            return {}
+        try:
+            points = await self.aclient.retrieve(
+                collection_name=settings.report_details_collection, ids=detail_ids, with_payload=True
+            )
+        except Exception as e:
+            print(f"⚠️  Could not read report details: {e}")
+            return {}
+        return {str(point.id): point.payload for point in points}
+
+    async def aget_report_by_id(self, report_id: str, with_details: bool = False) -> Optional[Dict[str, Any]]:
+        """Async variant of get_report_by_id"""
+        reports = await self.aget_reports_by_ids([report_id], with_details=with_details)
+        return reports[0] if reports else None
+
+    async def afind_similar_reports(
+        self,
+        embedding: List[float],
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        location_filter: Optional[Dict[str, Any]] = None,
+        time_window_days: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of find_similar_reports"""
+        try:
+            response = await self.aclient.query_points(
+                collection_name=settings.trash_reports_collection,
+                query=embedding,
+                search_params=search_params_for(settings.trash_reports_collection),
+                limit=limit,
+                score_threshold=score_threshold,
+                query_filter=self.build_report_filter(
+                    location_filter=location_filter,
+                    time_window_days=time_window_days,
+                    filters=filters
+                ),
+                with_payload=_report_payload_selector(fields)
+            )
+
+            details = {}
+            if _wants_report_details(fields, with_details):
+                details = await self._afetch_report_details(
+                    {str(result.id): result.payload for result in response.points}
+                )
+            formatted_results = _format_report_matches(response.points, details, fields)
+            print(f"🔍 Found {len(formatted_results)} similar reports")
+            return formatted_results
+
+        except Exception as e:
+            print(f"❌ Error searching reports: {e}")
+            return []
+
+    async def afind_similar_reports_batch(
+        self,
+        embedding: List[float],
+        searches: List[Dict[str, Any]],
+        limit: int = 10,
+        sparse_query: Optional[SparseVector] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Async variant of find_similar_reports_batch"""
+        try:
+            responses = await self.aclient.query_batch_points(
+                collection_name=settings.trash_reports_collection,
+                requests=self._report_query_requests(embedding, searches, limit, sparse_query, fields)
+            )
+            details = {}
+            if _wants_report_details(fields, with_details):
+                details = await self._afetch_report_details(_match_payloads(responses))
+            return [_format_report_matches(response.points, details, fields) for response in responses]
+
+        except Exception as e:
+            print(f"❌ Error searching reports: {e}")
+            return [[] for _ in searches]
+
+    async def asearch_reports_with_fallbacks(
+        self,
+        embedding: List[float],
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        location_filter: Optional[Dict[str, Any]] = None,
+        time_window_days: Optional[int] = None,
+        query_text: Optional[str] = None,
+        fields: PayloadFields = None,
+        with_details: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Async variant of search_reports_with_fallbacks"""
+        sparse_query = None
+        if query_text and await self._areports_have_sparse_vectors():
+            sparse_query = query_sparse_vector(query_text)
+        hybrid = sparse_query is not None
+        searches = _fallback_searches(score_threshold, location_filter, time_window_days, hybrid)
+        tiers = await self.afind_similar_reports_batch(
+            embedding, searches, limit=limit, sparse_query=sparse_query, fields=fields, with_details=with_details
+        )
+        return _select_fallback_tier(tiers, score_threshold, hybrid)
+
+    async def astore_volunteer_profile(
+        self,
+        embedding: List[float],
+        profile_data: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> str:
+        """Async variant of store_volunteer_profile"""
+        if user_id is None:
+            user_id = str(uuid.uuid4())
+
+        try:
+            point_id = point_id_for(user_id)
+            existing = await self.aclient.retrieve(
+                collection_name=settings.volunteer_profiles_collection,
+                ids=[point_id],
+                with_payload=True,
+                with_vectors=False
+            )
+            point = PointStruct(
+                id=point_id,
+                vector=embedding,
+                payload=_volunteer_payload(existing, profile_data, user_id)
+            )
+            await self.aclient.upsert(
+                collection_name=settings.volunteer_profiles_collection,
+                points=[point]
+            )
+            if self.user_replica is not None:
+                self.user_replica.upsert([point])
+
+            print(f"✅ Stored volunteer profile: {user_id}")
+            return user_id
+
+        except Exception as e:
+            print(f"❌ Error storing profile: {e}")
+            raise
+
+    async def afind_nearby_volunteers(
+        self,
+        task_embedding: List[float],
+        location: Dict[str, float],
+        radius_km: float = 5.0,
+        limit: int = 10,
+        min_match_score: float = 0.5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of find_nearby_volunteers"""
+        try:
+            replica = self._readable_user_replica()
+            if replica:
+                # In-process NumPy search: no network round trip
+                results = _replica_volunteer_search(replica, task_embedding, location, radius_km, limit, min_match_score, filters)
+            else:
+                results = (await self.aclient.query_points(
+                    collection_name=settings.volunteer_profiles_collection,
+                    query=task_embedding,
+                    search_params=search_params_for(settings.volunteer_profiles_collection),
+                    limit=limit,
+                    score_threshold=min_match_score,
+                    query_filter=_volunteer_filter(location, radius_km, filters)
+                )).points
+
+            formatted_results = _format_volunteer_matches(results, location, radius_km)
+            print(f"👥 Found {len(formatted_results)} matching volunteers")
+            return formatted_results
+
+        except Exception as e:
+            print(f"❌ Error searching volunteers: {e}")
+            return []
+
+    async def acount_points(self, collection: str, query_filter: Optional[Filter] = None) -> int:
+        """Async variant of count_points"""
+        return (await self.aclient.count(collection_name=collection, count_filter=query_filter, exact=True)).count
+
+    async def afacet_counts(
+        self,
+        collection: str,
+        key: str,
+        query_filter: Optional[Filter] = None,
+        limit: int = FACET_VALUE_LIMIT
+    ) -> Dict[Any, int]:
+        """Async variant of facet_counts"""
+        response = await self.aclient.facet(
+            collection_name=collection, key=key, facet_filter=query_filter, limit=limit, exact=True
+        )
+        return {hit.value: hit.count for hit in response.hits}
+
+    async def aget_report_impact_counts(self, high_priority_score: float = 8) -> Dict[str, Any]:
+        """
+        Trash report counts behind the ESG impact metrics
+        
+        One count or facet request per bucket dimension on indexed fields, all
+        issued concurrently, so the cost does not grow with the collection.
+        
+        Args:
+            high_priority_score: Minimum cleanup_priority_score of a high priority report
+            
+        Returns:
+            Dict with 'total', 'high_priority', 'hazardous' and 'recyclable' report counts,
+            and 'volumes', 'hazardous_volumes' and 'recyclable_volumes' mapping
+            estimated_volume values to report counts
+        """
+        collection = settings.trash_reports_collection
+        hazardous = Filter(must=[FieldCondition(key="primary_material", match=MatchValue(value="hazardous"))])
+        recyclable = Filter(must=[FieldCondition(key="recyclable", match=MatchValue(value=True))])
+        high_priority = Filter(must=[FieldCondition(key="cleanup_priority_score", range=Range(gte=high_priority_score))])
+
+        (total, volumes, hazardous_count, hazardous_volumes,
+         recyclable_count, recyclable_volumes, high_priority_count) = await asyncio.gather(
+            self.acount_points(collection),
+            self.afacet_counts(collection, "estimated_volume"),
+            self.acount_points(collection, hazardous),
+            self.afacet_counts(collection, "estimated_volume", hazardous),
+            self.acount_points(collection, recyclable),
+            self.afacet_counts(collection, "estimated_volume", recyclable),
+            self.acount_points(collection, high_priority),
+        )
+        return {
+            'total': total,
+            'high_priority': high_priority_count,
+            'hazardous': hazardous_count,
+            'recyclable': recyclable_count,
+            'volumes': volumes,
+            'hazardous_volumes': hazardous_volumes,
+            'recyclable_volumes': recyclable_volumes,
+        }
+
+    def aiter_points(
+        self,
+        collection: str,
+        scroll_filter: Optional[Filter] = None,
+        fields: PayloadFields = None,
+        page_size: int = 256,
+        offset: Optional[Any] = None
+    ) -> AsyncIterator[Record]:
+        """Async variant of iter_points (see aiter_collection_points)"""
+        return aiter_collection_points(self.aclient, collection, scroll_filter, fields, page_size, offset)
+
+    async def astore_campaign(
+        self,
+        embedding: List[float],
+        campaign_data: Dict[str, Any],
+        campaign_id: str
+    ) -> str:
+        """Async variant of store_campaign"""
+        try:
+            campaign_data.setdefault('campaign_id', campaign_id)
+            await self.aclient.upsert(
+                collection_name="campaigns",
+                points=[PointStruct(id=point_id_for(campaign_id), vector=embedding, payload=campaign_data)]
+            )
+
+            print(f"✅ Stored campaign: {campaign_id}")
+            return campaign_id
+
+        except Exception as e:
+            print(f"❌ Error storing campaign: {e}")
+            raise
+
+    async def aget_all_campaigns(self) -> List[Dict[str, Any]]:
+        """Async variant of get_all_campaigns"""
+        try:
+            return [point.payload async for point in self.aiter_points("campaigns")]
+
+        except Exception as e:
+            print(f"❌ Error fetching campaigns: {e}")
+            return []
+
+    async def aget_active_campaigns(self) -> List[Dict[str, Any]]:
+        """Async variant of get_active_campaigns"""
+        try:
+            now = datetime.now(timezone.utc)
+            active = [
+                point.payload async for point in self.aiter_points("campaigns")
+                if _is_active_campaign(point.payload, now)
+            ]
+            active.sort(key=lambda c: c.get('created_at', ''), reverse=True)
+            return active
+
+        except Exception as e:
+            print(f"❌ Error fetching active campaigns: {e}")
+            return []
+
+    async def aget_campaign_by_id(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_campaign_by_id"""
+        try:
+            points = await self.aclient.retrieve(
+                collection_name="campaigns",
+                ids=[point_id_for(campaign_id)],
+                with_payload=True,
+                with_vectors=False
+            )
+            return points[0].payload if points else None
         except Exception as e:
             print(f"❌ Error fetching campaign: {e}")
             return None
 
 
+def iter_collection_points(
+    client: QdrantClient,
+    collection: str,
+    scroll_filter: Optional[Filter] = None,
+    fields: PayloadFields = None,
+    page_size: int = 256,
+    offset: Optional[Any] = None,
+    with_vectors: bool = False
+) -> Iterator[Record]:
+    """
+    Yield every point of a collection, one scroll page at a time
+    
+    Pages are requested lazily by following next_page_offset, so memory stays
+    bounded by page_size and callers that stop early skip the remaining pages.
+    
+    Args:
+        client: Qdrant client
+        collection: Collection name
+        scroll_filter: Optional Qdrant filter
+        fields: Payload fields to return (all if None, none if False)
+        page_size: Points fetched per scroll request
+        offset: Point ID to start from
+        with_vectors: Also fetch each point's vector
+    """
+    with_payload = _payload_selector(fields)
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors
+        )
+        yield from points
+        if offset is None:
+            return
+
+
+async def aiter_collection_points(
+    client: AsyncQdrantClient,
+    collection: str,
+    scroll_filter: Optional[Filter] = None,
+    fields: PayloadFields = None,
+    page_size: int = 256,
+    offset: Optional[Any] = None
+) -> AsyncIterator[Record]:
+    """Async variant of iter_collection_points for an AsyncQdrantClient"""
+    with_payload = _payload_selector(fields)
+    while True:
+        points, offset = await client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=False
+        )
+        for point in points:
+            yield point
+        if offset is None:
+            return
+
+
+def _volunteer_filter(
+    location: Optional[Dict[str, float]],
+    radius_km: float,
+    filters: Optional[Dict[str, Any]]
+) -> Optional[Filter]:
+    """Geo-radius, availability and experience conditions for a volunteer search"""
+    conditions = []
+
+    # Geographic filter using Qdrant's geo-radius
+    if location and location.get('lat') and location.get('lon'):
+        try:
+            conditions.append(
+                FieldCondition(
+                    key="location",
+                    geo_radius=GeoRadius(
+                        center=GeoPoint(
+                            lon=location['lon'],
+                            lat=location['lat']
+                        ),
+                        radius=radius_km * 1000  # Convert to meters
+                    )
+                )
+            )
+            print(f"   Using Qdrant geo-filter: {radius_km}km radius")
+        except Exception as e:
+            print(f"   ⚠️  Geo-filter failed, using post-processing: {e}")
+
+    # Additional filters
+    if filters:
+        if filters.get('available'):
+            conditions.append(
+                FieldCondition(
+                    key="available",
+                    match=MatchValue(value=True)
+                )
+            )
+
+        if filters.get('min_experience_level'):
+            conditions.append(
+                FieldCondition(
+                    key="experience_level",
+                    range=Range(gte=filters['min_experience_level'])
+                )
+            )
+
+    return Filter(must=conditions) if conditions else None
+
+
+def report_sparse_vectors_config() -> Optional[Dict[str, SparseVectorParams]]:
+    """Sparse vector config for the trash reports collection (IDF is applied server-side), or None if disabled"""
+    if not settings.hybrid_search_enabled:
+        return None
+    return {settings.report_sparse_vector_name: SparseVectorParams(modifier=Modifier.IDF)}
+
+
+def collection_aliases(client: QdrantClient) -> Dict[str, str]:
+    """Alias name -> collection it points to"""
+    return {alias.alias_name: alias.collection_name for alias in client.get_aliases().aliases}
+
+
+def has_report_sparse_vector(info: Any) -> bool:
+    """Whether collection info includes the report sparse vector"""
+    return settings.report_sparse_vector_name in (info.config.params.sparse_vectors or {})
+
+
+def _report_vectors(
+    embedding: List[float],
+    metadata: Dict[str, Any],
+    with_sparse: bool
+) -> Union[List[float], Dict[str, Any]]:
+    """Point vectors for a report: the dense embedding (unnamed) plus its sparse vector when enabled"""
+    if with_sparse:
+        sparse = document_sparse_vector(report_sparse_text(metadata))
+        if sparse is not None:
+            return {"": embedding, settings.report_sparse_vector_name: sparse}
+    return embedding
+
+
+def _format_report_matches(
+    points: List[Any],
+    details_by_id: Optional[Dict[str, Dict[str, Any]]] = None,
+    fields: PayloadFields = None
+) -> List[Dict[str, Any]]:
+    """Scored report points in the find_similar_reports result format"""
+    details_by_id = details_by_id or {}
+    return [
+        {
+            'id': point.id,
+            'score': point.score,
+            'data': _expand_report_result(point.payload, details_by_id.get(str(point.id)), fields)
+        }
+        for point in points
+    ]
+
+
+def _match_payloads(responses: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Payloads by point ID across several query responses"""
+    return {str(point.id): point.payload for response in responses for point in response.points}
+
+
+def _fallback_searches(
+    score_threshold: float,
+    location_filter: Optional[Dict[str, Any]],
+    time_window_days: Optional[int],
+    hybrid: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Searches covering every fallback tier (see search_reports_with_fallbacks)
+    
+    Fused (RRF) scores are not similarities, so hybrid search cannot recover
+    the requested-threshold tier from the lowered one and runs it separately.
+    """
+    floor = min(score_threshold, FALLBACK_SCORE_THRESHOLD)
+    thresholds = [score_threshold, floor] if hybrid and score_threshold > floor else [floor]
+    searches = [
+        {'score_threshold': threshold, 'location_filter': location_filter, 'time_window_days': time_window_days}
+        for threshold in thresholds
+    ]
+    if location_filter is not None:
+        searches.append({'score_threshold': floor, 'location_filter': None, 'time_window_days': time_window_days})
+    return searches
+
+
+def _select_fallback_tier(
+    tiers: List[List[Dict[str, Any]]],
+    score_threshold: float,
+    hybrid: bool = False
+) -> Dict[str, Any]:
+    """Pick the first non-empty tier from _fallback_searches results, noting each fallback taken"""
+    effective_threshold = score_threshold
+    fallback_notes = []
+    lowered = score_threshold > FALLBACK_SCORE_THRESHOLD
+
+    if not hybrid:
+        # The requested tier is the top of the lowered-threshold search
+        tiers = [[item for item in tiers[0] if item['score'] >= score_threshold]] + tiers[:1 if lowered else 0] + tiers[1:]
+
+    results = tiers[0]
+    next_tier = 1
+
+    if not results and lowered:
+        effective_threshold = FALLBACK_SCORE_THRESHOLD
+        results = tiers[1]
+        next_tier = 2
+        fallback_notes.append(f"lowered score threshold to {FALLBACK_SCORE_THRESHOLD:.2f} for broader match")
+
+    if not results and len(tiers) > next_tier:
+        results = tiers[next_tier]
+        fallback_notes.append("removed location filter to broaden match")
+
+    print(f"🔍 Found {len(results)} similar reports")
+    return {
+        'results': results,
+        'effective_score_threshold': effective_threshold,
+        'fallback_notes': fallback_notes,
+        'hybrid': hybrid,
+    }
+
+
+def _replica_volunteer_search(
+    replica: Any,
+    task_embedding: List[float],
+    location: Optional[Dict[str, float]],
+    radius_km: float,
+    limit: int,
+    min_match_score: float,
+    filters: Optional[Dict[str, Any]]
+) -> List[Any]:
+    """The volunteer query (same conditions as _volunteer_filter) against a UserReplica"""
+    filters = filters or {}
+    return replica.search(
+        task_embedding,
+        limit=limit,
+        score_threshold=min_match_score,
+        location=location,
+        radius_km=radius_km,
+        available=bool(filters.get('available')),
+        min_experience=filters.get('min_experience_level') or None
+    )
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance in km using Haversine formula"""
+    R = 6371  # Earth's radius in km
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat/2) * math.sin(dlat/2) +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(dlon/2) * math.sin(dlon/2))
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    return R * c
+
+
+def _format_volunteer_matches(
+    results: List[Any],
+    location: Optional[Dict[str, float]],
+    radius_km: float
+) -> List[Dict[str, Any]]:
+    """Volunteer payloads with match score and distance, dropping any outside the radius"""
+    formatted_results = []
+    for result in results:
+        volunteer_data = result.payload.copy()
+        volunteer_data['match_score'] = result.score
+        volunteer_data['user_id'] = result.id
+
+        # Calculate distance if location provided
+        if location and location.get('lat') and location.get('lon'):
+            vol_loc = volunteer_data.get('location', {})
+            if vol_loc.get('lat') and vol_loc.get('lon'):
+                distance = _haversine_km(
+                    location['lat'], location['lon'],
+                    vol_loc['lat'], vol_loc['lon']
+                )
+                volunteer_data['distance_km'] = round(distance, 2)
+
+                # Filter by radius
+                if distance > radius_km:
+                    continue
+
+        formatted_results.append(volunteer_data)
+    return formatted_results
+
+
+def _volunteer_payload(existing: List[Record], profile_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """Layer a new volunteer profile over the stored payload (if any), keeping account fields"""
+    payload = dict(existing[0].payload or {}) if existing else {}
+    payload.update(profile_data)
+
+    # Ensure required fields
+    if 'created_at' not in payload:
+        payload['created_at'] = datetime.now(timezone.utc).isoformat()
+
+    # Store the user_id in metadata for retrieval
+    payload['user_id'] = user_id
+    return payload
+
+
+def _is_active_campaign(campaign: Dict[str, Any], now: datetime) -> bool:
+    """True for a campaign with status 'active' whose end date is still ahead"""
+    try:
+        end_date_str = campaign.get('timeline', {}).get('end_date')
+        if not end_date_str:
+            return False
+
+        end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
+        return end_date > now and campaign.get('status', 'unknown') == 'active'
+    except Exception:
+        return False
+
+
+def _payload_selector(fields: PayloadFields) -> Union[bool, List[str], PayloadSelectorExclude]:
+    """with_payload value for a field projection (None = everything)"""
+    if fields is None:
+        return True
+    if isinstance(fields, (bool, PayloadSelectorExclude)):
+        return fields
+    return list(fields)
+
+
+def point_id_for(business_id: str) -> str:
+    """
+    Deterministic Qdrant point ID for a report, campaign or user ID
+    
+    IDs that are already UUIDs (e.g. registered users) are used as-is; anything
+    else maps to a name-based uuid5, so the same business ID always lands on the
+    same point and lookups become a retrieve instead of a scan.
+    """
+    try:
+        return str(uuid.UUID(str(business_id)))
+    except ValueError:
+        return str(uuid.uuid5(POINT_ID_NAMESPACE, str(business_id)))
+
+
+def _unbackfilled_report_filter() -> Filter:
+    """Reports without timestamp_epoch, or with a location only under the nested metadata"""
+    return Filter(should=[
+        IsEmptyCondition(is_empty=PayloadField(key=TIMESTAMP_EPOCH_FIELD)),
+        Filter(
+            must=[IsEmptyCondition(is_empty=PayloadField(key="location"))],
+            must_not=[IsEmptyCondition(is_empty=PayloadField(key="metadata.location"))]
+        ),
+    ])
+
+
+def normalize_report_location(metadata: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Find a lat/lon pair at the top level or under metadata.location and coerce it to floats"""
+    candidates = [metadata.get('location')]
+    if isinstance(metadata.get('metadata'), dict):
+        candidates.append(metadata['metadata'].get('location'))
+    
+    for candidate in candidates:
+        if not isinstance(candidate, dict):
+            continue
+        lat = candidate.get('lat', candidate.get('latitude'))
+        lon = candidate.get('lon', candidate.get('lng', candidate.get('longitude')))
+        if lat is None or lon is None:
+            continue
+        try:
+            return {'lat': float(lat), 'lon': float(lon)}
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _normalize_timestamp(value: Any) -> Optional[str]:
+    """
+    Convert a timestamp to an ISO-8601 UTC string
+    
+    Accepts datetimes, epoch seconds/milliseconds and ISO strings (with or without 'Z');
+    unparseable strings are returned unchanged
+    """
+    if value is None or value == '':
+        return None
+    try:
+        if isinstance(value, datetime):
+            parsed = value
+        elif isinstance(value, (int, float)):
+            seconds = value / 1000 if value > 1e12 else value
+            parsed = datetime.fromtimestamp(seconds, tz=timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).isoformat()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return str(value)
+
+
+def timestamp_to_epoch(value: Any) -> Optional[int]:
+    """Epoch seconds for a timestamp accepted by _normalize_timestamp, or None if unparseable"""
+    normalized = _normalize_timestamp(value)
+    if not normalized:
+        return None
+    try:
+        return int(datetime.fromisoformat(normalized).timestamp())
+    except ValueError:
+        return None
+
+
+def _prepare_report_payload(metadata: Dict[str, Any], report_id: str) -> Dict[str, Any]:
+    """Fill in report_id, a UTC timestamp and a top-level geo location (in place)"""
+    # Normalize the timestamp to UTC ISO-8601 (now if missing) plus its indexed epoch copy
+    metadata['timestamp'] = _normalize_timestamp(metadata.get('timestamp')) or datetime.now(timezone.utc).isoformat()
+    epoch = timestamp_to_epoch(metadata['timestamp'])
+    metadata[TIMESTAMP_EPOCH_FIELD] = epoch if epoch is not None else UNKNOWN_TIMESTAMP_EPOCH
+    
+    # Store the report_id in metadata for retrieval
+    metadata['report_id'] = report_id
+    
+    # Ensure location is available at top-level for geo queries
+    location = normalize_report_location(metadata)
+    if location:
+        metadata['location'] = location
+    return metadata
+
+
+def _split_report_payload(metadata: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(point payload, details) for a prepared report in the configured payload schema"""
+    if settings.report_payload_schema >= REPORT_SCHEMA_V2:
+        return compact_report_payload(metadata)
+    return metadata, {}
+
+
+def _report_details_point(report_id: str, details: Dict[str, Any]) -> PointStruct:
+    """Details collection point of a v2 report (same point ID as the report)"""
+    return PointStruct(id=point_id_for(report_id), vector={}, payload={'report_id': report_id, **details})
+
+
+def _report_detail_ids(payloads_by_id: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Point IDs of the v2 reports among retrieved payloads (v1 reports carry their details inline)"""
+    return [
+        point_id for point_id, payload in payloads_by_id.items()
+        if report_schema_version(payload) >= REPORT_SCHEMA_V2
+    ]
+
+
+def _expand_reports(
+    report_ids: List[str],
+    payloads_by_id: Dict[str, Dict[str, Any]],
+    details_by_id: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Retrieved reports in request order, in the v1 shape"""
+    reports = []
+    for report_id in report_ids:
+        point_id = point_id_for(report_id)
+        if point_id in payloads_by_id:
+            reports.append(expand_report_payload(payloads_by_id[point_id], details_by_id.get(point_id)))
+    return reports
+
+
+def _report_payload_selector(fields: PayloadFields) -> Union[bool, List[str], PayloadSelectorExclude]:
+    """with_payload value for report points: the projection plus what v2 expansion reads"""
+    selector = _payload_selector(fields)
+    if isinstance(selector, list):
+        return list(dict.fromkeys([*selector, *report_summary_sources(selector)]))
+    return selector
+
+
+def _wants_report_details(fields: PayloadFields, with_details: Optional[bool]) -> bool:
+    """Whether a report read joins v2 reports with their details"""
+    if with_details is not None:
+        return with_details
+    if fields is False:
+        return False
+    return report_details_needed(list(fields) if isinstance(fields, (list, tuple)) else None)
+
+
+def _expand_report_result(
+    payload: Optional[Dict[str, Any]],
+    details: Optional[Dict[str, Any]],
+    fields: PayloadFields
+) -> Optional[Dict[str, Any]]:
+    """
+    Search or list payload in the v1 shape, limited to the requested fields
+
+    The selector fetched a few extra fields so v2 reports can be expanded;
+    those are dropped again when `fields` is a list, and excluded fields the
+    details brought back are dropped for an exclude selector.
+    """
+    if payload is None:
+        return None
+    report = expand_report_payload(payload, details)
+    if isinstance(fields, PayloadSelectorExclude):
+        if report is payload:
+            return report
+        for field in fields.exclude:
+            top, _, nested = field.partition('.')
+            if not nested:
+                report.pop(top, None)
+            elif top == 'metadata' and isinstance(report.get('metadata'), dict):
+                report['metadata'].pop(nested, None)
+        return report
+    if not isinstance(fields, (list, tuple)):
+        return report
+    top_level = {field.split('.', 1)[0] for field in fields}
+    projected = {key: value for key, value in report.items() if key in top_level}
+    metadata = projected.get('metadata')
+    if isinstance(metadata, dict) and 'metadata' not in fields:
+        nested = {field.split('.')[1] for field in fields if field.startswith('metadata.')}
+        projected['metadata'] = {key: value for key, value in metadata.items() if key in nested}
+        if not projected['metadata']:
+            del projected['metadata']
+    return projected
+
+
+def _capture_error(func, *args) -> Optional[Exception]:
+    """Run func and return the exception it raised (or None)"""
+    try:
+        func(*args)
+        return None
+    except Exception as e:
+        return e
+
+
 # Standalone test
 if __name__ == "__main__":
     print("=" * 60)
@@ -600,4 +2033,6 @@ if __name__ == "__main__":
         print("3. Add to .env file:")
         print("   QDRANT_URL=https://your-cluster.qdrant.io:6333")
         print("   QDRANT_API_KEY=your_api_key")
+        print("\nOr run an embedded Qdrant with no cluster:")
+        print("   QDRANT_LOCAL_PATH=:memory:   (or a storage directory)")
 
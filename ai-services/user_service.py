@@ -1,24 +1,39 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, PayloadSchemaType
+from qdrant_client.models import PointStruct, PayloadSchemaType, Filter, FieldCondition, MatchValue
 import hashlib
 import jwt
 import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List
 import uuid
-from sentence_transformers import SentenceTransformer
 import os
 
+from config import settings
+from embeddings.registry import model_registry
+from executors import run_cpu
+from qdrant.connection import QdrantConnectionFactory, get_qdrant_connection
+from qdrant.tuning import collection_tuning, search_params_for
+from qdrant.user_replica import UserReplica, readable_replica
+from qdrant.vector_store import aiter_collection_points, iter_collection_points
+
 class UserService:
-    def __init__(self):
-        self.client = QdrantClient(
-            url=os.getenv("QDRANT_URL"),
-            api_key=os.getenv("QDRANT_API_KEY")
-        )
+    # Optional in-process replica of the users collection (attached by the API server)
+    replica: Optional[UserReplica] = None
+    
+    def __init__(self, connection: Optional[QdrantConnectionFactory] = None):
+        # Pooled clients shared with the vector store (see qdrant.connection)
+        connection = connection or get_qdrant_connection()
+        self.client = connection.client
+        # Async client for the API server's event loop (the a* methods)
+        self.aclient = connection.aclient
         self.collection_name = "users"
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model_name = settings.embedding_model
         self.jwt_secret = os.getenv("JWT_SECRET", "ecosynk_secret_key")
         self._ensure_collection()
     
+    @property
+    def model(self):
+        """Embedding model shared with EmbeddingGenerator (loaded on first use)"""
+        return model_registry.get(self.model_name)
+    
     def _ensure_collection(self):
         """Create users collection if it doesn't exist"""
         try:
@@ -28,7 +43,7 @@ class UserService:
             if not collection_exists:
                 self.client.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=VectorParams(size=384, distance=Distance.COSINE)
+                    **collection_tuning(self.collection_name).create_collection_kwargs()
                 )
             
             # Create payload index for email field (required for filtering)
@@ -48,6 +63,85 @@ class UserService:
         except Exception as e:
             print(f"Error creating collection: {e}")
     
+    def _upsert_users(self, points: List[PointStruct]):
+        """Write user points to Qdrant and the replica"""
+        self.client.upsert(collection_name=self.collection_name, points=points)
+        if self.replica is not None:
+            self.replica.upsert(points)
+    
+    async def _aupsert_users(self, points: List[PointStruct]):
+        """Async variant of _upsert_users"""
+        await self.aclient.upsert(collection_name=self.collection_name, points=points)
+        if self.replica is not None:
+            self.replica.upsert(points)
+    
+    def _user_points(self, user_id: str) -> List[Any]:
+        """A user's point with its vector, from the replica when fresh (empty if not found)"""
+        replica = readable_replica(self.replica)
+        point = replica.get(user_id) if replica else None
+        if point is not None:
+            return [point]
+        return self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[user_id],
+            with_vectors=True
+        )
+    
+    async def _auser_points(self, user_id: str) -> List[Any]:
+        """Async variant of _user_points"""
+        replica = readable_replica(self.replica)
+        point = replica.get(user_id) if replica else None
+        if point is not None:
+            return [point]
+        return await self.aclient.retrieve(
+            collection_name=self.collection_name,
+            ids=[user_id],
+            with_vectors=True
+        )
+    
+    def _iter_users(self, page_size: int) -> Iterator[Any]:
+        """Every user point (payload only), from the replica when fresh, else paged from Qdrant"""
+        replica = readable_replica(self.replica)
+        if replica:
+            return replica.points()
+        return iter_collection_points(self.client, self.collection_name, page_size=page_size)
+    
+    async def _aiter_users(self, page_size: int) -> AsyncIterator[Any]:
+        """Async variant of _iter_users"""
+        replica = readable_replica(self.replica)
+        if replica:
+            for user in replica.points():
+                yield user
+            return
+        async for user in aiter_collection_points(self.aclient, self.collection_name, page_size=page_size):
+            yield user
+    
+    def _similar_points(self, vector: List[float], limit: int, score_threshold: float) -> List[Any]:
+        """Nearest users by vector, from the replica when fresh"""
+        replica = readable_replica(self.replica)
+        if replica:
+            return replica.search(vector, limit=limit, score_threshold=score_threshold)
+        return self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            search_params=search_params_for(self.collection_name),
+            limit=limit,
+            score_threshold=score_threshold
+        ).points
+    
+    async def _asimilar_points(self, vector: List[float], limit: int, score_threshold: float) -> List[Any]:
+        """Async variant of _similar_points"""
+        replica = readable_replica(self.replica)
+        if replica:
+            return replica.search(vector, limit=limit, score_threshold=score_threshold)
+        return (await self.aclient.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            search_params=search_params_for(self.collection_name),
+            limit=limit,
+            score_threshold=score_threshold
+        )).points
+    
     def _hash_password(self, password: str) -> str:
         """Hash password with salt"""
         salt = "ecosynk_salt"
@@ -104,37 +198,7 @@ class UserService:
             user_id = str(uuid.uuid4())
             hashed_password = self._hash_password(password)
             
-            user_data = {
-                "user_id": user_id,
-                "name": name,
-                "email": email,
-                "password_hash": hashed_password,
-                "created_at": datetime.datetime.utcnow().isoformat(),
-                "bio": kwargs.get("bio", ""),
-                "location": kwargs.get("location", ""),
-                "city": kwargs.get("city", ""),
-                "country": kwargs.get("country", ""),
-                "interests": kwargs.get("interests", []),
-                "skills": kwargs.get("skills", []),
-                "experience_level": kwargs.get("experience_level", "beginner"),
-                "total_cleanups": 0,
-                "total_points": 0,
-                "level": 1,
-                "achievements": [],
-                "following": [],
-                "followers": [],
-                "profile_picture_url": kwargs.get("profile_picture_url", ""),
-                "stats": {
-                    "campaigns_joined": 0,
-                    "campaigns_created": 0,
-                    "donations_made": 0,
-                    "total_area_cleaned_sqm": 0,
-                    "total_co2_saved_kg": 0,
-                    "most_common_city": "None",
-                    "cities_worked_in": 0,
-                    "individual_reports": 0
-                }
-            }
+            user_data = _new_user_record(user_id, name, email, hashed_password, kwargs)
             
             # Generate user vector
             user_vector = self._generate_user_vector(user_data)
@@ -146,10 +210,7 @@ class UserService:
                 payload=user_data
             )
             
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[point]
-            )
+            self._upsert_users([point])
             
             # Generate JWT token
             token = self._generate_jwt(user_id)
@@ -265,10 +326,7 @@ class UserService:
                 payload=full_user
             )
             
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[point]
-            )
+            self._upsert_users([point])
             
             # Return updated user without sensitive data
             user_response = {k: v for k, v in full_user.items() if k != "password_hash"}
@@ -284,11 +342,7 @@ class UserService:
     def find_similar_users(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
         """Find users with similar interests/profiles"""
         try:
-            current_user = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[user_id],
-                with_vectors=True
-            )
+            current_user = self._user_points(user_id)
             
             if not current_user:
                 return {"success": False, "error": "User not found"}
@@ -297,13 +351,8 @@ class UserService:
             if user_vector is None:
                 user_vector = self._generate_user_vector(current_user[0].payload)
             
-            # Search for similar users
-            search_result = self.client.query_points(
-                collection_name=self.collection_name,
-                query=user_vector,
-                limit=limit + 1,  # +1 to exclude self
-                score_threshold=0.3
-            ).points
+            # Search for similar users (+1 to exclude self)
+            search_result = self._similar_points(user_vector, limit + 1, score_threshold=0.3)
             
             # Filter out the current user and format results
             similar_users = []
@@ -334,18 +383,7 @@ class UserService:
                 return {"success": False, "error": "User not found"}
             
             user_data = current_user[0].payload
-            current_stats = user_data.get("stats", {})
-            
-            # Update stats
-            for key, value in stat_updates.items():
-                if key in current_stats:
-                    if isinstance(value, (int, float)):
-                        current_stats[key] += value
-                    else:
-                        current_stats[key] = value
-            
-            user_data["stats"] = current_stats
-            user_data["updated_at"] = datetime.datetime.utcnow().isoformat()
+            current_stats = _apply_stat_updates(user_data, stat_updates)
             
             # Update in Qdrant (regenerate vector if missing)
             current_vector = current_user[0].vector or self._generate_user_vector(user_data)
@@ -355,10 +393,7 @@ class UserService:
                 payload=user_data
             )
             
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[point]
-            )
+            self._upsert_users([point])
             
             return {"success": True, "stats": current_stats}
             
@@ -395,47 +430,28 @@ class UserService:
             followee = search_result[0][0]
             followee_id = followee.id
             
-            # Can't follow yourself
-            if follower_id == followee_id:
-                return {"success": False, "error": "Cannot follow yourself"}
-            
-            # Get current following lists
             follower_data = follower[0].payload
             followee_data = followee.payload
-            
-            following_list = follower_data.get("following", [])
-            followers_list = followee_data.get("followers", [])
-            
-            # Check if already following
-            if followee_id in following_list:
-                return {"success": False, "error": f"Already following {followee_name}"}
-            
-            # Update following and followers lists
-            following_list.append(followee_id)
-            followers_list.append(follower_id)
-            
-            follower_data["following"] = following_list
-            followee_data["followers"] = followers_list
+            error = _link_follow(follower_id, follower_data, followee_id, followee_data, followee_name)
+            if error:
+                return {"success": False, "error": error}
             
             # Update both users in Qdrant
             follower_vector = follower[0].vector or self._generate_user_vector(follower_data)
             followee_vector = followee.vector or self._generate_user_vector(followee_data)
 
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[
-                    PointStruct(
-                        id=follower_id,
-                        vector=follower_vector,
-                        payload=follower_data
-                    ),
-                    PointStruct(
-                        id=followee_id,
-                        vector=followee_vector,
-                        payload=followee_data
-                    )
-                ]
-            )
+            self._upsert_users([
+                PointStruct(
+                    id=follower_id,
+                    vector=follower_vector,
+                    payload=follower_data
+                ),
+                PointStruct(
+                    id=followee_id,
+                    vector=followee_vector,
+                    payload=followee_data
+                )
+            ])
             
             return {
                 "success": True,
@@ -464,38 +480,24 @@ class UserService:
             
             follower_data = follower.payload
             followee_data = followee.payload
-            
-            following_list = follower_data.get("following", [])
-            followers_list = followee_data.get("followers", [])
-            
-            # Remove from lists
-            if followee_id in following_list:
-                following_list.remove(followee_id)
-            if follower_id in followers_list:
-                followers_list.remove(follower_id)
-            
-            follower_data["following"] = following_list
-            followee_data["followers"] = followers_list
+            _unlink_follow(follower_id, follower_data, followee_id, followee_data)
             
             # Update both users
             follower_vector = follower.vector or self._generate_user_vector(follower_data)
             followee_vector = followee.vector or self._generate_user_vector(followee_data)
 
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[
-                    PointStruct(
-                        id=follower_id,
-                        vector=follower_vector,
-                        payload=follower_data
-                    ),
-                    PointStruct(
-                        id=followee_id,
-                        vector=followee_vector,
-                        payload=followee_data
-                    )
-                ]
-            )
+            self._upsert_users([
+                PointStruct(
+                    id=follower_id,
+                    vector=follower_vector,
+                    payload=follower_data
+                ),
+                PointStruct(
+                    id=followee_id,
+                    vector=followee_vector,
+                    payload=followee_data
+                )
+            ])
             
             return {
                 "success": True,
@@ -516,11 +518,7 @@ class UserService:
         5. Not already following
         """
         try:
-            current_user = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[user_id],
-                with_vectors=True
-            )
+            current_user = self._user_points(user_id)
             
             if not current_user:
                 return {"success": False, "error": "User not found"}
@@ -529,128 +527,11 @@ class UserService:
             user_vector = current_user[0].vector
             if user_vector is None:
                 user_vector = self._generate_user_vector(user_data)
-            following_list = user_data.get("following", [])
-            user_experience = user_data.get("experience_level", "beginner")
-            
-            # Support both user and volunteer data structures
-            user_interests = set(user_data.get("interests", []))
-            user_skills = set(user_data.get("skills", []))
-            user_materials = set(user_data.get("materials_expertise", []))
-            user_specializations = set(user_data.get("specializations", []))
-            user_city = user_data.get("city", "")
-            
-            # Search for similar users using vector similarity
-            search_result = self.client.query_points(
-                collection_name=self.collection_name,
-                query=user_vector,
-                limit=50,  # Get more candidates for filtering
-                score_threshold=0.2
-            ).points
-            
-            # Experience level weights for compatibility
-            exp_levels = {
-                "beginner": 1,
-                "intermediate": 2,
-                "advanced": 3,
-                "expert": 4
-            }
-            
-            recommendations = []
-            for result in search_result:
-                candidate_id = result.id
-                
-                # Skip self and already following
-                if candidate_id == user_id or candidate_id in following_list:
-                    continue
-                
-                candidate = result.payload
-                candidate_score = result.score
-                
-                # Calculate recommendation score based on multiple factors
-                factors = {
-                    "vector_similarity": candidate_score * 100,  # 0-100 scale
-                    "experience_compatibility": 0,
-                    "common_interests": 0,
-                    "common_skills": 0,
-                    "common_materials": 0,
-                    "common_specializations": 0,
-                    "location_match": 0,
-                    "activity_level": 0
-                }
-                
-                # Experience compatibility (prefer similar or slightly higher)
-                candidate_exp = candidate.get("experience_level", "beginner")
-                exp_diff = abs(exp_levels.get(candidate_exp, 1) - exp_levels.get(user_experience, 1))
-                factors["experience_compatibility"] = max(0, 15 - (exp_diff * 4))
-                
-                # Common interests (user-specific)
-                candidate_interests = set(candidate.get("interests", []))
-                if candidate_interests and user_interests:
-                    common_interests = len(user_interests & candidate_interests)
-                    factors["common_interests"] = min(15, common_interests * 5)
-                
-                # Common skills (both users and volunteers)
-                candidate_skills = set(candidate.get("skills", []))
-                if candidate_skills and user_skills:
-                    common_skills = len(user_skills & candidate_skills)
-                    factors["common_skills"] = min(15, common_skills * 3)
-                
-                # Common materials expertise (volunteer-specific but valuable for collaboration)
-                candidate_materials = set(candidate.get("materials_expertise", []))
-                if candidate_materials and user_materials:
-                    common_materials = len(user_materials & candidate_materials)
-                    factors["common_materials"] = min(10, common_materials * 5)
-                
-                # Common specializations (volunteer-specific)
-                candidate_specializations = set(candidate.get("specializations", []))
-                if candidate_specializations and user_specializations:
-                    common_spec = len(user_specializations & candidate_specializations)
-                    factors["common_specializations"] = min(10, common_spec * 5)
-                
-                # Same city bonus
-                candidate_city = candidate.get("city", "")
-                if user_city and candidate_city == user_city:
-                    factors["location_match"] = 15
-                
-                # Activity level (use past_cleanup_count for volunteers, stats for users)
-                past_cleanups = candidate.get("past_cleanup_count", 0)
-                candidate_stats = candidate.get("stats", {})
-                campaigns_joined = candidate_stats.get("campaigns_joined", 0)
-                total_cleanups = candidate.get("total_cleanups", past_cleanups)
-                activity_score = min(10, (campaigns_joined * 2 + total_cleanups) / 5)
-                factors["activity_level"] = activity_score
-                
-                # Calculate final score (weighted sum)
-                final_score = (
-                    factors["vector_similarity"] * 0.30 +          # 30% weight on semantic similarity
-                    factors["experience_compatibility"] * 0.10 +    # 10% on experience match
-                    factors["common_interests"] * 0.15 +           # 15% on shared interests
-                    factors["common_skills"] * 0.15 +              # 15% on shared skills
-                    factors["common_materials"] * 0.08 +           # 8% on materials expertise
-                    factors["common_specializations"] * 0.07 +     # 7% on specializations
-                    factors["location_match"] * 0.10 +             # 10% on location
-                    factors["activity_level"] * 0.05               # 5% on activity
-                )
-                
-                # Remove sensitive data
-                candidate_clean = {k: v for k, v in candidate.items() if k != "password_hash"}
-                candidate_clean["recommendation_score"] = round(final_score, 2)
-                candidate_clean["recommendation_factors"] = {
-                    k: round(v, 2) for k, v in factors.items()
-                }
-                candidate_clean["user_id"] = candidate_id
-                
-                recommendations.append(candidate_clean)
             
-            # Sort by final score and limit results
-            recommendations.sort(key=lambda x: x["recommendation_score"], reverse=True)
-            top_recommendations = recommendations[:limit]
+            # Search for similar users using vector similarity (50 candidates for filtering)
+            search_result = self._similar_points(user_vector, 50, score_threshold=0.2)
             
-            return {
-                "success": True,
-                "recommendations": top_recommendations,
-                "total_candidates": len(recommendations)
-            }
+            return _rank_recommendations(user_id, user_data, search_result, limit)
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -666,22 +547,12 @@ class UserService:
             matching_users = []
             seen_ids = set()
 
-            # Exact-ish matches via scroll (name/email contains query)
-            scroll_result = self.client.scroll(
-                collection_name=self.collection_name,
-                limit=limit * 2
-            )
-
-            for user in scroll_result[0]:
-                user_data = user.payload
-                name = user_data.get("name", "").lower()
-                email = user_data.get("email", "").lower()
-
-                if query_lower in name or query_lower in email:
-                    user_clean = {k: v for k, v in user_data.items() if k != "password_hash"}
-                    user_clean["user_id"] = user.id
-                    user_clean["match_type"] = "keyword"
-                    user_clean["match_score"] = 100.0
+            # Exact-ish matches via paged scroll (name/email contains query), stopping at `limit`
+            for user in self._iter_users(page_size=max(limit * 2, 64)):
+                if len(matching_users) >= limit:
+                    break
+                user_clean = _keyword_match(user, query_lower)
+                if user_clean:
                     matching_users.append(user_clean)
                     seen_ids.add(user.id)
 
@@ -689,23 +560,13 @@ class UserService:
             try:
                 query_vector = self.model.encode(normalized_query).tolist()
                 vector_threshold = 0.2 if len(normalized_query) >= 3 else 0.1
-                vector_results = self.client.query_points(
-                    collection_name=self.collection_name,
-                    query=query_vector,
-                    limit=limit * 2,
-                    score_threshold=vector_threshold
-                ).points
+                vector_results = self._similar_points(query_vector, limit * 2, score_threshold=vector_threshold)
 
                 for result in vector_results:
                     if result.id in seen_ids:
                         continue
 
-                    payload = result.payload or {}
-                    user_clean = {k: v for k, v in payload.items() if k != "password_hash"}
-                    user_clean["user_id"] = result.id
-                    user_clean["match_type"] = "semantic"
-                    user_clean["match_score"] = round((result.score or 0) * 100, 2)
-                    matching_users.append(user_clean)
+                    matching_users.append(_semantic_match(result))
                     seen_ids.add(result.id)
             except Exception as semantic_error:
                 print(f"Semantic search fallback due to error: {semantic_error}")
@@ -719,4 +580,537 @@ class UserService:
             }
             
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    # ------------------------------------------------------------------
+    # Async variants (AsyncQdrantClient) awaited by the API server; profile
+    # embeddings are computed on the shared CPU pool
+    # ------------------------------------------------------------------
+    
+    async def aregister_user(self, name: str, email: str, password: str, **kwargs) -> Dict[str, Any]:
+        """Async variant of register_user"""
+        try:
+            existing = await self.aget_user_by_email(email)
+            if existing:
+                return {"success": False, "error": "User already exists"}
+            
+            user_id = str(uuid.uuid4())
+            user_data = _new_user_record(user_id, name, email, self._hash_password(password), kwargs)
+            
+            user_vector = await run_cpu(self._generate_user_vector, user_data)
+            await self._aupsert_users([PointStruct(id=user_id, vector=user_vector, payload=user_data)])
+            
+            return {
+                "success": True,
+                "user": {k: v for k, v in user_data.items() if k != "password_hash"},
+                "token": self._generate_jwt(user_id)
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def alogin_user(self, email: str, password: str) -> Dict[str, Any]:
+        """Async variant of login_user"""
+        try:
+            user = await self.aget_user_by_email(email)
+            if not user:
+                return {"success": False, "error": "User not found"}
+            
+            if user["password_hash"] != self._hash_password(password):
+                return {"success": False, "error": "Invalid password"}
+            
+            return {
+                "success": True,
+                "user": {k: v for k, v in user.items() if k != "password_hash"},
+                "token": self._generate_jwt(user["user_id"])
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def aget_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_user_by_email"""
+        try:
+            points, _ = await self.aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=Filter(must=[FieldCondition(key="email", match=MatchValue(value=email))]),
+                limit=1
+            )
+            return points[0].payload if points else None
+            
+        except Exception as e:
+            print(f"Error getting user by email: {e}")
+            return None
+    
+    async def aget_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_user_by_id"""
+        try:
+            result = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=[user_id]
+            )
+            if result:
+                return {k: v for k, v in result[0].payload.items() if k != "password_hash"}
+            return None
+            
+        except Exception as e:
+            print(f"Error getting user by ID: {e}")
+            return None
+    
+    async def aupdate_user(self, user_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of update_user"""
+        try:
+            # Full user data including password hash (one retrieve instead of two)
+            points = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=[user_id],
+                with_vectors=True
+            )
+            if not points:
+                return {"success": False, "error": "User not found"}
+            
+            full_point = points[0]
+            full_user = full_point.payload
+            full_user.update(updates)
+            full_user["updated_at"] = datetime.datetime.utcnow().isoformat()
+            
+            # Regenerate vector if profile-relevant data changed (or it is missing)
+            if any(key in updates for key in ['name', 'bio', 'interests', 'skills']) or not full_point.vector:
+                user_vector = await run_cpu(self._generate_user_vector, full_user)
+            else:
+                user_vector = full_point.vector
+            
+            await self._aupsert_users([PointStruct(id=user_id, vector=user_vector, payload=full_user)])
+            
+            return {
+                "success": True,
+                "user": {k: v for k, v in full_user.items() if k != "password_hash"}
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def afind_similar_users(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """Async variant of find_similar_users"""
+        try:
+            current_user = await self._auser_points(user_id)
+            if not current_user:
+                return {"success": False, "error": "User not found"}
+            
+            user_vector = current_user[0].vector
+            if user_vector is None:
+                user_vector = await run_cpu(self._generate_user_vector, current_user[0].payload)
+            
+            # +1 to exclude self
+            search_result = await self._asimilar_points(user_vector, limit + 1, score_threshold=0.3)
+            
+            similar_users = []
+            for result in search_result:
+                if result.id != user_id:
+                    user_data = {k: v for k, v in result.payload.items() if k != "password_hash"}
+                    user_data["similarity_score"] = result.score
+                    similar_users.append(user_data)
+            
+            return {
+                "success": True,
+                "similar_users": similar_users[:limit]
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def aupdate_user_stats(self, user_id: str, stat_updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of update_user_stats"""
+        try:
+            current_user = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=[user_id],
+                with_vectors=True
+            )
+            if not current_user:
+                return {"success": False, "error": "User not found"}
+            
+            user_data = current_user[0].payload
+            current_stats = _apply_stat_updates(user_data, stat_updates)
+            
+            current_vector = current_user[0].vector or await run_cpu(self._generate_user_vector, user_data)
+            await self._aupsert_users([PointStruct(id=user_id, vector=current_vector, payload=user_data)])
+            
+            return {"success": True, "stats": current_stats}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def afollow_user(self, follower_id: str, followee_name: str) -> Dict[str, Any]:
+        """Async variant of follow_user"""
+        try:
+            follower = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=[follower_id],
+                with_vectors=True
+            )
+            if not follower:
+                return {"success": False, "error": "Follower user not found"}
+            
+            matches, _ = await self.aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=Filter(must=[FieldCondition(key="name", match=MatchValue(value=followee_name))]),
+                limit=1,
+                with_vectors=True
+            )
+            if not matches:
+                return {"success": False, "error": f"User '{followee_name}' not found"}
+            
+            followee = matches[0]
+            followee_id = followee.id
+            follower_data = follower[0].payload
+            followee_data = followee.payload
+            error = _link_follow(follower_id, follower_data, followee_id, followee_data, followee_name)
+            if error:
+                return {"success": False, "error": error}
+            
+            follower_vector = follower[0].vector or await run_cpu(self._generate_user_vector, follower_data)
+            followee_vector = followee.vector or await run_cpu(self._generate_user_vector, followee_data)
+            await self._aupsert_users([
+                PointStruct(id=follower_id, vector=follower_vector, payload=follower_data),
+                PointStruct(id=followee_id, vector=followee_vector, payload=followee_data)
+            ])
+            
+            return {
+                "success": True,
+                "message": f"Now following {followee_name}",
+                "followee": {k: v for k, v in followee_data.items() if k != "password_hash"}
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def aunfollow_user(self, follower_id: str, followee_id: str) -> Dict[str, Any]:
+        """Async variant of unfollow_user"""
+        try:
+            users = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=[follower_id, followee_id],
+                with_vectors=True
+            )
+            if len(users) != 2:
+                return {"success": False, "error": "One or both users not found"}
+            
+            follower = users[0] if users[0].id == follower_id else users[1]
+            followee = users[1] if users[0].id == follower_id else users[0]
+            follower_data = follower.payload
+            followee_data = followee.payload
+            _unlink_follow(follower_id, follower_data, followee_id, followee_data)
+            
+            follower_vector = follower.vector or await run_cpu(self._generate_user_vector, follower_data)
+            followee_vector = followee.vector or await run_cpu(self._generate_user_vector, followee_data)
+            await self._aupsert_users([
+                PointStruct(id=follower_id, vector=follower_vector, payload=follower_data),
+                PointStruct(id=followee_id, vector=followee_vector, payload=followee_data)
+            ])
+            
+            return {
+                "success": True,
+                "message": f"Unfollowed {followee_data.get('name', 'user')}"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def aget_recommended_users(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """Async variant of get_recommended_users"""
+        try:
+            current_user = await self._auser_points(user_id)
+            if not current_user:
+                return {"success": False, "error": "User not found"}
+            
+            user_data = current_user[0].payload
+            user_vector = current_user[0].vector
+            if user_vector is None:
+                user_vector = await run_cpu(self._generate_user_vector, user_data)
+            
+            # 50 candidates for filtering
+            search_result = await self._asimilar_points(user_vector, 50, score_threshold=0.2)
+            
+            return _rank_recommendations(user_id, user_data, search_result, limit)
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def asearch_users(self, query: str, limit: int = 20) -> Dict[str, Any]:
+        """Async variant of search_users"""
+        try:
+            normalized_query = (query or "").strip()
+            if not normalized_query:
+                return {"success": True, "users": []}
+            
+            query_lower = normalized_query.lower()
+            matching_users = []
+            seen_ids = set()
+            
+            async for user in self._aiter_users(page_size=max(limit * 2, 64)):
+                if len(matching_users) >= limit:
+                    break
+                user_clean = _keyword_match(user, query_lower)
+                if user_clean:
+                    matching_users.append(user_clean)
+                    seen_ids.add(user.id)
+            
+            try:
+                query_vector = (await run_cpu(self.model.encode, normalized_query)).tolist()
+                vector_threshold = 0.2 if len(normalized_query) >= 3 else 0.1
+                vector_results = await self._asimilar_points(query_vector, limit * 2, score_threshold=vector_threshold)
+                
+                for result in vector_results:
+                    if result.id not in seen_ids:
+                        matching_users.append(_semantic_match(result))
+                        seen_ids.add(result.id)
+            except Exception as semantic_error:
+                print(f"Semantic search fallback due to error: {semantic_error}")
+            
+            matching_users.sort(key=lambda item: item.get("match_score", 0), reverse=True)
+            return {
+                "success": True,
+                "users": matching_users[:limit]
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+
+def _new_user_record(user_id: str, name: str, email: str, password_hash: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload for a newly registered user (optional profile fields come from register_user kwargs)"""
+    return {
+        "user_id": user_id,
+        "name": name,
+        "email": email,
+        "password_hash": password_hash,
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "bio": profile.get("bio", ""),
+        "location": profile.get("location", ""),
+        "city": profile.get("city", ""),
+        "country": profile.get("country", ""),
+        "interests": profile.get("interests", []),
+        "skills": profile.get("skills", []),
+        "experience_level": profile.get("experience_level", "beginner"),
+        "total_cleanups": 0,
+        "total_points": 0,
+        "level": 1,
+        "achievements": [],
+        "following": [],
+        "followers": [],
+        "profile_picture_url": profile.get("profile_picture_url", ""),
+        "stats": {
+            "campaigns_joined": 0,
+            "campaigns_created": 0,
+            "donations_made": 0,
+            "total_area_cleaned_sqm": 0,
+            "total_co2_saved_kg": 0,
+            "most_common_city": "None",
+            "cities_worked_in": 0,
+            "individual_reports": 0
+        }
+    }
+
+
+def _rank_recommendations(user_id: str, user_data: Dict[str, Any], search_result: List[Any], limit: int) -> Dict[str, Any]:
+    """Score similar-user candidates (see UserService.get_recommended_users) and keep the top `limit`"""
+    following_list = user_data.get("following", [])
+    user_experience = user_data.get("experience_level", "beginner")
+
+    # Support both user and volunteer data structures
+    user_interests = set(user_data.get("interests", []))
+    user_skills = set(user_data.get("skills", []))
+    user_materials = set(user_data.get("materials_expertise", []))
+    user_specializations = set(user_data.get("specializations", []))
+    user_city = user_data.get("city", "")
+
+    # Experience level weights for compatibility
+    exp_levels = {
+        "beginner": 1,
+        "intermediate": 2,
+        "advanced": 3,
+        "expert": 4
+    }
+
+    recommendations = []
+    for result in search_result:
+        candidate_id = result.id
+
+        # Skip self and already following
+        if candidate_id == user_id or candidate_id in following_list:
+            continue
+
+        candidate = result.payload
+        candidate_score = result.score
+
+        # Calculate recommendation score based on multiple factors
+        factors = {
+            "vector_similarity": candidate_score * 100,  # 0-100 scale
+            "experience_compatibility": 0,
+            "common_interests": 0,
+            "common_skills": 0,
+            "common_materials": 0,
+            "common_specializations": 0,
+            "location_match": 0,
+            "activity_level": 0
+        }
+
+        # Experience compatibility (prefer similar or slightly higher)
+        candidate_exp = candidate.get("experience_level", "beginner")
+        exp_diff = abs(exp_levels.get(candidate_exp, 1) - exp_levels.get(user_experience, 1))
+        factors["experience_compatibility"] = max(0, 15 - (exp_diff * 4))
+
+        # Common interests (user-specific)
+        candidate_interests = set(candidate.get("interests", []))
+        if candidate_interests and user_interests:
+            common_interests = len(user_interests & candidate_interests)
+            factors["common_interests"] = min(15, common_interests * 5)
+
+        # Common skills (both users and volunteers)
+        candidate_skills = set(candidate.get("skills", []))
+        if candidate_skills and user_skills:
+            common_skills = len(user_skills & candidate_skills)
+            factors["common_skills"] = min(15, common_skills * 3)
+
+        # Common materials expertise (volunteer-specific but valuable for collaboration)
+        candidate_materials = set(candidate.get("materials_expertise", []))
+        if candidate_materials and user_materials:
+            common_materials = len(user_materials & candidate_materials)
+            factors["common_materials"] = min(10, common_materials * 5)
+
+        # Common specializations (volunteer-specific)
+        candidate_specializations = set(candidate.get("specializations", []))
+        if candidate_specializations and user_specializations:
+            common_spec = len(user_specializations & candidate_specializations)
+            factors["common_specializations"] = min(10, common_spec * 5)
+
+        # Same city bonus
+        candidate_city = candidate.get("city", "")
+        if user_city and candidate_city == user_city:
+            factors["location_match"] = 15
+
+        # Activity level (use past_cleanup_count for volunteers, stats for users)
+        past_cleanups = candidate.get("past_cleanup_count", 0)
+        candidate_stats = candidate.get("stats", {})
+        campaigns_joined = candidate_stats.get("campaigns_joined", 0)
+        total_cleanups = candidate.get("total_cleanups", past_cleanups)
+        activity_score = min(10, (campaigns_joined * 2 + total_cleanups) / 5)
+        factors["activity_level"] = activity_score
+
+        # Calculate final score (weighted sum)
+        final_score = (
+            factors["vector_similarity"] * 0.30 +          # 30% weight on semantic similarity
+            factors["experience_compatibility"] * 0.10 +    # 10% on experience match
+            factors["common_interests"] * 0.15 +           # 15% on shared interests
+            factors["common_skills"] * 0.15 +              # 15% on shared skills
+            factors["common_materials"] * 0.08 +           # 8% on materials expertise
+            factors["common_specializations"] * 0.07 +     # 7% on specializations
+            factors["location_match"] * 0.10 +             # 10% on location
+            factors["activity_level"] * 0.05               # 5% on activity
+        )
+
+        # Remove sensitive data
+        candidate_clean = {k: v for k, v in candidate.items() if k != "password_hash"}
+        candidate_clean["recommendation_score"] = round(final_score, 2)
+        candidate_clean["recommendation_factors"] = {
+            k: round(v, 2) for k, v in factors.items()
+        }
+        candidate_clean["user_id"] = candidate_id
+
+        recommendations.append(candidate_clean)
+
+    # Sort by final score and limit results
+    recommendations.sort(key=lambda x: x["recommendation_score"], reverse=True)
+    top_recommendations = recommendations[:limit]
+
+    return {
+        "success": True,
+        "recommendations": top_recommendations,
+        "total_candidates": len(recommendations)
+    }
+
+
+def _keyword_match(user: Any, query_lower: str) -> Optional[Dict[str, Any]]:
+    """Public user fields tagged as a keyword hit when the name or email contains the query"""
+    user_data = user.payload
+    name = user_data.get("name", "").lower()
+    email = user_data.get("email", "").lower()
+    if query_lower not in name and query_lower not in email:
+        return None
+
+    user_clean = {k: v for k, v in user_data.items() if k != "password_hash"}
+    user_clean["user_id"] = user.id
+    user_clean["match_type"] = "keyword"
+    user_clean["match_score"] = 100.0
+    return user_clean
+
+
+def _semantic_match(result: Any) -> Dict[str, Any]:
+    """Public user fields tagged as a semantic hit with a 0-100 score"""
+    payload = result.payload or {}
+    user_clean = {k: v for k, v in payload.items() if k != "password_hash"}
+    user_clean["user_id"] = result.id
+    user_clean["match_type"] = "semantic"
+    user_clean["match_score"] = round((result.score or 0) * 100, 2)
+    return user_clean
+
+
+def _apply_stat_updates(user_data: Dict[str, Any], stat_updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Add numeric stat deltas (or overwrite other values) in place and return the stats"""
+    current_stats = user_data.get("stats", {})
+    
+    # Update stats
+    for key, value in stat_updates.items():
+        if key in current_stats:
+            if isinstance(value, (int, float)):
+                current_stats[key] += value
+            else:
+                current_stats[key] = value
+    
+    user_data["stats"] = current_stats
+    user_data["updated_at"] = datetime.datetime.utcnow().isoformat()
+    return current_stats
+
+
+def _link_follow(
+    follower_id: str,
+    follower_data: Dict[str, Any],
+    followee_id: str,
+    followee_data: Dict[str, Any],
+    followee_name: str
+) -> Optional[str]:
+    """Add the follow to both users' lists in place; returns an error message instead if not allowed"""
+    # Can't follow yourself
+    if follower_id == followee_id:
+        return "Cannot follow yourself"
+    
+    following_list = follower_data.get("following", [])
+    followers_list = followee_data.get("followers", [])
+    
+    # Check if already following
+    if followee_id in following_list:
+        return f"Already following {followee_name}"
+    
+    # Update following and followers lists
+    following_list.append(followee_id)
+    followers_list.append(follower_id)
+    
+    follower_data["following"] = following_list
+    followee_data["followers"] = followers_list
+    return None
+
+
+def _unlink_follow(follower_id: str, follower_data: Dict[str, Any], followee_id: str, followee_data: Dict[str, Any]):
+    """Remove the follow from both users' lists in place"""
+    following_list = follower_data.get("following", [])
+    followers_list = followee_data.get("followers", [])
+    
+    # Remove from lists
+    if followee_id in following_list:
+        following_list.remove(followee_id)
+    if follower_id in followers_list:
+        followers_list.remove(follower_id)
+    
+    follower_data["following"] = following_list
+    followee_data["followers"] = followers_list
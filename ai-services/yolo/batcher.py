@@ -0,0 +1,119 @@
+"""
+Dynamic batching front end for WasteDetector
+Coalesces frames from concurrent requests into a single detect_batch call,
+dispatching early when waiting longer would break a request's latency SLO
+"""
+
+import sys
+import os
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from batching import BatchItem, MicroBatcher
+from config import settings
+from metrics import Histogram
+from yolo.waste_detector import WasteDetector
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+LATENCY_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Weight of the latest batch in the per-image inference time estimate
+INFERENCE_EWMA_ALPHA = 0.2
+
+
+class DetectionBatcher(MicroBatcher):
+    """Groups concurrent YOLO requests for a few milliseconds and infers them together"""
+
+    kind = "detection"
+    unit = "images"
+
+    def __init__(
+        self,
+        detector: WasteDetector,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            detector: WasteDetector that runs detect_batch
+            max_batch_size: Largest batch dispatched at once (uses settings if not provided)
+            max_wait_ms: Longest time the first request in a batch waits for company
+        """
+        super().__init__(
+            max_batch_size or settings.detection_batch_max_size,
+            max_wait_ms if max_wait_ms is not None else settings.detection_batch_max_wait_ms,
+            BATCH_SIZE_BUCKETS,
+            LATENCY_MS_BUCKETS
+        )
+        self.detector = detector
+
+        self.inference_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.latency_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.images_detected = 0
+        self.inference_seconds = 0.0
+        self.slo_violations = 0
+        # Per-image inference time estimate, used to dispatch before SLOs run out
+        self.image_inference_ms: Optional[float] = None
+
+    async def detect(self, image: np.ndarray, slo_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Detect waste in one decoded image, sharing a model call with concurrent requests
+
+        Args:
+            image: BGR image array
+            slo_ms: Target end-to-end latency of this request (uses settings.detection_slo_ms if not provided)
+
+        Returns:
+            Detections as returned by WasteDetector.detect
+        """
+        slo_ms = slo_ms if slo_ms is not None else settings.detection_slo_ms
+        enqueued_at = time.perf_counter()
+        try:
+            return await self._submit(image, asyncio.get_running_loop().time() + slo_ms / 1000.0)
+        finally:
+            latency_ms = (time.perf_counter() - enqueued_at) * 1000
+            self.latency_histogram.observe(latency_ms)
+            if latency_ms > slo_ms:
+                self.slo_violations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and latency histograms plus throughput counters"""
+        return {
+            **super().stats(),
+            "images_detected": self.images_detected,
+            "images_per_inference_second": (
+                round(self.images_detected / self.inference_seconds, 2) if self.inference_seconds else 0.0
+            ),
+            "image_inference_ms": round(self.image_inference_ms, 2) if self.image_inference_ms else None,
+            "slo_violations": self.slo_violations,
+            "inference_ms": self.inference_histogram.snapshot(),
+            "latency_ms": self.latency_histogram.snapshot(),
+        }
+
+    def _process(self, images: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """Run YOLO on one batch of images"""
+        return self.detector.detect_batch(images)
+
+    def _dispatch_by(self, batch: List[BatchItem]) -> float:
+        """Latest loop time one more image can join and the batch still finish within the tightest SLO"""
+        slo_deadline = min(deadline for _, _, _, deadline in batch)
+        return slo_deadline - (self.image_inference_ms or 0.0) * (len(batch) + 1) / 1000.0
+
+    def _record_batch(self, batch: List[BatchItem], seconds: float):
+        """Update the inference histogram, counters and per-image inference estimate"""
+        inference_ms = seconds * 1000
+        self.inference_histogram.observe(inference_ms)
+        per_image_ms = inference_ms / len(batch)
+        self.image_inference_ms = per_image_ms if self.image_inference_ms is None else (
+            INFERENCE_EWMA_ALPHA * per_image_ms + (1 - INFERENCE_EWMA_ALPHA) * self.image_inference_ms
+        )
+        self.images_detected += len(batch)
+        self.inference_seconds += seconds
@@ -7,8 +7,15 @@ import cv2
 import numpy as np
 from pathlib import Path
 from ultralytics import YOLO
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union
 import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from imaging import draw_detections, encode_jpeg
 
 logger = logging.getLogger(__name__)
 
@@ -128,12 +135,12 @@ class WasteDetector:
         # YOLOv8 handles resizing internally
         return img
     
-    def detect(self, image_path: str) -> List[Dict[str, Any]]:
+    def detect(self, image: Union[str, np.ndarray]) -> List[Dict[str, Any]]:
         """
         Detect waste objects in image
         
         Args:
-            image_path: Path to input image
+            image: Path to input image, or an already decoded BGR array (no disk I/O)
             
         Returns:
             List of detection dictionaries with bbox, class, confidence
@@ -143,52 +150,9 @@ class WasteDetector:
             return []
         
         try:
-            # Run inference
-            results = self.model.predict(
-                source=image_path,
-                conf=self.confidence_threshold,
-                iou=0.45,
-                device='cpu',  # Use 'cuda' if GPU available
-                verbose=False
-            )
-            
             detections = []
-            
-            for result in results:
-                boxes = result.boxes
-                
-                for box in boxes:
-                    # Extract box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    confidence = float(box.conf[0].cpu().numpy())
-                    class_id = int(box.cls[0].cpu().numpy())
-                    
-                    # Get COCO class name
-                    coco_class = result.names[class_id]
-                    
-                    # Prefer native class names when they match our waste taxonomy
-                    if coco_class in WASTE_CLASSES:
-                        waste_class = coco_class
-                    else:
-                        # Map COCO class to waste category, fall back to original name
-                        waste_class = COCO_TO_WASTE_MAPPING.get(coco_class, coco_class)
-                    
-                    detection = {
-                        'bbox': {
-                            'x1': float(x1),
-                            'y1': float(y1),
-                            'x2': float(x2),
-                            'y2': float(y2),
-                            'width': float(x2 - x1),
-                            'height': float(y2 - y1)
-                        },
-                        'class': waste_class,  # Use mapped waste class
-                        'coco_class': coco_class,  # Keep original for reference
-                        'confidence': confidence,
-                        'class_id': class_id
-                    }
-                    
-                    detections.append(detection)
+            for result in self._predict(image):
+                detections.extend(self._parse_result(result))
             
             logger.info(f"Detected {len(detections)} waste objects (mapped from COCO classes)")
             return detections
@@ -197,6 +161,90 @@ class WasteDetector:
             logger.error(f"Detection failed: {e}")
             return []
     
+    def detect_batch(self, images: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """
+        Detect waste objects in several decoded images with one model call
+        
+        Args:
+            images: BGR image arrays (sizes may differ)
+            
+        Returns:
+            One list of detections per image, in input order
+        """
+        if not self.model_loaded:
+            logger.warning("Model not loaded. Returning empty detections.")
+            return [[] for _ in images]
+        
+        try:
+            return [self._parse_result(result) for result in self._predict(list(images))]
+        except Exception as e:
+            logger.error(f"Batch detection failed ({len(images)} images): {e}")
+            return [[] for _ in images]
+    
+    def _predict(self, source: Union[str, np.ndarray, List[np.ndarray]]) -> list:
+        """Run inference (a list of arrays is letterboxed and inferred as one batch)"""
+        return self.model.predict(
+            source=source,
+            conf=self.confidence_threshold,
+            iou=0.45,
+            device='cpu',  # Use 'cuda' if GPU available
+            verbose=False
+        )
+    
+    def _parse_result(self, result) -> List[Dict[str, Any]]:
+        """Detections of one image from a YOLO result, mapped to waste classes"""
+        detections = []
+        
+        for box in result.boxes:
+            # Extract box coordinates
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            confidence = float(box.conf[0].cpu().numpy())
+            class_id = int(box.cls[0].cpu().numpy())
+            
+            # Get COCO class name
+            coco_class = result.names[class_id]
+            
+            # Prefer native class names when they match our waste taxonomy
+            if coco_class in WASTE_CLASSES:
+                waste_class = coco_class
+            else:
+                # Map COCO class to waste category, fall back to original name
+                waste_class = COCO_TO_WASTE_MAPPING.get(coco_class, coco_class)
+            
+            detections.append({
+                'bbox': {
+                    'x1': float(x1),
+                    'y1': float(y1),
+                    'x2': float(x2),
+                    'y2': float(y2),
+                    'width': float(x2 - x1),
+                    'height': float(y2 - y1)
+                },
+                'class': waste_class,  # Use mapped waste class
+                'coco_class': coco_class,  # Keep original for reference
+                'confidence': confidence,
+                'class_id': class_id
+            })
+        
+        return detections
+    
+    def annotate(self, image: np.ndarray, detections: List[Dict]) -> np.ndarray:
+        """
+        Draw bounding boxes on a copy of a decoded image
+        
+        Args:
+            image: BGR image array
+            detections: List of detections from detect()
+            
+        Returns:
+            Annotated BGR image array
+        """
+        return draw_detections(image, detections, CLASS_COLORS)
+    
+    def annotate_jpeg(self, image: np.ndarray, detections: List[Dict], quality: int = 90) -> bytes:
+        """Annotated image encoded as JPEG bytes in memory (see annotate)"""
+        return encode_jpeg(self.annotate(image, detections), quality)
+    
     def visualize_detections(
         self,
         image_path: str,
@@ -204,7 +252,7 @@ class WasteDetector:
         output_path: str = None
     ) -> str:
         """
-        Draw bounding boxes on image
+        Draw bounding boxes on an image file
         
         Args:
             image_path: Input image path
@@ -215,50 +263,14 @@ class WasteDetector:
             Path to annotated image
         """
         img = cv2.imread(image_path)
-        
-        for det in detections:
-            bbox = det['bbox']
-            class_name = det['class']
-            confidence = det['confidence']
-            
-            # Get color for class
-            color = CLASS_COLORS.get(class_name, (255, 255, 255))
-            
-            # Draw bounding box
-            x1, y1 = int(bbox['x1']), int(bbox['y1'])
-            x2, y2 = int(bbox['x2']), int(bbox['y2'])
-            
-            cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
-            
-            # Draw label
-            label = f"{class_name} {confidence:.2f}"
-            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-            
-            # Background for text
-            cv2.rectangle(
-                img,
-                (x1, y1 - label_size[1] - 10),
-                (x1 + label_size[0], y1),
-                color,
-                -1
-            )
-            
-            # Text
-            cv2.putText(
-                img,
-                label,
-                (x1, y1 - 5),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (0, 0, 0),
-                2
-            )
+        if img is None:
+            raise ValueError(f"Failed to load image: {image_path}")
         
         # Save annotated image
         if output_path is None:
             output_path = str(Path(image_path).with_suffix('.annotated.jpg'))
         
-        cv2.imwrite(output_path, img)
+        cv2.imwrite(output_path, self.annotate(img, detections))
         return output_path
     
     def get_detection_summary(self, detections: List[Dict]) -> Dict[str, Any]:
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Async Qdrant client benchmark
+Measures concurrent report searches through the sync client (on the I/O thread
+pool) against the AsyncQdrantClient variants awaited on the event loop
+
+Qdrant is replaced by a local HTTP stand-in that answers the REST query
+endpoint after a fixed delay, so the numbers isolate how concurrent searches
+overlap their network waits rather than Qdrant's own search cost. The
+stand-in runs in its own process; on a single core it competes with the
+client for CPU, so keep the latency well above the per-request CPU cost.
+Like qdrant_client itself, the connection factory does not keep connections
+alive to a localhost server, so the reuse column reads 0% here.
+
+Usage:
+    python tests/benchmarks/bench_async_qdrant.py [--concurrency 32 128 256] [--latency-ms 100]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+import uuid
+import warnings
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import uvicorn
+from fastapi import FastAPI
+
+import executors
+from config import settings
+from qdrant.connection import QdrantConnectionFactory
+from qdrant.vector_store import EcoSynkVectorStore
+
+
+def _standin_app(latency_seconds: float) -> FastAPI:
+    """Minimal Qdrant REST stand-in: version probe plus a slow query endpoint"""
+    app = FastAPI()
+
+    @app.get("/")
+    async def version():
+        return {"title": "qdrant - vector search engine", "version": "1.12.0"}
+
+    @app.post("/collections/{collection_name}/points/query")
+    async def query(collection_name: str):
+        await asyncio.sleep(latency_seconds)
+        points = [
+            {"id": str(uuid.uuid4()), "version": 0, "score": 0.9 - i * 0.01, "payload": {"report_id": f"r{i}"}}
+            for i in range(10)
+        ]
+        return {"result": {"points": points}, "status": "ok", "time": latency_seconds}
+
+    return app
+
+
+def _serve(latency_seconds: float, port: int):
+    uvicorn.run(_standin_app(latency_seconds), host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+@contextlib.contextmanager
+def standin_server(latency_seconds: float):
+    """Serve the stand-in on a free local port in its own process (so it does not share our GIL)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = multiprocessing.Process(target=_serve, args=(latency_seconds, port), daemon=True)
+    process.start()
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                process.terminate()
+                raise RuntimeError("Qdrant stand-in did not start")
+            time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.join()
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(store: EcoSynkVectorStore, concurrency: int, use_async: bool):
+    embedding = [0.1] * settings.embedding_dimension
+
+    async def search():
+        start = time.perf_counter()
+        if use_async:
+            results = await store.afind_similar_reports(embedding, limit=10)
+        else:
+            results = await executors.run_io(store.find_similar_reports, embedding, limit=10)
+        assert len(results) == 10
+        return (time.perf_counter() - start) * 1000
+
+    # Warm up connections so both modes start with an open pool
+    await asyncio.gather(*(search() for _ in range(min(concurrency, 8))))
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(search() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def run_mode(label: str, url: str, concurrency: int, use_async: bool):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), warnings.catch_warnings():
+        # The stand-in is plain HTTP, so the clients warn about sending an API key
+        warnings.simplefilter("ignore")
+        connection = QdrantConnectionFactory(url=url, api_key="bench", pool_size=concurrency)
+        store = EcoSynkVectorStore(connection=connection)
+
+        async def session():
+            try:
+                return await _run(store, concurrency, use_async)
+            finally:
+                await connection.aclose()
+
+        try:
+            latencies, wall_seconds = asyncio.run(session())
+        finally:
+            executors.shutdown_executors()
+
+    print(f"  {label:<36} p50 {statistics.median(latencies):7.1f} ms   "
+          f"p95 {_percentile(latencies, 95):7.1f} ms   "
+          f"wall {wall_seconds * 1000:7.1f} ms   "
+          f"{concurrency / wall_seconds:7.0f} searches/s   "
+          f"connections reused {connection.stats()['connections']['reuse_ratio']:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[32, 128, 256])
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Async Qdrant benchmark: concurrent find_similar_reports")
+    print("=" * 60)
+    print(f"Stand-in latency: {args.latency_ms:.0f} ms   I/O pool: {settings.executor_io_workers} threads")
+
+    with standin_server(args.latency_ms / 1000) as url:
+        for concurrency in args.concurrency:
+            print(f"\n{concurrency} concurrent searches")
+            run_mode("Sync client on the I/O pool", url, concurrency, use_async=False)
+            run_mode("AsyncQdrantClient on the event loop", url, concurrency, use_async=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Embedding backend benchmark
+Compares single-item and batch throughput of the torch and ONNX Runtime backends
+
+Runs the configured (or given) sentence-transformers model through PyTorch,
+ONNX fp32 and ONNX int8 on CPU, reporting texts/second and the cosine
+drift of each ONNX variant against the torch vectors. ONNX exports are
+written to a temporary directory unless --export-dir is given.
+
+Usage:
+    python tests/benchmarks/bench_embedding_backends.py [--model all-MiniLM-L6-v2] [--texts 256] [--batch-size 32]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from config import settings
+from embeddings.onnx_backend import OnnxSentenceEncoder
+
+MATERIALS = ["plastic", "glass", "metal", "paper", "organic", "electronic", "textile", "mixed"]
+ITEMS = ["bottles", "bags", "cans", "tyres", "cardboard", "food containers", "fishing nets", "cigarette butts"]
+PLACES = ["near the river", "on the beach", "in the park", "along the highway", "behind the market"]
+
+
+def _texts(count: int):
+    texts = []
+    for i in range(count):
+        material = MATERIALS[i % len(MATERIALS)]
+        items = ", ".join(ITEMS[(i + k) % len(ITEMS)] for k in range(1 + i % 4))
+        texts.append(
+            f"Material type: {material}. Items found: {items}. "
+            f"Description: pile of {material} waste {PLACES[i % len(PLACES)]}. Priority level: {1 + i % 10}/10"
+        )
+    return texts
+
+
+def _single_item(model, texts, repeats: int):
+    latencies = []
+    for text in texts[:repeats]:
+        started = time.perf_counter()
+        model.encode([text], batch_size=1, show_progress_bar=False, convert_to_numpy=True)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _batch(model, texts, batch_size: int):
+    started = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True)
+    return np.asarray(vectors, dtype=np.float32), time.perf_counter() - started
+
+
+def run_backend(label: str, model, texts, batch_size: int, repeats: int, reference=None):
+    # Warm-up so one-time graph/kernel setup is not timed
+    model.encode(texts[:batch_size], batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True)
+
+    latencies = _single_item(model, texts, repeats)
+    vectors, seconds = _batch(model, texts, batch_size)
+
+    print(f"\n{label}")
+    print(f"  single-item p50: {statistics.median(latencies):8.2f} ms")
+    print(f"  single-item throughput: {1000 / statistics.mean(latencies):8.1f} texts/s")
+    print(f"  batch ({batch_size}) throughput: {len(texts) / seconds:8.1f} texts/s")
+    if reference is not None:
+        cosine = np.sum(vectors * reference, axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        print(f"  cosine vs torch: min={cosine.min():.5f} mean={cosine.mean():.5f}")
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--export-dir", default=None)
+    args = parser.parse_args()
+
+    texts = _texts(args.texts)
+
+    print("=" * 60)
+    print(f"Embedding backend benchmark: {args.model}")
+    print("=" * 60)
+    print(f"{len(texts)} texts, batch size {args.batch_size}, {args.repeats} single-item calls")
+
+    torch_model = SentenceTransformer(args.model, device="cpu")
+    reference = run_backend("PyTorch", torch_model, texts, args.batch_size, args.repeats)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_dir = args.export_dir or tmp
+        for quantize, label in ((False, "ONNX Runtime fp32"), (True, "ONNX Runtime int8 (dynamic)")):
+            # Hide exporter chatter so the report stays readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                encoder = OnnxSentenceEncoder(args.model, quantize=quantize, export_dir=export_dir)
+            run_backend(label, encoder, texts, args.batch_size, args.repeats, reference=reference)
+            print(f"  model size: {encoder.memory_bytes() / (1024 * 1024):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Event loop responsiveness benchmark
+Measures /health latency while concurrent /detect-waste calls are in flight
+
+Gemini, YOLO, the embedder and Qdrant are replaced by stand-ins that block
+for a fixed time, so the numbers isolate how the server schedules blocking
+work. The "inline" run reproduces the old behaviour (blocking calls made
+directly on the event loop); the "executors" run uses the dependency pools.
+
+Usage:
+    python tests/benchmarks/bench_event_loop.py [--concurrency 20] [--probes 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import httpx
+from PIL import Image
+
+import api_server
+import batching
+import executors
+from embeddings.batcher import EmbeddingBatcher
+from yolo.batcher import DetectionBatcher
+
+GEMINI_SECONDS = 0.8
+YOLO_SECONDS = 0.15
+EMBED_SECONDS = 0.02
+QDRANT_SECONDS = 0.05
+PROBE_INTERVAL_SECONDS = 0.02
+
+
+class SlowAnalyzer:
+    def analyze_trash_image_bytes(self, image_data, mime_type, location=None, user_notes=None,
+                                  yolo_detections=None, image_name="upload"):
+        time.sleep(GEMINI_SECONDS)
+        return {
+            "primary_material": "plastic",
+            "estimated_volume": "medium",
+            "specific_items": ["bottle"],
+            "cleanup_priority_score": 5,
+            "description": "Benchmark analysis",
+            "metadata": {},
+        }
+
+
+class SlowDetector:
+    def detect_batch(self, images):
+        time.sleep(YOLO_SECONDS * len(images))
+        return [[] for _ in images]
+
+    def get_detection_summary(self, detections):
+        return {"total_items": len(detections)}
+
+
+class SlowEmbedder:
+    def get_cached_embedding(self, text):
+        return None
+
+    def build_trash_report_text(self, report_data):
+        return report_data.get("description", "")
+
+    def batch_generate(self, texts, show_progress_bar=None):
+        time.sleep(EMBED_SECONDS)
+        return [[0.0] * 384 for _ in texts]
+
+
+class SlowVectorStore:
+    def __init__(self, blocking: bool):
+        # The old synchronous client blocked the loop; the async client awaits
+        self.blocking = blocking
+
+    async def astore_trash_report(self, embedding, metadata, report_id=None):
+        if self.blocking:
+            time.sleep(QDRANT_SECONDS)
+        else:
+            await asyncio.sleep(QDRANT_SECONDS)
+        return report_id
+
+
+async def _inline(func, *args, **kwargs):
+    """Old behaviour: run the blocking call directly on the event loop"""
+    return func(*args, **kwargs)
+
+
+def _sample_jpeg() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (40, 120, 60)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(concurrency: int, probes: int):
+    image_bytes = _sample_jpeg()
+    transport = httpx.ASGITransport(app=api_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def detect():
+            response = await client.post(
+                "/detect-waste",
+                files={"file": ("frame.jpg", image_bytes, "image/jpeg")},
+            )
+            response.raise_for_status()
+
+        async def probe_health():
+            # Probes fire on a fixed schedule; latency is measured from the
+            # scheduled send time so time spent waiting on a blocked loop counts
+            latencies = []
+            first = time.perf_counter()
+            for i in range(probes):
+                scheduled = first + i * PROBE_INTERVAL_SECONDS
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                response = await client.get("/health")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+            return latencies
+
+        start = time.perf_counter()
+        detect_tasks = [asyncio.create_task(detect()) for _ in range(concurrency)]
+        latencies = await probe_health()
+        await asyncio.gather(*detect_tasks)
+        wall_seconds = time.perf_counter() - start
+
+    return latencies, wall_seconds
+
+
+# Executor entry points replaced by _inline in the "inline" run
+INLINE_PATCHES = (
+    (api_server, "run_io"), (api_server, "run_cpu"), (api_server, "run_image"), (batching, "run_cpu"),
+)
+
+
+def run_mode(label: str, concurrency: int, probes: int, inline: bool):
+    """Run one mode, print its summary and return (/health latencies in ms, wall seconds)"""
+    detector = SlowDetector()
+    api_server.analyzer = SlowAnalyzer()
+    api_server.waste_detector = detector
+    api_server.detection_batcher = DetectionBatcher(detector)
+    api_server.embedder = SlowEmbedder()
+    api_server.embedding_batcher = EmbeddingBatcher(api_server.embedder)
+    api_server.vector_store = SlowVectorStore(blocking=inline)
+
+    original = [getattr(module, name) for module, name in INLINE_PATCHES]
+    if inline:
+        for module, name in INLINE_PATCHES:
+            setattr(module, name, _inline)
+    try:
+        # Silence per-request logging so it does not skew the timings
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            latencies, wall_seconds = asyncio.run(_run(concurrency, probes))
+    finally:
+        for (module, name), func in zip(INLINE_PATCHES, original):
+            setattr(module, name, func)
+        executors.shutdown_executors()
+
+    print(f"\n{label}")
+    print(f"  /health p50: {statistics.median(latencies):8.1f} ms")
+    print(f"  /health p99: {_percentile(latencies, 99):8.1f} ms")
+    print(f"  /health max: {max(latencies):8.1f} ms")
+    print(f"  {concurrency} x /detect-waste wall time: {wall_seconds:6.2f} s")
+    return latencies, wall_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Event loop benchmark: /health under /detect-waste load")
+    print("=" * 60)
+    print(f"Stand-in latencies: gemini={GEMINI_SECONDS}s yolo={YOLO_SECONDS}s "
+          f"embed={EMBED_SECONDS}s qdrant={QDRANT_SECONDS}s")
+
+    run_mode("Inline (blocking calls on the event loop)", args.concurrency, args.probes, inline=True)
+    run_mode("Executors (io/cpu thread pools, image processes)", args.concurrency, args.probes, inline=False)
+
+
+if __name__ == "__main__":
+    main()
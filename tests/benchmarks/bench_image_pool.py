@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Image pool benchmark
+Runs the /detect-waste image stages (prepare_upload, then an annotated JPEG)
+for concurrent uploads on the CPU thread pool (the previous behaviour) and on
+the image worker processes with shared-memory handoff, reporting throughput
+and how late a 10 ms event-loop heartbeat fires meanwhile
+
+Usage:
+    python tests/benchmarks/bench_image_pool.py [--requests 32] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import numpy as np
+from PIL import Image
+
+from executors import DependencyExecutors
+from imaging import annotate_shared_jpeg, detection_block, draw_detections, encode_jpeg, prepare_upload
+
+COLORS = {"can": (0, 0, 255)}
+DETECTIONS = [{"bbox": {"x1": 40, "y1": 60, "x2": 200, "y2": 220}, "class": "can", "confidence": 0.9}] * 5
+
+
+def _photo() -> bytes:
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, (3000, 4000, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _annotate(pixels: np.ndarray) -> bytes:
+    return encode_jpeg(draw_detections(pixels, DETECTIONS, COLORS))
+
+
+async def _threads(executors: DependencyExecutors, content: bytes):
+    upload = await executors.run_cpu(prepare_upload, content, 640, 1536)
+    return await executors.run_cpu(_annotate, upload.detection_image)
+
+
+async def _processes(executors: DependencyExecutors, content: bytes):
+    block = detection_block(640)
+    try:
+        upload = await executors.run_image(prepare_upload, content, 640, 1536, shared=block.ref)
+    except BaseException:
+        block.unlink()
+        raise
+    block.close()
+    try:
+        return await executors.run_image(annotate_shared_jpeg, upload.detection_ref, DETECTIONS, COLORS)
+    finally:
+        upload.release()
+
+
+async def measure(handler, executors: DependencyExecutors, content: bytes, requests: int):
+    """Return (requests per second, median and max heartbeat lag in ms)"""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append((time.perf_counter() - start) * 1000 - 10)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(executors, content) for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+    return requests / elapsed, statistics.median(lags), max(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    content = _photo()
+    executors = DependencyExecutors(io_workers=1, cpu_workers=args.workers, image_workers=args.workers)
+
+    print("=" * 66)
+    print(f"Image stages: {args.requests} concurrent 12 MP uploads, {args.workers} workers, {os.cpu_count()} CPUs")
+    print("=" * 66)
+    print(f"  {'pool':<10} {'req/s':>8} {'loop lag p50 ms':>16} {'loop lag max ms':>16}")
+    try:
+        # Warm up the worker processes so their start-up is not measured
+        asyncio.run(measure(_processes, executors, content, args.workers))
+        for label, handler in (("threads", _threads), ("processes", _processes)):
+            rate, lag_p50, lag_max = asyncio.run(measure(handler, executors, content, args.requests))
+            print(f"  {label:<10} {rate:>8.1f} {lag_p50:>16.1f} {lag_max:>16.1f}")
+    finally:
+        executors.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Payload projection benchmark
+Compares the JSON size and scroll time of report and volunteer listings with
+the full payload (the previous behaviour, now `fields=*`) against the compact
+default projections
+
+Payloads mimic what /analyze-trash and /volunteer-profile store: the Gemini
+analysis (also copied under `metadata`), raw Nominatim `location_context` and
+volunteer follow lists. Runs against an embedded in-memory Qdrant, so the
+times only reflect payload handling, not network transfer.
+
+Usage:
+    python tests/benchmarks/bench_projection.py [--points 2000] [--page 200]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+import warnings
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from projection import REPORT_FIELDS, VOLUNTEER_FIELDS, parse_fields
+from qdrant.vector_store import EcoSynkVectorStore
+
+
+def _report(i: int):
+    context = {
+        "name": f"Corniche Road {i}",
+        "display_name": f"{i}, Corniche Road, Al Khalidiyah, Abu Dhabi, Abu Dhabi Emirate, 51133, United Arab Emirates",
+        "address": {"road": "Corniche Road", "suburb": "Al Khalidiyah", "city": "Abu Dhabi", "state": "Abu Dhabi Emirate",
+                    "postcode": "51133", "country": "United Arab Emirates", "country_code": "ae"},
+        "boundingbox": ["24.46", "24.47", "54.32", "54.33"], "confidence": 0.8, "source": "nominatim",
+    }
+    analysis = {
+        "primary_material": "plastic", "estimated_volume": "medium",
+        "specific_items": ["bottles", "bags", "food wrappers", "cans"],
+        "cleanup_priority_score": 6, "description": "Plastic bottles and bags scattered along the beach near the walkway.",
+        "recyclable": True, "requires_special_handling": False, "environmental_risk_level": "medium",
+        "recommended_equipment": ["gloves", "trash bags", "grabber"], "estimated_cleanup_time_minutes": 45,
+        "confidence_score": 0.87, "yolo_detections": [{"class": "bottle", "confidence": 0.9, "bbox": [10, 20, 30, 40]}] * 6,
+    }
+    return {
+        **analysis,
+        "report_id": f"report_{i}", "timestamp": "2026-03-01T10:00:00", "user_id": f"user_{i % 50}",
+        "location": {"lat": 24.46, "lon": 54.32}, "location_name": context["name"], "location_context": context,
+        "metadata": {**analysis, "analyzed_at": "2026-03-01T10:00:00", "location": {"lat": 24.46, "lon": 54.32},
+                     "location_context": context},
+    }
+
+
+def _volunteer(i: int):
+    return {
+        "user_id": f"user_{i}", "name": f"Volunteer {i}", "email": f"v{i}@example.com", "phone": "+971500000000",
+        "password_hash": "$2b$12$" + "x" * 53, "bio": "Beach cleanups every weekend.", "location": {"lat": 24.4, "lon": 54.3},
+        "available": True, "skills": ["sorting", "first aid"], "experience_level": "intermediate",
+        "materials_expertise": ["plastic"], "specializations": ["beach"], "equipment_owned": ["gloves"],
+        "past_cleanup_count": i % 40, "followers": [str(uuid.uuid4()) for _ in range(30)],
+        "following": [str(uuid.uuid4()) for _ in range(30)], "profile_text": "Volunteer profile " * 20,
+    }
+
+
+def measure(store: EcoSynkVectorStore, collection: str, selector, page: int, rounds: int = 5):
+    """Return (JSON bytes per page, median scroll ms)"""
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        points, _ = store.scroll_page(collection, fields=selector, limit=page)
+        times.append((time.perf_counter() - start) * 1000)
+    body = json.dumps([point.payload for point in points]).encode("utf-8")
+    return len(body), statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=200)
+    args = parser.parse_args()
+
+    client = QdrantClient(":memory:")
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    for name, make in (("reports", _report), ("volunteers", _volunteer)):
+        client.create_collection(name, vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+        client.upload_points(name, [PointStruct(id=i, vector=[1.0, 0, 0, 0], payload=make(i)) for i in range(args.points)])
+
+    print("=" * 60)
+    print(f"Payload projection: {args.page}-item pages from {args.points:,} points")
+    print("=" * 60)
+    print(f"  {'collection':<11} {'projection':<10} {'bytes/page':>12} {'bytes/item':>11} {'scroll ms':>10}")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, default in (("reports", REPORT_FIELDS), ("volunteers", VOLUNTEER_FIELDS)):
+            sizes = {}
+            for label, fields in (("full", "*"), ("default", None)):
+                size, ms = measure(store, name, parse_fields(fields, default).selector(), args.page)
+                sizes[label] = size
+                print(f"  {name:<11} {label:<10} {size:>12,} {size // args.page:>11,} {ms:>10.1f}")
+            print(f"  {'':<11} {'saving':<10} {1 - sizes['default'] / sizes['full']:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
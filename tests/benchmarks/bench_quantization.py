@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Quantization / HNSW recall-vs-latency benchmark
+Loads synthetic trash-report embeddings into one collection per quantization
+mode, then sweeps search-time ef (and oversampling for quantized modes) and
+reports recall@k against exact search alongside p50/p95 query latency
+
+Needs a real Qdrant server: the embedded local mode searches exhaustively and
+ignores HNSW and quantization settings (--local only smoke-tests the script).
+Vectors are clustered (like real report embeddings) and regenerated from a
+seed, so 1M points never have to sit in client memory at once.
+
+Usage:
+    docker run -p 6333:6333 qdrant/qdrant
+    python tests/benchmarks/bench_quantization.py --url http://localhost:6333 [--points 1000000]
+        [--modes none scalar binary] [--ef 16 32 64 128 256] [--oversampling 1 2 4] [--keep]
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import numpy as np
+from qdrant_client.models import CollectionStatus, PointStruct, QuantizationSearchParams, SearchParams
+
+from config import settings
+from qdrant.connection import QdrantConnectionFactory
+from qdrant.tuning import QUANTIZATION_MODES, CollectionTuning
+
+MATERIALS = ("plastic", "glass", "metal", "paper", "organic")
+CHUNK_SIZE = 2000
+
+
+def _centroids(seed: int, clusters: int, dim: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((clusters, dim)).astype(np.float32)
+
+
+def _vectors(centroids: np.ndarray, rng: np.random.Generator, count: int, spread: float) -> np.ndarray:
+    """Unit vectors scattered around random centroids"""
+    picks = rng.integers(0, len(centroids), size=count)
+    vectors = centroids[picks] + spread * rng.standard_normal((count, centroids.shape[1])).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load_collection(client, name: str, tuning: CollectionTuning, points: int, centroids: np.ndarray, seed: int):
+    """(Re)create a collection with the given tuning and upload the synthetic reports"""
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(collection_name=name, **tuning.create_collection_kwargs(size=centroids.shape[1]))
+
+    start = time.perf_counter()
+    for offset in range(0, points, CHUNK_SIZE):
+        count = min(CHUNK_SIZE, points - offset)
+        # Same seed per chunk across collections, so every mode holds identical data
+        vectors = _vectors(centroids, np.random.default_rng((seed, offset)), count, spread=0.35)
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(
+                    id=offset + i,
+                    vector=vectors[i].tolist(),
+                    payload={"report_id": f"bench_{offset + i}", "primary_material": MATERIALS[(offset + i) % len(MATERIALS)]}
+                )
+                for i in range(count)
+            ],
+            wait=offset + count >= points
+        )
+        if (offset // CHUNK_SIZE) % 50 == 0:
+            print(f"   … {name}: {offset + count:,}/{points:,} points uploaded")
+
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(2)
+    print(f"   ✓ {name}: loaded and indexed in {time.perf_counter() - start:.0f}s")
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_queries(client, name: str, queries: np.ndarray, limit: int, params: SearchParams):
+    """Return (ids per query, latencies in ms)"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        points = client.query_points(collection_name=name, query=query.tolist(), limit=limit, search_params=params).points
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({point.id for point in points})
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.qdrant_url or "http://localhost:6333")
+    parser.add_argument("--api-key", default=settings.qdrant_api_key or None)
+    parser.add_argument("--local", action="store_true", help="Use an embedded in-memory Qdrant (smoke test only)")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", choices=QUANTIZATION_MODES, default=list(QUANTIZATION_MODES))
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--oversampling", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    parser.add_argument("--m", type=int, default=settings.qdrant_hnsw_m)
+    parser.add_argument("--ef-construct", type=int, default=settings.qdrant_hnsw_ef_construct)
+    parser.add_argument("--on-disk", action="store_true", help="Keep original vectors on disk")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collections afterwards")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    connection = QdrantConnectionFactory(
+        url=args.url,
+        api_key=args.api_key,
+        local_path=":memory:" if args.local else "",
+        operation_timeouts={"upsert": 300, "query_points": 60}
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), warnings.catch_warnings():
+        # Plain-HTTP local servers make the client warn about the API key
+        warnings.simplefilter("ignore")
+        client = connection.client
+        client.get_collections()
+
+    print("=" * 60)
+    print("Quantization / HNSW benchmark: recall vs latency")
+    print("=" * 60)
+    print(f"Qdrant: {connection.location}   points: {args.points:,}   queries: {args.queries}   "
+          f"top-{args.limit}   m={args.m} ef_construct={args.ef_construct}   on_disk={args.on_disk}")
+    if args.local:
+        print("⚠️  Embedded mode searches exhaustively: recall is always 1.0 and settings have no effect")
+
+    dim = settings.embedding_dimension
+    centroids = _centroids(args.seed, args.clusters, dim)
+    queries = _vectors(centroids, np.random.default_rng(args.seed + 1), args.queries, spread=0.35)
+
+    collections = {}
+    for mode in args.modes:
+        name = f"bench_tuning_{mode}"
+        tuning = CollectionTuning(quantization=mode, on_disk=args.on_disk, m=args.m, ef_construct=args.ef_construct)
+        print(f"\n📦 Loading {name}")
+        load_collection(client, name, tuning, args.points, centroids, args.seed)
+        collections[mode] = name
+
+    # Ground truth: exact (brute-force) search on the original vectors
+    truth, exact_latencies = run_queries(
+        client, collections[args.modes[0]], queries, args.limit,
+        SearchParams(exact=True, quantization=QuantizationSearchParams(ignore=True))
+    )
+    print(f"\nExact search: p50 {statistics.median(exact_latencies):7.1f} ms   p95 {_percentile(exact_latencies, 95):7.1f} ms\n")
+
+    print(f"  {'mode':<7} {'ef':>5} {'oversample':>10} {'recall@' + str(args.limit):>10} {'p50 ms':>8} {'p95 ms':>8}")
+    try:
+        for mode, name in collections.items():
+            for ef in args.ef:
+                for oversampling in (args.oversampling if mode != "none" else [None]):
+                    tuning = CollectionTuning(quantization=mode, ef=ef, oversampling=oversampling or 1.0)
+                    found, latencies = run_queries(client, name, queries, args.limit, tuning.search_params())
+                    recall = statistics.mean(len(f & t) / max(1, len(t)) for f, t in zip(found, truth))
+                    print(f"  {mode:<7} {ef:>5} {oversampling or '-':>10} {recall:>10.3f} "
+                          f"{statistics.median(latencies):>8.1f} {_percentile(latencies, 95):>8.1f}")
+    finally:
+        if not args.keep:
+            for name in collections.values():
+                client.delete_collection(name)
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Upload decode benchmark
+Compares the previous upload handling of /detect-waste (full-resolution decode
+shared by YOLO and annotation, Gemini sent the original upload) against
+prepare_upload (JPEG draft-mode decode straight into a detection variant and a
+Gemini variant)
+
+Each case runs in a fresh subprocess that only reads the prepared JPEG, so its
+peak RSS is not inflated by generating the photo or by the previous case; the
+reported memory is the increase over the process baseline after imports and
+reading the file. Linux only (VmHWM from /proc: ru_maxrss would carry over
+the parent's peak across fork/exec).
+
+Usage:
+    python tests/benchmarks/bench_upload_decode.py [--rounds 5]
+"""
+
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'ai-services'))
+
+import numpy as np
+from PIL import Image
+
+from config import settings
+from imaging import decode_image, prepare_upload
+
+# Phone-camera sized photos
+SIZES = {"12MP": (4000, 3000), "48MP": (8000, 6000)}
+
+
+def _photo(size) -> bytes:
+    """Noisy gradient JPEG, so it compresses like a photo rather than a flat fill"""
+    width, height = size
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None] + np.zeros((height, 1, 3), np.float32)
+    pixels = np.clip(gradient + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def _before(content: bytes):
+    """Full-size BGR array for YOLO and annotation; Gemini got the JPEG as uploaded"""
+    return decode_image(content), content
+
+
+def _after(content: bytes):
+    upload = prepare_upload(
+        content,
+        settings.upload_detection_max_side,
+        settings.upload_gemini_max_side,
+        max_pixels=settings.upload_max_pixels,
+        gemini_quality=settings.upload_gemini_jpeg_quality
+    )
+    return upload.detection_image, upload.gemini_data
+
+
+def _peak_rss_kb() -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    raise RuntimeError("VmHWM not available")
+
+
+def run_case(variant: str, path: str, rounds: int):
+    """Measure one variant on one image in this process and print the result as JSON"""
+    content = Path(path).read_bytes()
+    handler = _before if variant == "before" else _after
+    baseline = _peak_rss_kb()
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _, gemini_data = handler(content)
+        times.append((time.perf_counter() - start) * 1000)
+
+    peak = _peak_rss_kb()
+    print(json.dumps({
+        "upload_bytes": len(content),
+        "ms": statistics.median(times),
+        "peak_mb": (peak - baseline) / 1024,
+        "gemini_bytes": len(gemini_data),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--case", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(*args.case, args.rounds)
+        return
+
+    print("=" * 72)
+    print(
+        f"Upload decode: detection {settings.upload_detection_max_side}px, "
+        f"Gemini {settings.upload_gemini_max_side}px q{settings.upload_gemini_jpeg_quality}"
+    )
+    print("=" * 72)
+    print(f"  {'image':<6} {'variant':<8} {'upload bytes':>13} {'decode ms':>10} {'peak MB':>9} {'gemini bytes':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size, dimensions in SIZES.items():
+            path = Path(directory) / f"{size}.jpg"
+            path.write_bytes(_photo(dimensions))
+            for variant in ("before", "after"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--case", variant, str(path), "--rounds", str(args.rounds)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(
+                    f"  {size:<6} {variant:<8} {result['upload_bytes']:>13,} {result['ms']:>10.1f} "
+                    f"{result['peak_mb']:>9.1f} {result['gemini_bytes']:>13,}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Tests for the concurrent /analyze-trash/batch pipeline
+"""
+
+import asyncio
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from fastapi import UploadFile
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+import api_server
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+
+DELAY = 0.3
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+PNG = _png()
+
+
+class SlowAnalyzer:
+    """Stand-in for TrashAnalyzer: a fixed delay per call, failing for images named bad*"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def analyze_trash_image_bytes(self, image_data: bytes, mime_type: str, image_name: str = "upload"):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(DELAY)
+        with self.lock:
+            self.in_flight -= 1
+        assert mime_type == "image/png" and image_data == PNG
+        content = Path(image_name).stem
+        if content.startswith("bad"):
+            return {"primary_material": "unknown", "metadata": {"error": "unreadable image"}}
+        return {"primary_material": content, "specific_items": [content], "cleanup_priority_score": 5, "metadata": {}}
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def build_trash_report_text(self, report):
+        return report["primary_material"]
+
+    def batch_generate(self, texts, show_progress_bar=None):
+        self.calls.append(len(texts))
+        return [[1.0] + [0.0] * (settings.embedding_dimension - 1) for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_concurrently_stores_once_and_keeps_order(monkeypatch):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        settings.trash_reports_collection,
+        vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+    )
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    store.report_sparse_vectors = False
+    analyzer, embedder = SlowAnalyzer(), CountingEmbedder()
+    monkeypatch.setattr(api_server, "analyzer", analyzer)
+    monkeypatch.setattr(api_server, "embedder", embedder)
+    monkeypatch.setattr(api_server, "vector_store", store)
+    monkeypatch.setattr(settings, "analyze_batch_concurrency", 6)
+
+    names = ["plastic", "glass", "bad1", "metal", "paper", "bad2", "cans", "rubber", "wood", "foam", "cloth", "tyres"]
+    files = [UploadFile(file=io.BytesIO(PNG), filename=f"{name}.png") for name in names]
+
+    # Start the image worker processes outside the timed section
+    await asyncio.gather(*(api_server._prepare_upload(PNG, detection=False) for _ in range(len(names))))
+
+    start = time.perf_counter()
+    response = await api_server.analyze_trash_batch(files=files, user_id="u1")
+    elapsed = time.perf_counter() - start
+
+    # 12 sequential calls would take 12 x DELAY; 6 in flight take about 2 x DELAY
+    assert analyzer.peak == 6 and elapsed < 4 * DELAY
+    assert [r["filename"] for r in response["results"]] == [f"{n}.png" for n in names if not n.startswith("bad")]
+    assert [e["index"] for e in response["errors"]] == [2, 5]
+    assert response["batch_summary"]["stored"] == 10 and embedder.calls == [10]
+
+    stored = store.get_report_by_id(response["results"][0]["report_id"])
+    assert stored["primary_material"] == "plastic" and stored["user_id"] == "u1"
+    assert client.count(settings.trash_reports_collection).count == 10
@@ -0,0 +1,93 @@
+"""
+Tests for the AsyncQdrantClient variants of EcoSynkVectorStore and UserService
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+from user_service import UserService
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+
+async def _client_with(*collections):
+    client = AsyncQdrantClient(":memory:")
+    for name in collections:
+        await client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+        )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_store_and_search_reports_and_volunteers():
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.aclient = await _client_with(settings.trash_reports_collection, settings.volunteer_profiles_collection)
+
+    await asyncio.gather(*(
+        store.astore_trash_report(VECTOR, {"primary_material": material, "timestamp": 1700000000}, report_id=f"r_{material}")
+        for material in ("plastic", "glass")
+    ))
+    await store.astore_volunteer_profile(VECTOR, {"name": "Ada", "location": {"lat": 51.5, "lon": -0.12}}, user_id="vol_1")
+    await store.astore_volunteer_profile(VECTOR, {"name": "Bo", "location": {"lat": 48.85, "lon": 2.35}}, user_id="vol_2")
+
+    similar = await store.afind_similar_reports(VECTOR, score_threshold=0.5, filters={"primary_material": "glass"})
+    nearby = await store.afind_nearby_volunteers(VECTOR, {"lat": 51.5, "lon": -0.1}, radius_km=10, min_match_score=0.5)
+
+    assert [r["data"]["report_id"] for r in similar] == ["r_glass"]
+    assert (await store.aget_report_by_id("r_plastic"))["primary_material"] == "plastic"
+    assert [v["name"] for v in nearby] == ["Ada"]
+    assert nearby[0]["distance_km"] < 10
+
+
+@pytest.mark.asyncio
+async def test_campaign_variants_stream_every_page():
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.aclient = await _client_with("campaigns")
+    future = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
+
+    for i in range(300):
+        status = "active" if i % 3 == 0 else "completed"
+        await store.astore_campaign(VECTOR, {"status": status, "timeline": {"end_date": future}}, f"camp_{i}")
+
+    assert len(await store.aget_all_campaigns()) == 300
+    assert len(await store.aget_active_campaigns()) == 100
+    assert (await store.aget_campaign_by_id("camp_3"))["status"] == "active"
+
+
+@pytest.mark.asyncio
+async def test_user_service_follow_round_trip():
+    service = UserService.__new__(UserService)
+    service.collection_name = "users"
+    service.aclient = await _client_with("users")
+    ada, bo = str(uuid.uuid4()), str(uuid.uuid4())
+    await service.aclient.upsert("users", [
+        PointStruct(id=ada, vector=VECTOR, payload={"user_id": ada, "name": "Ada", "email": "ada@example.com", "password_hash": "x"}),
+        PointStruct(id=bo, vector=VECTOR, payload={"user_id": bo, "name": "Bo", "email": "bo@example.com", "password_hash": "y"}),
+    ])
+
+    followed = await service.afollow_user(ada, "Bo")
+    again = await service.afollow_user(ada, "Bo")
+    profile = await service.aget_user_by_id(ada)
+    unfollowed = await service.aunfollow_user(ada, bo)
+
+    assert followed["success"] and "password_hash" not in followed["followee"]
+    assert again == {"success": False, "error": "Already following Bo"}
+    assert profile["following"] == [bo] and "password_hash" not in profile
+    assert unfollowed["success"]
+    assert (await service.aget_user_by_id(bo))["followers"] == []
+    assert (await service.aget_user_by_email("bo@example.com"))["name"] == "Bo"
@@ -0,0 +1,35 @@
+"""
+Smoke test for the event loop benchmark: its stand-ins must keep up with /detect-waste
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the benchmarks directory to path (it adds ai-services itself)
+sys.path.insert(0, str(Path(__file__).parent / 'benchmarks'))
+
+import bench_event_loop
+
+SHM_DIR = Path("/dev/shm")
+
+
+def _shared_blocks() -> set:
+    return {path.name for path in SHM_DIR.glob("psm_*")} if SHM_DIR.is_dir() else set()
+
+
+def test_benchmark_completes_both_modes_without_leaking_shared_memory(monkeypatch):
+    for name in ("GEMINI_SECONDS", "YOLO_SECONDS", "EMBED_SECONDS", "QDRANT_SECONDS"):
+        monkeypatch.setattr(bench_event_loop, name, 0.01)
+    # run_mode swaps in its stand-ins; restore the real globals afterwards
+    for name in ("analyzer", "waste_detector", "detection_batcher", "embedder", "embedding_batcher", "vector_store"):
+        monkeypatch.setattr(bench_event_loop.api_server, name, getattr(bench_event_loop.api_server, name))
+    before = _shared_blocks()
+
+    with open(os.devnull, "w") as devnull:
+        monkeypatch.setattr(sys, "stdout", devnull)
+        results = [bench_event_loop.run_mode("smoke", concurrency=2, probes=3, inline=inline) for inline in (True, False)]
+
+    # Every /detect-waste succeeded (the benchmark raises on an error status)
+    assert all(len(latencies) == 3 for latencies, _ in results)
+    assert _shared_blocks() <= before
@@ -0,0 +1,64 @@
+"""
+Tests for per-collection quantization and HNSW tuning
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client.models import (
+    BinaryQuantization, Disabled, HnswConfigDiff, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    VectorParams, Distance
+)
+
+from config import settings
+from qdrant.migrations import _tuning_changes
+from qdrant.tuning import CollectionTuning, collection_tuning, parse_collection_overrides
+
+
+def test_overrides_apply_per_collection(monkeypatch):
+    monkeypatch.setattr(settings, "qdrant_quantization", "scalar")
+    monkeypatch.setattr(settings, "qdrant_collection_tuning", "trash_reports:quantization=binary,ef=64;users:m=32,on_disk=yes,m=x")
+
+    reports = collection_tuning("trash_reports")
+    users = collection_tuning("users")
+    campaigns = collection_tuning("campaigns")
+
+    assert (reports.quantization, reports.ef) == ("binary", 64)
+    assert (users.quantization, users.m, users.on_disk) == ("scalar", 32, True)
+    assert campaigns.describe()["m"] == settings.qdrant_hnsw_m
+    assert parse_collection_overrides(";:m=1;users:") == {"users": {}}
+
+
+def test_configs_follow_quantization_mode():
+    scalar = CollectionTuning(quantization="scalar", on_disk=True, oversampling=3.0, ef=200)
+    kwargs = scalar.create_collection_kwargs()
+
+    assert kwargs["vectors_config"].on_disk is True
+    assert isinstance(kwargs["quantization_config"], ScalarQuantization)
+    assert scalar.search_params().hnsw_ef == 200
+    assert scalar.search_params().quantization.oversampling == 3.0
+    assert isinstance(CollectionTuning(quantization="binary").quantization_config(), BinaryQuantization)
+    assert CollectionTuning().search_params().quantization is None
+    assert CollectionTuning().update_collection_kwargs()["quantization_config"] == Disabled.DISABLED
+    with pytest.raises(ValueError):
+        CollectionTuning(quantization="product")
+
+
+def test_migration_reports_only_differing_settings():
+    info = SimpleNamespace(config=SimpleNamespace(
+        params=SimpleNamespace(vectors=VectorParams(size=384, distance=Distance.COSINE)),
+        hnsw_config=HnswConfigDiff(m=16, ef_construct=100),
+        quantization_config=ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)),
+    ))
+
+    assert _tuning_changes(info, CollectionTuning(quantization="scalar")) == {}
+    assert _tuning_changes(info, CollectionTuning(quantization="binary", m=32)) == {
+        "quantization": ("scalar", "binary"),
+        "m": (16, 32),
+    }
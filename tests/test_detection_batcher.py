@@ -0,0 +1,86 @@
+"""
+Tests for dynamic YOLO batching across concurrent requests
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from yolo.batcher import DetectionBatcher
+
+INFERENCE_S = 0.05
+
+
+class FakeDetector:
+    """Stand-in for WasteDetector: one detection per image, tagged with the image's fill value"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def detect_batch(self, images):
+        self.batch_sizes.append(len(images))
+        time.sleep(INFERENCE_S)
+        return [[{"class": "can", "tag": int(image[0, 0, 0])}] for image in images]
+
+
+def _frame(tag: int) -> np.ndarray:
+    return np.full((4, 4, 3), tag, dtype=np.uint8)
+
+
+def test_concurrent_frames_share_a_batch_and_get_their_own_detections():
+    detector = FakeDetector()
+    batcher = DetectionBatcher(detector, max_batch_size=4, max_wait_ms=50)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(batcher.detect(_frame(tag), slo_ms=5000) for tag in range(6)))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(scenario())
+
+    assert [result[0]["tag"] for result in results] == list(range(6))
+    assert detector.batch_sizes == [4, 2]
+    stats = batcher.stats()
+    assert stats["batches_dispatched"] == 2 and stats["images_detected"] == 6 and stats["slo_violations"] == 0
+
+
+def test_tight_slo_dispatches_without_waiting_for_a_full_batch():
+    detector = FakeDetector()
+    batcher = DetectionBatcher(detector, max_batch_size=8, max_wait_ms=500)
+
+    async def scenario():
+        try:
+            await batcher.detect(_frame(1), slo_ms=5000)  # learns the inference time
+            start = time.perf_counter()
+            await batcher.detect(_frame(2), slo_ms=100)
+            return time.perf_counter() - start
+        finally:
+            await batcher.close()
+
+    elapsed = asyncio.run(scenario())
+
+    # Waits at most until SLO minus the expected inference time, not the 500 ms max wait
+    assert elapsed < 0.2
+    assert batcher.image_inference_ms >= INFERENCE_S * 1000
+
+
+def test_close_fails_requests_still_waiting():
+    batcher = DetectionBatcher(FakeDetector(), max_batch_size=2, max_wait_ms=1000)
+
+    async def scenario():
+        # Two are being inferred, the third is still queued behind them
+        requests = [asyncio.create_task(batcher.detect(_frame(tag), slo_ms=5000)) for tag in range(3)]
+        await asyncio.sleep(INFERENCE_S / 2)
+        await batcher.close()
+        return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
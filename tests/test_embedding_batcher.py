@@ -0,0 +1,112 @@
+"""
+Tests for the embedding micro-batcher
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from embeddings.batcher import EmbeddingBatcher
+
+
+class RecordingGenerator:
+    """Generator stand-in that encodes a text as [len(text)] and records batch sizes"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def get_cached_embedding(self, text):
+        return None
+
+    def build_trash_report_text(self, report_data):
+        return f"Material type: {report_data['primary_material']}"
+
+    def build_volunteer_profile_text(self, profile):
+        return f"Skills: {', '.join(profile['skills'])}"
+
+    def batch_generate(self, texts, show_progress_bar=None):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    generator = RecordingGenerator()
+    batcher = EmbeddingBatcher(generator, max_batch_size=32, max_wait_ms=20)
+
+    texts = [f"query {'x' * i}" for i in range(10)]
+    vectors = await asyncio.gather(*(batcher.generate_query_embedding(t) for t in texts))
+
+    assert vectors == [[float(len(t))] for t in texts]
+    assert len(generator.batches) == 1
+    stats = batcher.stats()
+    assert stats["batches_dispatched"] == 1
+    assert stats["texts_encoded"] == 10
+    assert stats["batch_size"]["count"] == 1
+    assert stats["queue_wait_ms"]["count"] == 10
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size():
+    generator = RecordingGenerator()
+    batcher = EmbeddingBatcher(generator, max_batch_size=4, max_wait_ms=20)
+
+    await asyncio.gather(*(batcher.encode(f"text {i}") for i in range(10)))
+
+    assert [len(batch) for batch in generator.batches] == [4, 4, 2]
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_report_and_profile_texts_use_generator_builders():
+    generator = RecordingGenerator()
+    batcher = EmbeddingBatcher(generator, max_wait_ms=1)
+
+    await batcher.generate_trash_report_embedding({"primary_material": "plastic"})
+    await batcher.generate_volunteer_profile_embedding({"skills": ["sorting"]})
+
+    flattened = [text for batch in generator.batches for text in batch]
+    assert flattened == ["Material type: plastic", "Skills: sorting"]
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_model_errors_reach_every_caller():
+    batcher = EmbeddingBatcher(RecordingGenerator(fail=True), max_wait_ms=5)
+
+    results = await asyncio.gather(
+        batcher.encode("a"), batcher.encode("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    await batcher.close()
+
+
+
+class SlowGenerator(RecordingGenerator):
+    def batch_generate(self, texts, show_progress_bar=None):
+        time.sleep(0.2)
+        return super().batch_generate(texts, show_progress_bar)
+
+
+@pytest.mark.asyncio
+async def test_close_fails_requests_still_waiting():
+    batcher = EmbeddingBatcher(SlowGenerator(), max_batch_size=2, max_wait_ms=1000)
+
+    # Two are being encoded, the third is still queued behind them
+    requests = [asyncio.create_task(batcher.encode(f"text {i}")) for i in range(3)]
+    await asyncio.sleep(0.05)
+    await batcher.close()
+    results = await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), timeout=1)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
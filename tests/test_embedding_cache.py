@@ -0,0 +1,84 @@
+"""
+Tests for the content-addressed embedding cache
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+import embeddings.registry as registry_module
+from embeddings.cache import EmbeddingCache, ENTRY_OVERHEAD_BYTES, embedding_cache_key
+from embeddings.generator import EmbeddingGenerator
+
+
+class CountingModel:
+    """SentenceTransformer stand-in returning deterministic 4-D vectors"""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([[len(text), 1.0, 0.5, 0.25] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(registry_module, "SentenceTransformer", CountingModel)
+    registry_module.model_registry.unload("test-model")
+    yield EmbeddingGenerator(model_name="test-model")
+    registry_module.model_registry.unload("test-model")
+
+
+def test_equivalent_reports_share_one_model_call(generator):
+    report = {
+        "primary_material": "plastic",
+        "specific_items": ["bottle", "bag", "can"],
+        "recommended_equipment": ["gloves", "bags"],
+    }
+    reordered = dict(report, specific_items=["can", "bottle", "bag"], recommended_equipment=["bags", "gloves"])
+
+    first = generator.generate_trash_report_embedding(report)
+    second = generator.generate_trash_report_embedding(reordered)
+
+    assert first == second
+    assert len(generator.model.encoded) == 1
+    assert generator.cache.stats()["hits"] == 1
+    assert generator.cache.stats()["misses"] == 1
+
+
+def test_batch_generate_only_encodes_misses(generator):
+    generator.generate_query_embedding("plastic near the river")
+
+    vectors = generator.batch_generate(["plastic near the river", "glass  on the beach", "glass on the beach"])
+
+    assert len(vectors) == 3
+    assert vectors[1] == vectors[2]
+    assert generator.model.encoded == ["plastic near the river", "glass  on the beach"]
+
+
+def test_cache_key_includes_model_name():
+    assert embedding_cache_key("tyre", "model-a") != embedding_cache_key("tyre", "model-b")
+    assert embedding_cache_key(" tyre\n", "model-a") == embedding_cache_key("tyre", "model-a")
+
+
+def test_cache_evicts_least_recently_used_by_memory():
+    entry_bytes = 4 * 4 + ENTRY_OVERHEAD_BYTES
+    cache = EmbeddingCache(max_bytes=entry_bytes * 2)
+
+    cache.put("a", [1.0, 2.0, 3.0, 4.0])
+    cache.put("b", [1.0, 2.0, 3.0, 4.0])
+    cache.get("a")
+    cache.put("c", [1.0, 2.0, 3.0, 4.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c").dtype == np.float32
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
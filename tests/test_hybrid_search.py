@@ -0,0 +1,162 @@
+"""
+Tests for hybrid (sparse + dense, RRF-fused) report search
+"""
+
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from config import settings
+from embeddings.sparse import document_sparse_vector, query_sparse_vector, report_sparse_text, tokenize
+from qdrant import migrations
+from qdrant.migrations import enable_hybrid_search
+from qdrant.vector_store import (
+    SPARSE_VECTOR_RECHECK_SECONDS, EcoSynkVectorStore, collection_aliases, report_sparse_vectors_config
+)
+
+DIM = settings.embedding_dimension
+
+REPORTS = [
+    # Semantically far from the query, but names the searched item
+    {"report_id": "syringes", "cosine": 0.1, "metadata": {"specific_items": ["Syringes"], "primary_material": "hazardous"}},
+    {"report_id": "bottles", "cosine": 0.9, "metadata": {"specific_items": ["bottles"], "primary_material": "plastic"}},
+]
+
+
+def _vector(cosine_to_axis: float):
+    vector = np.zeros(DIM)
+    vector[0], vector[1] = cosine_to_axis, np.sqrt(1 - cosine_to_axis ** 2)
+    return vector.tolist()
+
+
+def _store(sparse: bool) -> EcoSynkVectorStore:
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=settings.trash_reports_collection,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE),
+        sparse_vectors_config=report_sparse_vectors_config() if sparse else None
+    )
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    store.store_trash_reports_batch([
+        {"report_id": report["report_id"], "embedding": _vector(report["cosine"]), "metadata": dict(report["metadata"])}
+        for report in REPORTS
+    ])
+    return store
+
+
+def _search(store: EcoSynkVectorStore):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Local mode ignores search params
+        search = store.search_reports_with_fallbacks(
+            _vector(1.0), limit=2, score_threshold=0.35, query_text="syringe dumped by the path"
+        )
+    return search, {item['data']['report_id'] for item in search['results']}
+
+
+def test_sparse_vectors_match_item_names_across_plurals():
+    document = document_sparse_vector(report_sparse_text({"specific_items": ["Syringes", "tyres"], "description": "by the river"}))
+    query = query_sparse_vector("tyre")
+
+    assert tokenize("Tyres and bottles near the batteries") == ["tyre", "bottle", "battery"]
+    assert set(query.indices) <= set(document.indices)
+    assert query_sparse_vector("the of near") is None
+
+
+def test_hybrid_search_finds_exact_item_without_fallbacks():
+    search, found = _search(_store(sparse=True))
+
+    assert search['hybrid'] is True
+    assert found == {"syringes", "bottles"}
+    assert search['fallback_notes'] == []
+
+    # Dense-only collections keep the previous behaviour
+    search, found = _search(_store(sparse=False))
+    assert search['hybrid'] is False and found == {"bottles"}
+
+
+def test_enable_hybrid_rebuilds_dense_only_collection():
+    store = _store(sparse=False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Local mode has no payload indexes
+        result = enable_hybrid_search(store, batch_size=1)
+
+    assert result == {'rebuilt': True, 'scanned': 2, 'updated': 2}
+    # The collection name now points at the rebuild, so later rebuilds can switch atomically
+    assert collection_aliases(store.client) == {settings.trash_reports_collection: f"{settings.trash_reports_collection}_hybrid"}
+    assert _search(store)[1] == {"syringes", "bottles"}
+    assert enable_hybrid_search(store)['updated'] == 0
+
+
+def test_enable_hybrid_keeps_reports_written_during_the_copy(monkeypatch):
+    store = _store(sparse=False)
+    copy_reports = migrations._copy_reports
+
+    def copy_then_write(store, source, target, batch_size):
+        copied = copy_reports(store, source, target, batch_size)
+        store.store_trash_reports_batch([
+            {"report_id": "late", "embedding": _vector(0.5), "metadata": {"specific_items": ["tyres"]}}
+        ])
+        return copied
+
+    monkeypatch.setattr(migrations, "_copy_reports", copy_then_write)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert enable_hybrid_search(store, batch_size=1)['scanned'] == 3
+
+    assert store.get_report_by_id("late") is not None
+
+
+def test_enable_hybrid_resumes_after_dropping_the_old_collection(monkeypatch):
+    store = _store(sparse=False)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(migrations, "_point_alias", crash)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with pytest.raises(RuntimeError):
+            enable_hybrid_search(store, batch_size=1)
+        assert not store.client.collection_exists(settings.trash_reports_collection)
+
+        monkeypatch.undo()
+        assert enable_hybrid_search(store)['rebuilt'] is False
+
+    assert _search(store)[1] == {"syringes", "bottles"}
+
+
+def test_running_server_picks_up_the_rebuild():
+    migration = _store(sparse=False)
+    server = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    server.client = migration.client
+    assert _search(server)[0]['hybrid'] is False
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        enable_hybrid_search(migration)
+
+    # The dense-only answer is cached until it expires
+    assert server._reports_have_sparse_vectors() is False
+    server.report_sparse_checked_at -= SPARSE_VECTOR_RECHECK_SECONDS
+    search, found = _search(server)
+    assert search['hybrid'] is True and found == {"syringes", "bottles"}
+
+
+def test_disabled_hybrid_search_stays_dense(monkeypatch):
+    store = _store(sparse=True)
+    monkeypatch.setattr(settings, "hybrid_search_enabled", False)
+
+    assert report_sparse_vectors_config() is None
+    search, found = _search(store)
+    assert search['hybrid'] is False and found == {"bottles"}
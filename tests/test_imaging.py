@@ -0,0 +1,192 @@
+"""
+Tests for the in-memory image pipeline (decode once at reduced size, no temp files)
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from PIL import Image
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+import api_server
+import executors as executors_module
+from executors import DependencyExecutors
+from gemini.trash_analyzer import TrashAnalyzer
+from imaging import (
+    ImageTooLarge,
+    SharedImage,
+    UploadSizeLimitMiddleware,
+    annotate_shared_jpeg,
+    decode_image,
+    detection_block,
+    prepare_upload,
+    sniff_image_mime_type,
+)
+from yolo.waste_detector import CLASS_COLORS, WasteDetector
+
+
+def _encoded(fmt: str, size=(64, 48), **save_args) -> bytes:
+    image = Image.new("RGB", size, (255, 0, 0))  # pure red
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **save_args)
+    return buffer.getvalue()
+
+
+def test_decode_to_bgr_and_gemini_payload():
+    png, bmp = _encoded("PNG"), _encoded("BMP")
+
+    pixels = decode_image(png)
+    assert pixels.shape == (48, 64, 3) and pixels.flags["C_CONTIGUOUS"]
+    assert tuple(pixels[0, 0]) == (0, 0, 255)  # red in BGR
+
+    # Accepted formats that are small enough go to Gemini untouched; others are re-encoded as JPEG
+    upload = prepare_upload(png, 640, 1536)
+    assert (upload.gemini_data, upload.gemini_mime_type) == (png, "image/png")
+    assert upload.detection_image.shape == (48, 64, 3) and upload.detection_scale == 1.0
+    upload = prepare_upload(bmp, None, 1536)
+    assert upload.gemini_mime_type == "image/jpeg" and sniff_image_mime_type(upload.gemini_data) == "image/jpeg"
+    assert upload.detection_image is None
+    with pytest.raises(ValueError):
+        decode_image(b"not an image")
+
+
+def test_large_jpeg_is_decoded_reduced_into_right_sized_variants():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored landscape, displayed portrait
+    jpeg = _encoded("JPEG", size=(4000, 3000), exif=exif.tobytes())
+
+    upload = prepare_upload(jpeg, 640, 1536)
+
+    assert upload.original_size == (3000, 4000)
+    assert upload.detection_image.shape == (640, 480, 3)
+    with Image.open(io.BytesIO(upload.gemini_data)) as gemini:
+        assert upload.gemini_mime_type == "image/jpeg" and gemini.size == (1152, 1536)
+
+    detection = {"bbox": {"x1": 10, "y1": 20, "x2": 100, "y2": 200}, "class": "can", "confidence": 0.9}
+    assert upload.to_original_coordinates([detection])[0]["bbox"] == {"x1": 62.5, "y1": 125.0, "x2": 625.0, "y2": 1250.0}
+
+    # Budgets are checked before decoding
+    with pytest.raises(ImageTooLarge):
+        prepare_upload(jpeg, 640, None, max_pixels=10_000_000)
+    with pytest.raises(ImageTooLarge):
+        prepare_upload(jpeg, 640, None, max_bytes=len(jpeg) - 1)
+
+
+def test_oversized_bodies_are_rejected_with_413():
+    app = FastAPI()
+    rejected = []
+    app.add_middleware(UploadSizeLimitMiddleware, limits={"/upload": 1000}, on_reject=rejected.append)
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    client = TestClient(app)
+    assert client.post("/upload", content=b"x" * 1000).json() == {"size": 1000}
+    assert client.post("/upload", content=b"x" * 1001).status_code == 413
+    # Without a Content-Length the body is counted as it streams in
+    chunked = client.post("/upload", content=iter([b"x" * 600, b"x" * 600]))
+    assert chunked.status_code == 413 and chunked.json()["detail"].startswith("Request body is larger")
+    assert rejected == ["/upload", "/upload"]
+
+
+def test_annotated_jpeg_is_encoded_in_memory():
+    pixels = decode_image(_encoded("PNG"))
+    detection = {"bbox": {"x1": 5, "y1": 20, "x2": 40, "y2": 40}, "class": "can", "confidence": 0.9}
+
+    annotated = WasteDetector().annotate_jpeg(pixels, [detection])
+
+    assert sniff_image_mime_type(annotated) == "image/jpeg"
+    assert decode_image(annotated).shape == pixels.shape
+    assert tuple(pixels[0, 0]) == (0, 0, 255)  # the shared decoded image is not drawn on
+
+
+def test_analyzer_sends_bytes_with_mime_type():
+    sent = {}
+
+    class FakeModel:
+        def generate_content(self, parts):
+            sent.update(parts[1])
+            return type("Response", (), {"text": '{"primary_material": "plastic", "cleanup_priority_score": 4}'})()
+
+    analyzer = TrashAnalyzer.__new__(TrashAnalyzer)
+    analyzer.model = FakeModel()
+    png = _encoded("PNG")
+
+    analysis = analyzer.analyze_trash_image_bytes(png, "image/png", image_name="beach.png")
+
+    assert sent == {"mime_type": "image/png", "data": png}
+    assert analysis["metadata"]["image_name"] == "beach.png"
+
+
+def test_worker_processes_hand_pixels_over_in_shared_memory():
+    executors = DependencyExecutors(io_workers=1, cpu_workers=1, image_workers=1)
+    jpeg = _encoded("JPEG", size=(1280, 960))
+    detection = {"bbox": {"x1": 5, "y1": 20, "x2": 40, "y2": 40}, "class": "can", "confidence": 0.9}
+
+    async def scenario():
+        block = detection_block(640)
+        upload = await executors.run_image(prepare_upload, jpeg, 640, None, shared=block.ref)
+        block.close()
+        assert upload.detection_image is None and upload.detection_ref.shape == (480, 640, 3)
+        assert upload.detection_scale == 2.0
+
+        upload.attach()
+        assert upload.detection_image[0, 0, 2] > 240  # red in BGR
+        annotated = await executors.run_image(annotate_shared_jpeg, upload.detection_ref, [detection], CLASS_COLORS)
+        upload.release()
+        return annotated
+
+    try:
+        annotated = asyncio.run(scenario())
+        stats = executors.stats()["image"]
+    finally:
+        executors.shutdown()
+
+    assert decode_image(annotated).shape == (480, 640, 3)
+    assert stats == {"workers": 1, "in_flight": 0, "queued": 0, "completed": 2}
+
+
+def _shared_blocks() -> set:
+    return {path.name for path in Path("/dev/shm").glob("psm_*")}
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="needs /dev/shm")
+def test_failed_or_cancelled_upload_frees_its_shared_block(monkeypatch):
+    monkeypatch.setattr(api_server.settings, "executor_image_workers", 1)
+    before = _shared_blocks()
+
+    async def scenario():
+        with pytest.raises(api_server.HTTPException):
+            await api_server._prepare_upload(b"not an image")
+        task = asyncio.create_task(api_server._prepare_upload(_encoded("JPEG", size=(1280, 960))))
+        await asyncio.sleep(0)  # the worker call is in flight
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executors_module.shutdown_executors()
+
+    assert _shared_blocks() <= before
+
+
+def test_unlinked_shared_image_stays_mapped_while_viewed():
+    shared = SharedImage.from_array(np.full((4, 4, 3), 7, dtype=np.uint8))
+    view = shared.array[1:3]
+
+    shared.unlink()
+
+    assert int(view.sum()) == 7 * 2 * 4 * 3
+    with pytest.raises(FileNotFoundError):
+        SharedImage.attach(shared.ref)
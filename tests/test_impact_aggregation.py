@@ -0,0 +1,66 @@
+"""
+Tests for the count/facet aggregation behind /impact/esg
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import PointStruct
+
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+
+VOLUMES = ["small", "medium", "large", "very_large", "unknown", None]
+MATERIALS = ["plastic", "glass", "hazardous"]
+
+
+def _payload(rng: random.Random):
+    payload = {
+        "primary_material": rng.choice(MATERIALS),
+        "recyclable": rng.random() < 0.4,
+        "cleanup_priority_score": rng.choice([3, 7.5, 8, 9, 10]),
+    }
+    volume = rng.choice(VOLUMES)
+    if volume is not None:
+        payload["estimated_volume"] = volume
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_impact_counts_match_a_full_scan():
+    rng = random.Random(7)
+    payloads = [_payload(rng) for _ in range(1500)]
+    client = AsyncQdrantClient(":memory:")
+    await client.create_collection(settings.trash_reports_collection, vectors_config={})
+    await client.upsert(
+        settings.trash_reports_collection,
+        [PointStruct(id=i, vector={}, payload=payload) for i, payload in enumerate(payloads)]
+    )
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.aclient = client
+
+    counts = await store.aget_report_impact_counts(high_priority_score=8)
+
+    def volumes(selected):
+        histogram = {}
+        for payload in selected:
+            if "estimated_volume" in payload:
+                histogram[payload["estimated_volume"]] = histogram.get(payload["estimated_volume"], 0) + 1
+        return histogram
+
+    hazardous = [p for p in payloads if p["primary_material"] == "hazardous"]
+    recyclable = [p for p in payloads if p["recyclable"]]
+    # Not capped at a scroll page: every report is counted
+    assert counts["total"] == 1500
+    assert counts["high_priority"] == sum(p["cleanup_priority_score"] >= 8 for p in payloads)
+    assert (counts["hazardous"], counts["recyclable"]) == (len(hazardous), len(recyclable))
+    assert counts["volumes"] == volumes(payloads)
+    assert counts["hazardous_volumes"] == volumes(hazardous)
+    assert counts["recyclable_volumes"] == volumes(recyclable)
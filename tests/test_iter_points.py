@@ -0,0 +1,111 @@
+"""
+Tests for paged collection iteration and cursor pagination on EcoSynkVectorStore
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+
+class CountingClient:
+    """Local client wrapper that counts scroll requests"""
+
+    def __init__(self, client):
+        self._client = client
+        self.scrolls = 0
+
+    def scroll(self, *args, **kwargs):
+        self.scrolls += 1
+        return self._client.scroll(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+@pytest.fixture
+def store():
+    client = QdrantClient(":memory:")
+    for name in (settings.trash_reports_collection, "campaigns"):
+        client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+        )
+    vector_store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    vector_store.client = CountingClient(client)
+    return vector_store
+
+
+def _add_campaigns(store, count):
+    store.client.upsert("campaigns", [
+        PointStruct(id=str(uuid.uuid4()), vector=VECTOR, payload={"campaign_id": f"c{i}", "status": "active", "notes": "x" * 50})
+        for i in range(count)
+    ])
+
+
+def test_iter_points_follows_pages_lazily_with_projection(store):
+    _add_campaigns(store, 25)
+
+    points = store.iter_points("campaigns", fields=["campaign_id"], page_size=10)
+    first = next(points)
+    assert store.client.scrolls == 1
+    assert set(first.payload) == {"campaign_id"}
+
+    rest = list(points)
+    assert len(rest) == 24
+    assert store.client.scrolls == 3
+
+
+def test_get_all_campaigns_is_not_truncated(store):
+    _add_campaigns(store, 300)
+
+    assert len(store.get_all_campaigns()) == 300
+
+
+def test_scroll_page_cursor_walks_every_point_once(store):
+    _add_campaigns(store, 7)
+
+    seen, cursor = [], None
+    while True:
+        points, cursor = store.scroll_page("campaigns", limit=3, cursor=cursor)
+        seen.extend(point.payload["campaign_id"] for point in points)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(f"c{i}" for i in range(7))
+
+
+def test_report_pages_are_newest_first_across_timestamp_ties(store):
+    # Three reports share every timestamp so page boundaries fall inside ties
+    store.store_trash_reports_batch([
+        {"report_id": f"r{i}", "embedding": VECTOR, "metadata": {"timestamp": 1700000000 + (i // 3) * 60}}
+        for i in range(10)
+    ])
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        points, cursor = store.list_reports_page(limit=4, cursor=cursor)
+        seen.extend(point.payload for point in points)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(p["report_id"] for p in seen) == sorted(f"r{i}" for i in range(10))
+    epochs = [p["timestamp_epoch"] for p in seen]
+    assert epochs == sorted(epochs, reverse=True)
+
+    with pytest.raises(ValueError):
+        store.list_reports_page(cursor="not-a-cursor")
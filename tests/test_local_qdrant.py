@@ -0,0 +1,56 @@
+"""
+Tests for the embedded (local) Qdrant mode of the connection factory
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from config import settings
+from qdrant.connection import QdrantConnectionFactory
+from qdrant.vector_store import EcoSynkVectorStore
+from user_service import UserService
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+
+def test_in_memory_mode_creates_every_collection():
+    connection = QdrantConnectionFactory(local_path=":memory:")
+    store = EcoSynkVectorStore(connection=connection)
+    store.setup_collections()
+    UserService(connection=connection)
+
+    names = {c.name for c in connection.client.get_collections().collections}
+    assert {settings.trash_reports_collection, "campaigns", "users"} <= names
+    assert connection.stats()["transport"] == "local"
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_shares_the_embedded_engine():
+    connection = QdrantConnectionFactory(local_path=":memory:")
+    store = EcoSynkVectorStore(connection=connection)
+    store.setup_collections()
+
+    store.store_trash_report(VECTOR, {"primary_material": "glass", "timestamp": 1700000000}, report_id="r1")
+
+    assert (await store.aget_report_by_id("r1"))["primary_material"] == "glass"
+    assert connection.stats()["operations"]
+    await connection.aclose()
+
+
+def test_on_disk_mode_persists_between_connections(tmp_path):
+    path = str(tmp_path / "qdrant")
+    first = QdrantConnectionFactory(local_path=path)
+    store = EcoSynkVectorStore(connection=first)
+    store.setup_collections()
+    store.store_trash_report(VECTOR, {"primary_material": "metal", "timestamp": 1700000000}, report_id="r2")
+    first.close()
+
+    second = QdrantConnectionFactory(local_path=path)
+    assert EcoSynkVectorStore(connection=second).get_report_by_id("r2")["primary_material"] == "metal"
+    second.close()
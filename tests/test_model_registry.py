@@ -0,0 +1,54 @@
+"""
+Tests for the shared embedding model registry
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+import embeddings.registry as registry_module
+from embeddings.generator import EmbeddingGenerator
+
+
+class FakeModel:
+    instances = 0
+
+    def __init__(self, model_name):
+        FakeModel.instances += 1
+        self.encode_calls = 0
+
+    def encode(self, text, convert_to_numpy=True):
+        self.encode_calls += 1
+        return [0.0]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(registry_module, "SentenceTransformer", FakeModel)
+    FakeModel.instances = 0
+    return registry_module.ModelRegistry()
+
+
+def test_model_is_loaded_once_and_shared(registry, monkeypatch):
+    monkeypatch.setattr(registry_module, "model_registry", registry)
+    monkeypatch.setattr("embeddings.generator.model_registry", registry)
+
+    generator = EmbeddingGenerator(model_name="shared-model", lazy=True)
+    assert not registry.is_loaded("shared-model")
+
+    assert generator.model is registry.get("shared-model")
+    assert FakeModel.instances == 1
+
+
+def test_warm_up_runs_once(registry):
+    model = registry.warm_up("shared-model")
+    registry.warm_up("shared-model")
+
+    assert model.encode_calls == 1
+    stats = registry.stats()["shared-model"]
+    assert stats["warmed_up"] is True
+    assert stats["load_seconds"] >= 0
@@ -0,0 +1,83 @@
+"""
+Parity tests for the ONNX Runtime embedding backend
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from sentence_transformers import SentenceTransformer, models
+from transformers import BertConfig, BertModel, BertTokenizer
+
+from embeddings.onnx_backend import OnnxSentenceEncoder
+
+TEXTS = [
+    "plastic bottle near the river",
+    "glass on the beach",
+    "a tyre and a syringe on the beach near the river",
+    "can",
+]
+WORDS = "plastic bottle bag river beach glass can tyre syringe near the on a of and".split()
+
+
+@pytest.fixture(scope="module")
+def tiny_model_dir(tmp_path_factory):
+    """A small random BERT sentence-transformer saved locally (no network needed)"""
+    root = tmp_path_factory.mktemp("tiny-model")
+    bert_dir = root / "bert"
+    bert_dir.mkdir()
+    (bert_dir / "vocab.txt").write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS))
+    BertTokenizer(str(bert_dir / "vocab.txt")).save_pretrained(str(bert_dir))
+
+    config = BertConfig(
+        vocab_size=5 + len(WORDS),
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=128,
+        max_position_embeddings=64,
+    )
+    import torch
+    torch.manual_seed(0)
+    BertModel(config).save_pretrained(str(bert_dir))
+
+    transformer = models.Transformer(str(bert_dir), max_seq_length=32)
+    pooling = models.Pooling(config.hidden_size, pooling_mode="mean")
+    SentenceTransformer(modules=[transformer, pooling, models.Normalize()]).save(str(root / "st"))
+    return str(root / "st")
+
+
+def _cosine(a, b):
+    return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+@pytest.mark.parametrize("quantize,min_cosine", [(False, 0.9999), (True, 0.98)])
+def test_onnx_matches_torch_embeddings(tiny_model_dir, tmp_path, quantize, min_cosine):
+    reference = SentenceTransformer(tiny_model_dir, device="cpu").encode(TEXTS, convert_to_numpy=True)
+    encoder = OnnxSentenceEncoder(tiny_model_dir, quantize=quantize, export_dir=str(tmp_path))
+
+    vectors = encoder.encode(TEXTS, batch_size=3)
+
+    assert vectors.shape == reference.shape
+    assert vectors.dtype == np.float32
+    assert _cosine(vectors, reference).min() >= min_cosine
+
+
+def test_onnx_export_is_reused_and_single_text_is_1d(tiny_model_dir, tmp_path):
+    first = OnnxSentenceEncoder(tiny_model_dir, quantize=True, export_dir=str(tmp_path))
+    modified = first.model_path.stat().st_mtime_ns
+
+    second = OnnxSentenceEncoder(tiny_model_dir, quantize=True, export_dir=str(tmp_path))
+    vector = second.encode(TEXTS[0])
+
+    assert second.model_path.stat().st_mtime_ns == modified
+    assert vector.ndim == 1
+    assert np.allclose(vector, first.encode([TEXTS[0]])[0], atol=1e-6)
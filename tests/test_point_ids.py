@@ -0,0 +1,102 @@
+"""
+Tests for deterministic point IDs and the point ID rewrite migration
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from qdrant.migrations import rewrite_point_ids
+from qdrant.vector_store import EcoSynkVectorStore, point_id_for
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+OTHER_VECTOR = [0.0, 1.0] + [0.0] * (settings.embedding_dimension - 2)
+
+
+@pytest.fixture
+def store():
+    vector_store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    vector_store.client = QdrantClient(":memory:")
+    for name in (settings.trash_reports_collection, settings.volunteer_profiles_collection, "campaigns"):
+        vector_store.client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+        )
+    return vector_store
+
+
+def test_point_ids_are_stable_and_keep_uuids():
+    account_id = str(uuid.uuid4())
+
+    assert point_id_for("report_1") == point_id_for("report_1")
+    assert point_id_for("report_1") != point_id_for("report_2")
+    assert point_id_for(account_id) == account_id
+
+
+def test_reports_and_campaigns_are_retrieved_by_business_id(store):
+    store.store_trash_report(VECTOR, {"primary_material": "glass"}, report_id="report_a")
+    store.store_trash_reports_batch([{"report_id": "report_b", "embedding": VECTOR, "metadata": {}}])
+    store.store_campaign(VECTOR, {"campaign_name": "River day"}, campaign_id="campaign_1")
+
+    reports = store.get_reports_by_ids(["report_b", "missing", "report_a"])
+
+    assert [r["report_id"] for r in reports] == ["report_b", "report_a"]
+    assert store.get_report_by_id("report_a")["primary_material"] == "glass"
+    assert store.get_campaign_by_id("campaign_1")["campaign_name"] == "River day"
+    assert store.get_campaign_by_id("campaign_2") is None
+
+
+def test_reprofiling_a_volunteer_overwrites_and_keeps_account_fields(store):
+    account_id = str(uuid.uuid4())
+    store.client.upsert(settings.volunteer_profiles_collection, [
+        PointStruct(id=account_id, vector=VECTOR, payload={"user_id": account_id, "email": "a@example.com"})
+    ])
+
+    store.store_volunteer_profile(VECTOR, {"name": "Ada", "skills": ["sorting"]}, user_id=account_id)
+    store.store_volunteer_profile(OTHER_VECTOR, {"name": "Ada", "skills": ["diving"]}, user_id=account_id)
+
+    points, _ = store.client.scroll(settings.volunteer_profiles_collection, limit=10, with_vectors=True)
+    assert len(points) == 1
+    assert points[0].payload["skills"] == ["diving"]
+    assert points[0].payload["email"] == "a@example.com"
+    assert points[0].vector[1] == pytest.approx(1.0)
+
+
+def test_migration_moves_reports_and_merges_duplicate_profiles(store):
+    legacy_report = str(uuid.uuid4())
+    store.client.upsert(settings.trash_reports_collection, [
+        PointStruct(id=legacy_report, vector=VECTOR, payload={"report_id": "report_old"}),
+        PointStruct(id=str(uuid.uuid4()), vector=VECTOR, payload={"note": "no business id"}),
+    ])
+    store.client.upsert(settings.volunteer_profiles_collection, [
+        PointStruct(id=str(uuid.uuid4()), vector=VECTOR,
+                    payload={"user_id": "vol_1", "skills": ["old"], "phone": "123", "created_at": "2024-01-01"}),
+        PointStruct(id=str(uuid.uuid4()), vector=OTHER_VECTOR,
+                    payload={"user_id": "vol_1", "skills": ["new"], "created_at": "2024-06-01"}),
+    ])
+
+    reports = rewrite_point_ids(store, settings.trash_reports_collection, "report_id", batch_size=1)
+    profiles = rewrite_point_ids(store, settings.volunteer_profiles_collection, "user_id")
+
+    assert reports == {"scanned": 2, "moved": 1, "duplicates_removed": 0, "without_id": 1}
+    assert profiles == {"scanned": 2, "moved": 1, "duplicates_removed": 1, "without_id": 0}
+    assert store.get_report_by_id("report_old") is not None
+    assert store.client.retrieve(settings.trash_reports_collection, ids=[legacy_report]) == []
+
+    points, _ = store.client.scroll(settings.volunteer_profiles_collection, limit=10, with_vectors=True)
+    assert [str(p.id) for p in points] == [point_id_for("vol_1")]
+    assert points[0].payload["skills"] == ["new"]
+    assert points[0].payload["phone"] == "123"
+    assert points[0].vector[1] == pytest.approx(1.0)
+
+    # Re-running is a no-op
+    assert rewrite_point_ids(store, settings.volunteer_profiles_collection, "user_id")["moved"] == 0
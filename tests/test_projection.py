@@ -0,0 +1,110 @@
+"""
+Tests for `fields=` payload projection and response-size metrics
+"""
+
+import sys
+import warnings
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PayloadSelectorExclude, PointStruct, VectorParams
+
+from config import settings
+from metrics import ResponseSizeMiddleware, ResponseSizeStats
+from projection import REPORT_FIELDS, parse_fields, projection_label
+from qdrant.vector_store import EcoSynkVectorStore
+
+PAYLOAD = {
+    "report_id": "r1",
+    "timestamp": "2026-01-01T00:00:00",
+    "location": {"lat": 51.5, "lon": -0.12},
+    "primary_material": "plastic",
+    "location_context": {"address": {"road": "x" * 500}},
+    "metadata": {"analyzed_at": "2026-01-01T00:00:00", "location_context": {"raw": "y" * 500}},
+    "password_hash": "secret",
+}
+
+
+def test_parse_fields_variants():
+    default = parse_fields(None, REPORT_FIELDS)
+    custom = parse_fields(" report_id, metadata.analyzed_at ,password_hash", REPORT_FIELDS)
+    full = parse_fields("*", REPORT_FIELDS)
+    excluding = parse_fields("-location_context,-metadata.location_context", REPORT_FIELDS)
+
+    assert default.label == "default" and default.include == list(REPORT_FIELDS)
+    assert (custom.label, custom.include) == ("custom", ["report_id", "metadata.analyzed_at"])
+    assert full.label == "full" and full.selector() == PayloadSelectorExclude(exclude=["password_hash"])
+    assert excluding.label == "custom" and excluding.include is None
+    assert [projection_label(value) for value in (None, "*", "a,b")] == ["default", "full", "custom"]
+    with pytest.raises(ValueError):
+        parse_fields("report_id,bad field", REPORT_FIELDS)
+
+
+def test_required_fields_are_fetched_then_trimmed():
+    projection = parse_fields("report_id", REPORT_FIELDS)
+    required = ("location", "metadata.analyzed_at")
+
+    assert projection.selector(required) == ["report_id", "location", "metadata.analyzed_at"]
+    fetched = {"report_id": "r1", "location": PAYLOAD["location"], "metadata": {"analyzed_at": "2026-01-01"}}
+    assert projection.trim(fetched, required) == {"report_id": "r1"}
+
+    excluding = parse_fields("-location,-location_context", REPORT_FIELDS)
+    assert excluding.selector(required).exclude == ["password_hash", "location_context"]
+    fetched = {key: value for key, value in PAYLOAD.items() if key != "location_context"}
+    assert set(excluding.trim(fetched, required)) == {"report_id", "timestamp", "primary_material", "metadata"}
+
+
+def test_projection_is_applied_by_qdrant():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        settings.trash_reports_collection,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    client.upsert(settings.trash_reports_collection, [PointStruct(id=1, vector=[1.0, 0.0], payload=PAYLOAD)])
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        default, _ = store.scroll_page(settings.trash_reports_collection, fields=parse_fields(None, REPORT_FIELDS).selector())
+        full, _ = store.scroll_page(settings.trash_reports_collection, fields=parse_fields("*", REPORT_FIELDS).selector())
+
+    assert default[0].payload == {
+        "report_id": "r1", "timestamp": PAYLOAD["timestamp"], "location": PAYLOAD["location"],
+        "primary_material": "plastic", "metadata": {"analyzed_at": PAYLOAD["metadata"]["analyzed_at"]},
+    }
+    assert "password_hash" not in full[0].payload and "location_context" in full[0].payload
+
+
+def test_response_sizes_recorded_per_projection():
+    app = FastAPI()
+    stats = ResponseSizeStats()
+    app.add_middleware(
+        ResponseSizeMiddleware, stats=stats, paths=["/reports"],
+        variant=lambda scope: projection_label(parse_qs(scope["query_string"].decode()).get("fields", [None])[-1])
+    )
+
+    @app.get("/reports")
+    async def reports(fields: str = None):
+        return {"data": "x" * (2000 if fields == "*" else 100)}
+
+    @app.get("/other")
+    async def other():
+        return {}
+
+    client = TestClient(app)
+    client.get("/reports")
+    client.get("/reports", params={"fields": "*"})
+    client.get("/other")
+
+    report = stats.stats()
+    assert set(report) == {"/reports"}
+    assert report["/reports"]["default"]["sum"] < 200 < report["/reports"]["full"]["sum"]
@@ -0,0 +1,66 @@
+"""
+Tests for the shared Qdrant connection layer
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant.connection import (
+    ConnectionStats,
+    InstrumentedClient,
+    QdrantConnectionFactory,
+    parse_operation_timeouts,
+)
+
+
+class RecordingClient:
+    """Stand-in client that records the timeout each call received"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def query_points(self, collection_name, query=None, timeout=None):
+        self.timeouts.append(timeout)
+        return []
+
+    def scroll(self, collection_name, timeout=None):
+        raise RuntimeError("down")
+
+    def collection_exists(self, collection_name):
+        return True
+
+
+def test_parse_operation_timeouts_skips_invalid_pairs():
+    assert parse_operation_timeouts("query_points=10, scroll = 30,bad=x,,count=") == {"query_points": 10, "scroll": 30}
+
+
+def test_instrumented_client_applies_timeouts_and_records_latency():
+    stats = ConnectionStats()
+    raw = RecordingClient()
+    client = InstrumentedClient(raw, stats, {"query_points": 5, "collection_exists": 5})
+
+    client.query_points("reports")
+    client.query_points("reports", timeout=1)
+    assert client.collection_exists("reports")
+    with pytest.raises(RuntimeError):
+        client.scroll("reports")
+
+    assert raw.timeouts == [5, 1]
+    operations = stats.snapshot()["operations"]
+    assert operations["query_points"]["count"] == 2
+    assert operations["scroll"]["errors"] == 1
+    assert client.wrapped_client is raw
+
+
+def test_factory_keeps_connections_alive_only_for_remote_hosts():
+    remote = QdrantConnectionFactory(url="https://cluster.example.com:6333", api_key="k", pool_size=8, keepalive_seconds=30)
+    local = QdrantConnectionFactory(url="http://localhost:6333", api_key="k", pool_size=8, keepalive_seconds=30)
+
+    assert remote._client_kwargs(asynchronous=False)["limits"].max_keepalive_connections == 8
+    assert local._client_kwargs(asynchronous=False)["limits"].max_keepalive_connections == 0
+    assert remote.stats()["connections"]["reuse_ratio"] == 0.0
@@ -0,0 +1,108 @@
+"""
+Tests for server-side trash report filtering and the index backfill migration
+"""
+
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from qdrant.migrations import backfill_report_index_fields
+from qdrant.vector_store import EcoSynkVectorStore, TIMESTAMP_EPOCH_FIELD
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+
+@pytest.fixture
+def store():
+    vector_store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    vector_store.client = QdrantClient(":memory:")
+    vector_store.client.create_collection(
+        collection_name=settings.trash_reports_collection,
+        vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+    )
+    return vector_store
+
+
+def _days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def test_time_window_is_filtered_before_the_limit(store):
+    # Old reports score highest, so a post-filter over a limit*2 fetch would miss the recent ones
+    old = [{"report_id": f"old_{i}", "embedding": VECTOR, "metadata": {"timestamp": _days_ago(90)}} for i in range(10)]
+    recent_vector = [0.9, 0.1] + [0.0] * (settings.embedding_dimension - 2)
+    recent = [{"report_id": f"new_{i}", "embedding": recent_vector, "metadata": {"timestamp": _days_ago(2)}} for i in range(3)]
+    store.store_trash_reports_batch(old + recent)
+
+    results = store.find_similar_reports(VECTOR, limit=3, score_threshold=0.5, time_window_days=30)
+
+    assert sorted(r["data"]["report_id"] for r in results) == ["new_0", "new_1", "new_2"]
+
+
+def test_keyword_filters_are_pushed_down(store):
+    store.store_trash_reports_batch([
+        {"report_id": "a", "embedding": VECTOR, "metadata": {"primary_material": "plastic", "user_id": "u1", "environmental_risk_level": "high"}},
+        {"report_id": "b", "embedding": VECTOR, "metadata": {"primary_material": "glass", "user_id": "u1", "environmental_risk_level": "low"}},
+        {"report_id": "c", "embedding": VECTOR, "metadata": {"primary_material": "plastic", "user_id": "u2", "environmental_risk_level": "high"}},
+    ])
+
+    plastic_u1 = store.find_similar_reports(
+        VECTOR, score_threshold=0.5, filters={"primary_material": "plastic", "user_id": "u1"}
+    )
+    by_ids = store.build_report_filter(filters={"report_id": ["b", "c"], "environmental_risk_level": "high"})
+    points, _ = store.client.scroll(settings.trash_reports_collection, scroll_filter=by_ids, limit=10)
+
+    assert [r["data"]["report_id"] for r in plastic_u1] == ["a"]
+    assert [p.payload["report_id"] for p in points] == ["c"]
+
+
+def test_backfill_adds_epoch_report_id_and_location(store):
+    legacy = {
+        "primary_material": "metal",
+        "timestamp": "2024-01-01T00:00:00",
+        "metadata": {"report_id": "legacy_1", "location": {"lat": "10.5", "lon": "20.25"}},
+    }
+    store.client.upsert(settings.trash_reports_collection, [PointStruct(id=str(uuid.uuid4()), vector=VECTOR, payload=legacy)])
+    store.store_trash_reports_batch([{"report_id": "fresh", "embedding": VECTOR, "metadata": {}}])
+
+    summary = backfill_report_index_fields(store, batch_size=1)
+
+    assert summary == {"scanned": 2, "updated": 1, "missing_timestamp": 0}
+    points, _ = store.client.scroll(
+        settings.trash_reports_collection,
+        scroll_filter=store.build_report_filter(filters={"report_id": "legacy_1"}),
+        limit=1
+    )
+    payload = points[0].payload
+    assert payload[TIMESTAMP_EPOCH_FIELD] == 1704067200
+    assert payload["location"] == {"lat": 10.5, "lon": 20.25}
+
+
+def test_setup_backfills_legacy_reports_so_listing_keeps_them(store):
+    legacy = [
+        {"report_id": "nested", "timestamp": "2024-01-01T00:00:00", "metadata": {"location": {"lat": 10.5, "lon": 20.25}}},
+        {"report_id": "garbled", "timestamp": "last tuesday", "location": {"lat": 10.5, "lon": 20.25}},
+    ]
+    store.client.upsert(settings.trash_reports_collection, [
+        PointStruct(id=str(uuid.uuid4()), vector=VECTOR, payload=payload) for payload in legacy
+    ])
+    store.store_trash_reports_batch([
+        {"report_id": "fresh", "embedding": VECTOR, "metadata": {"location": {"lat": 10.5, "lon": 20.25}}}
+    ])
+
+    store.setup_collections()
+
+    nearby = store.build_report_filter(location_filter={"lat": 10.5, "lon": 20.25, "radius_km": 5})
+    page, _ = store.list_reports_page(scroll_filter=nearby, fields=["report_id"])
+    assert [point.payload["report_id"] for point in page] == ["fresh", "nested", "garbled"]
+    assert backfill_report_index_fields(store)["updated"] == 0
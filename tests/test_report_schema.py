@@ -0,0 +1,141 @@
+"""
+Tests for the compact (v2) trash report payload schema and its migration
+"""
+
+import copy
+import sys
+import warnings
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from projection import REPORT_FIELDS
+from qdrant.migrations import compact_report_payloads
+from qdrant.report_schema import compact_report_payload, expand_report_payload, payload_bytes, report_details_needed
+from qdrant.vector_store import EcoSynkVectorStore, point_id_for
+
+DIM = settings.embedding_dimension
+
+CONTEXT = {
+    "display_name": "1, Corniche Road, Al Khalidiyah, Abu Dhabi, United Arab Emirates",
+    "address": {"road": "Corniche Road", "city": "Abu Dhabi", "country_code": "ae"},
+    "confidence": 0.8,
+    "source": "nominatim",
+}
+
+# What /detect-waste stored before v2
+LEGACY = {
+    "report_id": "r1",
+    "user_id": "u1",
+    "timestamp": "2026-03-01T10:00:00+00:00",
+    "timestamp_epoch": 1772359200,
+    "location": {"lat": 24.46, "lon": 54.32},
+    "location_name": "Corniche Road",
+    "location_context": CONTEXT,
+    "primary_material": "plastic",
+    "specific_items": ["bottles", "bags"],
+    "cleanup_priority_score": 6,
+    "description": "Bottles along the beach",
+    "yolo_detection": {"total_items": 7, "categories": {"plastic_bottle": 5, "can": 2}},
+    "metadata": {
+        "analyzed_at": "2026-03-01T10:00:00",
+        "model_used": "gemini",
+        "location": {"lat": 24.46, "lon": 54.32},
+        "location_context": CONTEXT,
+        "location_name": "Corniche Road",
+        "location_source": "nominatim",
+    },
+}
+
+
+def _store() -> EcoSynkVectorStore:
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        settings.trash_reports_collection,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE)
+    )
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    store.report_details_ready = False
+    store.report_sparse_vectors = False
+    return store
+
+
+def test_compact_payload_round_trips_to_the_legacy_shape():
+    compact, details = compact_report_payload(copy.deepcopy(LEGACY))
+
+    assert compact["schema_version"] == 2
+    assert "location_context" not in compact and "metadata" not in compact and "yolo_detection" not in compact
+    assert compact["location"] == LEGACY["location"] and compact["specific_items"] == LEGACY["specific_items"]
+    # Copies of top-level fields are not kept in the details; analyzed_at is lifted to the point
+    assert set(details["metadata"]) == {"model_used", "location_source"}
+    assert compact["analyzed_at"] == "2026-03-01T10:00:00"
+    assert payload_bytes(compact) < payload_bytes(LEGACY) / 2
+
+    expanded = expand_report_payload(compact, details)
+    assert {key: value for key, value in expanded.items() if key != "schema_version"} == LEGACY
+    assert expand_report_payload(LEGACY) is LEGACY
+
+
+def test_new_reports_are_stored_compact_and_read_back_in_both_shapes():
+    store = _store()
+    store.store_trash_report([1.0] + [0.0] * (DIM - 1), copy.deepcopy(LEGACY), report_id="r1")
+    store.store_trash_reports_batch([
+        {"report_id": "r2", "embedding": [1.0] + [0.0] * (DIM - 1), "metadata": {**copy.deepcopy(LEGACY), "report_id": "r2"}}
+    ])
+
+    stored = store.client.retrieve(settings.trash_reports_collection, [point_id_for("r1")])[0].payload
+    assert stored["schema_version"] == 2 and "metadata" not in stored
+
+    summary, full = store.get_reports_by_ids(["r1"]) + store.get_reports_by_ids(["r2"], with_details=True)
+    assert summary["metadata"]["location"] == LEGACY["location"] and "location_context" not in summary
+    assert full["location_context"] == CONTEXT and full["metadata"]["analyzed_at"] == "2026-03-01T10:00:00"
+
+
+def test_migration_compacts_legacy_points_and_is_resumable():
+    store = _store()
+    store.client.upsert(settings.trash_reports_collection, [
+        PointStruct(id=point_id_for(f"r{i}"), vector=[1.0] + [0.0] * (DIM - 1), payload={**LEGACY, "report_id": f"r{i}"})
+        for i in range(5)
+    ])
+
+    dry = compact_report_payloads(store, batch_size=2, dry_run=True)
+    assert dry["migrated"] == 5 and not store.client.collection_exists(settings.report_details_collection)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = compact_report_payloads(store, batch_size=2)
+    assert result["migrated"] == 5 and result["bytes_after"] < result["bytes_before"] / 2
+    assert compact_report_payloads(store)["migrated"] == 0
+
+    report = store.get_report_by_id("r3", with_details=True)
+    assert report["yolo_detection"] == LEGACY["yolo_detection"] and report["metadata"]["model_used"] == "gemini"
+
+
+def test_search_and_list_results_come_back_in_the_legacy_shape():
+    store = _store()
+    store.store_trash_report([1.0] + [0.0] * (DIM - 1), copy.deepcopy(LEGACY), report_id="r1")
+    query = [1.0] + [0.0] * (DIM - 1)
+
+    # Full payload: the details are joined back
+    full = store.find_similar_reports(query, score_threshold=0.5)[0]["data"]
+    assert full["location_context"] == CONTEXT and full["yolo_detection"] == LEGACY["yolo_detection"]
+    assert full["metadata"]["analyzed_at"] == "2026-03-01T10:00:00" and full["metadata"]["model_used"] == "gemini"
+    tiers = store.find_similar_reports_batch(query, [{"score_threshold": 0.5}, {"score_threshold": 0.9}])
+    assert all(tier[0]["data"]["location_context"] == CONTEXT for tier in tiers)
+
+    # The default projection is answered from the summary alone
+    assert not report_details_needed(REPORT_FIELDS)
+    page, _ = store.list_reports_page(fields=list(REPORT_FIELDS))
+    report = page[0].payload
+    assert report["metadata"] == {"analyzed_at": "2026-03-01T10:00:00", "location": LEGACY["location"]}
+    assert "schema_version" not in report and "location_context" not in report
+    assert report["timestamp"] == LEGACY["timestamp"] and report["specific_items"] == LEGACY["specific_items"]
+
+    page, _ = store.list_reports_page(fields=["report_id", "metadata.location_context"])
+    assert page[0].payload == {"report_id": "r1", "metadata": {"location_context": CONTEXT}}
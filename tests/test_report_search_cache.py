@@ -0,0 +1,82 @@
+"""
+Tests for the /reports/search result cache and its ingest-epoch invalidation
+"""
+
+import sys
+from pathlib import Path
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from config import settings
+from qdrant.search_cache import SearchResultCache, report_search_key, snap_to_grid
+from qdrant.vector_store import EcoSynkVectorStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_normalizes_query_and_snaps_location():
+    lat, lon = snap_to_grid(51.50012, -0.12049, 0.001)
+    near = {'lat': lat, 'lon': lon, 'radius_km': 5}
+    assert (lat, lon) == (51.5, -0.12)
+
+    key = report_search_key("Plastic  near the river ", 10, 0.35, near, 30)
+    assert key == report_search_key("plastic near the river", 10, 0.35, dict(near), 30)
+    assert key != report_search_key("plastic near the river", 10, 0.35, {**near, 'radius_km': 6}, 30)
+    assert key != report_search_key("plastic near the river", 10, 0.35, near, None)
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = SearchResultCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for key in ("a", "b"):
+        cache.put(key, {"key": key}, cache.epoch)
+    cache.get("a")
+    cache.put("c", {"key": "c"}, cache.epoch)  # Evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a")[1] == {"key": "a"}
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["expirations"] == 1
+
+
+def test_etag_is_content_derived():
+    cache = SearchResultCache(max_entries=4, ttl_seconds=10)
+    etag = cache.put("a", {"results": [1]}, cache.epoch)
+
+    assert etag.startswith('W/"')
+    assert etag == SearchResultCache(max_entries=4, ttl_seconds=10).put("x", {"results": [1]}, 0)
+    assert etag != SearchResultCache(max_entries=4, ttl_seconds=10).put("x", {"results": [2]}, 0)
+
+
+def test_report_writes_invalidate_cached_and_in_flight_results():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=settings.trash_reports_collection,
+        vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+    )
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    store.report_search_cache = cache = SearchResultCache(max_entries=8, ttl_seconds=60)
+    embedding = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+    cache.put("cached", {"results": []}, cache.epoch)
+    in_flight_epoch = cache.epoch
+    store.store_trash_report(embedding, {"primary_material": "plastic"}, report_id="r1")
+
+    assert cache.get("cached") is None
+    cache.put("in_flight", {"results": []}, in_flight_epoch)
+    assert cache.get("in_flight") is None and cache.stats()["discarded"] == 1
+
+    store.store_trash_reports_batch([{"report_id": "r2", "embedding": embedding, "metadata": {}}])
+    assert cache.epoch == in_flight_epoch + 2
@@ -0,0 +1,97 @@
+"""
+Tests for the single-round-trip fallback tiers behind /reports/search
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+
+DIM = settings.embedding_dimension
+LONDON = {'lat': 51.5, 'lon': -0.12, 'radius_km': 5}
+
+
+class CountingClient:
+    """Local client wrapper that counts search requests"""
+
+    def __init__(self, client):
+        self._client = client
+        self.round_trips = 0
+
+    def query_points(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._client.query_points(*args, **kwargs)
+
+    def query_batch_points(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._client.query_batch_points(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def _vector(cosine_to_axis: float):
+    """Unit vector whose cosine similarity to the first axis is cosine_to_axis"""
+    vector = np.zeros(DIM)
+    vector[0], vector[1] = cosine_to_axis, np.sqrt(1 - cosine_to_axis ** 2)
+    return vector.tolist()
+
+
+@pytest.fixture
+def store():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=settings.trash_reports_collection,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE)
+    )
+    vector_store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    vector_store.client = CountingClient(client)
+    vector_store.store_trash_reports_batch([
+        # Near London, moderately similar
+        {"report_id": "near_mid", "embedding": _vector(0.5), "metadata": {"location": {"lat": 51.5, "lon": -0.12}}},
+        # Paris, very similar
+        {"report_id": "far_high", "embedding": _vector(0.95), "metadata": {"location": {"lat": 48.85, "lon": 2.35}}},
+    ])
+    return vector_store
+
+
+def _sequential(store, threshold, location_filter):
+    """The previous three-call /reports/search logic"""
+    effective, notes = threshold, []
+    results = store.find_similar_reports(_vector(1.0), limit=5, score_threshold=effective, location_filter=location_filter)
+    if not results and effective > 0.3:
+        effective = 0.3
+        results = store.find_similar_reports(_vector(1.0), limit=5, score_threshold=effective, location_filter=location_filter)
+        notes.append("lowered score threshold to 0.30 for broader match")
+    if not results and location_filter is not None:
+        results = store.find_similar_reports(_vector(1.0), limit=5, score_threshold=effective, location_filter=None)
+        notes.append("removed location filter to broaden match")
+    return [r['data']['report_id'] for r in results], effective, notes
+
+
+@pytest.mark.parametrize("threshold, location_filter", [
+    (0.4, LONDON),   # requested tier hits
+    (0.7, LONDON),   # lowered threshold hits
+    (0.99, None),    # lowered threshold, no location to drop
+    (0.6, {'lat': 40.7, 'lon': -74.0, 'radius_km': 5}),  # both fallbacks
+    (0.2, {'lat': 40.7, 'lon': -74.0, 'radius_km': 5}),  # below the floor: only the location fallback
+])
+def test_fallback_tiers_match_sequential_search_in_one_round_trip(store, threshold, location_filter):
+    expected = _sequential(store, threshold, location_filter)
+    store.client.round_trips = 0
+
+    search = store.search_reports_with_fallbacks(_vector(1.0), limit=5, score_threshold=threshold, location_filter=location_filter)
+
+    assert store.client.round_trips == 1
+    found = [r['data']['report_id'] for r in search['results']]
+    assert (found, search['effective_score_threshold'], search['fallback_notes']) == expected
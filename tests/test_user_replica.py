@@ -0,0 +1,107 @@
+"""
+Tests for the in-process NumPy replica of the users collection
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import settings
+from qdrant.user_replica import UserReplica, readable_replica
+from qdrant.vector_store import EcoSynkVectorStore, _volunteer_filter
+
+DIM = settings.embedding_dimension
+LONDON = {"lat": 51.5, "lon": -0.12}
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    client.create_collection("users", vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+    rng = np.random.default_rng(3)
+    client.upsert("users", [
+        PointStruct(
+            id=str(uuid.uuid4()),
+            vector=rng.standard_normal(DIM).tolist(),
+            payload={
+                "name": f"user{i}",
+                "password_hash": "secret",
+                "available": i % 2 == 0,
+                "experience_level": i % 5,
+                "location": {"lat": 51.5 + (i % 10) * 0.02, "lon": -0.12},
+            }
+        )
+        for i in range(200)
+    ])
+    return client
+
+
+def test_search_matches_qdrant_with_filters(client):
+    replica = UserReplica(client, collection_name="users")
+    assert replica.refresh() == 200
+    query = np.random.default_rng(4).standard_normal(DIM).tolist()
+    filters = {"available": True, "min_experience_level": 2}
+
+    expected = client.query_points(
+        "users", query=query, limit=10, score_threshold=-1.0,
+        query_filter=_volunteer_filter(LONDON, 8.0, filters)
+    ).points
+    found = replica.search(query, limit=10, score_threshold=-1.0, location=LONDON, radius_km=8.0,
+                           available=True, min_experience=2)
+
+    assert [p.id for p in found] == [p.id for p in expected]
+    assert np.allclose([p.score for p in found], [p.score for p in expected], atol=1e-5)
+    assert all("password_hash" not in p.payload for p in found)
+
+
+def test_writes_are_applied_incrementally_and_survive_a_refresh(client):
+    replica = UserReplica(client, collection_name="users")
+    replica.refresh()
+    new_id, vector = str(uuid.uuid4()), [1.0] + [0.0] * (DIM - 1)
+    removed = next(replica.points()).id
+
+    # A write landing while the reconciliation scroll runs is replayed onto its result
+    scroll = client.scroll
+
+    def scroll_with_concurrent_write(*args, **kwargs):
+        replica.upsert([PointStruct(id=new_id, vector=vector, payload={"name": "late"})])
+        return scroll(*args, **kwargs)
+
+    client.scroll = scroll_with_concurrent_write
+    replica.refresh()
+    client.scroll = scroll
+
+    replica.update_payload([new_id], {"available": True})
+    replica.remove([removed])
+
+    top = replica.search(vector, limit=1, available=True)
+    assert top[0].id == new_id and top[0].payload == {"name": "late", "available": True}
+    assert replica.get(removed) is None
+    assert replica.stats()["users"] == 200
+
+
+def test_stale_replica_falls_back_to_qdrant(client):
+    replica = UserReplica(client, collection_name="users", max_staleness_seconds=60)
+    assert readable_replica(replica) is None
+    replica.refresh()
+    assert readable_replica(replica) is replica
+
+    store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    store.client = client
+    store.user_replica = replica
+    replica.max_staleness_seconds = 1e-9
+    query = np.random.default_rng(5).standard_normal(DIM).tolist()
+
+    results = store.find_nearby_volunteers(query, LONDON, radius_km=50, min_match_score=-1.0)
+
+    assert len(results) == 10
+    assert replica.stats()["fallbacks"] == 2
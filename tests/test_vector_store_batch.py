@@ -0,0 +1,103 @@
+"""
+Tests for bulk trash report ingestion on EcoSynkVectorStore
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from config import settings
+from qdrant.vector_store import EcoSynkVectorStore
+
+
+class FlakyClient:
+    """Wraps a local client, recording upsert chunk sizes and failing selected calls"""
+
+    def __init__(self, client, fail_calls=()):
+        self._client = client
+        self.fail_calls = set(fail_calls)
+        self.upserts = []
+
+    def upsert(self, collection_name, points, wait=True):
+        self.upserts.append(len(points))
+        if len(self.upserts) in self.fail_calls:
+            raise RuntimeError("upsert rejected")
+        return self._client.upsert(collection_name=collection_name, points=points, wait=wait)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+@pytest.fixture
+def store():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=settings.trash_reports_collection,
+        vectors_config=VectorParams(size=settings.embedding_dimension, distance=Distance.COSINE)
+    )
+    vector_store = EcoSynkVectorStore.__new__(EcoSynkVectorStore)
+    vector_store.client = FlakyClient(client)
+    return vector_store
+
+
+def _report(i, **metadata):
+    return {
+        "report_id": f"report_{i}",
+        "embedding": [1.0 + i] + [0.0] * (settings.embedding_dimension - 1),
+        "metadata": {"primary_material": "plastic", **metadata},
+    }
+
+
+def _payloads(store):
+    points, _ = store.client.scroll(settings.trash_reports_collection, limit=100, with_payload=True)
+    return {point.payload["report_id"]: point.payload for point in points}
+
+
+def test_batch_normalizes_locations_and_timestamps(store):
+    result = store.store_trash_reports_batch([
+        _report(0, metadata={"location": {"latitude": "51.5", "longitude": "-0.12"}}, timestamp=1700000000),
+        _report(1, location={"lat": 40.0, "lng": -74.0}, timestamp="2024-05-01T10:00:00Z"),
+        _report(2),
+    ])
+
+    assert result["report_ids"] == ["report_0", "report_1", "report_2"]
+    assert result["stored"] == 3 and result["failed"] == []
+
+    payloads = _payloads(store)
+    assert payloads["report_0"]["location"] == {"lat": 51.5, "lon": -0.12}
+    assert payloads["report_0"]["timestamp"] == "2023-11-14T22:13:20+00:00"
+    assert payloads["report_1"]["location"] == {"lat": 40.0, "lon": -74.0}
+    assert payloads["report_1"]["timestamp"] == "2024-05-01T10:00:00+00:00"
+    assert payloads["report_2"]["timestamp"]
+
+
+def test_batch_uploads_in_chunks_and_reports_failures_per_item(store):
+    store.client.fail_calls = {2}
+    reports = [_report(i) for i in range(7)]
+    reports[3]["embedding"] = [0.1, 0.2]
+
+    result = store.store_trash_reports_batch(reports, chunk_size=2, parallel=1, wait=False)
+
+    assert store.client.upserts == [2, 2, 2]
+    failed = {entry["index"]: entry for entry in result["failed"]}
+    assert set(failed) == {2, 3, 4}
+    assert "dimensions" in failed[3]["error"]
+    assert failed[2]["error"] == failed[4]["error"] == "upsert rejected"
+    assert result["report_ids"] == ["report_0", "report_1", None, None, None, "report_5", "report_6"]
+    assert result["stored"] == 4
+    assert set(_payloads(store)) == {"report_0", "report_1", "report_5", "report_6"}
+
+
+def test_parallel_chunks_store_every_report(store):
+    result = store.store_trash_reports_batch([_report(i) for i in range(10)], chunk_size=3, parallel=4)
+
+    assert sorted(store.client.upserts) == [1, 3, 3, 3]
+    assert result["stored"] == 10
+    assert len(_payloads(store)) == 10
@@ -0,0 +1,43 @@
+"""
+Tests for the volunteer endpoints, which only depend on the user service
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from qdrant_client.models import PointStruct
+
+# Add ai-services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ai-services'))
+
+import api_server
+from config import settings
+from qdrant.connection import QdrantConnectionFactory
+from user_service import UserService
+
+VECTOR = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+
+
+@pytest.mark.asyncio
+async def test_volunteer_endpoints_work_without_the_vector_store(monkeypatch):
+    connection = QdrantConnectionFactory(local_path=":memory:")
+    users = UserService(connection=connection)
+    users.client.upsert(settings.volunteer_profiles_collection, [
+        PointStruct(id=index, vector=VECTOR, payload={"user_id": f"u{index}", "name": f"User {index}", "past_cleanup_count": index})
+        for index in range(1, 4)
+    ])
+    # Startup leaves vector_store unset when setup_collections fails
+    monkeypatch.setattr(api_server, "vector_store", None)
+    monkeypatch.setattr(api_server, "user_service", users)
+
+    leaderboard = await api_server.get_leaderboard(limit=2, fields=None)
+    volunteers = await api_server.list_volunteers(
+        limit=10, lat=None, lon=None, radius_km=25.0, available_only=False, fields=None
+    )
+
+    assert [entry["user_id"] for entry in leaderboard["leaderboard"]] == ["u3", "u2"]
+    assert leaderboard["total_volunteers"] == 3
+    assert volunteers["count"] == 3
+    assert await api_server._count_volunteers() == 3
+    await connection.aclose()